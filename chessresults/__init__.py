@@ -46,6 +46,18 @@ APPLICATION_DATABASE_MODULE = {
     VEDIS_MODULE: _VEDISRESULTS,
 }
 
+# Map database module names to application module which defers index updates
+# when filling a new database in bulk.  DPT is not included: the DPT results
+# database does not support DPT's deferred update mode.
+APPLICATION_DATABASEDU_MODULE = {
+    BERKELEYDB_MODULE: _BERKELEYDBRESULTS + "du",
+    BSDDB3_MODULE: _DBRESULTS + "du",
+    SQLITE3_MODULE: _SQLITE3RESULTS + "du",
+    APSW_MODULE: _APSWRESULTS + "du",
+    UNQLITE_MODULE: _UNQLITERESULTS + "du",
+    VEDIS_MODULE: _VEDISRESULTS + "du",
+}
+
 # Default ECF reference data import module name
 _BASECORE_ECF_DATA_IMPORT = "..basecore.ecfdataimport"
 
@@ -5,13 +5,19 @@
 """Results database using Sqlite3 database via apsw.
 """
 
+import apsw
+
 from solentware_base import apsw_database
 
 from ..core.filespec import FileSpec
 from ..basecore import database
+from ..basecore import sqliteprofile
+from ..basecore import backup
 
 
-class ResultsDatabase(database.Database, apsw_database.Database):
+class ResultsDatabase(
+    sqliteprofile.Database, database.Database, apsw_database.Database
+):
     """Methods and data structures to create, open, and close database"""
 
     _datasourceset_modulename = "solentware_grid.core.datasourceset"
@@ -25,4 +31,20 @@ class ResultsDatabase(database.Database, apsw_database.Database):
 
     def delete_database(self):
         """Close and delete the open chess results database."""
-        return super().delete_database((self.database_file,))
+        return super().delete_database(
+            (
+                self.database_file,
+                self.database_file + "-wal",
+                self.database_file + "-shm",
+            )
+        )
+
+    def online_backup(self, filename):
+        """Copy database to filename by apsw backup method."""
+        target = apsw.Connection(filename)
+        try:
+            with target.backup("main", self.dbenv, "main") as step:
+                while not step.done:
+                    step.step(backup.BACKUP_PAGES)
+        finally:
+            target.close()
@@ -0,0 +1,164 @@
+# backup.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Backup and snapshot of an open ChessResults database.
+
+Each database engine interface has a backup_database method which copies the
+database to a backup folder while the database is open.  The SQLite engines
+use the SQLite online backup interface, which copies a few pages at a time
+so other connections can update the database while the backup is done.  The
+Berkeley DB engines do a hot backup: the database files are copied, then the
+log files, after a checkpoint.  Later backups to the same folder copy just
+the log files.  The other engines copy the database files when no update is
+in progress, and later backups to the same folder copy just the files which
+have changed.
+
+A backup folder holds copies of the files in the database folder, so the
+backup is used by copying it to a folder with the database folder's name.
+
+A snapshot is a backup in the database folder, replaced each time one is
+taken, which can be restored while the database is closed.  Large tasks run
+by bulk_task take a snapshot before they start if the snapshot_bulk_tasks
+configuration item is set, so the database can be rolled back if the task
+went wrong.  It is not set by default because the snapshot is a full copy
+of the database.
+
+"""
+
+import os
+import shutil
+
+from ..core import constants
+
+# Pages copied in each step of an SQLite online backup.
+BACKUP_PAGES = 1024
+
+
+class BackupError(Exception):
+    pass
+
+
+def copy_files(home_directory, names, backup_folder, incremental=True):
+    """Copy files in names to backup_folder and return names copied.
+
+    The names are paths in home_directory and are copied to the same
+    relative paths in backup_folder.  If incremental is True files with the
+    same size and modification time as the copy in backup_folder are not
+    copied.
+
+    """
+    copied = []
+    for name in names:
+        if not os.path.isfile(name):
+            continue
+        relname = os.path.relpath(name, home_directory)
+        target = os.path.join(backup_folder, relname)
+        if incremental and os.path.isfile(target):
+            source_stat = os.stat(name)
+            target_stat = os.stat(target)
+            if (
+                source_stat.st_size == target_stat.st_size
+                and source_stat.st_mtime == target_stat.st_mtime
+            ):
+                continue
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy2(name, target)
+        copied.append(relname)
+    return copied
+
+
+def berkeley_hot_backup(database, backup_folder, arch_data, arch_log, abs_):
+    """Do Berkeley DB hot backup of database and return names copied.
+
+    arch_data, arch_log, and abs_ are the DB_ARCH_DATA, DB_ARCH_LOG, and
+    DB_ARCH_ABS flags from the module providing the Berkeley DB interface.
+
+    The database files are copied if backup_folder does not contain a copy,
+    otherwise just the log files needed since the last backup are copied.
+    The last log file is always copied because it is still being written.
+
+    """
+    dbenv = database.dbenv
+    dbenv.txn_checkpoint()
+    home = database.home_directory
+    copied = []
+    datafiles = [
+        os.fsdecode(n) for n in dbenv.log_archive(arch_data | abs_) or ()
+    ]
+    if not datafiles:
+        datafiles = [database.database_file]
+    if not all(
+        os.path.isfile(os.path.join(backup_folder, os.path.relpath(n, home)))
+        for n in datafiles
+    ):
+        copied.extend(
+            copy_files(home, datafiles, backup_folder, incremental=False)
+        )
+    logfiles = sorted(
+        os.fsdecode(n) for n in dbenv.log_archive(arch_log | abs_) or ()
+    )
+    copied.extend(copy_files(home, logfiles[:-1], backup_folder))
+    copied.extend(
+        copy_files(home, logfiles[-1:], backup_folder, incremental=False)
+    )
+    return copied
+
+
+def take_snapshot(database):
+    """Replace snapshot of database with a new one and return names copied.
+
+    The new snapshot is built in a separate folder so the old snapshot is
+    kept if the backup fails.
+
+    """
+    snapshot = os.path.join(
+        database.home_directory, constants.DATABASE_SNAPSHOT
+    )
+    building = snapshot + constants.DATABASE_SNAPSHOT_NEW
+    shutil.rmtree(building, ignore_errors=True)
+    os.mkdir(building)
+    try:
+        copied = database.backup_database(building)
+    except BaseException:
+        shutil.rmtree(building, ignore_errors=True)
+        raise
+    shutil.rmtree(snapshot, ignore_errors=True)
+    os.rename(building, snapshot)
+    return copied
+
+
+def restore_snapshot(database):
+    """Replace database files by the snapshot and return names restored.
+
+    database must be closed.  Files in database folder which are not in
+    the snapshot but would be used when the database is opened, such as
+    SQLite write-ahead logs and Berkeley DB log files, are deleted.
+
+    """
+    home = database.home_directory
+    snapshot = os.path.join(home, constants.DATABASE_SNAPSHOT)
+    if not os.path.isdir(snapshot):
+        raise BackupError(
+            "".join(("There is no snapshot of the database in ", home))
+        )
+    restored = []
+    for folder, dirnames, filenames in os.walk(snapshot):
+        relfolder = os.path.relpath(folder, snapshot)
+        target = os.path.normpath(os.path.join(home, relfolder))
+        if relfolder != os.curdir and os.path.isdir(target):
+            for name in os.listdir(target):
+                if name not in filenames and os.path.isfile(
+                    os.path.join(target, name)
+                ):
+                    os.remove(os.path.join(target, name))
+        os.makedirs(target, exist_ok=True)
+        for name in filenames:
+            shutil.copy2(
+                os.path.join(folder, name), os.path.join(target, name)
+            )
+            restored.append(os.path.normpath(os.path.join(relfolder, name)))
+    for name in database.files_obsoleted_by_restore():
+        if os.path.isfile(name):
+            os.remove(name)
+    return restored
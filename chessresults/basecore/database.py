@@ -7,26 +7,165 @@
 
 import os
 import shutil
+import functools
 
 from .. import APPLICATION_NAME, ERROR_LOG
 from ..core import constants
+from . import backup
+from . import instrument
+from . import taskprofile
 
 
 class Database:
 
     """ """
 
+    # True if files not named in open_database() call are opened when first
+    # used, and close_idle_files() method closes those not used recently.
+    open_files_on_demand = False
+
+    # True if bulk_task takes a snapshot of the database before the task.
+    snapshot_bulk_tasks = False
+
+    # Database calls made by tasks are counted unless INSTRUMENT_TASKS_OFF.
+    instrument_tasks = constants.INSTRUMENT_TASKS_OFF
+
+    # True if tasks are profiled, saving the profiles in the database folder.
+    profile_tasks = False
+
     def open_database(self, files=None):
         """Return '' to fit behaviour of dpt version of this method."""
         super().open_database(files=files)
         return ""
 
+    def set_performance_profile(self, profile=None):
+        """Do nothing.  Only SQLite databases have performance profiles."""
+
+    def do_snapshot_task(
+        self,
+        taskmethod,
+        logwidget=None,
+        taskmethodargs=None,
+        use_specification_items=None,
+    ):
+        """Run taskmethod, which must not change the database, in a task.
+
+        Database engines which cannot provide a read-only snapshot run the
+        task by do_database_task.
+
+        """
+        self.do_database_task(
+            taskmethod,
+            logwidget=logwidget,
+            taskmethodargs=taskmethodargs,
+            use_specification_items=use_specification_items,
+        )
+
+    def do_database_task(
+        self,
+        taskmethod,
+        logwidget=None,
+        taskmethodargs=None,
+        use_specification_items=None,
+    ):
+        """Extend to count database calls made by, and profile, taskmethod.
+
+        The instrument_tasks and profile_tasks attributes say if these are
+        done.
+
+        """
+        super().do_database_task(
+            self.profile_task(self.instrument_task(taskmethod)),
+            logwidget=logwidget,
+            taskmethodargs=taskmethodargs,
+            use_specification_items=use_specification_items,
+        )
+
+    def instrument_task(self, taskmethod):
+        """Return taskmethod, wrapped to count its database calls if required.
+
+        The instrument_tasks attribute says if calls are counted.
+
+        """
+        if self.instrument_tasks in (
+            constants.INSTRUMENT_TASKS_LOG,
+            constants.INSTRUMENT_TASKS_JSON,
+        ):
+            return instrument.instrumented_task(taskmethod)
+        return taskmethod
+
+    def profile_task(self, method):
+        """Return method, wrapped to profile it if profile_tasks is True.
+
+        method can be a taskmethod for do_database_task or a method run by
+        a task log.
+
+        """
+        if self.profile_tasks:
+            return taskprofile.profiled(method, self.home_directory)
+        return method
+
+    def backup_database(self, backup_folder):
+        """Copy database to backup_folder and return names of files copied.
+
+        The database files are copied when no update is in progress, so this
+        connection must not have a transaction in progress.  Files which
+        have not changed since the last backup to backup_folder are not
+        copied.
+
+        """
+        return backup.copy_files(
+            self.home_directory,
+            self.get_backup_file_names(),
+            backup_folder,
+        )
+
+    def get_backup_file_names(self):
+        """Return names of files copied by backup_database.
+
+        The '.commit' file is the last committed version of the database if
+        the engine does not support transactions.
+
+        """
+        return (self.database_file, self.database_file + ".commit")
+
+    def files_obsoleted_by_restore(self):
+        """Return names of files deleted when a snapshot is restored."""
+        return ()
+
+    def compact_files(self):
+        """Return False.  The engine cannot compact its files in place.
+
+        Copying the database to a new one, as the compact_database tool
+        does when records are renumbered, gets rid of the free space.
+
+        """
+        return False
+
     def delete_database(self, names):
         """Delete results database and return message about items not deleted."""
         listnames = set(n for n in os.listdir(self.home_directory))
         homenames = set(n for n in names if os.path.basename(n) in listnames)
         if ERROR_LOG in listnames:
             homenames.add(os.path.join(self.home_directory, ERROR_LOG))
+        for name in listnames:
+            if name.startswith(
+                (
+                    instrument.INSTRUMENT_FILE_PREFIX,
+                    taskprofile.PROFILE_FILE_PREFIX,
+                )
+            ):
+                homenames.add(os.path.join(self.home_directory, name))
+        if constants.ECF_DOWNLOAD_CACHE in listnames:
+            homenames.add(
+                os.path.join(self.home_directory, constants.ECF_DOWNLOAD_CACHE)
+            )
+        for snapshot in (
+            constants.DATABASE_SNAPSHOT,
+            constants.DATABASE_SNAPSHOT + constants.DATABASE_SNAPSHOT_NEW,
+        ):
+            if snapshot in listnames:
+                homenames.add(os.path.join(self.home_directory, snapshot))
         if len(listnames - set(os.path.basename(h) for h in homenames)):
             message = "".join(
                 (
@@ -44,7 +183,8 @@ class Database:
         for h in homenames:
             if os.path.isdir(h):
                 shutil.rmtree(h, ignore_errors=True)
-            else:
+            elif os.path.exists(h):
+                # SQLite write-ahead log files go when database is closed.
                 os.remove(h)
         try:
             os.rmdir(self.home_directory)
@@ -70,3 +210,33 @@ class Database:
     def _keybyteify(self, value):
         """Tranform a value from an ECF json download for database key search."""
         return value
+
+
+def bulk_task(taskmethod):
+    """Return taskmethod wrapped to run with the bulk performance profile.
+
+    For do_database_task calls, where taskmethod is called as
+    taskmethod(database, logwidget, **taskmethodargs), which add or change
+    many records.
+
+    A snapshot of the database is taken before taskmethod is run if the
+    snapshot_bulk_tasks attribute of database is True.
+
+    """
+
+    @functools.wraps(taskmethod)
+    def bulk_taskmethod(database, logwidget, **kargs):
+        if database.snapshot_bulk_tasks:
+            if logwidget:
+                logwidget.append_text("Taking snapshot of database.")
+            backup.take_snapshot(database)
+            if logwidget:
+                logwidget.append_text("Snapshot of database taken.")
+                logwidget.append_text_only("")
+        database.set_performance_profile(constants.SQLITE_PROFILE_BULK)
+        try:
+            return taskmethod(database, logwidget, **kargs)
+        finally:
+            database.set_performance_profile()
+
+    return bulk_taskmethod
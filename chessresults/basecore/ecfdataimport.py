@@ -24,16 +24,26 @@ any download.
 """
 
 from ..core import filespec
+from ..core.taskexecutor import TaskProgress, TaskCancelled
 from ..core.ecf import ecfrecord
 from ..core.ecf import ecfclubdb
 from ..core.ecf import ecfplayerdb
 from ..core.ecf import ecfmaprecord
 
+_CANCELLED = "Cancelled: no changes made to the database."
+
 
 def copy_ecf_clubs_post_2020_rules(
-    results, logwidget=None, ecfdata=None, downloaddate=None, **kwargs
+    results,
+    logwidget=None,
+    ecfdata=None,
+    downloaddate=None,
+    progress=None,
+    **kwargs
 ):
     """Copy downloaded club records in ecfdata to database."""
+    if progress is None:
+        progress = TaskProgress("")
     keybyteify = results._keybyteify
 
     # downloaddate replaces the datecontrol and ecfdate arguments.
@@ -57,138 +67,148 @@ def copy_ecf_clubs_post_2020_rules(
             )
         )
     results.start_transaction()
-
-    # Update Master file date record.
-    # There is no publication date associated with all clubs download so
-    # use date of download to avoid design changes in clubs area.
-    datecursor = results.database_cursor(
-        filespec.ECFTXN_FILE_DEF, filespec.ECFDATE_FIELD_DEF
-    )
     try:
-        r = datecursor.first()
-        ecfdateexists = False
-        while r:
-            daterecord = ecfrecord.ECFrefDBrecordECFdate()
-            daterecord.load_instance(
-                results,
-                filespec.ECFTXN_FILE_DEF,
-                filespec.ECFDATE_FIELD_DEF,
-                r,
-            )
-            if daterecord.value.ECFobjtype == ecfrecord.objtypeClub:
-                if ecfdate != daterecord.value.appliedECFdate:
-                    newdaterecord = daterecord.clone()
-                    newdaterecord.value.appliedECFdate = ecfdate
-                    newdaterecord.edit_record(
-                        results,
-                        filespec.ECFTXN_FILE_DEF,
-                        filespec.ECFDATE_FIELD_DEF,
-                        newdaterecord,
-                    )
-                if ecfdate == daterecord.value.ECFdate:
-                    ecfdateexists = True
-            r = datecursor.next()
-        if not ecfdateexists:
-            txndaterec = ecfrecord.ECFrefDBrecordECFdate()
-            txndaterec.value.ECFdate = ecfdate
-            txndaterec.value.ECFtxntype = ecfrecord.txnNew
-            txndaterec.value.ECFobjtype = ecfrecord.objtypeClub
-            txndaterec.value.appliedECFdate = ecfdate
-            txndaterec.key.recno = None
-            txndaterec.put_record(results, filespec.ECFTXN_FILE_DEF)
-            ecfrecord.ECFrefDBrecordECFdate.set_most_recent_master_dates(
-                results
-            )
-    finally:
-        datecursor.close()
-
-    # Load the ECF data.
-    if logwidget:
-        logwidget.append_text("", timestamp=False)
-        logwidget.append_text(
-            "Add or edit ECF Club Code references to Master club file."
+        # Update Master file date record.
+        # There is no publication date associated with all clubs download so
+        # use date of download to avoid design changes in clubs area.
+        datecursor = results.database_cursor(
+            filespec.ECFTXN_FILE_DEF, filespec.ECFDATE_FIELD_DEF
         )
-    ecf_codes = set()
-    ecfcursor = results.database_cursor(
-        filespec.ECFCLUB_FILE_DEF, filespec.ECFCLUBCODE_FIELD_DEF
-    )
-    try:
-        for data in ecfdata["clubs"]:
-            club_code = data.get("club_code")
-            if club_code is None:
-                club_code = ""
-            club_name = data.get("club_name")
-            if club_name is None:
-                club_name = ""
-            assoc_code = data.get("assoc_code")
-            if assoc_code is None:
-                assoc_code = ""
-            ecfrec = ecfrecord.ECFrefDBrecordECFclub()
-            record = ecfcursor.nearest(keybyteify(club_code))
-            if record == None:
-                ecfrec.key.recno = None
-                ecfrec.value.ECFcode = club_code
-                ecfrec.value.ECFactive = True
-                ecfrec.value.ECFname = club_name
-                ecfrec.value.ECFcountycode = assoc_code
-                ecf_codes.add(ecfrec.value.ECFcode)
-                ecfrec.put_record(results, filespec.ECFCLUB_FILE_DEF)
-            elif record[0] != club_code:
-                ecfrec.key.recno = None
-                ecfrec.value.ECFcode = club_code
-                ecfrec.value.ECFactive = True
-                ecfrec.value.ECFname = club_name
-                ecfrec.value.ECFcountycode = assoc_code
-                ecf_codes.add(ecfrec.value.ECFcode)
-                ecfrec.put_record(results, filespec.ECFCLUB_FILE_DEF)
-            else:
-                ecfrec.load_instance(
+        try:
+            r = datecursor.first()
+            ecfdateexists = False
+            while r:
+                daterecord = ecfrecord.ECFrefDBrecordECFdate()
+                daterecord.load_instance(
                     results,
-                    filespec.ECFCLUB_FILE_DEF,
-                    filespec.ECFCLUBCODE_FIELD_DEF,
-                    record,
+                    filespec.ECFTXN_FILE_DEF,
+                    filespec.ECFDATE_FIELD_DEF,
+                    r,
                 )
-                ecfnew = ecfrec.clone()
-                ecfnew.value.ECFactive = True
-                ecfnew.value.ECFname = club_name
-                ecfnew.value.ECFcountycode = assoc_code
-                ecf_codes.add(ecfrec.value.ECFcode)
-                ecfrec.edit_record(
-                    results,
-                    filespec.ECFCLUB_FILE_DEF,
-                    filespec.ECFCLUBCODE_FIELD_DEF,
-                    ecfnew,
+                if daterecord.value.ECFobjtype == ecfrecord.objtypeClub:
+                    if ecfdate != daterecord.value.appliedECFdate:
+                        newdaterecord = daterecord.clone()
+                        newdaterecord.value.appliedECFdate = ecfdate
+                        newdaterecord.edit_record(
+                            results,
+                            filespec.ECFTXN_FILE_DEF,
+                            filespec.ECFDATE_FIELD_DEF,
+                            newdaterecord,
+                        )
+                    if ecfdate == daterecord.value.ECFdate:
+                        ecfdateexists = True
+                r = datecursor.next()
+            if not ecfdateexists:
+                txndaterec = ecfrecord.ECFrefDBrecordECFdate()
+                txndaterec.value.ECFdate = ecfdate
+                txndaterec.value.ECFtxntype = ecfrecord.txnNew
+                txndaterec.value.ECFobjtype = ecfrecord.objtypeClub
+                txndaterec.value.appliedECFdate = ecfdate
+                txndaterec.key.recno = None
+                txndaterec.put_record(results, filespec.ECFTXN_FILE_DEF)
+                ecfrecord.ECFrefDBrecordECFdate.set_most_recent_master_dates(
+                    results
                 )
+        finally:
+            datecursor.close()
 
-        # Mark ECF codes not in download as inactive.
-        # Meaning of inactive depends on which download is loaded, latest or
-        # earlier.
+        # Load the ECF data.
         if logwidget:
+            logwidget.append_text("", timestamp=False)
             logwidget.append_text(
-                "Delete ECF Club Code references not in all active clubs."
+                "Add or edit ECF Club Code references to Master club file."
             )
-        record = ecfcursor.first()
-        while record:
-            ecfrec = ecfrecord.ECFrefDBrecordECFclub()
-            ecfrec.load_instance(
-                results,
-                filespec.ECFCLUB_FILE_DEF,
-                filespec.ECFCLUBCODE_FIELD_DEF,
-                record,
-            )
-            if ecfrec.value.ECFcode not in ecf_codes:
-                ecfnew = ecfrec.clone()
-                ecfnew.value.ECFactive = False
-                ecfrec.edit_record(
+        ecf_codes = set()
+        ecfcursor = results.database_cursor(
+            filespec.ECFCLUB_FILE_DEF, filespec.ECFCLUBCODE_FIELD_DEF
+        )
+        try:
+            progress.start(total=len(ecfdata["clubs"]))
+            for data in ecfdata["clubs"]:
+                progress.advance()
+                club_code = data.get("club_code")
+                if club_code is None:
+                    club_code = ""
+                club_name = data.get("club_name")
+                if club_name is None:
+                    club_name = ""
+                assoc_code = data.get("assoc_code")
+                if assoc_code is None:
+                    assoc_code = ""
+                ecfrec = ecfrecord.ECFrefDBrecordECFclub()
+                record = ecfcursor.nearest(keybyteify(club_code))
+                if record == None:
+                    ecfrec.key.recno = None
+                    ecfrec.value.ECFcode = club_code
+                    ecfrec.value.ECFactive = True
+                    ecfrec.value.ECFname = club_name
+                    ecfrec.value.ECFcountycode = assoc_code
+                    ecf_codes.add(ecfrec.value.ECFcode)
+                    ecfrec.put_record(results, filespec.ECFCLUB_FILE_DEF)
+                elif record[0] != club_code:
+                    ecfrec.key.recno = None
+                    ecfrec.value.ECFcode = club_code
+                    ecfrec.value.ECFactive = True
+                    ecfrec.value.ECFname = club_name
+                    ecfrec.value.ECFcountycode = assoc_code
+                    ecf_codes.add(ecfrec.value.ECFcode)
+                    ecfrec.put_record(results, filespec.ECFCLUB_FILE_DEF)
+                else:
+                    ecfrec.load_instance(
+                        results,
+                        filespec.ECFCLUB_FILE_DEF,
+                        filespec.ECFCLUBCODE_FIELD_DEF,
+                        record,
+                    )
+                    ecfnew = ecfrec.clone()
+                    ecfnew.value.ECFactive = True
+                    ecfnew.value.ECFname = club_name
+                    ecfnew.value.ECFcountycode = assoc_code
+                    ecf_codes.add(ecfrec.value.ECFcode)
+                    ecfrec.edit_record(
+                        results,
+                        filespec.ECFCLUB_FILE_DEF,
+                        filespec.ECFCLUBCODE_FIELD_DEF,
+                        ecfnew,
+                    )
+
+            # Mark ECF codes not in download as inactive.
+            # Meaning of inactive depends on which download is loaded, latest or
+            # earlier.
+            if logwidget:
+                logwidget.append_text(
+                    "Delete ECF Club Code references not in all active clubs."
+                )
+            progress.start(total=ecfcursor.count_records())
+            record = ecfcursor.first()
+            while record:
+                progress.advance()
+                ecfrec = ecfrecord.ECFrefDBrecordECFclub()
+                ecfrec.load_instance(
                     results,
                     filespec.ECFCLUB_FILE_DEF,
                     filespec.ECFCLUBCODE_FIELD_DEF,
-                    ecfnew,
+                    record,
                 )
-            record = ecfcursor.next()
+                if ecfrec.value.ECFcode not in ecf_codes:
+                    ecfnew = ecfrec.clone()
+                    ecfnew.value.ECFactive = False
+                    ecfrec.edit_record(
+                        results,
+                        filespec.ECFCLUB_FILE_DEF,
+                        filespec.ECFCLUBCODE_FIELD_DEF,
+                        ecfnew,
+                    )
+                record = ecfcursor.next()
 
-    finally:
-        ecfcursor.close()
+        finally:
+            ecfcursor.close()
+    except TaskCancelled:
+        results.backout()
+        if logwidget:
+            logwidget.append_text("", timestamp=False)
+            logwidget.append_text(_CANCELLED)
+        return False
     results.commit()
     if logwidget:
         logwidget.append_text("", timestamp=False)
@@ -205,9 +225,16 @@ def copy_ecf_clubs_post_2020_rules(
 
 
 def copy_ecf_players_post_2020_rules(
-    results, logwidget=None, ecfdata=None, downloaddate=None, **kwargs
+    results,
+    logwidget=None,
+    ecfdata=None,
+    downloaddate=None,
+    progress=None,
+    **kwargs
 ):
     """Copy downloaded player records in ecfdata to database."""
+    if progress is None:
+        progress = TaskProgress("")
     keybyteify = results._keybyteify
 
     # downloaddate replaces the datecontrol argument.
@@ -233,188 +260,200 @@ def copy_ecf_players_post_2020_rules(
             )
         )
     results.start_transaction()
-
-    # Update Master file date record.
-    datecursor = results.database_cursor(
-        filespec.ECFTXN_FILE_DEF, filespec.ECFDATE_FIELD_DEF
-    )
     try:
-        r = datecursor.first()
-        ecfdateexists = False
-        while r:
-            daterecord = ecfrecord.ECFrefDBrecordECFdate()
-            daterecord.load_instance(
-                results,
-                filespec.ECFTXN_FILE_DEF,
-                filespec.ECFDATE_FIELD_DEF,
-                r,
+        # Update Master file date record.
+        datecursor = results.database_cursor(
+            filespec.ECFTXN_FILE_DEF, filespec.ECFDATE_FIELD_DEF
+        )
+        try:
+            r = datecursor.first()
+            ecfdateexists = False
+            while r:
+                daterecord = ecfrecord.ECFrefDBrecordECFdate()
+                daterecord.load_instance(
+                    results,
+                    filespec.ECFTXN_FILE_DEF,
+                    filespec.ECFDATE_FIELD_DEF,
+                    r,
+                )
+                if daterecord.value.ECFobjtype == ecfrecord.objtypePlayer:
+                    if ecfdate != daterecord.value.appliedECFdate:
+                        newdaterecord = daterecord.clone()
+                        newdaterecord.value.appliedECFdate = ecfdate
+                        newdaterecord.edit_record(
+                            results,
+                            filespec.ECFTXN_FILE_DEF,
+                            filespec.ECFDATE_FIELD_DEF,
+                            newdaterecord,
+                        )
+                    if ecfdate == daterecord.value.ECFdate:
+                        ecfdateexists = True
+                r = datecursor.next()
+            if not ecfdateexists:
+                txndaterec = ecfrecord.ECFrefDBrecordECFdate()
+                txndaterec.value.ECFdate = ecfdate
+                txndaterec.value.ECFtxntype = ecfrecord.txnNew
+                txndaterec.value.ECFobjtype = ecfrecord.objtypePlayer
+                txndaterec.value.appliedECFdate = ecfdate
+                txndaterec.key.recno = None
+                txndaterec.put_record(results, filespec.ECFTXN_FILE_DEF)
+                ecfrecord.ECFrefDBrecordECFdate.set_most_recent_master_dates(
+                    results
+                )
+        finally:
+            datecursor.close()
+
+        # Load the ECF data.
+        if logwidget:
+            logwidget.append_text("", timestamp=False)
+            logwidget.append_text(
+                "Add or edit ECF Grading Code references to Master player file."
             )
-            if daterecord.value.ECFobjtype == ecfrecord.objtypePlayer:
-                if ecfdate != daterecord.value.appliedECFdate:
-                    newdaterecord = daterecord.clone()
-                    newdaterecord.value.appliedECFdate = ecfdate
-                    newdaterecord.edit_record(
+        ecf_codes = set()
+        ecfcursor = results.database_cursor(
+            filespec.ECFPLAYER_FILE_DEF, filespec.ECFPLAYERCODE_FIELD_DEF
+        )
+        try:
+            code_index = ecfdata["column_names"].index("ECF_code")
+            name_index = ecfdata["column_names"].index("full_name")
+            club_code_index = (ecfdata["column_names"].index("club_code"),)
+            progress.start(total=len(ecfdata["players"]))
+            for data in ecfdata["players"]:
+                progress.advance()
+                ECF_code = data[code_index]
+                if ECF_code is None:
+                    ECF_code = ""
+                full_name = data[name_index]
+                if full_name is None:
+                    full_name = ""
+                clubcodes = []
+                for i in club_code_index:
+                    c = data[i]
+                    if isinstance(c, str):
+                        clubcodes.append(c)
+                    else:
+                        clubcodes.append(str(c).zfill(4))
+                clubcodes.sort()
+                ecfrec = ecfrecord.ECFrefDBrecordECFplayer()
+                record = ecfcursor.nearest(keybyteify(ECF_code))
+                if record == None:
+                    ecfrec.key.recno = None
+                    ecfrec.value.ECFcode = ECF_code
+                    ecfrec.value.ECFactive = True
+                    ecfrec.value.ECFname = full_name
+                    ecfrec.value.ECFclubcodes = clubcodes
+                    ecf_codes.add(ecfrec.value.ECFcode)
+                    ecfrec.put_record(results, filespec.ECFPLAYER_FILE_DEF)
+                elif record[0] != ECF_code:
+                    ecfrec.key.recno = None
+                    ecfrec.value.ECFcode = ECF_code
+                    ecfrec.value.ECFactive = True
+                    ecfrec.value.ECFname = full_name
+                    ecfrec.value.ECFclubcodes = clubcodes
+                    ecf_codes.add(ecfrec.value.ECFcode)
+                    ecfrec.put_record(results, filespec.ECFPLAYER_FILE_DEF)
+                else:
+                    ecfrec.load_instance(
                         results,
-                        filespec.ECFTXN_FILE_DEF,
-                        filespec.ECFDATE_FIELD_DEF,
-                        newdaterecord,
+                        filespec.ECFPLAYER_FILE_DEF,
+                        filespec.ECFPLAYERCODE_FIELD_DEF,
+                        record,
+                    )
+                    ecfnew = ecfrec.clone()
+                    ecfnew.value.ECFactive = True
+                    ecfnew.value.ECFname = full_name
+                    ecfnew.value.ECFclubcodes = clubcodes
+                    ecf_codes.add(ecfrec.value.ECFcode)
+                    ecfrec.edit_record(
+                        results,
+                        filespec.ECFPLAYER_FILE_DEF,
+                        filespec.ECFPLAYERCODE_FIELD_DEF,
+                        ecfnew,
                     )
-                if ecfdate == daterecord.value.ECFdate:
-                    ecfdateexists = True
-            r = datecursor.next()
-        if not ecfdateexists:
-            txndaterec = ecfrecord.ECFrefDBrecordECFdate()
-            txndaterec.value.ECFdate = ecfdate
-            txndaterec.value.ECFtxntype = ecfrecord.txnNew
-            txndaterec.value.ECFobjtype = ecfrecord.objtypePlayer
-            txndaterec.value.appliedECFdate = ecfdate
-            txndaterec.key.recno = None
-            txndaterec.put_record(results, filespec.ECFTXN_FILE_DEF)
-            ecfrecord.ECFrefDBrecordECFdate.set_most_recent_master_dates(
-                results
-            )
-    finally:
-        datecursor.close()
 
-    # Load the ECF data.
-    if logwidget:
-        logwidget.append_text("", timestamp=False)
-        logwidget.append_text(
-            "Add or edit ECF Grading Code references to Master player file."
-        )
-    ecf_codes = set()
-    ecfcursor = results.database_cursor(
-        filespec.ECFPLAYER_FILE_DEF, filespec.ECFPLAYERCODE_FIELD_DEF
-    )
-    try:
-        code_index = ecfdata["column_names"].index("ECF_code")
-        name_index = ecfdata["column_names"].index("full_name")
-        club_code_index = (ecfdata["column_names"].index("club_code"),)
-        for data in ecfdata["players"]:
-            ECF_code = data[code_index]
-            if ECF_code is None:
-                ECF_code = ""
-            full_name = data[name_index]
-            if full_name is None:
-                full_name = ""
+            # Mark ECF codes not in download as inactive.
+            # Meaning of inactive depends on which download is loaded, latest or
+            # earlier.
+            if logwidget:
+                logwidget.append_text(
+                    "Mark ECF Grading Codes not in player download inactive."
+                )
             clubcodes = []
-            for i in club_code_index:
-                c = data[i]
-                if isinstance(c, str):
-                    clubcodes.append(c)
-                else:
-                    clubcodes.append(str(c).zfill(4))
-            clubcodes.sort()
-            ecfrec = ecfrecord.ECFrefDBrecordECFplayer()
-            record = ecfcursor.nearest(keybyteify(ECF_code))
-            if record == None:
-                ecfrec.key.recno = None
-                ecfrec.value.ECFcode = ECF_code
-                ecfrec.value.ECFactive = True
-                ecfrec.value.ECFname = full_name
-                ecfrec.value.ECFclubcodes = clubcodes
-                ecf_codes.add(ecfrec.value.ECFcode)
-                ecfrec.put_record(results, filespec.ECFPLAYER_FILE_DEF)
-            elif record[0] != ECF_code:
-                ecfrec.key.recno = None
-                ecfrec.value.ECFcode = ECF_code
-                ecfrec.value.ECFactive = True
-                ecfrec.value.ECFname = full_name
-                ecfrec.value.ECFclubcodes = clubcodes
-                ecf_codes.add(ecfrec.value.ECFcode)
-                ecfrec.put_record(results, filespec.ECFPLAYER_FILE_DEF)
-            else:
+            progress.start(total=ecfcursor.count_records())
+            record = ecfcursor.first()
+            while record:
+                progress.advance()
+                ecfrec = ecfrecord.ECFrefDBrecordECFplayer()
                 ecfrec.load_instance(
                     results,
                     filespec.ECFPLAYER_FILE_DEF,
                     filespec.ECFPLAYERCODE_FIELD_DEF,
                     record,
                 )
-                ecfnew = ecfrec.clone()
-                ecfnew.value.ECFactive = True
-                ecfnew.value.ECFname = full_name
-                ecfnew.value.ECFclubcodes = clubcodes
-                ecf_codes.add(ecfrec.value.ECFcode)
-                ecfrec.edit_record(
-                    results,
-                    filespec.ECFPLAYER_FILE_DEF,
-                    filespec.ECFPLAYERCODE_FIELD_DEF,
-                    ecfnew,
-                )
+                if ecfrec.value.ECFcode not in ecf_codes:
+                    ecfnew = ecfrec.clone()
+                    ecfnew.value.ECFactive = False
+                    ecfnew.value.ECFclubcodes = clubcodes
+                    ecfrec.edit_record(
+                        results,
+                        filespec.ECFPLAYER_FILE_DEF,
+                        filespec.ECFPLAYERCODE_FIELD_DEF,
+                        ecfnew,
+                    )
+                record = ecfcursor.next()
+        finally:
+            ecfcursor.close()
 
-        # Mark ECF codes not in download as inactive.
-        # Meaning of inactive depends on which download is loaded, latest or
-        # earlier.
+        # Match grading codes for new players to copied master list
+        # Any left unlinked are probably merged before master list published
+        # if publication after results submission
         if logwidget:
             logwidget.append_text(
-                "Mark ECF Grading Codes not in player download inactive."
-            )
-        clubcodes = []
-        record = ecfcursor.first()
-        while record:
-            ecfrec = ecfrecord.ECFrefDBrecordECFplayer()
-            ecfrec.load_instance(
-                results,
-                filespec.ECFPLAYER_FILE_DEF,
-                filespec.ECFPLAYERCODE_FIELD_DEF,
-                record,
+                "Reconcile new player Grading Codes with player download."
             )
-            if ecfrec.value.ECFcode not in ecf_codes:
-                ecfnew = ecfrec.clone()
-                ecfnew.value.ECFactive = False
-                ecfnew.value.ECFclubcodes = clubcodes
-                ecfrec.edit_record(
-                    results,
-                    filespec.ECFPLAYER_FILE_DEF,
-                    filespec.ECFPLAYERCODE_FIELD_DEF,
-                    ecfnew,
-                )
-            record = ecfcursor.next()
-    finally:
-        ecfcursor.close()
-
-    # Match grading codes for new players to copied master list
-    # Any left unlinked are probably merged before master list published
-    # if publication after results submission
-    if logwidget:
-        logwidget.append_text(
-            "Reconcile new player Grading Codes with player download."
+        ecfmapcursor = results.database_cursor(
+            filespec.MAPECFPLAYER_FILE_DEF, filespec.MAPECFPLAYER_FIELD_DEF
         )
-    ecfmapcursor = results.database_cursor(
-        filespec.MAPECFPLAYER_FILE_DEF, filespec.MAPECFPLAYER_FIELD_DEF
-    )
-    try:
-        mapdata = ecfmapcursor.first()
-        while mapdata:
-            mr = ecfmaprecord.ECFmapDBrecordPlayer()
-            mr.load_record(mapdata)
-
-            # mapdata values like (key, None) occur sometimes, origin unknown
-            # but seen only when mixing event imports and ecf reference data
-            # imports.
-            # Ignoring them should be correct, and seems ok too.
-            # Find and delete them offline.
-            # See gui.events_lite too.
-            if mr.value.__dict__:
-
-                if mr.value.playercode is None:
-                    if mr.value.playerecfcode is not None:
-                        if ecfrecord.get_ecf_player_for_grading_code(
-                            results, mr.value.playerecfcode
-                        ):
-                            newmr = mr.clone()
-                            newmr.value.playerecfcode = None
-                            newmr.value.playercode = mr.value.playerecfcode
-                            mr.edit_record(
-                                results,
-                                filespec.MAPECFPLAYER_FILE_DEF,
-                                filespec.MAPECFPLAYER_FIELD_DEF,
-                                newmr,
-                            )
-            mapdata = ecfmapcursor.next()
-    finally:
-        ecfmapcursor.close()
+        try:
+            progress.start(total=ecfmapcursor.count_records())
+            mapdata = ecfmapcursor.first()
+            while mapdata:
+                progress.advance()
+                mr = ecfmaprecord.ECFmapDBrecordPlayer()
+                mr.load_record(mapdata)
+
+                # mapdata values like (key, None) occur sometimes, origin unknown
+                # but seen only when mixing event imports and ecf reference data
+                # imports.
+                # Ignoring them should be correct, and seems ok too.
+                # Find and delete them offline.
+                # See gui.events_lite too.
+                if mr.value.__dict__:
+
+                    if mr.value.playercode is None:
+                        if mr.value.playerecfcode is not None:
+                            if ecfrecord.get_ecf_player_for_grading_code(
+                                results, mr.value.playerecfcode
+                            ):
+                                newmr = mr.clone()
+                                newmr.value.playerecfcode = None
+                                newmr.value.playercode = mr.value.playerecfcode
+                                mr.edit_record(
+                                    results,
+                                    filespec.MAPECFPLAYER_FILE_DEF,
+                                    filespec.MAPECFPLAYER_FIELD_DEF,
+                                    newmr,
+                                )
+                mapdata = ecfmapcursor.next()
+        finally:
+            ecfmapcursor.close()
 
+    except TaskCancelled:
+        results.backout()
+        if logwidget:
+            logwidget.append_text("", timestamp=False)
+            logwidget.append_text(_CANCELLED)
+        return False
     results.commit()
     if logwidget:
         logwidget.append_text("", timestamp=False)
@@ -437,6 +476,7 @@ def copy_ecf_players_post_2011_rules(
     ecfdate=None,
     parent=None,
     datecontrol=None,
+    progress=None,
     **kwargs
 ):
     """Import a new ECF player file.
@@ -444,6 +484,8 @@ def copy_ecf_players_post_2011_rules(
     widget - the manager object for the ecf data import tab
 
     """
+    if progress is None:
+        progress = TaskProgress("")
     strify = results._strify
     keyify = results._keyify
     if logwidget:
@@ -454,189 +496,201 @@ def copy_ecf_players_post_2011_rules(
             )
         )
     results.start_transaction()
-
-    # Update Master file date record.
-    datecursor = results.database_cursor(
-        filespec.ECFTXN_FILE_DEF, filespec.ECFDATE_FIELD_DEF
-    )
     try:
-        r = datecursor.first()
-        ecfdateexists = False
-        while r:
-            daterecord = ecfrecord.ECFrefDBrecordECFdate()
-            daterecord.load_instance(
-                results,
-                filespec.ECFTXN_FILE_DEF,
-                filespec.ECFDATE_FIELD_DEF,
-                r,
-            )
-            if daterecord.value.ECFobjtype == ecfrecord.objtypePlayer:
-                if ecfdate != daterecord.value.appliedECFdate:
-                    newdaterecord = daterecord.clone()
-                    newdaterecord.value.appliedECFdate = ecfdate
-                    newdaterecord.edit_record(
-                        results,
-                        filespec.ECFTXN_FILE_DEF,
-                        filespec.ECFDATE_FIELD_DEF,
-                        newdaterecord,
-                    )
-                if ecfdate == daterecord.value.ECFdate:
-                    ecfdateexists = True
-            r = datecursor.next()
-        if not ecfdateexists:
-            txndaterec = ecfrecord.ECFrefDBrecordECFdate()
-            txndaterec.value.ECFdate = ecfdate
-            txndaterec.value.ECFtxntype = ecfrecord.txnNew
-            txndaterec.value.ECFobjtype = ecfrecord.objtypePlayer
-            txndaterec.value.appliedECFdate = ecfdate
-            txndaterec.key.recno = None
-            txndaterec.put_record(results, filespec.ECFTXN_FILE_DEF)
-            ecfrecord.ECFrefDBrecordECFdate.set_most_recent_master_dates(
-                results
-            )
-    finally:
-        datecursor.close()
-
-    # Load the ECF data.
-    ecfimp = ecfplayerdb.ECFplayersDBrecord()
-    if logwidget:
-        logwidget.append_text("", timestamp=False)
-        logwidget.append_text(
-            "Add or edit ECF Grading Code references to Master player file."
+        # Update Master file date record.
+        datecursor = results.database_cursor(
+            filespec.ECFTXN_FILE_DEF, filespec.ECFDATE_FIELD_DEF
         )
-    ecf_codes = set()
-    ecfcursor = results.database_cursor(
-        filespec.ECFPLAYER_FILE_DEF, filespec.ECFPLAYERCODE_FIELD_DEF
-    )
-    try:
-        players = ecffile.database_cursor(
-            ecfplayerdb.PLAYERS, ecfplayerdb.PLAYERS
+        try:
+            r = datecursor.first()
+            ecfdateexists = False
+            while r:
+                daterecord = ecfrecord.ECFrefDBrecordECFdate()
+                daterecord.load_instance(
+                    results,
+                    filespec.ECFTXN_FILE_DEF,
+                    filespec.ECFDATE_FIELD_DEF,
+                    r,
+                )
+                if daterecord.value.ECFobjtype == ecfrecord.objtypePlayer:
+                    if ecfdate != daterecord.value.appliedECFdate:
+                        newdaterecord = daterecord.clone()
+                        newdaterecord.value.appliedECFdate = ecfdate
+                        newdaterecord.edit_record(
+                            results,
+                            filespec.ECFTXN_FILE_DEF,
+                            filespec.ECFDATE_FIELD_DEF,
+                            newdaterecord,
+                        )
+                    if ecfdate == daterecord.value.ECFdate:
+                        ecfdateexists = True
+                r = datecursor.next()
+            if not ecfdateexists:
+                txndaterec = ecfrecord.ECFrefDBrecordECFdate()
+                txndaterec.value.ECFdate = ecfdate
+                txndaterec.value.ECFtxntype = ecfrecord.txnNew
+                txndaterec.value.ECFobjtype = ecfrecord.objtypePlayer
+                txndaterec.value.appliedECFdate = ecfdate
+                txndaterec.key.recno = None
+                txndaterec.put_record(results, filespec.ECFTXN_FILE_DEF)
+                ecfrecord.ECFrefDBrecordECFdate.set_most_recent_master_dates(
+                    results
+                )
+        finally:
+            datecursor.close()
+
+        # Load the ECF data.
+        ecfimp = ecfplayerdb.ECFplayersDBrecord()
+        if logwidget:
+            logwidget.append_text("", timestamp=False)
+            logwidget.append_text(
+                "Add or edit ECF Grading Code references to Master player file."
+            )
+        ecf_codes = set()
+        ecfcursor = results.database_cursor(
+            filespec.ECFPLAYER_FILE_DEF, filespec.ECFPLAYERCODE_FIELD_DEF
         )
         try:
-            data = players.first()
-            while data:
-                ecfimp.load_instance(
-                    ecffile, ecfplayerdb.PLAYERS, ecfplayerdb.PLAYERS, data
+            players = ecffile.database_cursor(
+                ecfplayerdb.PLAYERS, ecfplayerdb.PLAYERS
+            )
+            try:
+                progress.start()
+                data = players.first()
+                while data:
+                    progress.advance()
+                    ecfimp.load_instance(
+                        ecffile, ecfplayerdb.PLAYERS, ecfplayerdb.PLAYERS, data
+                    )
+                    clubcodes = []
+                    for f in ecfrecord._ECFplayerclubsfields:
+                        c = ecfimp.value.__dict__.get(f)
+                        if c:
+                            clubcodes.append(strify(c))
+                    clubcodes.sort()
+                    ecfrec = ecfrecord.ECFrefDBrecordECFplayer()
+                    record = ecfcursor.nearest(keyify(ecfimp.value.REF))
+                    if record == None:
+                        ecfrec.key.recno = None
+                        ecfrec.value.ECFcode = strify(ecfimp.value.REF)
+                        ecfrec.value.ECFactive = True
+                        ecfrec.value.ECFname = strify(ecfimp.value.NAME)
+                        ecfrec.value.ECFclubcodes = clubcodes
+                        ecf_codes.add(ecfrec.value.ECFcode)
+                        ecfrec.put_record(results, filespec.ECFPLAYER_FILE_DEF)
+                    elif record[0] != strify(ecfimp.value.REF):
+                        ecfrec.key.recno = None
+                        ecfrec.value.ECFcode = strify(ecfimp.value.REF)
+                        ecfrec.value.ECFactive = True
+                        ecfrec.value.ECFname = strify(ecfimp.value.NAME)
+                        ecfrec.value.ECFclubcodes = clubcodes
+                        ecf_codes.add(ecfrec.value.ECFcode)
+                        ecfrec.put_record(results, filespec.ECFPLAYER_FILE_DEF)
+                    else:
+                        ecfrec.load_instance(
+                            results,
+                            filespec.ECFPLAYER_FILE_DEF,
+                            filespec.ECFPLAYERCODE_FIELD_DEF,
+                            record,
+                        )
+                        ecfnew = ecfrec.clone()
+                        ecfnew.value.ECFactive = True
+                        ecfnew.value.ECFname = strify(ecfimp.value.NAME)
+                        ecfnew.value.ECFclubcodes = clubcodes
+                        ecf_codes.add(ecfrec.value.ECFcode)
+                        ecfrec.edit_record(
+                            results,
+                            filespec.ECFPLAYER_FILE_DEF,
+                            filespec.ECFPLAYERCODE_FIELD_DEF,
+                            ecfnew,
+                        )
+                    data = players.next()
+            finally:
+                players.close()
+
+            # Mark ECF codes not in download as inactive.
+            # Meaning of inactive depends on which download is loaded, latest or
+            # earlier.
+            if logwidget:
+                logwidget.append_text(
+                    "Mark ECF Grading Codes not on Master player file inactive."
                 )
-                clubcodes = []
-                for f in ecfrecord._ECFplayerclubsfields:
-                    c = ecfimp.value.__dict__.get(f)
-                    if c:
-                        clubcodes.append(strify(c))
-                clubcodes.sort()
+            clubcodes = []
+            progress.start(total=ecfcursor.count_records())
+            record = ecfcursor.first()
+            while record:
+                progress.advance()
                 ecfrec = ecfrecord.ECFrefDBrecordECFplayer()
-                record = ecfcursor.nearest(keyify(ecfimp.value.REF))
-                if record == None:
-                    ecfrec.key.recno = None
-                    ecfrec.value.ECFcode = strify(ecfimp.value.REF)
-                    ecfrec.value.ECFactive = True
-                    ecfrec.value.ECFname = strify(ecfimp.value.NAME)
-                    ecfrec.value.ECFclubcodes = clubcodes
-                    ecf_codes.add(ecfrec.value.ECFcode)
-                    ecfrec.put_record(results, filespec.ECFPLAYER_FILE_DEF)
-                elif record[0] != strify(ecfimp.value.REF):
-                    ecfrec.key.recno = None
-                    ecfrec.value.ECFcode = strify(ecfimp.value.REF)
-                    ecfrec.value.ECFactive = True
-                    ecfrec.value.ECFname = strify(ecfimp.value.NAME)
-                    ecfrec.value.ECFclubcodes = clubcodes
-                    ecf_codes.add(ecfrec.value.ECFcode)
-                    ecfrec.put_record(results, filespec.ECFPLAYER_FILE_DEF)
-                else:
-                    ecfrec.load_instance(
-                        results,
-                        filespec.ECFPLAYER_FILE_DEF,
-                        filespec.ECFPLAYERCODE_FIELD_DEF,
-                        record,
-                    )
+                ecfrec.load_instance(
+                    results,
+                    filespec.ECFPLAYER_FILE_DEF,
+                    filespec.ECFPLAYERCODE_FIELD_DEF,
+                    record,
+                )
+                if ecfrec.value.ECFcode not in ecf_codes:
                     ecfnew = ecfrec.clone()
-                    ecfnew.value.ECFactive = True
-                    ecfnew.value.ECFname = strify(ecfimp.value.NAME)
+                    ecfnew.value.ECFactive = False
                     ecfnew.value.ECFclubcodes = clubcodes
-                    ecf_codes.add(ecfrec.value.ECFcode)
                     ecfrec.edit_record(
                         results,
                         filespec.ECFPLAYER_FILE_DEF,
                         filespec.ECFPLAYERCODE_FIELD_DEF,
                         ecfnew,
                     )
-                data = players.next()
+                record = ecfcursor.next()
         finally:
-            players.close()
+            ecfcursor.close()
 
-        # Mark ECF codes not in download as inactive.
-        # Meaning of inactive depends on which download is loaded, latest or
-        # earlier.
+        # Match grading codes for new players to copied master list
+        # Any left unlinked are probably merged before master list published
+        # if publication after results submission
         if logwidget:
             logwidget.append_text(
-                "Mark ECF Grading Codes not on Master player file inactive."
+                "Reconcile new player Grading Codes with Master player file."
             )
-        clubcodes = []
-        record = ecfcursor.first()
-        while record:
-            ecfrec = ecfrecord.ECFrefDBrecordECFplayer()
-            ecfrec.load_instance(
-                results,
-                filespec.ECFPLAYER_FILE_DEF,
-                filespec.ECFPLAYERCODE_FIELD_DEF,
-                record,
-            )
-            if ecfrec.value.ECFcode not in ecf_codes:
-                ecfnew = ecfrec.clone()
-                ecfnew.value.ECFactive = False
-                ecfnew.value.ECFclubcodes = clubcodes
-                ecfrec.edit_record(
-                    results,
-                    filespec.ECFPLAYER_FILE_DEF,
-                    filespec.ECFPLAYERCODE_FIELD_DEF,
-                    ecfnew,
-                )
-            record = ecfcursor.next()
-    finally:
-        ecfcursor.close()
-
-    # Match grading codes for new players to copied master list
-    # Any left unlinked are probably merged before master list published
-    # if publication after results submission
-    if logwidget:
-        logwidget.append_text(
-            "Reconcile new player Grading Codes with Master player file."
+        ecfmapcursor = results.database_cursor(
+            filespec.MAPECFPLAYER_FILE_DEF, filespec.MAPECFPLAYER_FIELD_DEF
         )
-    ecfmapcursor = results.database_cursor(
-        filespec.MAPECFPLAYER_FILE_DEF, filespec.MAPECFPLAYER_FIELD_DEF
-    )
-    try:
-        mapdata = ecfmapcursor.first()
-        while mapdata:
-            mr = ecfmaprecord.ECFmapDBrecordPlayer()
-            mr.load_record(mapdata)
-
-            # mapdata values like (key, None) occur sometimes, origin unknown
-            # but seen only when mixing event imports and ecf reference data
-            # imports.
-            # Ignoring them should be correct, and seems ok too.
-            # Find and delete them offline.
-            # See gui.events_lite too.
-            if mr.value.__dict__:
-
-                if mr.value.playercode is None:
-                    if mr.value.playerecfcode is not None:
-                        if ecfrecord.get_ecf_player_for_grading_code(
-                            results, mr.value.playerecfcode
-                        ):
-                            newmr = mr.clone()
-                            newmr.value.playerecfcode = None
-                            newmr.value.playercode = mr.value.playerecfcode
-                            mr.edit_record(
-                                results,
-                                filespec.MAPECFPLAYER_FILE_DEF,
-                                filespec.MAPECFPLAYER_FIELD_DEF,
-                                newmr,
-                            )
-            mapdata = ecfmapcursor.next()
-    finally:
-        ecfmapcursor.close()
+        try:
+            progress.start(total=ecfmapcursor.count_records())
+            mapdata = ecfmapcursor.first()
+            while mapdata:
+                progress.advance()
+                mr = ecfmaprecord.ECFmapDBrecordPlayer()
+                mr.load_record(mapdata)
+
+                # mapdata values like (key, None) occur sometimes, origin unknown
+                # but seen only when mixing event imports and ecf reference data
+                # imports.
+                # Ignoring them should be correct, and seems ok too.
+                # Find and delete them offline.
+                # See gui.events_lite too.
+                if mr.value.__dict__:
+
+                    if mr.value.playercode is None:
+                        if mr.value.playerecfcode is not None:
+                            if ecfrecord.get_ecf_player_for_grading_code(
+                                results, mr.value.playerecfcode
+                            ):
+                                newmr = mr.clone()
+                                newmr.value.playerecfcode = None
+                                newmr.value.playercode = mr.value.playerecfcode
+                                mr.edit_record(
+                                    results,
+                                    filespec.MAPECFPLAYER_FILE_DEF,
+                                    filespec.MAPECFPLAYER_FIELD_DEF,
+                                    newmr,
+                                )
+                mapdata = ecfmapcursor.next()
+        finally:
+            ecfmapcursor.close()
 
+    except TaskCancelled:
+        results.backout()
+        if logwidget:
+            logwidget.append_text("", timestamp=False)
+            logwidget.append_text(_CANCELLED)
+        return False
     results.commit()
     if logwidget:
         logwidget.append_text("", timestamp=False)
@@ -660,6 +714,7 @@ def copy_ecf_clubs_post_2011_rules(
     parent=None,
     datecontrol=None,
     datekey=lambda d: d,
+    progress=None,
     **kwargs
 ):
     """Import a new ECF club file.
@@ -667,6 +722,8 @@ def copy_ecf_clubs_post_2011_rules(
     widget - the manager object for the ecf data import tab
 
     """
+    if progress is None:
+        progress = TaskProgress("")
     strify = results._strify
     keyify = results._keyify
     if logwidget:
@@ -677,137 +734,153 @@ def copy_ecf_clubs_post_2011_rules(
             )
         )
     results.start_transaction()
-
-    # Update Master file date record.
-    datecursor = results.database_cursor(
-        filespec.ECFTXN_FILE_DEF, filespec.ECFDATE_FIELD_DEF
-    )
     try:
-        r = datecursor.first()
-        ecfdateexists = False
-        while r:
-            daterecord = ecfrecord.ECFrefDBrecordECFdate()
-            daterecord.load_instance(
-                results,
-                filespec.ECFTXN_FILE_DEF,
-                filespec.ECFDATE_FIELD_DEF,
-                r,
-            )
-            if daterecord.value.ECFobjtype == ecfrecord.objtypeClub:
-                if ecfdate != daterecord.value.appliedECFdate:
-                    newdaterecord = daterecord.clone()
-                    newdaterecord.value.appliedECFdate = ecfdate
-                    newdaterecord.edit_record(
-                        results,
-                        filespec.ECFTXN_FILE_DEF,
-                        filespec.ECFDATE_FIELD_DEF,
-                        newdaterecord,
-                    )
-                if ecfdate == daterecord.value.ECFdate:
-                    ecfdateexists = True
-            r = datecursor.next()
-        if not ecfdateexists:
-            txndaterec = ecfrecord.ECFrefDBrecordECFdate()
-            txndaterec.value.ECFdate = ecfdate
-            txndaterec.value.ECFtxntype = ecfrecord.txnNew
-            txndaterec.value.ECFobjtype = ecfrecord.objtypeClub
-            txndaterec.value.appliedECFdate = ecfdate
-            txndaterec.key.recno = None
-            txndaterec.put_record(results, filespec.ECFTXN_FILE_DEF)
-            ecfrecord.ECFrefDBrecordECFdate.set_most_recent_master_dates(
-                results
-            )
-    finally:
-        datecursor.close()
+        # Update Master file date record.
+        datecursor = results.database_cursor(
+            filespec.ECFTXN_FILE_DEF, filespec.ECFDATE_FIELD_DEF
+        )
+        try:
+            r = datecursor.first()
+            ecfdateexists = False
+            while r:
+                daterecord = ecfrecord.ECFrefDBrecordECFdate()
+                daterecord.load_instance(
+                    results,
+                    filespec.ECFTXN_FILE_DEF,
+                    filespec.ECFDATE_FIELD_DEF,
+                    r,
+                )
+                if daterecord.value.ECFobjtype == ecfrecord.objtypeClub:
+                    if ecfdate != daterecord.value.appliedECFdate:
+                        newdaterecord = daterecord.clone()
+                        newdaterecord.value.appliedECFdate = ecfdate
+                        newdaterecord.edit_record(
+                            results,
+                            filespec.ECFTXN_FILE_DEF,
+                            filespec.ECFDATE_FIELD_DEF,
+                            newdaterecord,
+                        )
+                    if ecfdate == daterecord.value.ECFdate:
+                        ecfdateexists = True
+                r = datecursor.next()
+            if not ecfdateexists:
+                txndaterec = ecfrecord.ECFrefDBrecordECFdate()
+                txndaterec.value.ECFdate = ecfdate
+                txndaterec.value.ECFtxntype = ecfrecord.txnNew
+                txndaterec.value.ECFobjtype = ecfrecord.objtypeClub
+                txndaterec.value.appliedECFdate = ecfdate
+                txndaterec.key.recno = None
+                txndaterec.put_record(results, filespec.ECFTXN_FILE_DEF)
+                ecfrecord.ECFrefDBrecordECFdate.set_most_recent_master_dates(
+                    results
+                )
+        finally:
+            datecursor.close()
 
-    # Load the ECF data.
-    ecfimp = ecfclubdb.ECFclubsDBrecord()
-    if logwidget:
-        logwidget.append_text("", timestamp=False)
-        logwidget.append_text(
-            "Add or edit ECF Club Code references to Master club file."
+        # Load the ECF data.
+        ecfimp = ecfclubdb.ECFclubsDBrecord()
+        if logwidget:
+            logwidget.append_text("", timestamp=False)
+            logwidget.append_text(
+                "Add or edit ECF Club Code references to Master club file."
+            )
+        ecf_codes = set()
+        ecfcursor = results.database_cursor(
+            filespec.ECFCLUB_FILE_DEF, filespec.ECFCLUBCODE_FIELD_DEF
         )
-    ecf_codes = set()
-    ecfcursor = results.database_cursor(
-        filespec.ECFCLUB_FILE_DEF, filespec.ECFCLUBCODE_FIELD_DEF
-    )
-    try:
-        clubs = ecffile.database_cursor(ecfclubdb.CLUBS, ecfclubdb.CLUBS)
         try:
-            data = clubs.first()
-            while data:
-                ecfimp.load_instance(
-                    ecffile, ecfclubdb.CLUBS, ecfclubdb.CLUBS, data
+            clubs = ecffile.database_cursor(ecfclubdb.CLUBS, ecfclubdb.CLUBS)
+            try:
+                progress.start()
+                data = clubs.first()
+                while data:
+                    progress.advance()
+                    ecfimp.load_instance(
+                        ecffile, ecfclubdb.CLUBS, ecfclubdb.CLUBS, data
+                    )
+                    ecfrec = ecfrecord.ECFrefDBrecordECFclub()
+                    record = ecfcursor.nearest(keyify(ecfimp.value.CODE))
+                    if record == None:
+                        ecfrec.key.recno = None
+                        ecfrec.value.ECFcode = strify(ecfimp.value.CODE)
+                        ecfrec.value.ECFactive = True
+                        ecfrec.value.ECFname = strify(ecfimp.value.CLUB)
+                        ecfrec.value.ECFcountycode = strify(
+                            ecfimp.value.COUNTY
+                        )
+                        ecf_codes.add(ecfrec.value.ECFcode)
+                        ecfrec.put_record(results, filespec.ECFCLUB_FILE_DEF)
+                    elif record[0] != strify(ecfimp.value.CODE):
+                        ecfrec.key.recno = None
+                        ecfrec.value.ECFcode = strify(ecfimp.value.CODE)
+                        ecfrec.value.ECFactive = True
+                        ecfrec.value.ECFname = strify(ecfimp.value.CLUB)
+                        ecfrec.value.ECFcountycode = strify(
+                            ecfimp.value.COUNTY
+                        )
+                        ecf_codes.add(ecfrec.value.ECFcode)
+                        ecfrec.put_record(results, filespec.ECFCLUB_FILE_DEF)
+                    else:
+                        ecfrec.load_instance(
+                            results,
+                            filespec.ECFCLUB_FILE_DEF,
+                            filespec.ECFCLUBCODE_FIELD_DEF,
+                            record,
+                        )
+                        ecfnew = ecfrec.clone()
+                        ecfnew.value.ECFactive = True
+                        ecfnew.value.ECFname = strify(ecfimp.value.CLUB)
+                        ecfnew.value.ECFcountycode = strify(
+                            ecfimp.value.COUNTY
+                        )
+                        ecf_codes.add(ecfrec.value.ECFcode)
+                        ecfrec.edit_record(
+                            results,
+                            filespec.ECFCLUB_FILE_DEF,
+                            filespec.ECFCLUBCODE_FIELD_DEF,
+                            ecfnew,
+                        )
+                    data = clubs.next()
+            finally:
+                clubs.close()
+
+            # Mark ECF codes not in download as inactive.
+            # Meaning of inactive depends on which download is loaded, latest or
+            # earlier.
+            if logwidget:
+                logwidget.append_text(
+                    "Mark ECF Club Codes not on clubs download inactive."
                 )
+            progress.start(total=ecfcursor.count_records())
+            record = ecfcursor.first()
+            while record:
+                progress.advance()
                 ecfrec = ecfrecord.ECFrefDBrecordECFclub()
-                record = ecfcursor.nearest(keyify(ecfimp.value.CODE))
-                if record == None:
-                    ecfrec.key.recno = None
-                    ecfrec.value.ECFcode = strify(ecfimp.value.CODE)
-                    ecfrec.value.ECFactive = True
-                    ecfrec.value.ECFname = strify(ecfimp.value.CLUB)
-                    ecfrec.value.ECFcountycode = strify(ecfimp.value.COUNTY)
-                    ecf_codes.add(ecfrec.value.ECFcode)
-                    ecfrec.put_record(results, filespec.ECFCLUB_FILE_DEF)
-                elif record[0] != strify(ecfimp.value.CODE):
-                    ecfrec.key.recno = None
-                    ecfrec.value.ECFcode = strify(ecfimp.value.CODE)
-                    ecfrec.value.ECFactive = True
-                    ecfrec.value.ECFname = strify(ecfimp.value.CLUB)
-                    ecfrec.value.ECFcountycode = strify(ecfimp.value.COUNTY)
-                    ecf_codes.add(ecfrec.value.ECFcode)
-                    ecfrec.put_record(results, filespec.ECFCLUB_FILE_DEF)
-                else:
-                    ecfrec.load_instance(
-                        results,
-                        filespec.ECFCLUB_FILE_DEF,
-                        filespec.ECFCLUBCODE_FIELD_DEF,
-                        record,
-                    )
+                ecfrec.load_instance(
+                    results,
+                    filespec.ECFCLUB_FILE_DEF,
+                    filespec.ECFCLUBCODE_FIELD_DEF,
+                    record,
+                )
+                if ecfrec.value.ECFcode not in ecf_codes:
                     ecfnew = ecfrec.clone()
-                    ecfnew.value.ECFactive = True
-                    ecfnew.value.ECFname = strify(ecfimp.value.CLUB)
-                    ecfnew.value.ECFcountycode = strify(ecfimp.value.COUNTY)
-                    ecf_codes.add(ecfrec.value.ECFcode)
+                    ecfnew.value.ECFactive = False
                     ecfrec.edit_record(
                         results,
                         filespec.ECFCLUB_FILE_DEF,
                         filespec.ECFCLUBCODE_FIELD_DEF,
                         ecfnew,
                     )
-                data = clubs.next()
+                record = ecfcursor.next()
         finally:
-            clubs.close()
+            ecfcursor.close()
 
-        # Mark ECF codes not in download as inactive.
-        # Meaning of inactive depends on which download is loaded, latest or
-        # earlier.
+    except TaskCancelled:
+        results.backout()
         if logwidget:
-            logwidget.append_text(
-                "Mark ECF Club Codes not on clubs download inactive."
-            )
-        record = ecfcursor.first()
-        while record:
-            ecfrec = ecfrecord.ECFrefDBrecordECFclub()
-            ecfrec.load_instance(
-                results,
-                filespec.ECFCLUB_FILE_DEF,
-                filespec.ECFCLUBCODE_FIELD_DEF,
-                record,
-            )
-            if ecfrec.value.ECFcode not in ecf_codes:
-                ecfnew = ecfrec.clone()
-                ecfnew.value.ECFactive = False
-                ecfrec.edit_record(
-                    results,
-                    filespec.ECFCLUB_FILE_DEF,
-                    filespec.ECFCLUBCODE_FIELD_DEF,
-                    ecfnew,
-                )
-            record = ecfcursor.next()
-    finally:
-        ecfcursor.close()
-
+            logwidget.append_text("", timestamp=False)
+            logwidget.append_text(_CANCELLED)
+        return False
     results.commit()
     if logwidget:
         logwidget.append_text("", timestamp=False)
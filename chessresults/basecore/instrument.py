@@ -0,0 +1,304 @@
+# instrument.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Count and time the database calls made by a task.
+
+An Instrumentation instance is attached to an open database while a task
+runs.  Attaching replaces the database methods in INSTRUMENTED_METHODS, and
+the first, last, next, prev, and nearest methods of cursors returned by
+database_cursor, by versions which count the calls and record the time taken
+in a histogram for each file and index.  Detaching restores the methods, so
+a database which is not instrumented pays nothing.
+
+Tasks are instrumented when the instrument_tasks attribute of the database
+class is not INSTRUMENT_TASKS_OFF.  The counts are appended to the task log
+when the task ends, and exported as JSON to a file in the database folder if
+instrument_tasks is INSTRUMENT_TASKS_JSON.
+
+"""
+
+import os
+import time
+import json
+import bisect
+import functools
+
+from ..core import constants
+
+# Database methods instrumented, and the arguments naming file and index.
+# The index is None for methods which do not use an index.
+INSTRUMENTED_METHODS = (
+    ("get_primary_record", 1),
+    ("database_cursor", 2),
+    ("put_instance", 1),
+    ("edit_instance", 1),
+    ("delete_instance", 1),
+    ("commit", 0),
+)
+
+# Cursor methods instrumented.
+INSTRUMENTED_CURSOR_METHODS = ("first", "last", "next", "prev", "nearest")
+
+# Upper bounds, in seconds, of the latency histogram buckets.  The last
+# bucket counts calls taking at least a second.
+LATENCY_BOUNDS = (0.00001, 0.0001, 0.001, 0.01, 0.1, 1)
+LATENCY_LABELS = (
+    "<10us",
+    "<100us",
+    "<1ms",
+    "<10ms",
+    "<100ms",
+    "<1s",
+    ">=1s",
+)
+
+# Prefix of file names for JSON exports.
+INSTRUMENT_FILE_PREFIX = "instrument-"
+
+
+class Counter(object):
+    """Number of calls, total time, and latency histogram for calls."""
+
+    def __init__(self):
+        super(Counter, self).__init__()
+        self.calls = 0
+        self.seconds = 0
+        self.histogram = [0] * (len(LATENCY_BOUNDS) + 1)
+
+    def add(self, seconds):
+        """Note a call which took seconds."""
+        self.calls += 1
+        self.seconds += seconds
+        self.histogram[bisect.bisect_right(LATENCY_BOUNDS, seconds)] += 1
+
+    def as_dict(self):
+        """Return counts as a dict for JSON export."""
+        return dict(
+            calls=self.calls,
+            seconds=round(self.seconds, 6),
+            histogram=dict(zip(LATENCY_LABELS, self.histogram)),
+        )
+
+
+class InstrumentedCursor(object):
+    """Count and time calls to the navigation methods of cursor.
+
+    Other attributes are those of cursor.
+
+    """
+
+    def __init__(self, cursor, counters):
+        super(InstrumentedCursor, self).__init__()
+        self._cursor = cursor
+        for name in INSTRUMENTED_CURSOR_METHODS:
+            if hasattr(cursor, name):
+                setattr(
+                    self,
+                    name,
+                    _timed(
+                        getattr(cursor, name),
+                        functools.partial(counters.add, name),
+                    ),
+                )
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+def _timed(method, note):
+    """Return method wrapped to pass time taken by each call to note."""
+
+    @functools.wraps(method)
+    def timed_method(*args, **kargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kargs)
+        finally:
+            note(time.perf_counter() - start)
+
+    return timed_method
+
+
+class Instrumentation(object):
+    """Counters for database calls made by a task called name.
+
+    counters is {(method, file, index): Counter(), ...} where file and index
+    are None if the method does not refer to them.
+
+    """
+
+    def __init__(self, name):
+        super(Instrumentation, self).__init__()
+        self.name = name
+        self.started = time.time()
+        self.seconds = None
+        self.counters = {}
+        self._replaced = None
+
+    def get_counter(self, method, file=None, index=None):
+        """Return Counter for method on file and index."""
+        key = (method, file, index)
+        counter = self.counters.get(key)
+        if counter is None:
+            counter = self.counters[key] = Counter()
+        return counter
+
+    def attach(self, database):
+        """Instrument the database methods of database."""
+        self._replaced = {
+            name: database.__dict__.get(name)
+            for name, arguments in INSTRUMENTED_METHODS
+        }
+        for name, arguments in INSTRUMENTED_METHODS:
+            setattr(
+                database,
+                name,
+                self._instrument(name, arguments, getattr(database, name)),
+            )
+
+    def detach(self, database):
+        """Restore the database methods of database."""
+        for name, method in self._replaced.items():
+            if method is None:
+                delattr(database, name)
+            else:
+                setattr(database, name, method)
+        self._replaced = None
+        self.seconds = time.time() - self.started
+
+    def _instrument(self, name, arguments, method):
+        """Return method wrapped to count and time calls."""
+
+        @functools.wraps(method)
+        def instrumented_method(*args, **kargs):
+            counter = self.get_counter(name, *args[:arguments])
+            start = time.perf_counter()
+            try:
+                value = method(*args, **kargs)
+            finally:
+                counter.add(time.perf_counter() - start)
+            if name == "database_cursor":
+                value = InstrumentedCursor(
+                    value,
+                    _CursorCounters(self, *args[:arguments]),
+                )
+            return value
+
+        return instrumented_method
+
+    def get_report(self):
+        """Return list of lines reporting counts, most time taken first."""
+        lines = [
+            "".join(
+                (
+                    "Database calls made by ",
+                    self.name,
+                    " (method, file, index, calls, seconds, histogram ",
+                    " ".join(LATENCY_LABELS),
+                    "):",
+                )
+            )
+        ]
+        for (method, file, index), counter in sorted(
+            self.counters.items(), key=lambda item: -item[1].seconds
+        ):
+            lines.append(
+                "\t".join(
+                    (
+                        method,
+                        file or "",
+                        index or "",
+                        str(counter.calls),
+                        "%.6f" % counter.seconds,
+                        " ".join(str(c) for c in counter.histogram),
+                    )
+                )
+            )
+        return lines
+
+    def as_dict(self):
+        """Return counts as a dict for JSON export."""
+        return dict(
+            task=self.name,
+            started=time.strftime(
+                "%Y-%m-%dT%H:%M:%S", time.localtime(self.started)
+            ),
+            seconds=self.seconds,
+            calls=[
+                dict(
+                    method=method, file=file, index=index, **counter.as_dict()
+                )
+                for (method, file, index), counter in self.counters.items()
+            ],
+        )
+
+    def export(self, folder):
+        """Write counts to JSON file in folder and return its name."""
+        filename = os.path.join(
+            folder,
+            "".join(
+                (
+                    INSTRUMENT_FILE_PREFIX,
+                    self.name,
+                    "-",
+                    time.strftime(
+                        "%Y%m%d%H%M%S", time.localtime(self.started)
+                    ),
+                    ".json",
+                )
+            ),
+        )
+        with open(filename, "w", encoding="utf-8") as jsonfile:
+            json.dump(self.as_dict(), jsonfile, indent=2)
+        return filename
+
+
+class _CursorCounters(object):
+    """Note calls of cursor methods on a file and index."""
+
+    def __init__(self, instrumentation, file, index):
+        super(_CursorCounters, self).__init__()
+        self.instrumentation = instrumentation
+        self.file = file
+        self.index = index
+
+    def add(self, method, seconds):
+        """Note a call of method which took seconds."""
+        self.instrumentation.get_counter(method, self.file, self.index).add(
+            seconds
+        )
+
+
+def instrumented_task(taskmethod):
+    """Return taskmethod wrapped to count and time its database calls.
+
+    For do_database_task calls, where taskmethod is called as
+    taskmethod(database, logwidget, **taskmethodargs).
+
+    """
+
+    @functools.wraps(taskmethod)
+    def instrumented_taskmethod(database, logwidget, **kargs):
+        instrumentation = Instrumentation(
+            getattr(taskmethod, "__name__", "task")
+        )
+        instrumentation.attach(database)
+        try:
+            return taskmethod(database, logwidget, **kargs)
+        finally:
+            instrumentation.detach(database)
+            if logwidget:
+                logwidget.append_text_only("")
+                for line in instrumentation.get_report():
+                    logwidget.append_text_only(line)
+                logwidget.append_text_only("")
+            if database.instrument_tasks == constants.INSTRUMENT_TASKS_JSON:
+                filename = instrumentation.export(database.home_directory)
+                if logwidget:
+                    logwidget.append_text_only(
+                        " ".join(("Database call counts saved in", filename))
+                    )
+                    logwidget.append_text_only("")
+
+    return instrumented_taskmethod
@@ -0,0 +1,227 @@
+# sqliteprofile.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Performance profiles for ChessResults databases using SQLite.
+
+A profile is a set of pragma settings applied to the connection when the
+database is opened, or when a task switches profile.  The same settings are
+used by the sqlite3 and apsw database engine interfaces.
+
+The 'default' profile is the SQLite defaults, as used before profiles were
+introduced.  The 'normal' profile uses write-ahead logging, so readers do
+not block the writer, and bigger caches.  The 'bulk' profile is for tasks
+which add or change many records, such as imports.  It does not wait for
+data to reach the disk, so a power failure or operating system crash during
+the task could corrupt the database, and does not change the journal mode
+because that may need exclusive access to the database.
+
+Reports can be run on a read-only snapshot of the database, taken when the
+report starts, while an import is writing to the database.  In 'wal' journal
+mode the reader and writer do not block each other.
+
+Backups are done by the SQLite online backup interface, so the database can
+be updated by other connections while the backup is done.
+
+"""
+
+import os
+
+from ..core import constants
+
+# Pragmas in the order they are applied.
+PRAGMAS = (
+    "journal_mode",
+    "synchronous",
+    "cache_size",
+    "mmap_size",
+    "temp_store",
+)
+
+# Negative cache_size is KiB rather than pages.
+PROFILES = {
+    constants.SQLITE_PROFILE_DEFAULT: dict(
+        journal_mode="delete",
+        synchronous="full",
+        cache_size=-2000,
+        mmap_size=0,
+        temp_store="default",
+    ),
+    constants.SQLITE_PROFILE_NORMAL: dict(
+        journal_mode="wal",
+        synchronous="normal",
+        cache_size=-65536,
+        mmap_size=268435456,
+        temp_store="memory",
+    ),
+    constants.SQLITE_PROFILE_BULK: dict(
+        synchronous="off",
+        cache_size=-262144,
+        mmap_size=268435456,
+        temp_store="memory",
+    ),
+}
+
+
+def apply_pragmas(connection, settings, applied=None):
+    """Apply settings to connection and return dict of settings applied.
+
+    Pragmas with the value in applied, the settings from the previous call
+    for connection, are not applied again.  journal_mode cannot be changed
+    inside a transaction but setting the current mode again is harmless.
+
+    """
+    if applied is None:
+        applied = {}
+    cursor = connection.cursor()
+    try:
+        for pragma in PRAGMAS:
+            if pragma not in settings:
+                continue
+            value = settings[pragma]
+            if applied.get(pragma) == value:
+                continue
+            cursor.execute(
+                "".join(("pragma ", pragma, " = ", str(value)))
+            ).fetchall()
+    finally:
+        cursor.close()
+    applied = applied.copy()
+    applied.update(settings)
+    return applied
+
+
+def get_pragmas(connection):
+    """Return dict of current values of pragmas in PRAGMAS for connection."""
+    cursor = connection.cursor()
+    try:
+        return {
+            pragma: cursor.execute("pragma " + pragma).fetchall()[0][0]
+            for pragma in PRAGMAS
+        }
+    finally:
+        cursor.close()
+
+
+class Database:
+    """Apply a performance profile to SQLite database when opened.
+
+    The profile is set by the performance_profile attribute, by default
+    'normal', and can be changed while the database is open by the
+    set_performance_profile method.
+
+    """
+
+    performance_profile = constants.SQLITE_PROFILE_NORMAL
+    performance_profiles = PROFILES
+
+    def open_database(self, files=None):
+        """Extend, apply performance profile after opening database."""
+        self._applied_pragmas = None
+        message = super().open_database(files=files)
+        if not message:
+            self.set_performance_profile()
+        return message
+
+    def set_performance_profile(self, profile=None):
+        """Apply profile, default performance_profile, to the connection.
+
+        An unknown profile name means the 'normal' profile.
+
+        """
+        if self.dbenv is None:
+            return
+        if profile is None:
+            profile = self.performance_profile
+        settings = self.performance_profiles.get(profile)
+        if settings is None:
+            settings = self.performance_profiles[
+                constants.SQLITE_PROFILE_NORMAL
+            ]
+        self._applied_pragmas = apply_pragmas(
+            self.dbenv, settings, applied=self._applied_pragmas
+        )
+
+    def do_snapshot_task(
+        self,
+        taskmethod,
+        logwidget=None,
+        taskmethodargs=None,
+        use_specification_items=None,
+    ):
+        """Run taskmethod on a read-only snapshot of the database.
+
+        A new connection is opened, as by do_database_task, and made
+        read-only.  In 'wal' journal mode a read transaction is started so
+        taskmethod sees the database as it was when the task started, even
+        if another connection commits changes meanwhile.  Otherwise a read
+        transaction would stop other connections committing changes, so
+        each read sees the latest committed changes.
+
+        """
+        db = self.__class__(
+            self.home_directory,
+            use_specification_items=use_specification_items,
+        )
+        db.open_database()
+        if taskmethodargs is None:
+            taskmethodargs = {}
+        try:
+            snapshot = db.start_read_snapshot()
+            try:
+                self.profile_task(self.instrument_task(taskmethod))(
+                    db, logwidget, **taskmethodargs
+                )
+            finally:
+                if snapshot:
+                    db.backout()
+        finally:
+            db.close_database()
+
+    def backup_database(self, backup_folder):
+        """Copy database to backup_folder by SQLite online backup.
+
+        The online_backup method is provided by the engine interface.
+
+        """
+        name = os.path.relpath(self.database_file, self.home_directory)
+        target = os.path.join(backup_folder, name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        self.online_backup(target)
+        return [name]
+
+    def files_obsoleted_by_restore(self):
+        """Return names of write-ahead log files, which belong to old data."""
+        return (self.database_file + "-wal", self.database_file + "-shm")
+
+    def compact_files(self):
+        """Rebuild database file without free pages by SQLite vacuum.
+
+        No transaction can be in progress.  Return True.
+
+        """
+        cursor = self.dbenv.cursor()
+        try:
+            cursor.execute("vacuum")
+        finally:
+            cursor.close()
+        return True
+
+    def start_read_snapshot(self):
+        """Make connection read-only and return True if snapshot started.
+
+        The snapshot is started by a read in a transaction which must be
+        ended by backout() or commit().
+
+        """
+        cursor = self.dbenv.cursor()
+        try:
+            cursor.execute("pragma query_only = on").fetchall()
+            mode = cursor.execute("pragma journal_mode").fetchall()[0][0]
+            if mode.lower() != "wal":
+                return False
+            cursor.execute("begin").fetchall()
+            cursor.execute("select count(*) from sqlite_master").fetchall()
+        finally:
+            cursor.close()
+        return True
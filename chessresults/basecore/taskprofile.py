@@ -0,0 +1,220 @@
+# taskprofile.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Profile the time and memory used by a task.
+
+A profiled task is run under cProfile and tracemalloc.  When it ends the
+profile is written to a '.pstats' file, which can be read by the pstats
+module, and the lines of code which allocated most memory are written to a
+text file.  The files are put in the database folder, next to the error log,
+and are named by task and time started so a user can send them with a
+report of a slow task.  The process id and a sequence number in the name
+keep the files of tasks started in the same second apart.
+
+Memory tracing is shared by all threads, so it is started by the first of
+any concurrent profiled tasks and stopped when the last one finishes.  The
+memory figures for a task include allocations by tasks running at the
+same time.
+
+Only one cProfile profiler can be active in a process from Python 3.12, so
+a task started while another task is under cProfile, or while some other
+profiling tool is active, is not time profiled.  The allocations summary
+for the task says so.
+
+A failure to write the profile is reported on stderr: it does not replace
+the result, or exception, of the task.
+
+Tasks run by do_database_task or do_snapshot_task, and methods started by
+the task logs of the import panels, are profiled when the profile_tasks
+attribute of the database class is True.
+
+A task started while another task is profiled in the same thread is part of
+that task's profile.
+
+"""
+
+import os
+import sys
+import time
+import cProfile
+import tracemalloc
+import threading
+import functools
+import itertools
+import traceback
+
+# Prefix of file names for profiles.
+PROFILE_FILE_PREFIX = "profile-"
+
+# Number of lines of code reported in the allocations summary.
+TOP_ALLOCATIONS = 25
+
+# Frames kept by tracemalloc for each allocation.
+TRACEMALLOC_FRAMES = 1
+
+_profiling = threading.local()
+
+# Number of profiled tasks using tracemalloc, and whether it was started
+# for them, guarded by _tracing_lock.
+_tracing_lock = threading.Lock()
+_tracing_count = 0
+_tracing_started = False
+
+# True while a profiled task is running under cProfile, guarded by
+# _cprofile_lock.
+_cprofile_lock = threading.Lock()
+_cprofile_active = False
+
+_profile_numbers = itertools.count(1)
+
+
+def get_profile_file_name(folder, name, started):
+    """Return unique file name, without extension, for profile of name."""
+    return os.path.join(
+        folder,
+        "".join(
+            (
+                PROFILE_FILE_PREFIX,
+                name,
+                "-",
+                time.strftime("%Y%m%d%H%M%S", time.localtime(started)),
+                "-",
+                str(os.getpid()),
+                "-",
+                str(next(_profile_numbers)),
+            )
+        ),
+    )
+
+
+def start_tracing():
+    """Start tracemalloc if no profiled task is using it already."""
+    global _tracing_count, _tracing_started
+    with _tracing_lock:
+        if _tracing_count == 0:
+            _tracing_started = not tracemalloc.is_tracing()
+            if _tracing_started:
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+        _tracing_count += 1
+
+
+def stop_tracing():
+    """Return (snapshot, traced) and stop tracemalloc if last task using it.
+
+    traced is the (current, peak) memory tuple from tracemalloc.
+
+    """
+    global _tracing_count, _tracing_started
+    with _tracing_lock:
+        try:
+            return tracemalloc.take_snapshot(), tracemalloc.get_traced_memory()
+        finally:
+            _tracing_count -= 1
+            if _tracing_count == 0 and _tracing_started:
+                tracemalloc.stop()
+                _tracing_started = False
+
+
+def start_profile():
+    """Return enabled cProfile.Profile, or None if a profiler is active.
+
+    The profile must be enabled in the thread which runs the task.
+
+    """
+    global _cprofile_active
+    with _cprofile_lock:
+        if _cprofile_active:
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiling tool is active in Python 3.12 or later.
+            return None
+        _cprofile_active = True
+        return profile
+
+
+def stop_profile(profile):
+    """Disable profile, from start_profile, so another task can profile."""
+    global _cprofile_active
+    if profile is None:
+        return
+    with _cprofile_lock:
+        profile.disable()
+        _cprofile_active = False
+
+
+def write_allocations(filename, name, snapshot, traced, note=None):
+    """Write summary of largest allocations in snapshot to filename.
+
+    traced is the (current, peak) memory tuple from tracemalloc.  note, if
+    given, is written before the summary.
+
+    """
+    with open(filename, "w", encoding="utf-8") as summary:
+        if note:
+            summary.write(note)
+            summary.write("\n\n")
+        summary.write(
+            "".join(
+                (
+                    "Memory allocated by ",
+                    name,
+                    "\n\nCurrent size: ",
+                    str(traced[0]),
+                    "\nPeak size: ",
+                    str(traced[1]),
+                    "\n\nTop ",
+                    str(TOP_ALLOCATIONS),
+                    " lines:\n\n",
+                )
+            )
+        )
+        for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+            summary.write(str(stat))
+            summary.write("\n")
+
+
+def profiled(method, folder):
+    """Return method wrapped to profile it and save results in folder."""
+
+    @functools.wraps(method)
+    def profiled_method(*args, **kargs):
+        if getattr(_profiling, "active", False):
+            return method(*args, **kargs)
+        name = getattr(method, "__name__", "task")
+        started = time.time()
+        start_tracing()
+        profile = start_profile()
+        _profiling.active = True
+        try:
+            return method(*args, **kargs)
+        finally:
+            _profiling.active = False
+            stop_profile(profile)
+            try:
+                snapshot, traced = stop_tracing()
+                filename = get_profile_file_name(folder, name, started)
+                if profile is None:
+                    note = "".join(
+                        (
+                            "No time profile: another task, or profiling ",
+                            "tool, was using the profiler.",
+                        )
+                    )
+                else:
+                    note = None
+                    profile.dump_stats(filename + ".pstats")
+                write_allocations(
+                    filename + "-allocations.txt",
+                    name,
+                    snapshot,
+                    traced,
+                    note=note,
+                )
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
+
+    return profiled_method
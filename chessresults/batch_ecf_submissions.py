@@ -0,0 +1,105 @@
+# batch_ecf_submissions.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Write ECF submission files for events selected by date or name.
+
+For example, to write submission files for all events in the 2024-2025
+season whose names contain 'League':
+
+python -m chessresults.batch_ecf_submissions <database folder> <output folder>
+    --start 2024-09-01 --end 2025-08-31 --name "*league*"
+
+"""
+
+import os
+import sys
+import argparse
+
+
+def _show_progress(stage, done, total):
+    sys.stderr.write(
+        "".join(("\r", stage, " ", str(done), " of ", str(total)))
+    )
+    if done == total:
+        sys.stderr.write("\n")
+
+
+def main(argv=None):
+    """Write submission files for events selected by argv arguments."""
+    parser = argparse.ArgumentParser(
+        description="Write ECF submission files for events in a database.",
+    )
+    parser.add_argument("database", help="folder containing results database")
+    parser.add_argument("output", help="folder for submission files")
+    parser.add_argument(
+        "--start", help="earliest event start date (yyyy-mm-dd)"
+    )
+    parser.add_argument("--end", help="latest event end date (yyyy-mm-dd)")
+    parser.add_argument(
+        "--name", help="event name pattern, like *league*, ignoring case"
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=os.cpu_count(),
+        help="number of worker processes",
+    )
+    parser.add_argument(
+        "--allow-no-ecf-code",
+        action="store_true",
+        help="write files with new players who have no ECF code",
+    )
+    parser.add_argument(
+        "--no-update",
+        action="store_true",
+        help="do not increment the ECF event submission index",
+    )
+    args = parser.parse_args(argv)
+
+    from .core.opendatabase import OpenDatabaseError
+    from .core.ecf.submissionbatch import SubmissionBatch
+
+    if not os.path.isdir(args.output):
+        parser.error("".join(("Output folder ", args.output, " not found")))
+    try:
+        batch = SubmissionBatch(
+            os.path.abspath(args.database),
+            processes=args.processes,
+            progress=_show_progress,
+        )
+        batch.open_database()
+    except OpenDatabaseError as exc:
+        parser.error(str(exc))
+    try:
+        identities = batch.get_events(
+            startdate=args.start, enddate=args.end, pattern=args.name
+        )
+        if not identities:
+            print("No events selected")
+            return 0
+        problems = batch.write_submissions(
+            batch.build_submissions(identities),
+            args.output,
+            allow_no_ecf_code=args.allow_no_ecf_code,
+            update=not args.no_update,
+        )
+    finally:
+        batch.close_database()
+    written = len(identities)
+    for identity, filepath, reports in problems:
+        if filepath is None:
+            written -= 1
+            print("Not written:", "\t".join(identity))
+        else:
+            print("Written with warnings:", filepath)
+        for title, players in reports:
+            print("   ", title)
+            for p in players:
+                print("       ", p)
+    print(written, "of", len(identities), "submission files written")
+    return 1 if written < len(identities) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
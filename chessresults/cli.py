@@ -0,0 +1,437 @@
+# cli.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Run results database tasks without the GUI, for example from cron.
+
+python -m chessresults.cli <command> <database folder> [arguments]
+
+The commands are:
+
+collate <import file>: collate events in an import file and check them
+against the database without changing the database.
+
+import <import file>: import events in an import file and save the Import
+Events report, in the folder containing the import file by default.
+
+ecf-players: apply the ECF list of rated players, downloaded from the
+configured URL, or from --url, or read from --file, to the database.
+
+ecf-clubs: apply the ECF list of active clubs in the same way.
+
+export <output file>: export events selected by --start, --end, and --name
+to a bz2 compressed file suitable for the import command.
+
+The SQLite performance profile, and the snapshot, instrument, and profile
+task options, are read from the configuration file as in the GUI.
+
+Each line written to stdout is a JSON object with a 'type' of 'log' for task
+log text, 'progress' for progress reports, or 'result' for the outcome of the
+command, which is the last line.  The exit status is one of the EXIT_*
+values.
+
+"""
+
+import os
+import sys
+import bz2
+import json
+import argparse
+import datetime
+import importlib
+import traceback
+import functools
+
+# Exit status values.
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_DATABASE = 3
+EXIT_ERROR = 4
+
+# Status values in the result line.
+STATUS_OK = "ok"
+STATUS_FAILED = "failed"
+STATUS_ERROR = "error"
+
+
+class CommandFailed(Exception):
+    pass
+
+
+class Reporter(object):
+    """Write task log text and progress as lines of JSON to stream.
+
+    An instance is the logwidget argument of database tasks.
+
+    """
+
+    def __init__(self, command, stream=None):
+        super(Reporter, self).__init__()
+        self.command = command
+        self.stream = sys.stdout if stream is None else stream
+
+    def emit(self, type_, **kargs):
+        """Write one line of JSON with type_ and kargs."""
+        self.stream.write(json.dumps(dict(type=type_, **kargs)))
+        self.stream.write("\n")
+        self.stream.flush()
+
+    def append_text(self, text, timestamp=True):
+        """Write non-empty text as a log line."""
+        if text:
+            self.emit("log", text=text)
+
+    def append_text_only(self, text):
+        """Write non-empty text as a log line."""
+        if text:
+            self.emit("log", text=text)
+
+    def get_progress(self, name):
+        """Return TaskProgress for task name which writes progress lines."""
+        from .core.taskexecutor import TaskProgress
+
+        progress = TaskProgress(name)
+
+        def report(text):
+            self.emit(
+                "progress",
+                task=name,
+                text=text,
+                done=progress.done,
+                total=progress.total,
+            )
+
+        progress.report = report
+        return progress
+
+    def result(self, status, message, **kargs):
+        """Write the result line for the command."""
+        self.emit(
+            "result",
+            command=self.command,
+            status=status,
+            message=message,
+            **kargs
+        )
+
+
+def run_task(
+    database,
+    taskmethod,
+    reporter,
+    taskmethodargs=None,
+    use_specification_items=None,
+    snapshot=False,
+):
+    """Run taskmethod as a database task and return its value.
+
+    The task is run by do_snapshot_task if snapshot is True, so taskmethod
+    must not change the database, and by do_database_task otherwise.
+
+    """
+    value = []
+
+    @functools.wraps(taskmethod)
+    def task(database, logwidget, **kargs):
+        value.append(taskmethod(database, logwidget, **kargs))
+
+    if snapshot:
+        runner = database.do_snapshot_task
+    else:
+        runner = database.do_database_task
+    runner(
+        task,
+        logwidget=reporter,
+        taskmethodargs=taskmethodargs,
+        use_specification_items=use_specification_items,
+    )
+    return value[0] if value else None
+
+
+def _read_import_file(args, reporter):
+    """Return EventImport for import file validated for database."""
+    from .core.eventimport import EventImport
+
+    importer = EventImport(
+        os.path.abspath(args.importfile),
+        validation_report=args.validate,
+        importevent_report=getattr(args, "report", None),
+        progress=reporter.get_progress(args.command),
+    )
+    if not importer.read_import_file(logwidget=reporter):
+        raise CommandFailed(importer.failure)
+    if not importer.is_import_validated(logwidget=reporter):
+        raise CommandFailed(importer.failure)
+    return importer
+
+
+def collate_command(database, args, reporter):
+    """Collate import file and check it against database."""
+    importer = _read_import_file(args, reporter)
+    if not run_task(database, importer.check_events, reporter, snapshot=True):
+        raise CommandFailed(importer.failure)
+    return "The import would be attempted", {}
+
+
+def import_command(database, args, reporter):
+    """Import events in import file to database."""
+    from .basecore.database import bulk_task
+
+    importer = _read_import_file(args, reporter)
+    if not run_task(database, bulk_task(importer.do_updates), reporter):
+        raise CommandFailed(importer.failure)
+    return "Database update completed", dict(
+        report=importer.importevent_report
+    )
+
+
+def _get_ecf_data(database, args, reporter, urlitem):
+    """Return (source, data) for ECF download from file or URL."""
+    if args.file:
+        with open(args.file, encoding="utf8") as ecffile:
+            return args.file, json.loads(ecffile.read())
+    from .core import constants
+    from .core.ecf import downloadcache
+
+    url = args.url
+    if url is None:
+        from solentware_misc.core.getconfigurationitem import (
+            get_configuration_item,
+        )
+        from .core import configuration
+
+        url = get_configuration_item(
+            configuration.Configuration().get_configuration_file_name(),
+            urlitem,
+            constants.DEFAULT_URLS,
+        )
+    reporter.append_text(" ".join(("Download", url)))
+    cache = downloadcache.DownloadCache(
+        os.path.join(database.home_directory, constants.ECF_DOWNLOAD_CACHE)
+    )
+    try:
+        urldata, cached = cache.fetch(url)
+    except Exception as exc:
+        raise CommandFailed(
+            "".join(("Exception raised trying to read URL: ", str(exc)))
+        )
+    if cached:
+        reporter.append_text("Using download saved in cache.")
+    return url, json.loads(urldata)
+
+
+def _ecf_command(database, args, reporter, name, structure, importname):
+    """Apply ECF download to database."""
+    from . import ECF_DATA_IMPORT_MODULE
+    from .core import constants
+    from .core import filespec
+    from .basecore.database import bulk_task
+
+    if name == "players":
+        urlitem = constants.PLAYERS_RATINGS_URL
+        specification_items = {
+            filespec.ECFPLAYER_FILE_DEF,
+            filespec.MAPECFPLAYER_FILE_DEF,
+            filespec.ECFTXN_FILE_DEF,
+        }
+    else:
+        urlitem = constants.ACTIVE_CLUBS_URL
+        specification_items = {
+            filespec.ECFCLUB_FILE_DEF,
+            filespec.ECFTXN_FILE_DEF,
+        }
+    source, data = _get_ecf_data(database, args, reporter, urlitem)
+    try:
+        structure(data)
+    except RuntimeError as exc:
+        raise CommandFailed(str(exc))
+    module = importlib.import_module(
+        ECF_DATA_IMPORT_MODULE[args.enginename], "chessresults.core"
+    )
+    if not run_task(
+        database,
+        bulk_task(getattr(module, importname)),
+        reporter,
+        taskmethodargs=dict(
+            ecfdata=data,
+            downloaddate=str(datetime.date.today()),
+            progress=reporter.get_progress(args.command),
+        ),
+        use_specification_items=specification_items,
+    ):
+        raise CommandFailed(" ".join(("ECF", name, "not applied")))
+    return " ".join(("ECF", name, "applied")), dict(source=source)
+
+
+def ecf_players_command(database, args, reporter):
+    """Apply ECF list of rated players to database."""
+    from .core.ecf import ecfdataimport
+
+    return _ecf_command(
+        database,
+        args,
+        reporter,
+        "players",
+        ecfdataimport.check_players_ratings_structure,
+        "copy_ecf_players_post_2020_rules",
+    )
+
+
+def ecf_clubs_command(database, args, reporter):
+    """Apply ECF list of active clubs to database."""
+    from .core.ecf import ecfdataimport
+
+    return _ecf_command(
+        database,
+        args,
+        reporter,
+        "clubs",
+        ecfdataimport.check_active_clubs_structure,
+        "copy_ecf_clubs_post_2020_rules",
+    )
+
+
+def export_command(database, args, reporter):
+    """Export selected events to output file."""
+    from .core import eventdata
+    from .core.ecf import ecfsubmission
+
+    def export_events(database, logwidget):
+        identities = ecfsubmission.get_events_for_submission(
+            database,
+            startdate=args.start,
+            enddate=args.end,
+            pattern=args.name,
+        )
+        events = [(key,) for keys in identities.values() for key in keys]
+        if not events:
+            return events
+        for identity in identities:
+            logwidget.append_text_only("\t".join(identity))
+        return eventdata.get_event_export_data(
+            database, events, logwidget=logwidget
+        )
+
+    exportdata = run_task(database, export_events, reporter, snapshot=True)
+    if exportdata is None:
+        raise CommandFailed(
+            " ".join(
+                (
+                    "Cannot generate an export file when some players in the",
+                    "events being exported have not been merged or joined.",
+                )
+            )
+        )
+    if not exportdata:
+        return "No events selected", {}
+    outputfile = bz2.open(args.output, mode="wt", encoding="utf8")
+    try:
+        outputfile.write("\n".join(exportdata))
+    finally:
+        outputfile.close()
+    return "Events exported", dict(output=args.output)
+
+
+def _date(text):
+    """Return text as an ISO date, yyyy-mm-dd, for argparse."""
+    try:
+        return datetime.date.fromisoformat(text).isoformat()
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "".join(("'", text, "' is not a date like yyyy-mm-dd"))
+        ) from None
+
+
+def _get_parser():
+    """Return ArgumentParser for the commands."""
+    parser = argparse.ArgumentParser(
+        prog="python -m chessresults.cli",
+        description="Run results database tasks without the GUI.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_command(name, function, help_):
+        command = commands.add_parser(name, help=help_)
+        command.set_defaults(function=function)
+        command.add_argument(
+            "database", help="folder containing results database"
+        )
+        return command
+
+    for name, function, help_ in (
+        ("collate", collate_command, "collate and check an import file"),
+        ("import", import_command, "import events from an import file"),
+    ):
+        command = add_command(name, function, help_)
+        command.add_argument("importfile", help="bz2 compressed import file")
+        command.add_argument(
+            "--validate",
+            help="Import Events report for original import file",
+        )
+        if function is import_command:
+            command.add_argument(
+                "--report", help="file for Import Events report"
+            )
+    for name, function, help_ in (
+        ("ecf-players", ecf_players_command, "apply ECF rated players"),
+        ("ecf-clubs", ecf_clubs_command, "apply ECF active clubs"),
+    ):
+        command = add_command(name, function, help_)
+        source = command.add_mutually_exclusive_group()
+        source.add_argument("--url", help="URL instead of configured URL")
+        source.add_argument("--file", help="previously downloaded file")
+    command = add_command("export", export_command, "export events")
+    command.add_argument("output", help="bz2 compressed export file")
+    command.add_argument(
+        "--start", type=_date, help="earliest event start date (yyyy-mm-dd)"
+    )
+    command.add_argument(
+        "--end", type=_date, help="latest event end date (yyyy-mm-dd)"
+    )
+    command.add_argument(
+        "--name", help="event name pattern, like *league*, ignoring case"
+    )
+    return parser
+
+
+def main(argv=None):
+    """Run command in argv and return exit status."""
+    args = _get_parser().parse_args(argv)
+    reporter = Reporter(args.command)
+
+    from .core.opendatabase import (
+        OpenDatabaseError,
+        get_database_engine,
+        open_results_database,
+    )
+
+    try:
+        args.enginename = get_database_engine(args.database)
+        database = open_results_database(
+            args.database, enginename=args.enginename
+        )
+    except OpenDatabaseError as exc:
+        reporter.result(STATUS_ERROR, str(exc))
+        return EXIT_DATABASE
+    except Exception as exc:
+        traceback.print_exc()
+        reporter.result(STATUS_ERROR, str(exc))
+        return EXIT_DATABASE
+    try:
+        message, details = args.function(database, args, reporter)
+    except CommandFailed as exc:
+        reporter.result(STATUS_FAILED, str(exc))
+        return EXIT_FAILED
+    except Exception as exc:
+        traceback.print_exc()
+        reporter.result(STATUS_ERROR, str(exc))
+        return EXIT_ERROR
+    finally:
+        database.close_database()
+    reporter.result(STATUS_OK, message, **details)
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+# batchlookup.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Read many records, or index entries, in one pass sorted by key.
+
+These functions replace loops which call a get_<something> function, each
+opening a cursor, once per key.  One cursor is used for all the keys in a
+batch and the keys are visited in sorted order.
+
+"""
+
+
+def get_records(database, file, keys, recordclass):
+    """Return {key: recordclass(), ...} for keys, None if no record.
+
+    The records are read in key order but the dict is in the order of keys.
+
+    """
+    records = dict()
+    for k in sorted(set(keys)):
+        value = database.get_primary_record(file, k)
+        if value is None:
+            records[k] = None
+            continue
+        record = recordclass()
+        record.load_record(value)
+        records[k] = record
+    return {k: records[k] for k in keys}
+
+
+def get_index_primary_keys(database, file, field, keys):
+    """Return {key: record key, ...} for encoded index keys using nearest.
+
+    A key is absent if the nearest index entry is for another key, and
+    maps to None if the index has no entry at or after key.  This follows
+    the cursor.nearest() idiom used in ecfmaprecord functions.
+
+    """
+    found = dict()
+    cursor = database.database_cursor(file, field)
+    try:
+        for k in sorted(keys):
+            r = cursor.nearest(k)
+            if r is None:
+                found[k] = None
+            elif database.encode_record_selector(r[0]) == k:
+                found[k] = r[-1]
+    finally:
+        cursor.close()
+    return found
+
+
+def get_unique_primary_keys(database, file, field, keys):
+    """Return {key: record key, ...} for unique index keys, or None.
+
+    All keys are looked up on one cursor in sorted order.
+
+    """
+    primary = dict()
+    cursor = database.database_cursor(file, field)
+    try:
+        for k in sorted(set(keys)):
+            primary[k] = cursor.get_unique_primary_for_index_key(
+                database.encode_record_selector(k)
+            )
+    finally:
+        cursor.close()
+    return primary
+
+
+def get_unique_index_records(database, file, field, keys, recordclass):
+    """Return {key: recordclass(), ...} for unique index keys, or None."""
+    primary = get_unique_primary_keys(database, file, field, keys)
+    records = get_records(
+        database,
+        file,
+        [p for p in primary.values() if p is not None],
+        recordclass,
+    )
+    return {
+        k: (records[p] if p is not None else None) for k, p in primary.items()
+    }
+
+
+def get_record_keys_on_index(database, file, field):
+    """Return list of record keys, without duplicates, on index field.
+
+    The list is in record key order, ready for get_records.
+
+    """
+    keys = set()
+    cursor = database.database_cursor(file, field)
+    try:
+        r = cursor.first()
+        while r is not None:
+            keys.add(r[-1])
+            r = cursor.next()
+    finally:
+        cursor.close()
+    return sorted(keys)
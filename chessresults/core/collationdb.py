@@ -26,28 +26,35 @@ from .resultsrecord import get_alias, get_name_from_record_value
 from .resultsrecord import get_events_matching_event_identity
 from .resultsrecord import get_games_for_event, get_affiliation_details
 from . import filespec
+from .taskexecutor import TaskProgress
 
 
 class CollationDB(object):
 
     """Update results database from games in a Collation instance."""
 
-    def __init__(self, games, database):
+    def __init__(self, games, database, progress=None):
         """Note the games and database to be updated.
 
         games - the games containing results to apply to database
         database - the ResultsDatabase instance for the database to be updated
+        progress - the taskexecutor.TaskProgress instance for the update
 
         """
         self._games = games
         self._database = database
+        if progress is None:
+            progress = TaskProgress("")
+        self._progress = progress
 
     def update_results(self):
         """Apply games to database replacing existing games for event.
 
-        Caller is responsible for commit or backout action.
+        Caller is responsible for commit or backout action, including when
+        taskexecutor.TaskCancelled is raised because the update is cancelled.
 
         """
+        progress = self._progress
         eventsections = dict()  # {name : {section name : srkey, ...}, ...}
         eventsamend = dict()
         eventskey = dict()  # {srkey : name, ...}
@@ -184,6 +191,7 @@ class CollationDB(object):
 
         """Get new events"""
         for ugkey in self._games:
+            progress.check_cancelled()
             competition = self._games[ugkey].competition
             for game in self._games[ugkey].games:
                 if isinstance(game, Game):
@@ -248,6 +256,7 @@ class CollationDB(object):
         value dictionary for comparison with new games"""
         for dbevents in (delete_events, use_events):
             for dbe, e, record in dbevents:
+                progress.check_cancelled()
                 for s in record.value.sections:
                     namemanager.unset_name(s)
                 for g in get_games_for_event(self._database, record):
@@ -340,7 +349,9 @@ class CollationDB(object):
                     eventsamend[eventsmap[n]].value.sections[:] = snl
 
         """Create new name and player records for new games."""
+        progress.start(total=len(self._games))
         for ugkey in self._games:
+            progress.advance()
             collation = self._games[ugkey]
             competition = collation.competition
             matchreport = isinstance(collation, MatchReport)
@@ -392,7 +403,9 @@ class CollationDB(object):
 
         """Prepare new games and invert the value dictionary for comparison
         with games from database."""
+        progress.start(total=len(self._games))
         for ugkey in self._games:
+            progress.advance()
             collation = self._games[ugkey]
             competition_date = collation.date
             competition = collation.competition
@@ -502,7 +515,9 @@ class CollationDB(object):
         Minor because the match on Open causes an amend to happen rather
         than an insert.
         """
+        progress.start(total=max(len(dbgames), len(newgames)))
         for og, ng in zip(dbgames, newgames):
+            progress.advance()
             ng.key.recno = og.key.recno
             og.edit_record(
                 self._database,
@@ -511,8 +526,10 @@ class CollationDB(object):
                 ng,
             )
         for og in dbgames[len(newgames) :]:
+            progress.advance()
             og.delete_record(self._database, filespec.GAME_FILE_DEF)
         for ng in newgames[len(dbgames) :]:
+            progress.advance()
             ng.put_record(self._database, filespec.GAME_FILE_DEF)
         namemanager.update_names()
         for p in players:
@@ -10,11 +10,29 @@ user's home directory if the file exists.
 """
 from solentware_misc.core import configuration
 
-import ecfformat.core.constants
-
 from . import constants
 
 
+def _get_ecfformat_item_values():
+    """Return default values of ecfformat items, or () without ecfformat.
+
+    ecfformat is imported here, rather than at module level, so the command
+    line interface can read the configuration without ecfformat installed.
+
+    """
+    try:
+        import ecfformat.core.constants
+    except ImportError:
+        return ()
+    return (
+        (ecfformat.core.constants.RECENT_RESULTS_FORMAT_FILE, "~"),
+        (
+            ecfformat.core.constants.SHOW_VALUE_BOUNDARY,
+            ecfformat.core.constants.SHOW_VALUE_BOUNDARY_TRUE,
+        ),
+    )
+
+
 class Configuration(configuration.Configuration):
     """Identify configuration and recent files and delegate to superclass."""
 
@@ -38,9 +56,27 @@ class Configuration(configuration.Configuration):
         (constants.RECENT_EVENT_SUMMARY, "~"),
         (constants.RECENT_GRADING_LIST, "~"),
         (constants.RECENT_RATING_LIST, "~"),
-        (ecfformat.core.constants.RECENT_RESULTS_FORMAT_FILE, "~"),
         (
-            ecfformat.core.constants.SHOW_VALUE_BOUNDARY,
-            ecfformat.core.constants.SHOW_VALUE_BOUNDARY_TRUE,
+            constants.SQLITE_PERFORMANCE_PROFILE,
+            constants.SQLITE_PROFILE_NORMAL,
+        ),
+        (
+            constants.SNAPSHOT_BULK_TASKS,
+            constants.SNAPSHOT_BULK_TASKS_FALSE,
+        ),
+        (
+            constants.INSTRUMENT_TASKS,
+            constants.INSTRUMENT_TASKS_OFF,
+        ),
+        (
+            constants.PROFILE_TASKS,
+            constants.PROFILE_TASKS_FALSE,
         ),
     )
+
+    def __init__(self):
+        """Extend, add default values of ecfformat items if installed."""
+        self._DEFAULT_ITEM_VAULES = (
+            type(self)._DEFAULT_ITEM_VAULES + _get_ecfformat_item_values()
+        )
+        super().__init__()
@@ -424,6 +424,33 @@ RECENT_EVENT_SUMMARY = "event_summary"
 RECENT_GRADING_LIST = "grading_list"
 RECENT_RATING_LIST = "rating_list"
 
+# Performance profiles for the sqlite3 and apsw database engines.  The name
+# of the profile used when a database is opened is a configuration item.
+SQLITE_PERFORMANCE_PROFILE = "sqlite_performance_profile"
+SQLITE_PROFILE_DEFAULT = "default"
+SQLITE_PROFILE_NORMAL = "normal"
+SQLITE_PROFILE_BULK = "bulk"
+
+# Configuration item to take a snapshot of the database before large tasks,
+# such as imports and ECF reference data updates, so they can be rolled back.
+# Off by default because each snapshot is a full copy of the database.
+SNAPSHOT_BULK_TASKS = "snapshot_bulk_tasks"
+SNAPSHOT_BULK_TASKS_TRUE = "true"
+SNAPSHOT_BULK_TASKS_FALSE = "false"
+
+# Configuration item to count and time the database calls made by tasks, and
+# report them in the task log or in the task log and a JSON file.
+INSTRUMENT_TASKS = "instrument_tasks"
+INSTRUMENT_TASKS_OFF = "off"
+INSTRUMENT_TASKS_LOG = "log"
+INSTRUMENT_TASKS_JSON = "json"
+
+# Configuration item to profile tasks with cProfile and tracemalloc, saving
+# the profiles in the database folder.
+PROFILE_TASKS = "profile_tasks"
+PROFILE_TASKS_TRUE = "true"
+PROFILE_TASKS_FALSE = "false"
+
 # Default URLs to access ECF website.
 # These are copied to a file, paired with a user, which may need editing
 # if the ECF URLs change.
@@ -467,6 +494,19 @@ DEFAULT_URLS = (
     ),
 )
 
+# Folder, in database folder, for cached ECF rated players and active clubs
+# list downloads.
+ECF_DOWNLOAD_CACHE = "ecfdownloadcache"
+
+# Folder, in database folder, for the snapshot of the database taken before
+# large tasks.  The new snapshot is built in a folder with the suffix added.
+DATABASE_SNAPSHOT = "snapshot"
+DATABASE_SNAPSHOT_NEW = "-new"
+
+# Folder, in user's home directory, for cached responses to ECF website
+# player and club queries done for many players at once.
+ECF_LOOKUP_CACHE = ".chessresults_ecf_lookup"
+
 # ECF Grading and Rating list downloads.
 
 # Names of the relevant columns in the ECF Grading List csv download.
@@ -31,7 +31,6 @@ a single file making it difficult to forget some data.)
 """
 
 import os
-import collections
 
 from chessvalidate.core import gameresults
 
@@ -41,10 +40,27 @@ from . import constants as cc
 # This should be used upstream but could not locate place.
 homeplayerwhitemap = {True: "yes", False: "no"}
 
+# Keyword validity checks in TranslationRules.table entries.
+_CHECK_NONE = 0
+_CHECK_CONTEXT = 1
+_CHECK_UNEXPECTED = 2
+_CHECK_UNDETERMINED = 3
+
+# Value actions in TranslationRules.table entries.
+_ACTION_NONE = 0
+_ACTION_FIELD = 1
+_ACTION_MAP_PIN = 2
+_ACTION_MAP_AND_READ_PIN = 3
+_ACTION_READ_PIN = 4
+_ACTION_GRADING_CODE = 5
+
 
 class ConvertResults(object):
     """Class for importing results data."""
 
+    # Subclasses set TranslationRules instance on first translation.
+    translation_rules = None
+
     def __init__(self, pinprefix):
         super(ConvertResults, self).__init__()
         self.pinprefix = pinprefix
@@ -311,104 +327,99 @@ class ConvertResults(object):
         pinreadmap=None,
         pinmap=None,
         gradingcodemap=None,
+        rules=None,
+        lines=None,
     ):
         """Extract results into a common format.
 
-        Provide rules in context and keymap arguments.
+        Provide rules in context and keymap arguments, or a TranslationRules
+        instance compiled from them in rules argument.  The context argument
+        is always needed to provide the functions which process data.
+
+        Lines are taken from lines argument if given, otherwise from the
+        get_lines method.  Any iterable of lines will do so input can be
+        converted in one streaming pass.
 
         """
 
         def null(data, context):
             pass
 
-        process = null
-
         if context is None:
             context = dict()
-        for c in context:
-            if not isinstance(context[c], collections.Callable):
-                context[c] = null
-        if keymap is None:
-            keymap = dict()
-        if validmap is None:
-            validmap = dict()
-        if pinreadmap is None:
-            pinreadmap = set()
-        if pinmap is None:
-            pinmap = set()
-        if gradingcodemap is None:
-            gradingcodemap = set()
+        if rules is None:
+            rules = TranslationRules(
+                context=context,
+                keymap=keymap,
+                validmap=validmap,
+                pinreadmap=pinreadmap,
+                pinmap=pinmap,
+                gradingcodemap=gradingcodemap,
+            )
+        if lines is None:
+            lines = self.get_lines()
+
+        process = [null]
+        for c in rules.contexts:
+            p = context.get(c)
+            process.append(p if callable(p) else null)
+        contextkeys = (None,) + rules.contexts
+        table = rules.table
+        grading_code_length = cc.GRADING_CODE_LENGTH
+        grading_code_check = cc.GRADING_CODE_CHECK_CHARACTERS
 
         pinvaluemap = dict()
         data = dict()
-        for e, t in enumerate(self.get_lines()):
-            ts = t.split("=", 1)
-            key, value = ts[0], ts[-1]
-            if key not in validmap:
+        state = 0
+        for t in lines:
+            key, sep, value = t.partition("=")
+            if not sep:
+                value = key
+            rule = table.get(key)
+            if rule is None:
                 if len(key) != 0:
                     self.converterror = ("Keyword not expected : ", key)
                     return self.empty_extract()
-            else:
-                vm = validmap[key]
-                if isinstance(vm, str):
-                    if contextkey != vm:
-                        self.converterror = (
-                            "Keyword ",
-                            key,
-                            " not expected after keyword ",
-                            contextkey,
-                        )
-                        return self.empty_extract()
-                elif isinstance(vm, dict):
-                    try:
-                        if contextkey not in vm:
+                continue
+            check, allowed, newstate, action, field = rule
+            if check:
+                if check == _CHECK_CONTEXT:
+                    if state not in allowed:
+                        if state:
                             self.converterror = (
                                 "Keyword ",
                                 key,
                                 " not expected after keyword ",
-                                contextkey,
+                                contextkeys[state],
+                            )
+                        else:
+                            self.converterror = (
+                                "Keyword ",
+                                key,
+                                " not expected before context determined",
                             )
-                            return self.empty_extract()
-                    except:
-                        self.converterror = (
-                            "Keyword ",
-                            key,
-                            " not expected before context determined",
-                        )
                         return self.empty_extract()
-                elif vm is not None:
+                elif check == _CHECK_UNEXPECTED:
+                    self.converterror = ("Keyword not expected : ", key)
+                    return self.empty_extract()
+                else:
                     self.converterror = (
                         "Unable to determine validity of keyword ",
                         key,
                     )
                     return self.empty_extract()
-            if key in context:
+            if newstate:
                 if len(data):
-                    process(data, contextkey)
-                process = context[key]
+                    process[state](data, contextkeys[state])
+                state = newstate
                 data = dict()
-                contextkey = key
-            if key in keymap:
-                if key in pinmap:
-                    if value not in pinvaluemap:
-                        if len(value) != cc.GRADING_CODE_LENGTH:
-                            pinvaluemap[value] = value
-                        elif (
-                            value[-1] in cc.GRADING_CODE_CHECK_CHARACTERS
-                            and value[:-1].isdigit()
-                        ):
-                            pinvaluemap[value] = "-".join(
-                                (self.pinprefix, str(len(pinvaluemap)))
-                            )
-                        else:
-                            pinvaluemap[value] = value
-                if key in pinreadmap:
-                    data[keymap[key]] = pinvaluemap[value]
-                else:
-                    data[keymap[key]] = value
-            elif key in gradingcodemap:
+            if not action:
+                continue
+            if action == _ACTION_FIELD:
+                data[field] = value
+            elif action == _ACTION_GRADING_CODE:
                 if cc._pcode in data:
-                    if len(value) == cc.GRADING_CODE_LENGTH:
+                    if len(value) == grading_code_length:
                         if value[:-1] in data[cc._pcode]:
                             self.converterror = (
                                 "Grading code ",
@@ -417,9 +428,26 @@ class ConvertResults(object):
                                 data[cc._pcode],
                             )
                             return self.empty_extract()
+            else:
+                if action != _ACTION_READ_PIN and value not in pinvaluemap:
+                    if len(value) != grading_code_length:
+                        pinvaluemap[value] = value
+                    elif (
+                        value[-1] in grading_code_check
+                        and value[:-1].isdigit()
+                    ):
+                        pinvaluemap[value] = "-".join(
+                            (self.pinprefix, str(len(pinvaluemap)))
+                        )
+                    else:
+                        pinvaluemap[value] = value
+                if action == _ACTION_MAP_PIN:
+                    data[field] = value
+                else:
+                    data[field] = pinvaluemap[value]
 
         if len(data):
-            process(data, contextkey)
+            process[state](data, contextkeys[state])
 
         self.prune(self.match, self.game, cc._mcode)
         self.prune(self.event, self.match, cc._ecode)
@@ -778,7 +806,9 @@ class ConvertSubmissionFile(ConvertResults):
         cc.ECF_COLOURDEFAULT_UNKNOWN: cc.COLOR_NOT_SPECIFIED,
     }
 
-    def translate_results_format(self):
+    def translate_results_format(self, lines=None):
+        """Extract results from ECF submission file format lines."""
+
         def convert_colour_text(data):
             # try:
             # data[cc._gcolor] = ConvertSubmissionFile.colour[
@@ -1014,13 +1044,19 @@ class ConvertSubmissionFile(ConvertResults):
             },
         }
 
+        if ConvertSubmissionFile.translation_rules is None:
+            ConvertSubmissionFile.translation_rules = TranslationRules(
+                context=context,
+                keymap=keymap,
+                validmap=validmap,
+                pinreadmap={cc.PIN, cc.PIN1, cc.PIN2},
+                pinmap={cc.PIN},
+                gradingcodemap={cc.BCF_CODE},
+            )
         extract = super(ConvertSubmissionFile, self).translate_results_format(
             context=context,
-            keymap=keymap,
-            validmap=validmap,
-            pinreadmap={cc.PIN, cc.PIN1, cc.PIN2},
-            pinmap={cc.PIN},
-            gradingcodemap={cc.BCF_CODE},
+            rules=ConvertSubmissionFile.translation_rules,
+            lines=lines,
         )
 
         if not extract:
@@ -1114,7 +1150,9 @@ class ConvertLeagueDump(ConvertResults):
                 fi.close()
         return (fixturelines, reportlines, matchresults)
 
-    def translate_results_format(self):
+    def translate_results_format(self, lines=None):
+        """Extract results from League program dump format lines."""
+
         def get_affiliate(data, context):
             self.affiliate[(data[cc._ecode], data[cc._pcode])] = data
             if cc._pname in data:
@@ -1324,12 +1362,18 @@ class ConvertLeagueDump(ConvertResults):
             cc.match: None,
         }
 
+        if ConvertLeagueDump.translation_rules is None:
+            ConvertLeagueDump.translation_rules = TranslationRules(
+                context=context,
+                keymap=keymap,
+                validmap=validmap,
+                pinreadmap={cc.PCODE, cc.PCODE1, cc.PCODE2},
+                pinmap={cc.PCODE1, cc.PCODE2},
+            )
         extract = super(ConvertLeagueDump, self).translate_results_format(
             context=context,
-            keymap=keymap,
-            validmap=validmap,
-            pinreadmap={cc.PCODE, cc.PCODE1, cc.PCODE2},
-            pinmap={cc.PCODE1, cc.PCODE2},
+            rules=ConvertLeagueDump.translation_rules,
+            lines=lines,
         )
 
         if not extract:
@@ -1356,6 +1400,87 @@ class ConvertLeagueDump(ConvertResults):
                 del self.affiliate[(e, p)]
 
 
+class TranslationRules(object):
+    """Rules for ConvertResults.translate_results_format compiled to a table.
+
+    The validmap, context, and keymap, rules, and the pin and grading code
+    sets, are combined into one dict mapping keyword to a tuple:
+
+    (check, allowed states, new state, action, field name)
+
+    States are integers: 0 means no context keyword seen yet, and n means
+    the context keyword in self.contexts[n-1] was the most recent seen.
+
+    Only the keys of context are used: the functions which process data
+    are supplied each time translate_results_format is called.
+
+    """
+
+    def __init__(
+        self,
+        context=None,
+        keymap=None,
+        validmap=None,
+        pinreadmap=None,
+        pinmap=None,
+        gradingcodemap=None,
+    ):
+        super(TranslationRules, self).__init__()
+        if context is None:
+            context = dict()
+        if keymap is None:
+            keymap = dict()
+        if validmap is None:
+            validmap = dict()
+        if pinreadmap is None:
+            pinreadmap = set()
+        if pinmap is None:
+            pinmap = set()
+        if gradingcodemap is None:
+            gradingcodemap = set()
+        self.contexts = tuple(context)
+        states = {c: e for e, c in enumerate(self.contexts, start=1)}
+        self.table = table = dict()
+        for key in set(validmap).union(context, keymap, gradingcodemap):
+            if key in validmap:
+                vm = validmap[key]
+                if vm is None:
+                    check, allowed = _CHECK_NONE, None
+                elif isinstance(vm, str):
+                    check = _CHECK_CONTEXT
+                    allowed = frozenset((states[vm],) if vm in states else ())
+                elif isinstance(vm, dict):
+                    check = _CHECK_CONTEXT
+                    allowed = frozenset(states[c] for c in vm if c in states)
+                else:
+                    check, allowed = _CHECK_UNDETERMINED, None
+            elif len(key) != 0:
+                check, allowed = _CHECK_UNEXPECTED, None
+            else:
+                check, allowed = _CHECK_NONE, None
+            if key in keymap:
+                if key in pinmap:
+                    if key in pinreadmap:
+                        action = _ACTION_MAP_AND_READ_PIN
+                    else:
+                        action = _ACTION_MAP_PIN
+                elif key in pinreadmap:
+                    action = _ACTION_READ_PIN
+                else:
+                    action = _ACTION_FIELD
+            elif key in gradingcodemap:
+                action = _ACTION_GRADING_CODE
+            else:
+                action = _ACTION_NONE
+            table[key] = (
+                check,
+                allowed,
+                states.get(key, 0),
+                action,
+                keymap.get(key),
+            )
+
+
 class PhraseCounts(object):
     """Counts of phrase usage.
 
@@ -0,0 +1,149 @@
+# downloadcache.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Cache of ECF rated players and active clubs list downloads.
+
+The body of each download is saved with the ETag and Last-Modified headers
+of the response.  The next download of the same URL sends these back as
+If-None-Match and If-Modified-Since headers, and the saved body is used if
+the ECF website replies '304 Not Modified'.
+
+Several URLs, the players and clubs lists for example, can be downloaded at
+the same time.  A URL likely to be wanted next can be prefetched into the
+cache in a background thread, without waiting for the download to finish.
+
+"""
+
+import os
+import json
+import hashlib
+import threading
+import urllib.request
+import urllib.error
+import concurrent.futures
+
+# Request timeout in seconds.
+TIMEOUT = 300
+
+
+class DownloadCache(object):
+    """Downloads saved in folder, usually in the database folder.
+
+    For each URL there is a body file and a json file holding the URL and
+    the response headers used in conditional requests.
+
+    """
+
+    def __init__(self, folder, timeout=TIMEOUT):
+        super(DownloadCache, self).__init__()
+        self.folder = folder
+        self.timeout = timeout
+
+    def _paths(self, url):
+        name = os.path.join(
+            self.folder, hashlib.sha256(url.encode()).hexdigest()
+        )
+        return name + ".body", name + ".json"
+
+    def _get_cached(self, url):
+        """Return (body, headers) saved for url or (None, {})."""
+        bodypath, headerpath = self._paths(url)
+        try:
+            with open(headerpath, encoding="utf-8") as hf:
+                headers = json.load(hf)
+            if headers.get("url") != url:
+                return None, {}
+            with open(bodypath, "rb") as bf:
+                return bf.read(), headers
+        except (OSError, ValueError):
+            return None, {}
+
+    def _put_cached(self, url, body, etag, last_modified):
+        """Save body and headers for url replacing each file in one step."""
+        os.makedirs(self.folder, exist_ok=True)
+        bodypath, headerpath = self._paths(url)
+        suffix = "".join(
+            (".", str(os.getpid()), "-", str(threading.get_ident()), ".tmp")
+        )
+        with open(bodypath + suffix, "wb") as bf:
+            bf.write(body)
+        with open(headerpath + suffix, "w", encoding="utf-8") as hf:
+            json.dump(
+                dict(url=url, etag=etag, last_modified=last_modified), hf
+            )
+        os.replace(bodypath + suffix, bodypath)
+        os.replace(headerpath + suffix, headerpath)
+
+    def fetch(self, url):
+        """Return (body, cached) for url, cached True if saved body used.
+
+        Exceptions raised by urllib are not caught, except the HTTPError for
+        a '304 Not Modified' reply when a body is saved for url.
+
+        """
+        body, headers = self._get_cached(url)
+        request = urllib.request.Request(url)
+        if body is not None:
+            if headers.get("etag"):
+                request.add_header("If-None-Match", headers["etag"])
+            if headers.get("last_modified"):
+                request.add_header(
+                    "If-Modified-Since", headers["last_modified"]
+                )
+        try:
+            with urllib.request.urlopen(
+                request, timeout=self.timeout
+            ) as response:
+                data = response.read()
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+        except urllib.error.HTTPError as exc:
+            if exc.code == 304 and body is not None:
+                return body, True
+            raise
+        if etag or last_modified:
+            self._put_cached(url, data, etag, last_modified)
+        return data, False
+
+    def fetch_many(self, urls):
+        """Return {url: (body, cached, error), ...} for concurrent fetches.
+
+        body and cached are as returned by fetch(), or None if error, the
+        exception raised by fetch(), is not None.
+
+        """
+        results = {}
+        if not urls:
+            return results
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=len(urls)
+        ) as executor:
+            futures = {executor.submit(self.fetch, url): url for url in urls}
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    body, cached = future.result()
+                    results[futures[future]] = (body, cached, None)
+                except Exception as exc:
+                    results[futures[future]] = (None, None, exc)
+        return results
+
+    def prefetch(self, urls):
+        """Start thread to fetch urls into the cache and return the thread.
+
+        The caller does not wait for the downloads.  Errors are ignored
+        because each URL is fetched again when it is wanted.
+
+        """
+        thread = threading.Thread(
+            target=self._prefetch, args=(urls,), daemon=True
+        )
+        thread.start()
+        return thread
+
+    def _prefetch(self, urls):
+        for url in urls:
+            try:
+                self.fetch(url)
+            except Exception:
+                pass
@@ -15,6 +15,38 @@ ever played a graded game (since early 1990s in practice).
 """
 
 from .. import filespec
+from .. import constants
+from ...basecore.database import bulk_task
+
+
+def check_players_ratings_structure(data):
+    """Return data if it is a downloaded list of rated players.
+
+    RuntimeError is raised if data does not have the expected structure.
+
+    """
+    if set(data.keys()) == constants.PLAYERS_RATINGS_KEYS:
+        if (
+            tuple(data[constants.P_R_COLUMN_NAMES])
+            == constants.PLAYERS_RATINGS_COLUMN_NAMES
+        ):
+            return data
+    raise RuntimeError(
+        "Downloaded data not in expected format for rated players"
+    )
+
+
+def check_active_clubs_structure(data):
+    """Return data if it is a downloaded list of active clubs.
+
+    RuntimeError is raised if data does not have the expected structure.
+
+    """
+    if set(data.keys()) == constants.ACTIVE_CLUBS_KEYS:
+        return data
+    raise RuntimeError(
+        "Downloaded data not in expected format for active clubs"
+    )
 
 
 def _do_ecf_downloaded_data_import(
@@ -24,6 +56,7 @@ def _do_ecf_downloaded_data_import(
     specification_items=None,
     ecfdata=None,
     downloaddate=None,
+    progress=None,
 ):
     """ """
 
@@ -32,12 +65,13 @@ def _do_ecf_downloaded_data_import(
         return False
 
     results.do_database_task(
-        import_method,
+        bulk_task(import_method),
         logwidget=logwidget,
         taskmethodargs=dict(
             ecfdata=ecfdata,
             parent=widget.get_widget(),
             downloaddate=downloaddate,
+            progress=progress,
         ),
         use_specification_items=specification_items,
     )
@@ -52,6 +86,7 @@ def _do_ecf_reference_data_import(
     specification_items=None,
     ecfdate=None,
     datecontrol=None,
+    progress=None,
 ):
     """Import a new ECF club file.
 
@@ -83,7 +118,7 @@ def _do_ecf_reference_data_import(
         return False
 
     results.do_database_task(
-        import_method,
+        bulk_task(import_method),
         logwidget=logwidget,
         taskmethodargs=dict(
             ecffile=ecffile,
@@ -91,6 +126,7 @@ def _do_ecf_reference_data_import(
             parent=widget.get_widget(),
             # datecontrol=widget.ecfdatecontrol.get(),
             datecontrol=datecontrol,  # See --enable-threads comment just above.
+            progress=progress,
         ),
         use_specification_items=specification_items,
     )
@@ -99,7 +135,7 @@ def _do_ecf_reference_data_import(
 
 
 def copy_ecf_players_post_2020_rules(
-    widget, logwidget=None, ecfdata=None, downloaddate=None
+    widget, logwidget=None, ecfdata=None, downloaddate=None, progress=None
 ):
     """Import a new ECF player file.
 
@@ -119,11 +155,12 @@ def copy_ecf_players_post_2020_rules(
         },
         ecfdata=ecfdata,
         downloaddate=downloaddate,
+        progress=progress,
     )
 
 
 def copy_ecf_clubs_post_2020_rules(
-    widget, logwidget=None, ecfdata=None, downloaddate=None
+    widget, logwidget=None, ecfdata=None, downloaddate=None, progress=None
 ):
     """Import a new ECF club file.
 
@@ -142,11 +179,12 @@ def copy_ecf_clubs_post_2020_rules(
         },
         ecfdata=ecfdata,
         downloaddate=downloaddate,
+        progress=progress,
     )
 
 
 def copy_ecf_players_post_2011_rules(
-    widget, logwidget=None, ecfdate=None, datecontrol=None
+    widget, logwidget=None, ecfdate=None, datecontrol=None, progress=None
 ):
     """Import a new ECF player file.
 
@@ -166,11 +204,12 @@ def copy_ecf_players_post_2011_rules(
         },
         ecfdate=ecfdate,
         datecontrol=datecontrol,
+        progress=progress,
     )
 
 
 def copy_ecf_clubs_post_2011_rules(
-    widget, logwidget=None, ecfdate=None, datecontrol=None
+    widget, logwidget=None, ecfdate=None, datecontrol=None, progress=None
 ):
     """Import a new ECF club file.
 
@@ -189,4 +228,5 @@ def copy_ecf_clubs_post_2011_rules(
         },
         ecfdate=ecfdate,
         datecontrol=datecontrol,
+        progress=progress,
     )
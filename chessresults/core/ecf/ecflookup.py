@@ -0,0 +1,196 @@
+# ecflookup.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Fetch details of many ECF players or clubs from the ECF website at once.
+
+The single player and club queries of the ECF API, PLAYER_INFO_URL,
+MEMBER_INFO_URL, and CLUB_INFO_URL in constants, for many players or clubs
+are done by a small pool of threads.  Responses can be kept in a URLCache,
+a folder of files keyed by URL, so repeating a lookup within the expiry
+time does not go to the ECF website again.
+
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import urllib.request
+import concurrent.futures
+
+# Default number of concurrent requests to the ECF website.
+WORKERS = 4
+
+# Default time, in seconds, a cached response is used.
+EXPIRY = 24 * 60 * 60
+
+# Request timeout in seconds.
+TIMEOUT = 60
+
+
+# Same as the pattern in NewPlayers panel for reported codes.
+_reported_code_re = re.compile(
+    "|".join(
+        (
+            r"(?P<ec>[1-9][0-9]{5}[a-hjklA-HJKL])",  # code
+            r"(?P<mno>[0-9]{6})(?![a-zA-Z])",  # membership
+        )
+    )
+)
+
+
+def is_ecf_code_valid(ecfcode):
+    """Return True if ecfcode is 6 digits followed by correct check letter."""
+    if len(ecfcode) != 7 or not ecfcode[:6].isdigit():
+        return False
+    checkdigit = 0
+    for i in range(6):
+        checkdigit += int(ecfcode[5 - i]) * (i + 2)
+    return ecfcode[-1] == "ABCDEFGHJKL"[checkdigit % 11]
+
+
+class URLCache(object):
+    """Responses to URL requests saved in files in folder.
+
+    A response is used for expiry seconds after it was saved.
+
+    """
+
+    def __init__(self, folder, expiry=EXPIRY):
+        super(URLCache, self).__init__()
+        self.folder = folder
+        self.expiry = expiry
+
+    def _path(self, url):
+        return os.path.join(
+            self.folder, hashlib.sha256(url.encode()).hexdigest() + ".json"
+        )
+
+    def get(self, url):
+        """Return response text saved for url or None if none or expired."""
+        try:
+            with open(self._path(url), encoding="utf-8") as cf:
+                entry = json.load(cf)
+        except (OSError, ValueError):
+            return None
+        if entry.get("url") != url:
+            return None
+        if time.time() - entry.get("time", 0) > self.expiry:
+            return None
+        return entry.get("response")
+
+    def put(self, url, response):
+        """Save response text for url, replacing the file in one step."""
+        os.makedirs(self.folder, exist_ok=True)
+        path = self._path(url)
+        temporary = "".join((path, ".", str(os.getpid()), ".tmp"))
+        with open(temporary, "w", encoding="utf-8") as cf:
+            json.dump(dict(url=url, time=time.time(), response=response), cf)
+        os.replace(temporary, path)
+
+    def remove_expired(self):
+        """Delete files for expired responses."""
+        if not os.path.isdir(self.folder):
+            return
+        now = time.time()
+        for name in os.listdir(self.folder):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.folder, name)
+            try:
+                if now - os.path.getmtime(path) > self.expiry:
+                    os.remove(path)
+            except OSError:
+                pass
+
+
+class ECFLookup(object):
+    """Fetch ECF player or club details for many URLs concurrently.
+
+    cache is a URLCache or None.  At most workers requests are in progress
+    at once.
+
+    """
+
+    def __init__(self, cache=None, workers=WORKERS, timeout=TIMEOUT):
+        super(ECFLookup, self).__init__()
+        self.cache = cache
+        self.workers = max(1, workers)
+        self.timeout = timeout
+
+    def fetch(self, urls, progress=None):
+        """Return {key: (data, error), ...} for urls {key: url, ...}.
+
+        data is the decoded json response, or None if error, the exception
+        raised when fetching or decoding the response, is not None.
+
+        progress, if given, is called as progress(key, data, error) in the
+        calling thread as each request completes.
+
+        """
+        results = {}
+        if not urls:
+            return results
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(self.workers, len(urls))
+        ) as executor:
+            futures = {
+                executor.submit(self._fetch, url): key
+                for key, url in urls.items()
+            }
+            for future in concurrent.futures.as_completed(futures):
+                key = futures[future]
+                try:
+                    data, error = future.result(), None
+                except Exception as exc:
+                    data, error = None, exc
+                results[key] = (data, error)
+                if progress is not None:
+                    progress(key, data, error)
+        return results
+
+    def _fetch(self, url):
+        """Return decoded json response for url from cache or ECF website."""
+        if self.cache is not None:
+            response = self.cache.get(url)
+            if response is not None:
+                return json.loads(response)
+        with urllib.request.urlopen(url, timeout=self.timeout) as uf:
+            response = uf.read().decode()
+        data = json.loads(response)
+        if self.cache is not None:
+            self.cache.put(url, response)
+        return data
+
+
+def split_reported_code(reportedcode):
+    """Yield (ECF code, membership number) pairs found in reportedcode.
+
+    One of each pair is None.  Like the NewPlayers panel, six digits
+    followed by a check letter is an ECF code, which may have the wrong
+    check letter, and six digits not followed by a letter is a membership
+    number.
+
+    """
+    for match in _reported_code_re.finditer(reportedcode):
+        yield match.group("ec"), match.group("mno")
+
+
+def get_player_urls(urlname, ecfcodes):
+    """Return {ECF code: URL, ...} for PLAYER_INFO_URL urlname."""
+    return {c: "".join((urlname, c[:6])) for c in ecfcodes}
+
+
+def get_member_urls(urlname, membershipnumbers):
+    """Return {'ME' + number: URL, ...} for MEMBER_INFO_URL urlname."""
+    return {
+        "".join(("ME", n)): "".join((urlname, "ME", n))
+        for n in membershipnumbers
+    }
+
+
+def get_club_urls(urlname, clubcodes):
+    """Return {club code: URL, ...} for CLUB_INFO_URL urlname."""
+    return {c: "".join((urlname, c)) for c in clubcodes}
@@ -0,0 +1,925 @@
+# ecfsubmission.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Build ECF results submission file for events without a user interface.
+
+Submission file format is defined at www.ecfrating.org.uk/doc/.
+
+The player, ECF map, ECF player, ECF club, and name, records needed for the
+submission are read in batches sorted by key before the submission file
+lines and the lists of player errors are generated.  One cursor per index
+is used for each batch rather than one cursor per player.
+
+"""
+
+import os
+import fnmatch
+
+from chessvalidate.core import gameresults
+
+from . import ecfmaprecord
+from . import ecfrecord
+from .. import resultsrecord
+from .. import batchlookup
+from .. import constants
+from .. import filespec
+
+
+class ECFSubmissionError(Exception):
+    pass
+
+
+class ECFSubmission(object):
+    """Games, players, and clubs, for events in an ECF submission file.
+
+    events is {key: resultsrecord.ResultsDBrecordEvent(), ...} and all
+    events must have the same name, start date, and end date.
+
+    """
+
+    def __init__(self, database, events):
+        """Note database and events to be submitted."""
+        super(ECFSubmission, self).__init__()
+        self.database = database
+        self.events = events
+        self.games = None
+        self.submit_games = None
+        self.aliases = None
+        self.persons = None
+        self.players = None
+        self.player_clubs = None
+        self.clubs = None
+        self.counties = None
+        self.names = None
+        self.no_club_code = []
+        self.not_in_event = []
+        self.no_ecf_name = []
+        self.no_ecf_code = []
+        self._event_details = dict()
+        self._section_names = dict()
+
+    def prefetch(self):
+        """Read all records needed for submission and find player errors."""
+        database = self.database
+        self.games = _get_games_for_events(database, self.events)
+        submit_games = dict()
+        for g in self.games:
+            v = g.value
+            if v.hometeam and v.awayteam:
+                ecfsection = (v.hometeam, v.awayteam)
+            elif v.section:
+                ecfsection = v.section
+            else:
+                ecfsection = (v.event,)
+            if ecfsection not in submit_games:
+                submit_games[ecfsection] = [g]
+            else:
+                submit_games[ecfsection].append(g)
+        self.submit_games = submit_games
+        alias_keys = []
+        for g in self.games:
+            alias_keys.append(g.value.homeplayer)
+            alias_keys.append(g.value.awayplayer)
+        alias_keys = list(dict.fromkeys(alias_keys))
+        self.aliases = batchlookup.get_records(
+            database,
+            filespec.PLAYER_FILE_DEF,
+            alias_keys,
+            resultsrecord.ResultsDBrecordPlayer,
+        )
+        self.persons = self._get_persons()
+        self.players = self._get_ecf_players_for_persons()
+        self.player_clubs = self._get_player_clubs(alias_keys)
+        self.clubs = self._get_ecf_clubs_for_player_clubs()
+        self.counties = dict()
+        for sc in self.clubs:
+            # this needs pick relevant txn date I think
+            v = self.clubs[sc].value
+            if v.ECFcode not in self.counties:
+                self.counties[v.ECFcode] = v.ECFcountycode
+        name_keys = []
+        for g in self.games:
+            for v in (g.value.hometeam, g.value.awayteam, g.value.section):
+                if v is not None:
+                    name_keys.append(v)
+        self.names = batchlookup.get_records(
+            database,
+            filespec.NAME_FILE_DEF,
+            list(dict.fromkeys(name_keys)),
+            resultsrecord.ResultsDBrecordName,
+        )
+        self._find_player_errors()
+
+    def _get_persons(self):
+        """Return {alias: ResultsDBrecordPlayer(), ...} for self.aliases.
+
+        The mapping is the one given by resultsrecord.get_persons, including
+        sharing of records by aliases of the same person, but persons not
+        in self.aliases are read in one sorted batch.
+
+        """
+        database = self.database
+        aliases = self.aliases
+        wanted = set()
+        for a in aliases:
+            m = aliases[a].value.merge
+            if m is not None and m is not True and m is not False:
+                wanted.add(m)
+        merged = batchlookup.get_records(
+            database,
+            filespec.PLAYER_FILE_DEF,
+            wanted,
+            resultsrecord.ResultsDBrecordPlayer,
+        )
+        persons = dict()
+        merge = dict()
+        for a in aliases:
+            m = aliases[a].value.merge
+            if m is None:
+                continue
+            if m is False or m is True:
+                m = database.encode_record_number(aliases[a].key.recno)
+                merge[m] = aliases[a].clone()
+            elif m not in merge:
+                merge[m] = merged[m]
+            persons[a] = merge[m]
+        return persons
+
+    def _get_ecf_players_for_persons(self):
+        """Return {player: ECFrefDBrecordECFplayer(), ...} for self.persons.
+
+        ECFmapDBvaluePlayer() is given for persons without a grading code,
+        and None for persons with a grading code not on the ECF master list.
+        Persons with no ECF map record are not included unless the map index
+        has no entries after the person.
+
+        """
+        database = self.database
+        persons = self.persons
+        identities = {
+            a: database.encode_record_number(persons[a].key.recno)
+            for a in persons
+        }
+        found = batchlookup.get_index_primary_keys(
+            database,
+            filespec.MAPECFPLAYER_FILE_DEF,
+            filespec.PERSONID_FIELD_DEF,
+            set(identities.values()),
+        )
+        maprecs = batchlookup.get_records(
+            database,
+            filespec.MAPECFPLAYER_FILE_DEF,
+            {k for k in found.values() if k is not None},
+            ecfmaprecord.ECFmapDBrecordPlayer,
+        )
+        ecfmap = dict()
+        for identity, key in found.items():
+            maprec = maprecs.get(key)
+            ecfmap[identity] = maprec.value if maprec else None
+        ecfcodes = {
+            v.playercode
+            for v in ecfmap.values()
+            if v is not None and v.playercode
+        }
+        codes = batchlookup.get_unique_index_records(
+            database,
+            filespec.ECFPLAYER_FILE_DEF,
+            filespec.ECFPLAYERCODE_FIELD_DEF,
+            ecfcodes,
+            ecfrecord.ECFrefDBrecordECFplayer,
+        )
+        for identity, v in ecfmap.items():
+            if v is not None and v.playercode:
+                ecfmap[identity] = codes[v.playercode]
+        ecfplayers = dict()
+        for a, identity in identities.items():
+            if identity in ecfmap:
+                ecfplayers[a] = ecfmap[identity]
+        return ecfplayers
+
+    def _get_player_clubs(self, alias_keys):
+        """Return {player: ECFmapDBrecordClub(), ...} for alias_keys."""
+        database = self.database
+        encoded = {a: database.encode_record_number(a) for a in alias_keys}
+        found = batchlookup.get_index_primary_keys(
+            database,
+            filespec.MAPECFCLUB_FILE_DEF,
+            filespec.PLAYERALIASID_FIELD_DEF,
+            set(encoded.values()),
+        )
+        maprecs = batchlookup.get_records(
+            database,
+            filespec.MAPECFCLUB_FILE_DEF,
+            {k for k in found.values() if k is not None},
+            ecfmaprecord.ECFmapDBrecordClub,
+        )
+        players = dict()
+        for a in alias_keys:
+            maprec = maprecs.get(found.get(encoded[a]))
+            if maprec is not None:
+                players[a] = maprec
+        return players
+
+    def _get_ecf_clubs_for_player_clubs(self):
+        """Return {player: ECFrefDBrecordECFclub(), ...} for player clubs."""
+        player_clubs = self.player_clubs
+        codes = batchlookup.get_unique_index_records(
+            self.database,
+            filespec.ECFCLUB_FILE_DEF,
+            filespec.ECFCLUBCODE_FIELD_DEF,
+            {
+                pc.value.clubcode
+                for pc in player_clubs.values()
+                if pc.value.clubcode
+            },
+            ecfrecord.ECFrefDBrecordECFclub,
+        )
+        ecfclubs = dict()
+        for a in player_clubs:
+            clubcode = player_clubs[a].value.clubcode
+            if clubcode and codes[clubcode] is not None:
+                ecfclubs[a] = codes[clubcode]
+        return ecfclubs
+
+    def _find_player_errors(self):
+        """Populate the lists of players who cannot be submitted to ECF."""
+        self.no_club_code = []
+        self.not_in_event = []
+        self.no_ecf_name = []
+        self.no_ecf_code = []
+        for spc in self.player_clubs.values():
+            if spc.value.clubcode is None and spc.value.clubecfcode is None:
+                self.no_club_code.append(
+                    self.get_player_name_text_tabs(
+                        spc.value.get_unpacked_playername()
+                    )
+                )
+        for sp, spv in self.players.items():
+            if isinstance(spv, ecfmaprecord.ECFmapDBvaluePlayer):
+                if spv.playerecfname is None:
+                    self.no_ecf_name.append(
+                        self.get_player_name_text_tabs(
+                            spv.get_unpacked_playername()
+                        )
+                    )
+                elif spv.playerecfcode is None:
+                    self.no_ecf_code.append(
+                        self.get_player_name_text_tabs(
+                            spv.get_unpacked_playername()
+                        )
+                    )
+            elif spv is None:
+                self.not_in_event.append(
+                    self.get_player_name_text_tabs(
+                        self.persons[sp].value.identity()
+                    )
+                )
+
+    def get_player_name_text_tabs(self, playername):
+        """Return tab separated player identity for playername.
+
+        Same as resultsrecord.get_player_name_text_tabs with event details
+        and section names read once per event and section.
+
+        """
+        name, e = playername
+        kevent, ksection, tpin = e
+        if kevent not in self._event_details:
+            self._event_details[kevent] = resultsrecord.get_event_details(
+                self.database, kevent
+            )
+        if ksection is None:
+            section = ""
+        else:
+            if ksection not in self._section_names:
+                self._section_names[
+                    ksection
+                ] = resultsrecord.get_section_details(
+                    self.database, ksection, None
+                )
+            section = self._section_names[ksection]
+            if tpin:
+                section = "\t".join((section, str(tpin)))
+        return "\t".join((name, self._event_details[kevent], section))
+
+    def get_error_reports(self):
+        """Return list of (title, [player, ...]) for players with errors.
+
+        Players without an ECF club code are reported alone because those
+        errors are checked before the others.
+
+        """
+        if self.no_club_code:
+            return [("Player has no ECF club code", self.no_club_code)]
+        reports = []
+        if self.not_in_event:
+            reports.append(("Player not in event list", self.not_in_event))
+        if self.no_ecf_name:
+            reports.append(("Player has no ECF name", self.no_ecf_name))
+        if self.no_ecf_code:
+            reports.append(("Player has no ECF code", self.no_ecf_code))
+        return reports
+
+    def get_submission_lines(self, ecfeventrecord):
+        """Return (filename, lines) of submission file for ecfeventrecord.
+
+        ecfeventrecord is the ECFrefDBrecordEvent for the events.
+
+        """
+        if self.games is None:
+            raise ECFSubmissionError("Submission data has not been read")
+        submit_games = self.submit_games
+        aliases = self.persons
+        submit_players = self.players
+        submit_player_clubs = self.player_clubs
+        submit_clubs = self.clubs
+        submit_counties = self.counties
+        submit_names = self.names
+
+        def dcc(ecf_field_name):
+            # Hack to make things work at Python 3
+            # Probably correct is making all ecfeventrecord.value attributes
+            # bytes and coping with that at the interface with Text widgets.
+            # This is consistent with strategy elsewhere.
+            # Only thing in favour of technique used here is the need to
+            # translate from utf-8 to ascii, or iso-8859-1 or some other 256
+            # code point map while ECF system expects that.
+            # Change to str in application code may make this hack redundant.
+            # return ecf_field_name.decode('ascii')
+            return ecf_field_name
+
+        def ecf_line(data):
+            return "".join(("#", "=".join(data)))
+
+        def pin_convention(pin):
+            if pin in pin_to_ecf_code:
+                return pin_to_ecf_code[pin]
+            spin = str(pin)
+            if spin == str(0):
+                return constants.ECF_ZERO_NOT_0
+            else:
+                return spin
+
+        v = ecfeventrecord.value
+        if v.eventcode:
+            submission = v.submission + 1
+            subfilename = "".join(
+                (v.eventcode, str(submission).zfill(2), ".txt")
+            )
+        else:
+            subfilename = "ecf00.txt"
+            submission = 0
+        lines = [ecf_line((dcc(constants.EVENT_DETAILS),))]
+        lines.append(ecf_line((dcc(constants.EVENT_CODE), v.eventcode)))
+        lines.append(ecf_line((dcc(constants.EVENT_NAME), v.eventname)))
+        lines.append(
+            ecf_line((dcc(constants.SUBMISSION_INDEX), str(submission)))
+        )
+        d = v.eventstartdate.split("-")
+        d.reverse()
+        lines.append(ecf_line((dcc(constants.EVENT_DATE), "/".join(d))))
+        d = v.eventenddate.split("-")
+        d.reverse()
+        lines.append(ecf_line((dcc(constants.FINAL_RESULT_DATE), "/".join(d))))
+        lines.append(ecf_line((dcc(constants.RESULTS_OFFICER), v.gradername)))
+        if len(v.graderemail):
+            lines.append(
+                ecf_line(
+                    (dcc(constants.RESULTS_OFFICER_ADDRESS), v.graderemail)
+                )
+            )
+        else:
+            addr = v.graderaddress.split("\n")
+            for a in addr:
+                lines.append(
+                    ecf_line((dcc(constants.RESULTS_OFFICER_ADDRESS), a))
+                )
+            if len(v.graderpostcode):
+                lines.append(
+                    ecf_line(
+                        (
+                            dcc(constants.RESULTS_OFFICER_ADDRESS),
+                            v.graderpostcode,
+                        )
+                    )
+                )
+        lines.append(ecf_line((dcc(constants.TREASURER), v.treasurername)))
+        addr = v.treasureraddress.split("\n")
+        for a in addr:
+            lines.append(ecf_line((dcc(constants.TREASURER_ADDRESS), a)))
+        if len(v.treasurerpostcode):
+            lines.append(
+                ecf_line(
+                    (dcc(constants.TREASURER_ADDRESS), v.treasurerpostcode)
+                )
+            )
+        if len(v.movesfirst):
+            lines.append(
+                ecf_line((dcc(constants.MOVES_FIRST_SESSION), v.movesfirst))
+            )
+        if len(v.minutesfirst):
+            lines.append(
+                ecf_line(
+                    (dcc(constants.MINUTES_FIRST_SESSION), v.minutesfirst)
+                )
+            )
+        if len(v.moveslater):
+            lines.append(
+                ecf_line((dcc(constants.MOVES_SECOND_SESSION), v.moveslater))
+            )
+        if len(v.minuteslater):
+            lines.append(
+                ecf_line(
+                    (dcc(constants.MINUTES_SECOND_SESSION), v.minuteslater)
+                )
+            )
+        if len(v.minuteslast):
+            lines.append(
+                ecf_line((dcc(constants.MINUTES_REST_OF_GAME), v.minuteslast))
+            )
+        if len(v.minutesonly):
+            lines.append(
+                ecf_line((dcc(constants.MINUTES_FOR_GAME), v.minutesonly))
+            )
+        if len(v.secondspermove):
+            lines.append(
+                ecf_line((dcc(constants.SECONDS_PER_MOVE), v.secondspermove))
+            )
+        if v.adjudication == 0:
+            lines.append(ecf_line((dcc(constants.ADJUDICATED), "Maybe")))
+        elif v.adjudication == 1:
+            lines.append(ecf_line((dcc(constants.ADJUDICATED), "Yes")))
+        elif v.adjudication == 2:
+            lines.append(ecf_line((dcc(constants.ADJUDICATED), "No")))
+        if v.informgrandprix:
+            lines.append(ecf_line((dcc(constants.INFORM_GRAND_PRIX),)))
+        if v.informfide:
+            lines.append(ecf_line((dcc(constants.INFORM_FIDE),)))
+        if v.informchessmoves:
+            lines.append(ecf_line((dcc(constants.INFORM_CHESSMOVES),)))
+        if v.informeast:
+            lines.append(ecf_line((dcc(constants.INFORM_UNION), "EAST")))
+        if v.informmidlands:
+            lines.append(ecf_line((dcc(constants.INFORM_UNION), "MIDLANDS")))
+        if v.informnorth:
+            lines.append(ecf_line((dcc(constants.INFORM_UNION), "NORTH")))
+        if v.informsouth:
+            lines.append(ecf_line((dcc(constants.INFORM_UNION), "SOUTH")))
+        if v.informwest:
+            lines.append(ecf_line((dcc(constants.INFORM_UNION), "WEST")))
+        if len(submit_players):
+            lines.append(ecf_line((dcc(constants.PLAYER_LIST),)))
+        # Decorate PLAYER LIST data to sort players by name and grading code.
+        # The comparison operators defined for ECFmapDBvaluePlayer may not be
+        # suitable for alphabetic sorting.
+        sorted_submit_players = []
+        # pin_to_ecf_code and ecf_code_to_pin are used to implement a hack
+        # which causes league results for players to be presented one block per
+        # player on the ECF Online Grading Database as found at 02 March 2016
+        # even when multiple spellings of player names occur in reports from
+        # leagues.  It was assumed the blocking should ignore PINs if grading
+        # codes are present.
+        # club_code is added to the decoration in sorted_submit_players so that
+        # duplicate entries can be ignored later.
+        pin_to_ecf_code = dict()
+        ecf_code_to_pin = dict()
+        for pk, pv in submit_players.items():
+            if isinstance(pv, ecfmaprecord.ECFmapDBvaluePlayer):
+                ssp_code = dcc(pv.playerecfcode) if pv.playerecfcode else ""
+                ssp_player = pv.playerecfname if pv.playerecfname else ""
+            elif pv is not None:
+                ssp_code = dcc(pv.value.ECFcode)
+                ssp_player = dcc(pv.value.ECFname)
+            else:
+                continue
+            if pk in submit_clubs:
+                club_code = submit_clubs[pk].value.ECFcode
+            elif pk in submit_player_clubs:
+                club_code = submit_player_clubs[pk].value.clubecfcode
+            else:
+                club_code = None
+            if ssp_code:
+                pin_to_ecf_code[pk] = ecf_code_to_pin.setdefault(
+                    (ssp_code, club_code), str(pk)
+                )
+            sorted_submit_players.append(
+                (
+                    ssp_player,
+                    ssp_code,
+                    club_code,
+                    pk,
+                    pv,
+                )
+            )
+        # Original for statement now populates sorted_submit_players.
+        # The original no longer generates output in the same order across runs
+        # of the program when the data has not changed.
+        # sspp and sspc were sinks to absorb the sort decorators, but now allow
+        # duplicate entries to be ignored.
+        # pin_to_person_pin extends the blocking hack done with pin_to_ecf_code
+        # and ecf_code_to_pin to players where a grading code is not available.
+        pin_to_person_pin = {None: None}
+        prev_sspc = None
+        prev_cc = None
+        prev_pk = None
+        for sspp, sspc, cc, pk, pv in sorted(sorted_submit_players):
+            if prev_sspc == sspc and prev_cc == cc:
+                if pk in pin_to_ecf_code:
+                    continue
+                if aliases[prev_pk] == aliases[pk]:
+                    pin_to_person_pin[pk] = prev_pk
+                    continue
+            prev_sspc = sspc
+            prev_cc = cc
+            prev_pk = pk
+            playerline = [ecf_line((dcc(constants.PIN), pin_convention(pk)))]
+            if isinstance(pv, ecfmaprecord.ECFmapDBvaluePlayer):
+                if pv.playerecfcode:
+                    playerline.append(
+                        ecf_line(
+                            (dcc(constants.BCF_CODE), dcc(pv.playerecfcode))
+                        )
+                    )
+                if pv.playerecfname:
+                    playerline.append(
+                        ecf_line((dcc(constants.NAME), pv.playerecfname))
+                    )
+            elif pv is not None:
+                playerline.append(
+                    ecf_line((dcc(constants.BCF_CODE), dcc(pv.value.ECFcode)))
+                )
+                playerline.append(
+                    ecf_line((dcc(constants.NAME), dcc(pv.value.ECFname)))
+                )
+            else:
+                continue
+            if pk in submit_clubs:
+                v = submit_clubs[pk].value
+                playerline.append(
+                    ecf_line((dcc(constants.CLUB), dcc(v.ECFname)))
+                )
+                playerline.append(
+                    ecf_line((dcc(constants.CLUB_CODE), dcc(v.ECFcode)))
+                )
+                playerline.append(
+                    ecf_line(
+                        (
+                            dcc(constants.CLUB_COUNTY),
+                            dcc(submit_counties[v.ECFcode]),
+                        )
+                    )
+                )
+            elif pk in submit_player_clubs:
+                v = submit_player_clubs[pk].value
+                if (
+                    v.clubcode is None
+                    and v.clubecfname is not None
+                    and v.clubecfcode is not None
+                ):
+                    playerline.append(
+                        ecf_line((dcc(constants.CLUB), dcc(v.clubecfname)))
+                    )
+                    playerline.append(
+                        ecf_line(
+                            (dcc(constants.CLUB_CODE), dcc(v.clubecfcode))
+                        )
+                    )
+            lines.append("".join(playerline))
+        del pin_to_person_pin[None]
+
+        # Quoted from "Grading Results File Layout"
+
+        # BOARD - One may be present if this sequence is in a Match Results
+        # part of the results file, otherwise none
+        # ROUND - One must be present if this sequence is in a Section Results
+        # part of the results file, otherwise none
+        # GAME DATE - One must be present if this sequence is in an Other
+        # Results part of the results file, otherwise one may be present.
+
+        # These rules are applied as follows:
+
+        # Thus the presence of board in ResultsDBvalueGame means the game can
+        # be reported under a MATCH RESULTS header; the absence of board and
+        # presence of round means the game can be reported under a SECTION
+        # RESULTS header; the absence of board and round and presence of
+        # GAME DATE means the game can be reported under an OTHER RESULTS
+        # header.
+
+        # The type and value of section in ResultsDBvalueGame determines
+        # which possibility is used. If this is tuple length 2 report under
+        # MATCH RESULTS header if possible and OTHER RESULTS header if not.
+        # Otherwise report under a SECTION RESULTS header if possible and
+        # OTHER RESULTS if not.
+
+        # Decorate MATCH RESULTS, SECTION RESULTS, and OTHER RESULTS data to
+        # sort sections by name.
+        # The objects in submit_games are no longer in the same order across
+        # runs of the program ever.  In particular when the data is the same.
+        sorted_submit_games = []
+        for gs in submit_games:
+            if isinstance(gs, tuple):
+                ssgh = " - ".join([submit_names[n].value.name for n in gs])
+            else:
+                ssgh = dcc(submit_names[gs].value.name)
+            sorted_submit_games.append((ssgh, gs))
+        # Original for statement now populates sorted_submit_games.
+        # The original no longer generates output in the same order across runs
+        # of the program when the data has not changed.
+        # ssgh is the sink to absorb the sort decorator.
+        for ssgh, gs in sorted(sorted_submit_games):
+            match = False
+            other = False
+            if isinstance(gs, tuple):
+                header = " - ".join([submit_names[n].value.name for n in gs])
+                if len(gs) == 2:
+                    match = True
+            else:
+                header = dcc(submit_names[gs].value.name)
+            if not match:
+                section = True
+                for g in submit_games[gs]:
+                    v = g.value
+                    if v.round is None:
+                        section = False
+                        other = True
+                        break
+                    # Validate round value by ECF submission rules to allow
+                    # removal of round validation on input to this program.
+                    elif not str(v.round).isdecimal():
+                        section = False
+                        other = True
+                        break
+                    elif int(v.round) < 1 or int(v.round) > 99:
+                        section = False
+                        other = True
+                        break
+            else:
+                section = False
+            if not (match or section or other):
+                other = True
+            header_games = []
+            for g in submit_games[gs]:
+                v = g.value
+                # Add round, date, and board to sort decorator in preparation
+                # for ECF publishing match details on Online Grading Database.
+                # Board identifiers are integers usually so give priority to
+                # length of board string in the sort.
+                header_games.append(
+                    (
+                        v.section,
+                        v.round if v.round else "",
+                        v.date if v.date else "",
+                        (len(v.board), v.board) if v.board else (),
+                        v,
+                    )
+                )
+            header_games.sort()
+            prev_game_header = (None,)
+            for g in header_games:
+                v = g[-1]
+                # Adjust header line generation for more accurate reconstruction
+                # of original match details, for planned ECF publication, based
+                # on round and date information added to sort decorator.
+                # Board is part of the sort decorator because the ECF Database
+                # Administrator thinks the games will not be sorted by board
+                # following the example of existing Central Database process.
+                if match:
+                    if prev_game_header != g[:-2]:
+                        lines.append(
+                            ecf_line((dcc(constants.MATCH_RESULTS), header))
+                        )
+                        lines.append(
+                            ecf_line((dcc(constants.WHITE_ON), "Unknown"))
+                        )
+                elif section:
+                    if prev_game_header[:-2] != g[:-4]:
+                        lines.append(
+                            ecf_line((dcc(constants.SECTION_RESULTS), header))
+                        )
+                        lines.append(
+                            ecf_line((dcc(constants.WHITE_ON), "Unknown"))
+                        )
+                elif other:
+                    if prev_game_header[:-2] != g[:-4]:
+                        lines.append(
+                            ecf_line((dcc(constants.OTHER_RESULTS), header))
+                        )
+                        lines.append(
+                            ecf_line((dcc(constants.WHITE_ON), "Unknown"))
+                        )
+                prev_game_header = g[:-2]
+                score = gameresults.ecfresult.get(v.result)
+                if score is not None:
+                    gameline = [
+                        ecf_line(
+                            (
+                                dcc(constants.PIN1),
+                                pin_convention(
+                                    pin_to_person_pin.get(
+                                        v.homeplayer, v.homeplayer
+                                    )
+                                ),
+                            )
+                        )
+                    ]
+                    gameline.append(ecf_line((dcc(constants.SCORE), score)))
+                    gameline.append(
+                        ecf_line(
+                            (
+                                dcc(constants.PIN2),
+                                pin_convention(
+                                    pin_to_person_pin.get(
+                                        v.awayplayer, v.awayplayer
+                                    )
+                                ),
+                            )
+                        )
+                    )
+                    if section:
+                        gameline.append(
+                            ecf_line(
+                                (dcc(constants.ROUND), str(int(dcc(v.round))))
+                            )
+                        )
+                    d = v.date.split("-")
+                    d.reverse()
+                    gameline.append(
+                        ecf_line((dcc(constants.GAME_DATE), "/".join(d)))
+                    )
+                    if match:
+                        if v.board is not None:
+                            gameline.append(
+                                ecf_line((dcc(constants.BOARD), str(v.board)))
+                            )
+                    colour = v.homeplayerwhite
+                    if colour == True:
+                        gameline.append(
+                            ecf_line((dcc(constants.COLOUR), "WHITE"))
+                        )
+                    elif colour == False:
+                        gameline.append(
+                            ecf_line((dcc(constants.COLOUR), "BLACK"))
+                        )
+                    lines.append("".join(gameline))
+
+        lines.append(ecf_line((dcc(constants.FINISH),)))
+        return subfilename, lines
+
+
+def get_ecf_event_for_event(database, event):
+    """Return ECFrefDBrecordEvent for event's identity or None."""
+    return ecfrecord.get_ecf_event(
+        database.get_primary_record(
+            filespec.ECFEVENT_FILE_DEF,
+            database.database_cursor(
+                filespec.ECFEVENT_FILE_DEF,
+                filespec.ECFEVENTIDENTITY_FIELD_DEF,
+            ).get_unique_primary_for_index_key(
+                database.encode_record_number(event.value.get_event_identity())
+            ),
+        )
+    )
+
+
+def is_one_event_identity(events):
+    """Return True if all events have same name, start date, and end date."""
+    identities = {
+        (e.value.startdate, e.value.enddate, e.value.name)
+        for e in events.values()
+    }
+    return len(identities) < 2
+
+
+def get_events_for_submission(
+    database, startdate=None, enddate=None, pattern=None
+):
+    """Return {event identity: [event key, ...], ...} for selected events.
+
+    Events starting on or after startdate and ending on or before enddate,
+    ISO format dates, with names matching the fnmatch pattern ignoring
+    case are selected.  A submission file is created for each identity.
+
+    """
+    if pattern is not None:
+        pattern = pattern.lower()
+    if enddate is not None:
+        endselector = database.encode_record_selector(enddate)
+    identities = dict()
+    cursor = database.database_cursor(
+        filespec.EVENT_FILE_DEF, filespec.STARTDATE_FIELD_DEF
+    )
+    try:
+        if startdate is None:
+            r = cursor.first()
+        else:
+            r = cursor.nearest(database.encode_record_selector(startdate))
+        while r:
+            if (
+                enddate is not None
+                and database.encode_record_selector(r[0]) > endselector
+            ):
+                break
+            event = resultsrecord.get_event(database, r[-1])
+            r = cursor.next()
+            if event is None:
+                continue
+            v = event.value
+            if enddate is not None and v.enddate > enddate:
+                continue
+            if pattern is not None:
+                if not fnmatch.fnmatchcase(v.name.lower(), pattern):
+                    continue
+            identities.setdefault(v.get_event_identity(), []).append(
+                event.key.recno
+            )
+    finally:
+        cursor.close()
+    return identities
+
+
+def build_submission_for_events(database, eventkeys):
+    """Return (filename, lines, reports) for submission of eventkeys.
+
+    reports is ECFSubmission.get_error_reports() value.  filename and lines
+    are None if the events have no ECF event details or if there are errors
+    other than players without an ECF code.
+
+    """
+    events = dict()
+    for k in eventkeys:
+        events[k] = resultsrecord.get_event(database, k)
+    for event in events.values():
+        ecfeventrecord = get_ecf_event_for_event(database, event)
+        break
+    else:
+        ecfeventrecord = None
+    if ecfeventrecord is None:
+        return None, None, [("No ECF event details", [])]
+    submission = ECFSubmission(database, events)
+    submission.prefetch()
+    reports = submission.get_error_reports()
+    if (
+        submission.no_club_code
+        or submission.not_in_event
+        or submission.no_ecf_name
+    ):
+        return None, None, reports
+    subfilename, lines = submission.get_submission_lines(ecfeventrecord)
+    return subfilename, lines, reports
+
+
+def write_submission_file(filepath, lines):
+    """Write lines to ECF submission file at filepath."""
+    of = open(filepath, "wb")
+    try:
+        of.write(os.linesep.join(lines).encode("ascii"))
+    finally:
+        of.close()
+
+
+def increment_submission_index(database, ecfeventrecord):
+    """Increment submission index for ecfeventrecord if it has event code."""
+    newrecord = ecfeventrecord.clone()
+    if newrecord.value.eventcode:
+        newrecord.value.submission += 1
+    database.start_transaction()
+    ecfeventrecord.edit_record(
+        database,
+        filespec.ECFEVENT_FILE_DEF,
+        filespec.ECFEVENT_FIELD_DEF,
+        newrecord,
+    )
+    database.commit()
+
+
+def _get_games_for_events(database, events):
+    """Return [ResultsDBrecordGame(), ...] for events in event order.
+
+    The game record keys are found from the event index and the game
+    records are read in record key order.
+
+    """
+    keys = []
+    cursor = database.database_cursor(
+        filespec.GAME_FILE_DEF, filespec.GAMEEVENT_FIELD_DEF
+    )
+    try:
+        for event in events.values():
+            evkey = database.encode_record_number(event.key.recno)
+            r = cursor.nearest(evkey)
+            while r:
+                ge, gk = r
+                if database.encode_record_selector(ge) != evkey:
+                    break
+                keys.append(gk)
+                r = cursor.next()
+    finally:
+        cursor.close()
+    games = batchlookup.get_records(
+        database,
+        filespec.GAME_FILE_DEF,
+        keys,
+        resultsrecord.ResultsDBrecordGame,
+    )
+    return [games[k] for k in keys if games[k] is not None]
@@ -7,6 +7,7 @@
 
 from html.parser import HTMLParser
 import re
+import collections
 
 _whitespace_at_end_re = re.compile(r".*\s+\Z", flags=re.DOTALL)
 _whitespace_at_start_re = re.compile(r"\A\s+.*", flags=re.DOTALL)
@@ -43,6 +44,51 @@ _dd_mm_yyyy_re = re.compile(r"[0-9]{2}/[0-9]{2}/[0-9]{4}", flags=re.DOTALL)
 # These seem to be identified with tag 'tr' attribute _CLASS_ISSUE.
 _CLASS_ISSUE = ("class", "issue")
 
+# The start and end of the player lists, from the _feedback_player_list_re
+# and _submission_player_list_re patterns, for FeedbackRowsHTML.
+_feedback_player_list_start_re = re.compile(
+    r"\s+Submitted\s+Players\s+", flags=re.DOTALL
+)
+_feedback_player_list_end_re = re.compile(
+    r"\s+Submitted\s+Games\s+", flags=re.DOTALL
+)
+_submission_player_list_start_re = re.compile(
+    r"\s*#\s*PlayerList\s*", flags=re.DOTALL
+)
+_submission_player_list_end_re = re.compile(
+    r"".join(
+        (
+            r"\s*#\s*",
+            r"(?:SectionResults|OtherResults|MatchResults)",
+            r"\s*=\s*",
+        )
+    ),
+    flags=re.DOTALL,
+)
+
+# End tags which close a row of text for FeedbackRowsHTML.  The feedback
+# players are rows of a table, and the submission players are usually in one
+# 'pre' or 'textarea' element.
+_ROW_END_TAGS = frozenset(
+    ("tr", "table", "pre", "textarea", "p", "div", "li", "body", "html")
+)
+
+# Row types in FeedbackRowsHTML.rows.
+FEEDBACK_PLAYER = "feedback player"
+SUBMISSION_PLAYER = "submission player"
+
+
+def redact_dates(text):
+    """Return text with dates replaced by 'nnnn-nn-nn' or 'nn/nn/nnnn'."""
+    return _dd_mm_yyyy_re.sub(
+        "nn/nn/nnnn", _yyyy_mm_dd_re.sub("nnnn-nn-nn", text)
+    )
+
+
+def _join_text(pieces):
+    """Return pieces of text from rows separated by a space."""
+    return " ".join(p for p in (p.strip() for p in pieces) if p)
+
 
 class FeedbackHTML(HTMLParser):
 
@@ -88,9 +134,7 @@ class FeedbackHTML(HTMLParser):
             ):
                 fbds.append(" ")
             fbds.append(fbd[i])
-        self.feedbackstring = _dd_mm_yyyy_re.sub(
-            "nn/nn/nnnn", _yyyy_mm_dd_re.sub("nnnn-nn-nn", r"".join(fbds))
-        )
+        self.feedbackstring = redact_dates(r"".join(fbds))
 
     def find_player_lists(self):
         fbpl = _feedback_player_list_re.search(self.feedbackstring)
@@ -140,3 +184,242 @@ class FeedbackHTML(HTMLParser):
 
     def handle_unknown_decl(self, tag):
         pass
+
+
+class FeedbackRowsHTML(HTMLParser):
+
+    """Parse a feedback file noting player rows as each row closes.
+
+    FeedbackHTML keeps all the text in the feedback file and finds the
+    player lists after the whole file has been read.  FeedbackRowsHTML
+    keeps the text of the current row only: rows are examined when they
+    close and the players found are appended to rows, a deque of
+    (FEEDBACK_PLAYER, number, text) and (SUBMISSION_PLAYER, pin, text)
+    tuples, with dates redacted in text.
+
+    A player may continue into later rows, so a player is added to rows
+    when the next player in its list starts or the list ends.  Outside the
+    feedback player list each line of text is treated as a row, so the start
+    and end of the lists are expected on one line.
+
+    feedback_heading and submission_heading are the text in the lists before
+    the first player, like the first item of feedbackplayers and
+    submissionplayers in FeedbackHTML.
+
+    feedback_list_complete and submission_list_complete are set True when
+    the end of the relevant list is found.  The lists are not complete, as
+    in FeedbackHTML when find_player_lists does not find them, if these
+    are still False after close().
+
+    """
+
+    def __init__(self, *a, **k):
+        super().__init__(*a, **k)
+        self.rows = collections.deque()
+        self.submission_file_name = None
+        self.responsestring = None
+        self.issues_exist = False
+        self.feedback_heading = ""
+        self.submission_heading = ""
+        self.feedback_list_complete = False
+        self.submission_list_complete = False
+        self._ignore_data = 0
+        self._text = []
+        self._row_data = []
+        self._in_feedback_list = False
+        self._in_submission_list = False
+        self._feedback_player = None
+        self._submission_player = None
+
+    def get_rows(self):
+        """Return list of rows found since previous call and clear rows."""
+        rows = list(self.rows)
+        self.rows.clear()
+        return rows
+
+    def iter_rows(self, chunks):
+        """Feed chunks of feedback text, yielding rows as they are found.
+
+        close() is called after the last chunk.
+
+        """
+        for chunk in chunks:
+            self.feed(chunk)
+            yield from self.get_rows()
+        self.close()
+        yield from self.get_rows()
+
+    def iter_matched_players(self, chunks):
+        """Feed chunks, yielding (number, feedback, pin, submission) tuples.
+
+        The feedback players and submission players are matched in display
+        order, like the zip() of feedbacknumbers and submissionpins done for
+        FeedbackHTML.  Players are held until the other list reaches them, so
+        memory is proportional to the difference in progress through the
+        two lists.
+
+        """
+        feedback = collections.deque()
+        submission = collections.deque()
+        for kind, key, text in self.iter_rows(chunks):
+            if kind == FEEDBACK_PLAYER:
+                feedback.append((key, text))
+            else:
+                submission.append((key, text))
+            while feedback and submission:
+                yield feedback.popleft() + submission.popleft()
+
+    def close(self):
+        super().close()
+        self._end_row()
+
+    def handle_starttag(self, tag, attrs):
+        self._end_text()
+        if str(tag) == "tr" and _CLASS_ISSUE in attrs:
+            self.issues_exist = True
+        if tag.strip() in {"script", "style"}:
+            self._ignore_data += 1
+
+    def handle_endtag(self, tag):
+        self._end_text()
+        if tag.strip() in {"script", "style"}:
+            self._ignore_data -= 1
+        elif tag.strip() in _ROW_END_TAGS:
+            self._end_row()
+
+    def handle_startendtag(self, tag, attrs):
+        self._end_text()
+        super().handle_startendtag(tag, attrs)
+
+    def handle_data(self, tag):
+        # The text between two tags may arrive in pieces when the document
+        # is fed in chunks.  Outside the feedback player list, where the
+        # submission file may be one long 'pre' element, the text is examined
+        # a line at a time.
+        if self._ignore_data:
+            return
+        self._text.append(tag)
+        if not self._in_feedback_list and "\n" in tag:
+            lines = "".join(self._text).split("\n")
+            for line in lines[:-1]:
+                self._text = [line]
+                self._end_row()
+            self._text = lines[-1:]
+
+    def handle_entityref(self, tag):
+        pass
+
+    def handle_charref(self, tag):
+        pass
+
+    def handle_comment(self, tag):
+        pass
+
+    def handle_decl(self, tag):
+        pass
+
+    def handle_pi(self, tag):
+        pass
+
+    def handle_unknown_decl(self, tag):
+        pass
+
+    def _end_text(self):
+        """Add text since previous tag to row."""
+        ts = "".join(self._text).strip()
+        self._text = []
+        if ts:
+            self._row_data.append(ts)
+
+    def _end_row(self):
+        """Find players in text of closed row and start a new row."""
+        self._end_text()
+        if not self._row_data:
+            return
+        self._row_data.append("")
+        self._row_data.insert(0, "")
+        text = redact_dates(" ".join(self._row_data))
+        self._row_data = []
+        while text:
+            if self._in_feedback_list:
+                text = self._find_feedback_players(text)
+            elif self._in_submission_list:
+                text = self._find_submission_players(text)
+            else:
+                text = self._find_player_list_start(text)
+
+    def _find_player_list_start(self, text):
+        """Note start of first player list in text and return rest of text."""
+        starts = []
+        if not self.feedback_list_complete:
+            m = _feedback_player_list_start_re.search(text)
+            if m:
+                starts.append((m.start(), m, FEEDBACK_PLAYER))
+        if not self.submission_list_complete:
+            m = _submission_player_list_start_re.search(text)
+            if m:
+                starts.append((m.start(), m, SUBMISSION_PLAYER))
+        if not starts:
+            return ""
+        start, m, kind = min(starts, key=lambda s: s[0])
+        if kind == FEEDBACK_PLAYER:
+            self._in_feedback_list = True
+        else:
+            self._in_submission_list = True
+        return " " + text[m.end() :]
+
+    def _find_feedback_players(self, text):
+        """Add feedback players in text to rows and return rest of text."""
+        m = _feedback_player_list_end_re.search(text)
+        players = text if m is None else text[: m.start()]
+        pieces = _feedback_number_re.split(players)
+        if self._feedback_player is not None:
+            self._feedback_player[1].append(pieces[0])
+        else:
+            self.feedback_heading += pieces[0]
+        for number, player in zip(
+            _feedback_number_re.findall(players), pieces[1:]
+        ):
+            self._add_feedback_player()
+            self._feedback_player = [number.strip().rstrip("."), [player]]
+        if m is None:
+            return ""
+        self._add_feedback_player()
+        self.feedback_heading = self.feedback_heading.strip()
+        self._in_feedback_list = False
+        self.feedback_list_complete = True
+        return " " + text[m.end() :]
+
+    def _find_submission_players(self, text):
+        """Add submission players in text to rows and return rest of text."""
+        m = _submission_player_list_end_re.search(text)
+        players = text if m is None else text[: m.start()]
+        pieces = _submission_pin_re.split(players)
+        if self._submission_player is not None:
+            self._submission_player[1].append(pieces[0])
+        else:
+            self.submission_heading += pieces[0]
+        for pin, player in zip(
+            _submission_pin_re.findall(players), pieces[1:]
+        ):
+            self._add_submission_player()
+            self._submission_player = [pin.split("=")[1], [player]]
+        if m is None:
+            return ""
+        self._add_submission_player()
+        self.submission_heading = self.submission_heading.strip()
+        self._in_submission_list = False
+        self.submission_list_complete = True
+        return " " + text[m.end() :]
+
+    def _add_feedback_player(self):
+        if self._feedback_player is not None:
+            number, player = self._feedback_player
+            self.rows.append((FEEDBACK_PLAYER, number, _join_text(player)))
+            self._feedback_player = None
+
+    def _add_submission_player(self):
+        if self._submission_player is not None:
+            pin, player = self._submission_player
+            self.rows.append((SUBMISSION_PLAYER, pin, _join_text(player)))
+            self._submission_player = None
@@ -0,0 +1,634 @@
+# feedbackupdate.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Apply updates deduced from ECF feedback to a results database.
+
+The players, clubs, and PINs, mentioned in the feedback are collected first
+and looked up in batches sorted by key, one cursor per index, before any
+record is changed.  All the changes are made in one transaction.
+
+The updates done are returned as a list of report lines so the caller
+decides how to show them.
+
+"""
+
+from ast import literal_eval
+
+from .. import batchlookup
+from .. import constants
+from .. import filespec
+from .. import resultsrecord
+from . import ecfmaprecord
+from . import ecfrecord
+
+# Feedback file line prefixes and fragments, also the keys of the dicts of
+# player details extracted from a feedback file.
+subline = "Line "
+pinline = "New Player - Pin "
+newcodeline = "New code generated - "
+usecodeline = "Code to be used is "
+mergecodeline = ": Please note that the ECF Code supplied ("
+clubline = ": New Club supplied ("
+
+
+class FeedbackUpdate(object):
+    """Apply new grading codes, clubs, and merges, from ECF feedback."""
+
+    def __init__(self, database):
+        super(FeedbackUpdate, self).__init__()
+        self.database = database
+
+    def get_ecf_player_codes_not_on_database(self, codes):
+        """Return set of grading codes in codes not on ECF player list."""
+        found = batchlookup.get_unique_primary_keys(
+            self.database,
+            filespec.ECFPLAYER_FILE_DEF,
+            filespec.ECFPLAYERCODE_FIELD_DEF,
+            codes,
+        )
+        return {k for k, v in found.items() if v is None}
+
+    def get_ecf_club_codes_not_on_database(self, codes):
+        """Return set of club codes in codes not on ECF club list."""
+        found = batchlookup.get_unique_primary_keys(
+            self.database,
+            filespec.ECFCLUB_FILE_DEF,
+            filespec.ECFCLUBCODE_FIELD_DEF,
+            codes,
+        )
+        return {k for k, v in found.items() if v is None}
+
+    def apply_feedback(self, feedbackplayers):
+        """Apply feedback file updates and return list of report lines.
+
+        feedbackplayers is a list of dicts, one per player in the feedback
+        file, keyed by the subline, pinline, newcodeline, usecodeline,
+        mergecodeline, and clubline, prefixes and the #<field>=<value>
+        field names in each player's subline.
+
+        """
+        database = self.database
+        report = []
+        codes = set()
+        clubcodes = set()
+        newpins = set()
+        personpins = set()
+        playerpins = set()
+        for fbplayer in feedbackplayers:
+            if fbplayer[pinline]:
+                newpins.add(int(fbplayer[constants.PIN]))
+                codes.add(fbplayer[usecodeline] or fbplayer[newcodeline])
+                clubcodes.add(fbplayer[constants.CLUB_CODE])
+                playerpins.add(int(fbplayer[constants.PIN]))
+            else:
+                personpins.add(int(fbplayer[constants.PIN]))
+                codes.add(fbplayer[constants.BCF_CODE])
+                if fbplayer[clubline]:
+                    clubcodes.add(fbplayer[constants.CLUB_CODE])
+                    playerpins.add(int(fbplayer[constants.PIN]))
+        codes = {c for c in codes if c}
+        clubcodes = {c for c in clubcodes if c}
+        aliases = batchlookup.get_records(
+            database,
+            filespec.PLAYER_FILE_DEF,
+            sorted(newpins.union(personpins, playerpins)),
+            resultsrecord.ResultsDBrecordPlayer,
+        )
+        ecfplayers = batchlookup.get_unique_index_records(
+            database,
+            filespec.ECFPLAYER_FILE_DEF,
+            filespec.ECFPLAYERCODE_FIELD_DEF,
+            codes,
+            ecfrecord.ECFrefDBrecordECFplayer,
+        )
+        newclubs = self.get_ecf_club_codes_not_on_database(clubcodes)
+        newpersonkeys, newpersons = self._get_new_person_map(
+            {p: aliases[p] for p in newpins}
+        )
+        personkeys, persons = self._get_person_map(
+            {p: aliases[p] for p in personpins}
+        )
+        playerkeys, players = self._get_player_map(
+            {p: aliases[p] for p in playerpins}
+        )
+
+        def new_club():
+            record = ecfrecord.ECFrefDBrecordECFclub()
+            record.key.recno = None
+            record.value.ECFcode = fbplayer[constants.CLUB_CODE]
+            record.value.ECFname = fbplayer[constants.CLUB]
+            record.value.ECFactive = False
+            record.put_record(database, filespec.ECFCLUB_FILE_DEF)
+            newclubs.discard(fbplayer[constants.CLUB_CODE])
+            report.append(
+                "\t".join(
+                    (
+                        fbplayer[constants.CLUB_CODE],
+                        fbplayer[constants.CLUB],
+                        "added as feedback update to club list",
+                    )
+                )
+            )
+
+        def new_ecf_player(gcode):
+            record = ecfrecord.ECFrefDBrecordECFplayer()
+            record.key.recno = None
+            record.value.ECFcode = gcode
+            record.value.ECFname = fbplayer[constants.NAME]
+            record.value.ECFactive = False
+            if fbplayer[mergecodeline]:
+                record.value.ECFmerge = fbplayer[mergecodeline]
+            record.put_record(database, filespec.ECFPLAYER_FILE_DEF)
+            ecfplayers[gcode] = record
+            report.append(
+                "\t".join(
+                    (
+                        gcode,
+                        fbplayer[constants.NAME],
+                        "added as feedback update to master list",
+                    )
+                )
+            )
+
+        def update_ecf_player(ecfplayer):
+
+            # Unmerge not done by feedback merge line.
+            # Currently wait for full Masterlist, but does absence of merge
+            # line imply break merge if it does not exist?
+            if not fbplayer[mergecodeline]:
+                return False
+
+            if fbplayer[mergecodeline] == ecfplayer.value.ECFmerge:
+                return
+            if ecfplayer.value.ECFmerge:
+                repmerge = " ".join(
+                    ("replacing noted merge into", ecfplayer.value.ECFmerge)
+                )
+            else:
+                repmerge = ""
+            ecfplayerclone = ecfplayer.clone()
+            ecfplayerclone.value.ECFmerge = fbplayer[mergecodeline]
+            ecfplayerclone.value.ECFactive = not bool(fbplayer[mergecodeline])
+            ecfplayer.edit_record(
+                database,
+                filespec.ECFPLAYER_FILE_DEF,
+                filespec.ECFPLAYER_FIELD_DEF,
+                ecfplayerclone,
+            )
+            ecfplayers[fbplayer[constants.BCF_CODE]] = ecfplayerclone
+            report.append(
+                "\t".join(
+                    (
+                        fbplayer[constants.BCF_CODE],
+                        fbplayer[constants.NAME],
+                        "noted as merged into",
+                        fbplayer[mergecodeline],
+                        "in feedback update",
+                        repmerge,
+                    )
+                )
+            )
+            return True
+
+        def update_person(maprecords, key, gcode):
+            person = maprecords[key]
+            personclone = person.clone()
+            personclone.value.playerecfcode = None
+            personclone.value.playerecfname = None
+            personclone.value.playercode = gcode
+            person.edit_record(
+                database,
+                filespec.MAPECFPLAYER_FILE_DEF,
+                filespec.MAPECFPLAYER_FIELD_DEF,
+                personclone,
+            )
+            maprecords[key] = personclone
+            report.append(
+                "\t".join(
+                    (
+                        fbplayer[constants.PIN],
+                        fbplayer[constants.NAME],
+                        "associated with",
+                        gcode,
+                    )
+                )
+            )
+
+        def update_player_club():
+            key = playerkeys.get(int(fbplayer[constants.PIN]))
+            if key is None:
+                return
+            player = players[key]
+            if player is None or player.value.clubcode is not None:
+                return
+            playerclone = player.clone()
+            playerclone.value.clubecfname = None
+            playerclone.value.clubecfcode = None
+            playerclone.value.clubcode = fbplayer[constants.CLUB_CODE]
+            player.edit_record(
+                database,
+                filespec.MAPECFCLUB_FILE_DEF,
+                filespec.MAPECFCLUB_FIELD_DEF,
+                playerclone,
+            )
+            players[key] = playerclone
+            report.append(
+                "\t".join(
+                    (
+                        fbplayer[constants.PIN],
+                        fbplayer[constants.NAME],
+                        "associated with club",
+                        fbplayer[constants.CLUB_CODE],
+                        fbplayer[constants.CLUB],
+                        "on club list",
+                    )
+                )
+            )
+
+        database.start_transaction()
+        for fbplayer in feedbackplayers:
+            pin = int(fbplayer[constants.PIN])
+            if fbplayer[pinline]:
+                key = newpersonkeys.get(pin)
+                if key is not None and _is_new_person(newpersons[key]):
+                    ecfgcode = fbplayer[newcodeline]
+                    if fbplayer[usecodeline]:
+                        ecfgcode = fbplayer[usecodeline]
+                    if ecfgcode:
+                        if ecfplayers.get(ecfgcode) is None:
+                            new_ecf_player(ecfgcode)
+                        update_person(newpersons, key, ecfgcode)
+                if fbplayer[constants.CLUB_CODE] in newclubs:
+                    new_club()
+                update_player_club()
+            else:
+                ecfplayer = ecfplayers.get(fbplayer[constants.BCF_CODE])
+                if ecfplayer is None:
+                    callup = new_ecf_player(fbplayer[constants.BCF_CODE])
+                else:
+                    callup = update_ecf_player(ecfplayer)
+                key = personkeys.get(pin)
+                if key is not None and persons[key] is not None:
+                    if persons[key].value.playercode:
+                        if callup:
+                            update_person(
+                                persons, key, fbplayer[constants.BCF_CODE]
+                            )
+                if fbplayer[clubline]:
+                    if fbplayer[constants.CLUB_CODE] in newclubs:
+                        new_club()
+                    update_player_club()
+        database.commit()
+        return report
+
+    def apply_monthly_feedback(
+        self, updateplayers, updateclubs, newecfcodes, mergeecfcodes
+    ):
+        """Apply monthly feedback updates and return list of report lines.
+
+        updateplayers is a list of dicts with 'ECFCode' and 'Name' keys.
+        updateclubs is a list of dicts with 'ClubCode' and 'ClubName' keys.
+        newecfcodes is a list of (PIN, grading code) tuples.
+        mergeecfcodes is a list of (PIN, used code, merged code) tuples.
+
+        """
+        database = self.database
+        report = []
+        database.start_transaction()
+
+        if updateplayers:
+            newcodes = self.get_ecf_player_codes_not_on_database(
+                [up["ECFCode"] for up in updateplayers]
+            )
+            record = ecfrecord.ECFrefDBrecordECFplayer()
+            report.append("Add ECF codes and player names.")
+            report.append("")
+            for up in updateplayers:
+                if up["ECFCode"] not in newcodes:
+                    continue
+                newcodes.discard(up["ECFCode"])
+                record.key.recno = None
+                record.value.ECFcode = up["ECFCode"]
+                record.value.ECFname = up["Name"]
+                record.value.ECFactive = True
+                record.value.ECFclubcodes = []
+                record.put_record(database, filespec.ECFPLAYER_FILE_DEF)
+                report.append("  ".join(("Added", up["ECFCode"], up["Name"])))
+            report.append("")
+            self._set_player_codes_from_ecf_codes()
+
+        if updateclubs:
+            newcodes = self.get_ecf_club_codes_not_on_database(
+                [uc["ClubCode"] for uc in updateclubs]
+            )
+            ecfrec = ecfrecord.ECFrefDBrecordECFclub()
+            report.append("Add ECF codes and club names.")
+            report.append("")
+            for uc in updateclubs:
+                if uc["ClubCode"] not in newcodes:
+                    continue
+                newcodes.discard(uc["ClubCode"])
+                ecfrec.key.recno = None
+                ecfrec.value.ECFcode = uc["ClubCode"]
+                ecfrec.value.ECFactive = True
+                ecfrec.value.ECFname = uc["ClubName"]
+                ecfrec.value.ECFcountycode = ""
+                ecfrec.put_record(database, filespec.ECFCLUB_FILE_DEF)
+                report.append(
+                    "  ".join(("Added", uc["ClubCode"], uc["ClubName"]))
+                )
+            report.append("")
+            self._set_club_codes_from_ecf_codes()
+
+        if newecfcodes:
+            aliases = batchlookup.get_records(
+                database,
+                filespec.PLAYER_FILE_DEF,
+                sorted({int(spin) for spin, newcode in newecfcodes}),
+                resultsrecord.ResultsDBrecordPlayer,
+            )
+            keys, persons = self._get_new_person_map(aliases)
+            for spin, newcode in newecfcodes:
+                key = keys.get(int(spin))
+                if key is None or not _is_new_person(persons[key]):
+                    report.append(
+                        "".join(
+                            (
+                                newcode,
+                                " is not consistent with code provided ",
+                                "locally (try removing code for player in ",
+                                "'Grading Codes' tab)",
+                            )
+                        )
+                    )
+                    continue
+                person = persons[key]
+                personclone = person.clone()
+                personclone.value.playerecfcode = None
+                personclone.value.playerecfname = None
+                personclone.value.playercode = newcode
+                person.edit_record(
+                    database,
+                    filespec.MAPECFPLAYER_FILE_DEF,
+                    filespec.MAPECFPLAYER_FIELD_DEF,
+                    personclone,
+                )
+                persons[key] = personclone
+                report.append(
+                    "".join(
+                        (
+                            newcode,
+                            " added as feedback update to ECF player list",
+                        )
+                    )
+                )
+            report.append("")
+
+        if mergeecfcodes:
+            ecfplayers = batchlookup.get_unique_index_records(
+                database,
+                filespec.ECFPLAYER_FILE_DEF,
+                filespec.ECFPLAYERCODE_FIELD_DEF,
+                [usedcode for spin, usedcode, mergecode in mergeecfcodes],
+                ecfrecord.ECFrefDBrecordECFplayer,
+            )
+            for spin, usedcode, mergecode in mergeecfcodes:
+                ecfplayer = ecfplayers[usedcode]
+                if ecfplayer is None:
+                    continue
+                if mergecode == ecfplayer.value.ECFmerge:
+                    if not ecfplayer.value.ECFactive:
+                        continue
+                if ecfplayer.value.ECFmerge:
+                    repmerge = "  ".join(
+                        (
+                            " replacing noted merge into",
+                            ecfplayer.value.ECFmerge,
+                        )
+                    )
+                else:
+                    repmerge = ""
+                ecfplayerclone = ecfplayer.clone()
+                ecfplayerclone.value.ECFmerge = mergecode
+                ecfplayerclone.value.ECFactive = False
+                ecfplayer.edit_record(
+                    database,
+                    filespec.ECFPLAYER_FILE_DEF,
+                    filespec.ECFPLAYER_FIELD_DEF,
+                    ecfplayerclone,
+                )
+                ecfplayers[usedcode] = ecfplayerclone
+                report.append(
+                    "".join(
+                        (
+                            usedcode,
+                            "  noted as merged into  ",
+                            mergecode,
+                            "  in feedback update",
+                            repmerge,
+                        )
+                    )
+                )
+            report.append("")
+
+        database.commit()
+        return report
+
+    def _set_player_codes_from_ecf_codes(self):
+        """Set grading code of persons whose ECF code is on ECF player list.
+
+        Only records without a grading code are candidates and these are the
+        records on the PERSONMAP_FIELD_DEF index.
+
+        """
+        database = self.database
+        maprecords = batchlookup.get_records(
+            database,
+            filespec.MAPECFPLAYER_FILE_DEF,
+            batchlookup.get_record_keys_on_index(
+                database,
+                filespec.MAPECFPLAYER_FILE_DEF,
+                filespec.PERSONMAP_FIELD_DEF,
+            ),
+            ecfmaprecord.ECFmapDBrecordPlayer,
+        )
+
+        # Map records with values like (key, None) are ignored, see the
+        # copy_ecf_players_post_2020_rules function in ecfdataimport module.
+        candidates = [
+            mr
+            for mr in maprecords.values()
+            if mr is not None
+            and mr.value.__dict__
+            and mr.value.playercode is None
+            and mr.value.playerecfcode is not None
+        ]
+        codes = batchlookup.get_unique_primary_keys(
+            database,
+            filespec.ECFPLAYER_FILE_DEF,
+            filespec.ECFPLAYERCODE_FIELD_DEF,
+            [mr.value.playerecfcode for mr in candidates],
+        )
+        for mr in candidates:
+            if codes[mr.value.playerecfcode] is None:
+                continue
+            newmr = mr.clone()
+            newmr.value.playerecfcode = None
+            newmr.value.playercode = mr.value.playerecfcode
+            mr.edit_record(
+                database,
+                filespec.MAPECFPLAYER_FILE_DEF,
+                filespec.MAPECFPLAYER_FIELD_DEF,
+                newmr,
+            )
+
+    def _set_club_codes_from_ecf_codes(self):
+        """Set club code of players whose ECF club code is on ECF club list.
+
+        Only records without a club code are candidates and these are the
+        records on the PLAYERALIASMAP_FIELD_DEF index.
+
+        """
+        database = self.database
+        maprecords = batchlookup.get_records(
+            database,
+            filespec.MAPECFCLUB_FILE_DEF,
+            batchlookup.get_record_keys_on_index(
+                database,
+                filespec.MAPECFCLUB_FILE_DEF,
+                filespec.PLAYERALIASMAP_FIELD_DEF,
+            ),
+            ecfmaprecord.ECFmapDBrecordClub,
+        )
+        candidates = [
+            mr
+            for mr in maprecords.values()
+            if mr is not None
+            and mr.value.__dict__
+            and mr.value.clubcode is None
+            and mr.value.clubecfcode is not None
+        ]
+        codes = batchlookup.get_unique_primary_keys(
+            database,
+            filespec.ECFCLUB_FILE_DEF,
+            filespec.ECFCLUBCODE_FIELD_DEF,
+            [mr.value.clubecfcode for mr in candidates],
+        )
+        for mr in candidates:
+            if codes[mr.value.clubecfcode] is None:
+                continue
+            newmr = mr.clone()
+            newmr.value.clubecfcode = None
+            newmr.value.clubcode = mr.value.clubecfcode
+            mr.edit_record(
+                database,
+                filespec.MAPECFCLUB_FILE_DEF,
+                filespec.MAPECFCLUB_FIELD_DEF,
+                newmr,
+            )
+
+    def _get_map_records(self, file, field, selectors, recordclass):
+        """Return ({pin: map key, ...}, {map key: record, ...}).
+
+        selectors is {pin: encoded index key, ...} and pins whose index key
+        is not found are not in the returned dicts.
+
+        """
+        found = batchlookup.get_index_primary_keys(
+            self.database, file, field, set(selectors.values())
+        )
+        keys = {
+            p: found[s]
+            for p, s in selectors.items()
+            if found.get(s) is not None
+        }
+        return keys, batchlookup.get_records(
+            self.database, file, sorted(set(keys.values())), recordclass
+        )
+
+    def _get_new_person_map(self, aliases):
+        """Return map records for new players in aliases, {pin: alias, ...}.
+
+        Whether the map record can be updated with a grading code is decided
+        by _is_new_person when it is used.
+
+        """
+        encode = self.database.encode_record_number
+        return self._get_map_records(
+            filespec.MAPECFPLAYER_FILE_DEF,
+            filespec.PERSONMAP_FIELD_DEF,
+            {
+                p: literal_eval(encode(a.value.identity_packed()))
+                for p, a in aliases.items()
+                if a is not None
+            },
+            ecfmaprecord.ECFmapDBrecordPlayer,
+        )
+
+    def _get_person_map(self, aliases):
+        """Return map records for persons of players in aliases."""
+        database = self.database
+        merged = batchlookup.get_records(
+            database,
+            filespec.PLAYER_FILE_DEF,
+            sorted(
+                {
+                    a.value.merge
+                    for a in aliases.values()
+                    if a is not None
+                    and a.value.merge is not False
+                    and isinstance(a.value.merge, int)
+                }
+            ),
+            resultsrecord.ResultsDBrecordPlayer,
+        )
+        selectors = dict()
+        for p, a in aliases.items():
+            if a is None:
+                continue
+            if a.value.merge is False:
+                person = a
+            elif isinstance(a.value.merge, int):
+                person = merged[a.value.merge]
+            else:
+                person = None
+            if person is not None:
+                selectors[p] = database.encode_record_number(person.key.pack())
+        return self._get_map_records(
+            filespec.MAPECFPLAYER_FILE_DEF,
+            filespec.PERSONID_FIELD_DEF,
+            selectors,
+            ecfmaprecord.ECFmapDBrecordPlayer,
+        )
+
+    def _get_player_map(self, aliases):
+        """Return player to club map records for players in aliases."""
+        encode = self.database.encode_record_number
+        return self._get_map_records(
+            filespec.MAPECFCLUB_FILE_DEF,
+            filespec.PLAYERALIASID_FIELD_DEF,
+            {
+                p: encode(a.key.pack())
+                for p, a in aliases.items()
+                if a is not None
+            },
+            ecfmaprecord.ECFmapDBrecordClub,
+        )
+
+
+def _is_new_person(maprecord):
+    """Return True if maprecord can be given grading code from feedback.
+
+    False is returned if, for example, a grading code has been supplied by
+    editing from the Grading Codes tab.
+
+    """
+    if maprecord is None:
+        return False
+    value = maprecord.value
+    return (
+        value.playercode is None
+        and value.playerecfcode is None
+        and value.playerecfname is not None
+    )
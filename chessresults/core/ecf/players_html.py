@@ -7,6 +7,7 @@
 
 from html.parser import HTMLParser
 import re
+import collections
 
 _row_identifier_re = re.compile(r"^\d+\.$")
 _ecf_code_re = re.compile(r"^\d{6}[ABCDEFGHJKL]$")
@@ -35,6 +36,10 @@ class PlayersHTML(HTMLParser):
     consisting of six digits.  Often, if not always, the third data item is
     '99' if it is not a 'ECF membership number'.
 
+    Use iter_rows to get each complete row as an (ECF code, ECF membership
+    number) tuple when its last data item is seen.  Rows are not kept, so a
+    long response can be read in chunks.
+
     """
 
     def __init__(self, ecf_membership_number, *a, **k):
@@ -44,26 +49,61 @@ class PlayersHTML(HTMLParser):
         self._data_row = []
         self._ecf_membership_number_rows = []
         self._feed_method_called = False
+        self.rows = collections.deque()
+        self._keep_rows = False
+        self._text = []
 
     def feed(self, data):
         self._feed_method_called = True
         super().feed(data)
 
+    def iter_rows(self, chunks):
+        """Feed chunks of response text, yielding rows as they are found.
+
+        close() is called after the last chunk.
+
+        """
+        self._keep_rows = True
+        for chunk in chunks:
+            self.feed(chunk)
+            while self.rows:
+                yield self.rows.popleft()
+        self.close()
+        while self.rows:
+            yield self.rows.popleft()
+
+    def close(self):
+        super().close()
+        self._end_text()
+
     def handle_starttag(self, tag, attrs):
+        self._end_text()
         if tag.strip() in {"script", "style"}:
             self._ignore_data += 1
 
     def handle_endtag(self, tag):
+        self._end_text()
         if tag.strip() in {"script", "style"}:
             self._ignore_data -= 1
 
     def handle_startendtag(self, tag, attrs):
+        self._end_text()
         super().handle_startendtag(tag, attrs)
 
     def handle_data(self, tag):
+        # The text between two tags may arrive in pieces when the response
+        # is fed in chunks.
         if self._ignore_data:
             return
-        ts = tag.strip()
+        self._text.append(tag)
+
+    def _end_text(self):
+        """Process text since previous tag as one data item."""
+        if not self._text:
+            return
+        text = "".join(self._text)
+        self._text = []
+        ts = text.strip()
         if not ts:
             self._data_row = []
             return
@@ -85,6 +125,10 @@ class PlayersHTML(HTMLParser):
                 self._data_row = []
                 return
             self._data_row.append(match)
+            if self._keep_rows:
+                self.rows.append(
+                    (self._data_row[1].group(), self._data_row[2].group())
+                )
             if self._ecf_membership_number == match.group():
                 self._ecf_membership_number_rows.append(self._data_row)
             self._data_row = []
@@ -0,0 +1,188 @@
+# submissionbatch.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Create ECF results submission files for many events in one run.
+
+One submission file is created for each event identity, name start date
+and end date, selected by date range or name pattern.  The submissions are
+built in a pool of processes, each opening its own connection to the
+database and reading it in a read-only snapshot task.  The submission
+files are written, and the submission index of each ECF event updated, in
+the calling process after all submissions are built.
+
+"""
+
+import os
+import concurrent.futures
+
+from solentware_base.core.constants import SQLITE3_MODULE, APSW_MODULE
+
+from .. import opendatabase
+from .. import resultsrecord
+from . import ecfsubmission
+
+# Database engines which allow several processes to read a database at the
+# same time.  Submissions for other engines are built in the calling process.
+_CONCURRENT_READ_ENGINES = frozenset((SQLITE3_MODULE, APSW_MODULE))
+
+
+def build_submission_in_snapshot(database, eventkeys):
+    """Return build_submission_for_events value for eventkeys.
+
+    The submission is built by a do_snapshot_task task, so the database is
+    not changed, and for SQLite databases the events are read as they were
+    when the task started.
+
+    """
+    built = []
+
+    def build_submission(database, logwidget, eventkeys=None):
+        built.append(
+            ecfsubmission.build_submission_for_events(database, eventkeys)
+        )
+
+    database.do_snapshot_task(
+        build_submission, taskmethodargs=dict(eventkeys=eventkeys)
+    )
+    return built[0]
+
+
+def _build_submission(args):
+    """Return (identity, filename, lines, reports) for process pool workers."""
+    database_folder, enginename, identity, eventkeys = args
+    database = opendatabase.open_results_database(database_folder, enginename)
+    try:
+        return (identity,) + build_submission_in_snapshot(database, eventkeys)
+    finally:
+        database.close_database()
+
+
+class SubmissionBatch(object):
+    """Build and write ECF submission files for events in a results database.
+
+    Submissions are built in a pool of processes if processes is a number
+    greater than 1 and the database engine allows concurrent readers.
+
+    progress, if given, is called as progress(stage, done, total) after each
+    submission is built or written.
+
+    """
+
+    def __init__(self, database_folder, processes=None, progress=None):
+        super(SubmissionBatch, self).__init__()
+        self.database_folder = database_folder
+        self.enginename = opendatabase.get_database_engine(database_folder)
+        self.processes = processes
+        self.progress = progress
+        self.database = None
+
+    def open_database(self):
+        """Open the results database for selecting events and updating."""
+        self.database = opendatabase.open_results_database(
+            self.database_folder, self.enginename
+        )
+
+    def close_database(self):
+        """Close the results database."""
+        if self.database is not None:
+            self.database.close_database()
+            self.database = None
+
+    def get_events(self, startdate=None, enddate=None, pattern=None):
+        """Return {event identity: [event key, ...], ...} for selection."""
+        return ecfsubmission.get_events_for_submission(
+            self.database,
+            startdate=startdate,
+            enddate=enddate,
+            pattern=pattern,
+        )
+
+    def build_submissions(self, identities):
+        """Return [(identity, filename, lines, reports), ...] for identities.
+
+        identities is the get_events() value and results are in sorted order
+        of identity.
+
+        """
+        arguments = [
+            (self.database_folder, self.enginename, i, identities[i])
+            for i in sorted(identities)
+        ]
+        total = len(arguments)
+        results = []
+        if (
+            self.processes is None
+            or self.processes < 2
+            or total < 2
+            or self.enginename not in _CONCURRENT_READ_ENGINES
+        ):
+            for a in arguments:
+                results.append(
+                    (a[2],) + build_submission_in_snapshot(self.database, a[3])
+                )
+                self._report_progress("Build", len(results), total)
+            return results
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=min(self.processes, total)
+        ) as executor:
+            for r in executor.map(_build_submission, arguments):
+                results.append(r)
+                self._report_progress("Build", len(results), total)
+        return results
+
+    def write_submissions(
+        self, submissions, folder, allow_no_ecf_code=False, update=True
+    ):
+        """Write submission files and return [(identity, path, reports), ...].
+
+        path is None for submissions not written, and the list includes
+        files written with warnings.
+
+        Submissions with errors, or with players without an ECF code unless
+        allow_no_ecf_code is True, are not written.  Existing files are not
+        overwritten.  The ECF event submission index is incremented for each
+        file written if update is True.
+
+        """
+        problems = []
+        total = len(submissions)
+        for done, (identity, filename, lines, reports) in enumerate(
+            submissions
+        ):
+            self._report_progress("Write", done + 1, total)
+            if filename is None or (reports and not allow_no_ecf_code):
+                problems.append((identity, None, reports))
+                continue
+            filepath = os.path.join(folder, filename)
+            if os.path.exists(filepath):
+                problems.append(
+                    (
+                        identity,
+                        None,
+                        [("".join((filepath, " already exists")), [])],
+                    )
+                )
+                continue
+            ecfsubmission.write_submission_file(filepath, lines)
+            if reports:
+                problems.append((identity, filepath, reports))
+            if update:
+                ecfsubmission.increment_submission_index(
+                    self.database,
+                    ecfsubmission.get_ecf_event_for_event(
+                        self.database,
+                        self._get_event_for_identity(identity),
+                    ),
+                )
+        return problems
+
+    def _get_event_for_identity(self, identity):
+        for event in resultsrecord.get_events_matching_event_identity(
+            self.database, identity
+        ).values():
+            return event
+
+    def _report_progress(self, stage, done, total):
+        if self.progress is not None:
+            self.progress(stage, done, total)
@@ -0,0 +1,103 @@
+# httpstub.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Local HTTP server giving scripted replies for ECF download and upload tests.
+
+Replies are looked up by request path for GET requests, and by the base name
+of the uploaded file for POST requests.  Each key has a list of replies, used
+in turn, and the last reply is repeated.
+
+"""
+
+import os
+import re
+import threading
+import http.server
+
+_FILENAME = re.compile(rb'filename="([^"]*)"')
+
+
+class StubServer(object):
+    """HTTP server on localhost run in a thread while used as a context.
+
+    replies is {key: [reply, ...], ...} where reply is (status, headers,
+    body), headers a dict and body bytes, or a function which returns the
+    reply when called with the request headers.  requests is a list of
+    (method, key, headers) for requests received.
+
+    """
+
+    def __init__(self, replies=None):
+        super(StubServer, self).__init__()
+        self.replies = {} if replies is None else replies
+        self.requests = []
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        """Return URL of server."""
+        return "http://%s:%d" % self._server.server_address[:2]
+
+    def get_reply(self, method, key, headers):
+        """Note request and return reply for key."""
+        with self._lock:
+            self.requests.append((method, key, headers))
+            replies = self.replies.get(key)
+            if not replies:
+                return 404, {}, b"not found"
+            reply = replies.pop(0) if len(replies) > 1 else replies[0]
+        if callable(reply):
+            return reply(headers)
+        return reply
+
+    def count_requests(self, key):
+        """Return number of requests received for key."""
+        with self._lock:
+            return len([r for r in self.requests if r[1] == key])
+
+    def __enter__(self):
+        stub = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def _reply(self, key):
+                status, headers, body = stub.get_reply(
+                    self.command, key, dict(self.headers)
+                )
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                self._reply(self.path)
+
+            def do_POST(self):
+                data = self.rfile.read(int(self.headers["Content-Length"]))
+                match = _FILENAME.search(data)
+                self._reply(
+                    os.path.basename(match.group(1).decode())
+                    if match
+                    else self.path
+                )
+
+            def log_message(self, *args):
+                pass
+
+        self._server = http.server.ThreadingHTTPServer(
+            ("127.0.0.1", 0), Handler
+        )
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
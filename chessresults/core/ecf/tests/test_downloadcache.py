@@ -0,0 +1,228 @@
+# test_downloadcache.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""downloadcache tests against a local stub server."""
+
+import unittest
+import os
+import json
+import shutil
+import tempfile
+import threading
+import urllib.error
+
+from .. import downloadcache
+from .httpstub import StubServer
+
+_ETAG = '"v1"'
+_LAST_MODIFIED = "Wed, 01 Apr 2026 12:00:00 GMT"
+_PLAYERS = b'{"players": [1, 2]}'
+_CLUBS = b'{"clubs": [1]}'
+
+
+def _conditional(body, etag=_ETAG, last_modified=_LAST_MODIFIED):
+    """Return reply which is '304 Not Modified' if etag is sent back."""
+
+    def reply(headers):
+        if _lower(headers).get("if-none-match") == etag:
+            return 304, {}, b""
+        return 200, {"ETag": etag, "Last-Modified": last_modified}, body
+
+    return reply
+
+
+def _lower(headers):
+    return {k.lower(): v for k, v in headers.items()}
+
+
+class DownloadCache(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.cache = downloadcache.DownloadCache(
+            os.path.join(self.folder, "cache")
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_not_modified_uses_saved_body(self):
+        with StubServer({"/players": [_conditional(_PLAYERS)]}) as stub:
+            url = stub.url + "/players"
+            self.assertEqual(self.cache.fetch(url), (_PLAYERS, False))
+            self.assertEqual(self.cache.fetch(url), (_PLAYERS, True))
+            headers = _lower(stub.requests[-1][-1])
+        self.assertEqual(headers["if-none-match"], _ETAG)
+        self.assertEqual(headers["if-modified-since"], _LAST_MODIFIED)
+
+    def test_first_request_not_conditional(self):
+        with StubServer({"/players": [_conditional(_PLAYERS)]}) as stub:
+            self.cache.fetch(stub.url + "/players")
+            headers = _lower(stub.requests[0][-1])
+        self.assertNotIn("if-none-match", headers)
+        self.assertNotIn("if-modified-since", headers)
+
+    def test_modified_replaces_saved_body(self):
+        with StubServer(
+            {
+                "/players": [
+                    _conditional(_PLAYERS),
+                    _conditional(b"new list", etag='"v2"'),
+                ]
+            }
+        ) as stub:
+            url = stub.url + "/players"
+            self.cache.fetch(url)
+            self.assertEqual(self.cache.fetch(url), (b"new list", False))
+            self.assertEqual(self.cache.fetch(url), (b"new list", True))
+            self.assertEqual(
+                _lower(stub.requests[-1][-1])["if-none-match"], '"v2"'
+            )
+
+    def test_last_modified_only(self):
+        def reply(headers):
+            if _lower(headers).get("if-modified-since") == _LAST_MODIFIED:
+                return 304, {}, b""
+            return 200, {"Last-Modified": _LAST_MODIFIED}, _PLAYERS
+
+        with StubServer({"/players": [reply]}) as stub:
+            url = stub.url + "/players"
+            self.cache.fetch(url)
+            self.assertEqual(self.cache.fetch(url), (_PLAYERS, True))
+            self.assertNotIn("if-none-match", _lower(stub.requests[-1][-1]))
+
+    def test_response_without_validators_not_saved(self):
+        with StubServer({"/players": [(200, {}, _PLAYERS)]}) as stub:
+            url = stub.url + "/players"
+            self.assertEqual(self.cache.fetch(url), (_PLAYERS, False))
+            self.assertEqual(self.cache.fetch(url), (_PLAYERS, False))
+            self.assertNotIn("if-none-match", _lower(stub.requests[-1][-1]))
+        self.assertFalse(os.path.exists(self.cache.folder))
+
+    def test_not_modified_without_saved_body(self):
+        with StubServer({"/players": [(304, {}, b"")]}) as stub:
+            with self.assertRaises(urllib.error.HTTPError) as cm:
+                self.cache.fetch(stub.url + "/players")
+        self.assertEqual(cm.exception.code, 304)
+        cm.exception.close()
+
+    def test_error_not_hidden_by_saved_body(self):
+        with StubServer(
+            {"/players": [_conditional(_PLAYERS), (503, {}, b"busy")]}
+        ) as stub:
+            url = stub.url + "/players"
+            self.cache.fetch(url)
+            with self.assertRaises(urllib.error.HTTPError) as cm:
+                self.cache.fetch(url)
+        self.assertEqual(cm.exception.code, 503)
+        cm.exception.close()
+
+    def test_unreadable_saved_headers_ignored(self):
+        with StubServer({"/players": [_conditional(_PLAYERS)]}) as stub:
+            url = stub.url + "/players"
+            self.cache.fetch(url)
+            with open(self.cache._paths(url)[1], "w") as hf:
+                hf.write("not json")
+            self.assertEqual(self.cache.fetch(url), (_PLAYERS, False))
+            self.assertNotIn("if-none-match", _lower(stub.requests[-1][-1]))
+            self.assertEqual(self.cache.fetch(url), (_PLAYERS, True))
+
+    def test_saved_headers_for_other_url_ignored(self):
+        with StubServer({"/players": [_conditional(_PLAYERS)]}) as stub:
+            url = stub.url + "/players"
+            self.cache.fetch(url)
+            headerpath = self.cache._paths(url)[1]
+            with open(headerpath) as hf:
+                headers = json.load(hf)
+            headers["url"] = stub.url + "/clubs"
+            with open(headerpath, "w") as hf:
+                json.dump(headers, hf)
+            self.assertEqual(self.cache.fetch(url), (_PLAYERS, False))
+
+    def test_fetch_many(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def concurrent(body):
+            reply = _conditional(body)
+
+            def wait_for_other(headers):
+                barrier.wait()
+                return reply(headers)
+
+            return wait_for_other
+
+        with StubServer(
+            {
+                "/players": [concurrent(_PLAYERS), _conditional(_PLAYERS)],
+                "/clubs": [concurrent(_CLUBS), _conditional(_CLUBS)],
+            }
+        ) as stub:
+            urls = [stub.url + "/players", stub.url + "/clubs"]
+            self.assertEqual(
+                self.cache.fetch_many(urls),
+                {
+                    urls[0]: (_PLAYERS, False, None),
+                    urls[1]: (_CLUBS, False, None),
+                },
+            )
+            self.assertEqual(
+                self.cache.fetch_many(urls),
+                {
+                    urls[0]: (_PLAYERS, True, None),
+                    urls[1]: (_CLUBS, True, None),
+                },
+            )
+
+    def test_fetch_many_error_for_one_url(self):
+        with StubServer({"/players": [_conditional(_PLAYERS)]}) as stub:
+            urls = [stub.url + "/players", stub.url + "/clubs"]
+            results = self.cache.fetch_many(urls)
+        self.assertEqual(results[urls[0]], (_PLAYERS, False, None))
+        body, cached, error = results[urls[1]]
+        self.assertIsNone(body)
+        self.assertIsNone(cached)
+        self.assertEqual(error.code, 404)
+        error.close()
+
+    def test_fetch_many_no_urls(self):
+        self.assertEqual(self.cache.fetch_many([]), {})
+
+    def test_prefetch(self):
+        with StubServer({"/clubs": [_conditional(_CLUBS)]}) as stub:
+            url = stub.url + "/clubs"
+            thread = self.cache.prefetch([url])
+            thread.join(timeout=5)
+            self.assertFalse(thread.is_alive())
+            self.assertEqual(self.cache.fetch(url), (_CLUBS, True))
+
+    def test_prefetch_not_waited_for(self):
+        release = threading.Event()
+
+        def slow(headers):
+            release.wait(timeout=5)
+            return _conditional(_CLUBS)(headers)
+
+        with StubServer(
+            {"/players": [_conditional(_PLAYERS)], "/clubs": [slow]}
+        ) as stub:
+            thread = self.cache.prefetch([stub.url + "/clubs"])
+            try:
+                self.assertEqual(
+                    self.cache.fetch(stub.url + "/players"),
+                    (_PLAYERS, False),
+                )
+                self.assertTrue(thread.is_alive())
+            finally:
+                release.set()
+                thread.join(timeout=5)
+
+    def test_prefetch_errors_ignored(self):
+        with StubServer({}) as stub:
+            thread = self.cache.prefetch([stub.url + "/clubs"])
+            thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(os.path.exists(self.cache.folder))
+
+
+if __name__ == "__main__":
+    unittest.main()
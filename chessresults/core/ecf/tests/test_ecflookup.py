@@ -0,0 +1,190 @@
+# test_ecflookup.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""ecflookup tests against a local stub server."""
+
+import unittest
+import os
+import json
+import time
+import shutil
+import tempfile
+import threading
+
+from .. import ecflookup
+from .httpstub import StubServer
+
+
+def _player(code, name):
+    return (
+        200,
+        {"Content-Type": "application/json"},
+        json.dumps(dict(ECF_code=code, full_name=name)).encode(),
+    )
+
+
+class ECFLookup(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.cache = ecflookup.URLCache(os.path.join(self.folder, "cache"))
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_fetch(self):
+        with StubServer(
+            {
+                "/player/123456": [_player("123456A", "Smith, John")],
+                "/player/ME654321": [_player("234567B", "Jones, Ann")],
+            }
+        ) as stub:
+            urls = ecflookup.get_player_urls(
+                stub.url + "/player/", ["123456A"]
+            )
+            urls.update(
+                ecflookup.get_member_urls(stub.url + "/player/", ["654321"])
+            )
+            progress = []
+            results = ecflookup.ECFLookup().fetch(
+                urls, progress=lambda *p: progress.append(p[0])
+            )
+        self.assertEqual(
+            results,
+            {
+                "123456A": (
+                    dict(ECF_code="123456A", full_name="Smith, John"),
+                    None,
+                ),
+                "ME654321": (
+                    dict(ECF_code="234567B", full_name="Jones, Ann"),
+                    None,
+                ),
+            },
+        )
+        self.assertEqual(sorted(progress), ["123456A", "ME654321"])
+
+    def test_errors_reported_per_url(self):
+        with StubServer(
+            {
+                "/player/123456": [_player("123456A", "Smith, John")],
+                "/player/234567": [(200, {}, b"<html>not json</html>")],
+            }
+        ) as stub:
+            results = ecflookup.ECFLookup().fetch(
+                ecflookup.get_player_urls(
+                    stub.url + "/player/", ["123456A", "234567B", "345678C"]
+                )
+            )
+        self.assertIsNone(results["123456A"][1])
+        self.assertIsInstance(results["234567B"][1], ValueError)
+        self.assertIsNone(results["345678C"][0])
+        self.assertIn("404", str(results["345678C"][1]))
+
+    def test_requests_concurrent_up_to_workers(self):
+        lock = threading.Lock()
+        active = [0, 0]
+
+        def reply(headers):
+            with lock:
+                active[0] += 1
+                active[1] = max(active)
+            time.sleep(0.2)
+            with lock:
+                active[0] -= 1
+            return _player("123456A", "Smith, John")
+
+        codes = ["%d00000" % i for i in range(1, 9)]
+        with StubServer({"/player/" + c: [reply] for c in codes}) as stub:
+            urls = {c: stub.url + "/player/" + c for c in codes}
+            ecflookup.ECFLookup(workers=3).fetch(urls)
+        self.assertEqual(active[1], 3)
+
+    def test_cached_response_used(self):
+        with StubServer(
+            {"/player/123456": [_player("123456A", "Smith, John")]}
+        ) as stub:
+            urls = ecflookup.get_player_urls(
+                stub.url + "/player/", ["123456A"]
+            )
+            lookup = ecflookup.ECFLookup(cache=self.cache)
+            first = lookup.fetch(urls)
+            second = lookup.fetch(urls)
+            self.assertEqual(stub.count_requests("/player/123456"), 1)
+        self.assertEqual(first, second)
+
+    def test_failed_response_not_cached(self):
+        with StubServer(
+            {
+                "/player/123456": [
+                    (503, {}, b"busy"),
+                    _player("123456A", "Smith, John"),
+                ]
+            }
+        ) as stub:
+            urls = ecflookup.get_player_urls(
+                stub.url + "/player/", ["123456A"]
+            )
+            lookup = ecflookup.ECFLookup(cache=self.cache)
+            self.assertIsNotNone(lookup.fetch(urls)["123456A"][1])
+            self.assertIsNone(lookup.fetch(urls)["123456A"][1])
+            self.assertEqual(stub.count_requests("/player/123456"), 2)
+
+    def test_expired_response_fetched_again(self):
+        self.cache.expiry = 0
+        with StubServer(
+            {"/player/123456": [_player("123456A", "Smith, John")]}
+        ) as stub:
+            urls = ecflookup.get_player_urls(
+                stub.url + "/player/", ["123456A"]
+            )
+            lookup = ecflookup.ECFLookup(cache=self.cache)
+            lookup.fetch(urls)
+            time.sleep(0.01)
+            lookup.fetch(urls)
+            self.assertEqual(stub.count_requests("/player/123456"), 2)
+
+
+class URLCache(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.cache = ecflookup.URLCache(self.folder, expiry=100)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_put_and_get(self):
+        self.cache.put("http://a", "response a")
+        self.assertEqual(self.cache.get("http://a"), "response a")
+        self.assertIsNone(self.cache.get("http://b"))
+
+    def test_remove_expired(self):
+        self.cache.put("http://a", "response a")
+        self.cache.put("http://b", "response b")
+        old = time.time() - 1000
+        os.utime(self.cache._path("http://a"), (old, old))
+        self.cache.remove_expired()
+        self.assertEqual(
+            os.listdir(self.folder),
+            [os.path.basename(self.cache._path("http://b"))],
+        )
+
+    def test_remove_expired_without_folder(self):
+        ecflookup.URLCache(os.path.join(self.folder, "none")).remove_expired()
+
+
+class ReportedCodes(unittest.TestCase):
+    def test_is_ecf_code_valid(self):
+        self.assertTrue(ecflookup.is_ecf_code_valid("123456A"))
+        self.assertFalse(ecflookup.is_ecf_code_valid("123456E"))
+        self.assertFalse(ecflookup.is_ecf_code_valid("12345E"))
+
+    def test_split_reported_code(self):
+        self.assertEqual(
+            list(ecflookup.split_reported_code("123456E or ME 234567")),
+            [("123456E", None), (None, "234567")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
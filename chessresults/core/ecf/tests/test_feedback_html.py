@@ -0,0 +1,185 @@
+# test_feedback_html.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""feedback_html tests on feedback documents with players over several rows.
+
+The documents follow the layout of ECF feedback pages: a table of submitted
+players, where a player's match details are in rows after the row with the
+player's number, followed by the submission file in a 'pre' element.
+
+"""
+
+import unittest
+
+from .. import feedback_html
+
+_FEEDBACK = """<html>
+<head><title>Feedback</title>
+<style>td { padding: 2px; }</style>
+<script>var submitted = "1. Not a player";</script>
+</head>
+<body>
+<h2>Results Upload</h2>
+<p>Submission 1234 for event Example League received 2026-03-04.</p>
+<h3> Submitted Players </h3>
+<table>
+<tr><th>No.</th><th>Name</th><th>Club</th></tr>
+<tr><td>1.</td><td>Smith, John</td><td>Example Club</td></tr>
+<tr><td></td><td>Born 12/05/1980</td><td>Exact match 123456A</td></tr>
+<tr><td>2.</td><td>Jones, Ann</td><td>Example Club</td></tr>
+<tr><td></td><td>Matched to : 234567B</td><td></td></tr>
+<tr><td></td><td>Membership expires 2027-01-31</td><td></td></tr>
+<tr class="issue"><td>3.</td><td>Brown, Sam</td><td>Other Club</td></tr>
+<tr class="issue"><td></td><td>3 - Issue: ECFCode not submitted. Check</td>
+<td></td></tr>
+</table>
+<h3> Submitted Games </h3>
+<table>
+<tr><td>1.</td><td>Smith, John</td><td>1-0</td><td>Jones, Ann</td></tr>
+</table>
+<h3>Submission file</h3>
+<pre>
+#EVENT DETAILS
+#EVENT NAME=Example League
+# PlayerList
+#PIN=11\t#Name=Smith, John\t#ECFCode=123456A
+#PIN=12\t#Name=Jones, Ann
+\t#ClubName=Example Club
+#PIN=13\t#Name=Brown, Sam\t#DateOfBirth=1990-06-07
+# MatchResults=Example Club - Other Club
+#PIN1=11\t#PIN2=12\t#Score=1-0
+#FINISH
+</pre>
+<p>Contact the ECF office about problems with this submission.</p>
+</body>
+</html>
+"""
+
+_FEEDBACK_PLAYERS = [
+    (
+        feedback_html.FEEDBACK_PLAYER,
+        "1",
+        "Smith, John Example Club Born nn/nn/nnnn Exact match 123456A",
+    ),
+    (
+        feedback_html.FEEDBACK_PLAYER,
+        "2",
+        " ".join(
+            (
+                "Jones, Ann Example Club Matched to : 234567B",
+                "Membership expires nnnn-nn-nn",
+            )
+        ),
+    ),
+    (
+        feedback_html.FEEDBACK_PLAYER,
+        "3",
+        " ".join(
+            (
+                "Brown, Sam Other Club",
+                "3 - Issue: ECFCode not submitted. Check",
+            )
+        ),
+    ),
+]
+
+_SUBMISSION_PLAYERS = [
+    (
+        feedback_html.SUBMISSION_PLAYER,
+        "11",
+        "#Name=Smith, John\t#ECFCode=123456A",
+    ),
+    (
+        feedback_html.SUBMISSION_PLAYER,
+        "12",
+        "#Name=Jones, Ann #ClubName=Example Club",
+    ),
+    (
+        feedback_html.SUBMISSION_PLAYER,
+        "13",
+        "#Name=Brown, Sam\t#DateOfBirth=nnnn-nn-nn",
+    ),
+]
+
+
+def _chunks(text, size):
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+class FeedbackRowsHTML(unittest.TestCase):
+    def _rows(self, chunks):
+        parser = feedback_html.FeedbackRowsHTML()
+        rows = list(parser.iter_rows(chunks))
+        return parser, rows
+
+    def test_players_over_several_rows(self):
+        parser, rows = self._rows((_FEEDBACK,))
+        self.assertEqual(
+            [r for r in rows if r[0] == feedback_html.FEEDBACK_PLAYER],
+            _FEEDBACK_PLAYERS,
+        )
+        self.assertEqual(
+            [r for r in rows if r[0] == feedback_html.SUBMISSION_PLAYER],
+            _SUBMISSION_PLAYERS,
+        )
+        self.assertTrue(parser.feedback_list_complete)
+        self.assertTrue(parser.submission_list_complete)
+        self.assertTrue(parser.issues_exist)
+
+    def test_headings(self):
+        parser, rows = self._rows((_FEEDBACK,))
+        self.assertEqual(parser.feedback_heading, "No. Name Club")
+        self.assertEqual(parser.submission_heading, "")
+
+    def test_chunks_give_same_rows(self):
+        expected = self._rows((_FEEDBACK,))[1]
+        for size in (1, 7, 64):
+            self.assertEqual(
+                self._rows(_chunks(_FEEDBACK, size))[1], expected, size
+            )
+
+    def test_rows_yielded_before_document_ends(self):
+        parser = feedback_html.FeedbackRowsHTML()
+        rows = parser.iter_rows(_FEEDBACK.partition("<h3> Submitted Games"))
+        self.assertEqual([next(rows), next(rows)], _FEEDBACK_PLAYERS[:2])
+        self.assertFalse(parser.feedback_list_complete)
+        self.assertEqual(next(rows), _FEEDBACK_PLAYERS[2])
+        self.assertTrue(parser.feedback_list_complete)
+
+    def test_matched_players(self):
+        parser = feedback_html.FeedbackRowsHTML()
+        self.assertEqual(
+            list(parser.iter_matched_players(_chunks(_FEEDBACK, 50))),
+            [
+                f[1:] + s[1:]
+                for f, s in zip(_FEEDBACK_PLAYERS, _SUBMISSION_PLAYERS)
+            ],
+        )
+
+    def test_same_players_as_feedbackhtml(self):
+        fb = feedback_html.FeedbackHTML()
+        fb.feed(_FEEDBACK)
+        fb.insert_whitespace_and_redact_dates()
+        fb.find_player_lists()
+        rows = self._rows((_FEEDBACK,))[1]
+        self.assertEqual(
+            [n.strip().rstrip(".") for n in fb.feedbacknumbers],
+            [r[1] for r in rows if r[0] == feedback_html.FEEDBACK_PLAYER],
+        )
+        self.assertEqual(
+            [p.split("=")[1] for p in fb.submissionpins],
+            [r[1] for r in rows if r[0] == feedback_html.SUBMISSION_PLAYER],
+        )
+
+    def test_player_lists_incomplete(self):
+        parser, rows = self._rows(
+            (_FEEDBACK.partition("<h3> Submitted Games </h3>")[0],)
+        )
+        self.assertFalse(parser.feedback_list_complete)
+        self.assertFalse(parser.submission_list_complete)
+        self.assertEqual(rows, _FEEDBACK_PLAYERS[:2])
+
+
+if __name__ == "__main__":
+    unittest.main()
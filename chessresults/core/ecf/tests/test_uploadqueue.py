@@ -0,0 +1,160 @@
+# test_uploadqueue.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""uploadqueue tests against a local stub server."""
+
+import unittest
+import os
+import json
+import shutil
+import tempfile
+
+from .. import uploadqueue
+from .httpstub import StubServer
+
+_OK = (200, {}, b"accepted")
+_BUSY = (503, {}, b"busy")
+_FORBIDDEN = (403, {}, b"bad password")
+_BAD_REQUEST = (400, {}, b"bad file")
+
+
+@unittest.skipIf(uploadqueue.requests is None, "requests not installed")
+class UploadQueue(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.statefile = os.path.join(self.folder, "state.json")
+        self.files = []
+        for name in ("a.txt", "b.txt", "c.txt"):
+            filename = os.path.join(self.folder, name)
+            with open(filename, "w") as submission:
+                submission.write(name)
+            self.files.append(filename)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def _queue(self, stub, **kargs):
+        kargs.setdefault("backoff", 0.01)
+        return uploadqueue.UploadQueue(
+            stub.url + "/submit/", "user", "password", self.statefile, **kargs
+        )
+
+    def _saved_state(self):
+        with open(self.statefile) as sf:
+            return json.load(sf)
+
+    def test_upload(self):
+        with StubServer({"a.txt": [_OK], "b.txt": [_OK]}) as stub:
+            queue = self._queue(stub)
+            queue.add_files(self.files[:2])
+            responses = []
+            self.assertEqual(
+                queue.run(callback=lambda *r: responses.append(r[:3])), []
+            )
+        self.assertEqual(
+            sorted(responses),
+            [
+                (self.files[0], 200, "accepted"),
+                (self.files[1], 200, "accepted"),
+            ],
+        )
+        state = self._saved_state()
+        self.assertEqual(state[self.files[0]]["state"], uploadqueue.UPLOADED)
+        self.assertNotIn("password", json.dumps(state))
+
+    def test_retry_busy_server(self):
+        with StubServer({"a.txt": [_BUSY, _BUSY, _OK]}) as stub:
+            queue = self._queue(stub)
+            queue.add_files(self.files[:1])
+            self.assertEqual(queue.run(), [])
+            self.assertEqual(stub.count_requests("a.txt"), 3)
+        self.assertEqual(self._saved_state()[self.files[0]]["attempts"], 3)
+
+    def test_retries_exhausted(self):
+        with StubServer({"a.txt": [_BUSY]}) as stub:
+            queue = self._queue(stub, retries=2)
+            queue.add_files(self.files[:1])
+            self.assertEqual(queue.run(), self.files[:1])
+            self.assertEqual(stub.count_requests("a.txt"), 3)
+        state = self._saved_state()[self.files[0]]
+        self.assertEqual(state["state"], uploadqueue.FAILED)
+        self.assertEqual(state["status_code"], 503)
+
+    def test_rejected_files_not_uploaded(self):
+        with StubServer(
+            {"a.txt": [_FORBIDDEN], "b.txt": [_BAD_REQUEST]}
+        ) as stub:
+            queue = self._queue(stub)
+            queue.add_files(self.files[:2])
+            self.assertEqual(queue.run(), self.files[:2])
+            self.assertEqual(stub.count_requests("a.txt"), 1)
+            self.assertEqual(stub.count_requests("b.txt"), 1)
+        state = self._saved_state()
+        self.assertEqual(state[self.files[0]]["state"], uploadqueue.FAILED)
+        self.assertEqual(state[self.files[0]]["status_code"], 403)
+        self.assertEqual(state[self.files[1]]["state"], uploadqueue.FAILED)
+
+    def test_resume_sends_only_files_not_uploaded(self):
+        with StubServer({"a.txt": [_OK], "b.txt": [_FORBIDDEN, _OK]}) as stub:
+            queue = self._queue(stub)
+            queue.add_files(self.files[:2])
+            self.assertEqual(queue.run(), self.files[1:2])
+            queue = self._queue(stub)
+            queue.add_files(self.files[:2])
+            self.assertEqual(
+                queue.get_pending_files(filenames=self.files[:2]),
+                self.files[1:2],
+            )
+            self.assertEqual(queue.run(filenames=self.files[:2]), [])
+            self.assertEqual(stub.count_requests("a.txt"), 1)
+            self.assertEqual(stub.count_requests("b.txt"), 2)
+
+    def test_only_selected_files_sent(self):
+        with StubServer(
+            {"a.txt": [_FORBIDDEN], "b.txt": [_OK], "c.txt": [_OK]}
+        ) as stub:
+            queue = self._queue(stub)
+            queue.add_files(self.files[:1])
+            queue.run()
+            queue = self._queue(stub)
+            queue.add_files(self.files[1:])
+            self.assertEqual(
+                queue.get_pending_files(filenames=self.files[1:]),
+                self.files[1:],
+            )
+            self.assertEqual(queue.run(filenames=self.files[1:]), [])
+            self.assertEqual(stub.count_requests("a.txt"), 1)
+        self.assertEqual(
+            self._saved_state()[self.files[0]]["state"], uploadqueue.FAILED
+        )
+
+    def test_cancel(self):
+        with StubServer({"a.txt": [_OK]}) as stub:
+            queue = self._queue(stub)
+            queue.add_files(self.files[:1])
+            queue.cancel()
+            self.assertTrue(queue.is_cancelled())
+            self.assertEqual(queue.run(), self.files[:1])
+            self.assertEqual(stub.count_requests("a.txt"), 0)
+
+    def test_cancel_during_backoff(self):
+        with StubServer({"a.txt": [_BUSY]}) as stub:
+            queue = self._queue(stub, backoff=60)
+            queue.add_files(self.files[:1])
+            original_set_state = queue._set_state
+
+            def set_state(filename, **kargs):
+                original_set_state(filename, **kargs)
+                queue.cancel()
+
+            queue._set_state = set_state
+            self.assertEqual(queue.run(), self.files[:1])
+            self.assertEqual(stub.count_requests("a.txt"), 1)
+        self.assertEqual(
+            self._saved_state()[self.files[0]]["state"], uploadqueue.PENDING
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
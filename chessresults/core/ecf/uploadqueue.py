@@ -0,0 +1,246 @@
+# uploadqueue.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Upload several results submission files to the ECF.
+
+The files are sent by a small pool of threads sharing one requests.Session,
+so connections to the ECF server are reused.  Uploads which fail because
+the connection fails, or the server reports it is busy or broken, are tried
+again after a delay which doubles after each attempt.
+
+The state of each file in the queue is held in a json state file which is
+rewritten after each change.  A queue created with the same state file
+continues from where an interrupted run stopped: files already uploaded are
+not sent again.  Only files which got a 2xx reply are taken as uploaded; a
+file rejected by the server, for example with 400 or 403, is marked failed
+and is sent again only if it is selected again.
+
+The user name and password are not saved in the state file.
+
+"""
+
+import os
+import json
+import time
+import threading
+import concurrent.futures
+
+try:
+    import requests
+    import requests.adapters
+except ImportError:  # Not ModuleNotFoundError for Pythons earlier than 3.6
+    requests = None
+
+PENDING = "pending"
+UPLOADED = "uploaded"
+FAILED = "failed"
+
+# Status codes which suggest the upload may succeed if tried again later.
+_RETRY_STATUS = frozenset((429, 500, 502, 503, 504))
+
+
+class UploadQueueError(Exception):
+    pass
+
+
+class UploadQueue(object):
+    """Queue of results submission files to upload to url.
+
+    options is a dict of form fields, such as report_only, added to the
+    username and password fields on each upload.
+
+    At most workers uploads are in progress at once.  Each upload is tried
+    at most retries + 1 times, waiting backoff seconds before the first
+    retry.
+
+    """
+
+    def __init__(
+        self,
+        url,
+        username,
+        password,
+        statefile,
+        options=None,
+        workers=2,
+        retries=3,
+        backoff=2.0,
+        timeout=120,
+    ):
+        """Note upload details and load the state of an earlier run."""
+        super(UploadQueue, self).__init__()
+        if requests is None:
+            raise UploadQueueError(
+                "The Requests package is needed to upload several files"
+            )
+        self.url = url
+        self.username = username
+        self.password = password
+        self.statefile = statefile
+        self.options = {} if options is None else dict(options)
+        self.workers = max(1, workers)
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self.state = self._load_state()
+
+    def _load_state(self):
+        """Return state dict from statefile or empty dict if no statefile."""
+        if not os.path.exists(self.statefile):
+            return {}
+        with open(self.statefile, encoding="utf-8") as sf:
+            state = json.load(sf)
+        if not isinstance(state, dict):
+            raise UploadQueueError(
+                "".join((self.statefile, " is not an upload state file"))
+            )
+        return state
+
+    def _save_state(self):
+        """Write state to statefile, replacing the file in one step."""
+        temporary = self.statefile + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as sf:
+            json.dump(self.state, sf, indent=1, sort_keys=True)
+        os.replace(temporary, self.statefile)
+
+    def _set_state(self, filename, **kargs):
+        with self._lock:
+            self.state.setdefault(filename, {}).update(kargs)
+            self._save_state()
+
+    def add_files(self, filenames):
+        """Add filenames to queue unless already in queue."""
+        with self._lock:
+            for filename in filenames:
+                filename = os.path.abspath(filename)
+                if filename not in self.state:
+                    self.state[filename] = dict(state=PENDING, attempts=0)
+            self._save_state()
+
+    def get_pending_files(self, filenames=None):
+        """Return sorted list of files not yet uploaded.
+
+        Only files in filenames are included if filenames is given, so
+        files left in the state file by earlier runs are not sent unless
+        they are selected again.
+
+        """
+        if filenames is not None:
+            filenames = {os.path.abspath(f) for f in filenames}
+        with self._lock:
+            return sorted(
+                f
+                for f, s in self.state.items()
+                if s["state"] != UPLOADED
+                and (filenames is None or f in filenames)
+            )
+
+    def cancel(self):
+        """Stop starting uploads.  Uploads in progress are completed."""
+        self._cancel.set()
+
+    def is_cancelled(self):
+        """Return True if cancel() has been called."""
+        return self._cancel.is_set()
+
+    def run(self, filenames=None, callback=None):
+        """Upload pending files and return list of files not uploaded.
+
+        Only pending files in filenames are uploaded if filenames is given.
+
+        callback, if given, is called in the uploading thread as
+        callback(filename, status_code, text, error) when each file is
+        finished.  text is the response text, or None if error, the
+        exception which stopped the last attempt, is not None.
+
+        """
+        pending = self.get_pending_files(filenames=filenames)
+        if not pending:
+            return []
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=1, pool_maxsize=self.workers
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        try:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.workers
+            ) as executor:
+                futures = [
+                    executor.submit(self._upload, session, f, callback)
+                    for f in pending
+                ]
+                concurrent.futures.wait(futures)
+        finally:
+            session.close()
+        return self.get_pending_files(filenames=filenames)
+
+    def _upload(self, session, filename, callback):
+        """Upload filename, retrying if worthwhile, and note outcome."""
+        attempt = 0
+        while True:
+            if self._cancel.is_set():
+                return
+            attempt += 1
+            status_code = None
+            text = None
+            error = None
+            try:
+                status_code, text = self._post(session, filename)
+            except (OSError, requests.RequestException) as exc:
+                error = exc
+            retry = attempt <= self.retries and (
+                (
+                    error is not None
+                    and not isinstance(error, FileNotFoundError)
+                )
+                or status_code in _RETRY_STATUS
+            )
+            with self._lock:
+                attempts = self.state[filename].get("attempts", 0) + 1
+            if retry:
+                self._set_state(
+                    filename, attempts=attempts, error=_error_text(error)
+                )
+                if self._cancel.wait(self.backoff * 2 ** (attempt - 1)):
+                    return
+                continue
+            if error is None and 200 <= status_code < 300:
+                outcome = UPLOADED
+            else:
+                outcome = FAILED
+            self._set_state(
+                filename,
+                state=outcome,
+                attempts=attempts,
+                status_code=status_code,
+                error=_error_text(error),
+                finished=time.strftime("%Y-%m-%d %H:%M:%S"),
+                response=text,
+            )
+            if callback is not None:
+                callback(filename, status_code, text, error)
+            return
+
+    def _post(self, session, filename):
+        """Return (status_code, text) for upload of filename."""
+        postdata = {"username": self.username, "password": self.password}
+        postdata.update(self.options)
+        with open(filename, "rb") as of:
+            response = session.post(
+                self.url,
+                data=postdata,
+                files={"uploaded_file": (filename, of)},
+                timeout=self.timeout,
+            )
+        return response.status_code, response.text
+
+
+def _error_text(error):
+    if error is None:
+        return None
+    return "".join((type(error).__name__, ": ", str(error)))
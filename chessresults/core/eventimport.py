@@ -0,0 +1,412 @@
+# eventimport.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Import events from a file in results export format.
+
+The checks and updates are those used by the Import Events panel and the
+command line interface: the file is read and collated, player
+identifications are checked against the database, the database is updated,
+and a report enabling the Identify application to record identification
+decisions is saved.
+
+An import file containing identification decisions must be validated
+against the report file produced for the original import file.
+
+"""
+
+import os
+import bz2
+from time import ctime
+
+from . import importreports
+from . import importcollation
+from . import importcollationdb
+
+
+class EventImport(object):
+    """Import events in importfile to a database.
+
+    importtext is the content of importfile if it has been read already.
+
+    validation_report is the report file produced for the original import
+    file when importfile contains identification decisions.
+
+    importevent_report is the name of the report file saved after the
+    update.  A name generated from the current time, in the folder
+    containing importfile, is used if it is None.
+
+    progress is the taskexecutor.TaskProgress instance for the update.
+
+    failure is the reason the import was not done, if it was not done.
+
+    """
+
+    def __init__(
+        self,
+        importfile,
+        validation_report=None,
+        importevent_report=None,
+        progress=None,
+        importtext=None,
+    ):
+        super(EventImport, self).__init__()
+        self.importfile = importfile
+        self.validation_report = validation_report
+        self.importevent_report = importevent_report
+        self.progress = progress
+        self.importtext = importtext
+        self.importdata = None
+        self.failure = None
+        self.updated = False
+
+    def _fail(self, logwidget, message, explanation=None):
+        self.failure = message
+        if logwidget:
+            logwidget.append_text(message)
+            logwidget.append_text_only("")
+            if explanation:
+                logwidget.append_text_only(explanation)
+                logwidget.append_text_only("")
+        return False
+
+    def read_import_file(self, logwidget=None):
+        """Return True if events were extracted from import file."""
+        if self.importtext is None:
+            bz2file = bz2.open(self.importfile, "rt", encoding="utf8")
+            try:
+                self.importtext = bz2file.read().rstrip()
+            finally:
+                bz2file.close()
+        importdata = importreports.get_import_event_reports(
+            self.importtext.split("\n")
+        )
+        if importdata is None:
+            return self._fail(
+                logwidget, "Unable to extract events from import file."
+            )
+        ien = importdata.get_event_names()
+        if len(ien) == 0:
+            return self._fail(logwidget, "No events in input file.")
+        if logwidget:
+            if len(ien) == 1:
+                logwidget.append_text("Event to be imported:")
+            else:
+                logwidget.append_text("Events to be imported:")
+            for en in ien:
+                logwidget.append_text_only("  ".join((en[1], en[2], en[0])))
+            logwidget.append_text_only("")
+        self.importdata = importdata
+        return True
+
+    def is_players_identified(self, logwidget=None, action="Import Events"):
+        """Return True if all players in import file have been identified.
+
+        action names the abandoned action in the message if not.
+
+        """
+        if not len(self.importdata.get_new_players()):
+            return True
+        return self._fail(
+            logwidget,
+            "".join(
+                (
+                    action,
+                    " abandoned.  Identification decisions are missing ",
+                    "for some unmatched players.",
+                )
+            ),
+            explanation=" ".join(
+                (
+                    "Some exported players are not identified on the",
+                    "importing database.  Use the Identify application to",
+                    "decide the missing identifications.\n\nThe owner of",
+                    "the exporting database is probably able to do this",
+                    "best.",
+                )
+            ),
+        )
+
+    def is_import_validated(self, logwidget=None):
+        """Return True if import file can be applied to database.
+
+        An import file with identification decisions must be consistent
+        with the validation report.
+
+        """
+        importdata = self.importdata
+        if not importdata.remoteplayer:
+            return True
+        if not self.is_players_identified(logwidget=logwidget):
+            return False
+        if not self.validation_report:
+            return self._fail(
+                logwidget,
+                "Validation Report file not set.",
+                explanation="".join(
+                    (
+                        "The import file contains identification decisions ",
+                        "for all players in the events being imported.  ",
+                        "Before importing the events, this import file must ",
+                        "be validated against the report file produced for ",
+                        "the original import file.",
+                    )
+                ),
+            )
+        if logwidget:
+            logwidget.append_text(
+                "Validating import against report to which it is the response."
+            )
+            logwidget.append_text_only("")
+            logwidget.append_text_only("Import file:")
+            logwidget.append_text_only(self.importfile)
+            logwidget.append_text_only("Report file:")
+            logwidget.append_text_only(self.validation_report)
+            logwidget.append_text_only("")
+        if os.path.abspath(self.validation_report) == os.path.abspath(
+            self.importfile
+        ):
+            return self._fail(
+                logwidget, "Must not validate import file against itself."
+            )
+        bz2file = bz2.open(self.validation_report, "rt", encoding="utf8")
+        try:
+            originaldata = bz2file.read()
+        finally:
+            bz2file.close()
+        if originaldata == self.importtext:
+            return self._fail(
+                logwidget,
+                "".join(
+                    (
+                        "Must not validate import file against a file which ",
+                        "contains the data.",
+                    )
+                ),
+            )
+        request = importreports.get_import_event_reports(
+            originaldata.split("\n")
+        )
+        if not request:
+            return self._fail(
+                logwidget,
+                "The selected report file is not a valid report file.",
+            )
+        if not importdata.is_reply_consistent_with_request(request):
+            return self._fail(
+                logwidget,
+                "".join(
+                    (
+                        "Cannot proceed with import because the import file ",
+                        "is not consistent with the selected report file.  ",
+                        "Perhaps the wrong report file was selected.",
+                    )
+                ),
+            )
+        return True
+
+    def _get_collation_database(self, database, logwidget):
+        """Return (ImportCollationDB, empty) for import file and database.
+
+        empty is True if the database has no players.  Otherwise the player
+        identifications on the import file are checked against the database
+        and the ImportCollationDB is None if they are not consistent.
+
+        """
+        if logwidget:
+            logwidget.append_text(
+                "Preparing to check the import file against the database."
+            )
+            logwidget.append_text_only("")
+        collation = importcollation.ImportCollation(self.importdata)
+        collatedb = importcollationdb.ImportCollationDB(
+            collation, database, progress=self.progress
+        )
+        if collatedb.is_database_empty_of_players():
+            return collatedb, True
+        if logwidget:
+            logwidget.append_text(
+                "".join(
+                    (
+                        "Check that player identifications are consistent ",
+                        "between import file and database.",
+                    )
+                )
+            )
+        if len(collatedb.is_player_identification_inconsistent()):
+            return None, False
+        return collatedb, False
+
+    def check_events(self, database, logwidget=None):
+        """Collate import file and check it against database.
+
+        For do_database_task calls.  The database is not changed.
+
+        """
+        collatedb, empty = self._get_collation_database(database, logwidget)
+        if collatedb is None:
+            return self._fail(
+                logwidget,
+                "".join(
+                    (
+                        "The import would not be attempted because player ",
+                        "identifications on import are not consistent with ",
+                        "player records on database.",
+                    )
+                ),
+            )
+        if logwidget:
+            logwidget.append_text("The import would be attempted.")
+            if empty:
+                logwidget.append_text(
+                    "".join(
+                        (
+                            "The exporting database's identifications ",
+                            "would be accepted.",
+                        )
+                    )
+                )
+                logwidget.append_text_only(
+                    "(The database was empty at time of assessment.)"
+                )
+            logwidget.append_text_only("")
+        return True
+
+    def is_new_player_consistent(self, database, logwidget=None):
+        """Return True if new players in validated import fit database.
+
+        For do_database_task calls.  The database is not changed.
+
+        """
+        collation = importcollation.ImportCollation(self.importdata)
+        collatedb = importcollationdb.ImportCollationDB(
+            collation, database, progress=self.progress
+        )
+        if collatedb.is_database_empty_of_players():
+            return True
+        if not collatedb.is_new_player_inconsistent():
+            return True
+        return self._fail(
+            logwidget,
+            "".join(
+                (
+                    "Cannot proceed with import because new players are ",
+                    "not consistent with database.  Perhaps validation ",
+                    "done against wrong request.",
+                )
+            ),
+        )
+
+    def do_updates(self, database, logwidget=None):
+        """Collate import file and update database.
+
+        For do_database_task calls.  New players in an import file with
+        identification decisions are checked against the database first.
+        The update is backed out if player records block it, or it is
+        cancelled or fails.
+
+        """
+        if self.importdata.remoteplayer:
+            if not self.is_new_player_consistent(database, logwidget):
+                return False
+        collatedb, empty = self._get_collation_database(database, logwidget)
+        if collatedb is None:
+            return self._fail(
+                logwidget,
+                "".join(
+                    (
+                        "Cannot proceed with import because player ",
+                        "identifications on import are not consistent with ",
+                        "player records on database.",
+                    )
+                ),
+            )
+        database.start_transaction()
+        try:
+            if logwidget:
+                logwidget.append_text("Update database with imported results.")
+            message = collatedb.update_results()
+            if not message:
+                if not empty:
+                    if logwidget:
+                        logwidget.append_text(
+                            "Merge exported database players."
+                        )
+                    collatedb.merge_players()
+                else:
+                    if logwidget:
+                        logwidget.append_text(
+                            "Accept exporting database identifications."
+                        )
+                        logwidget.append_text_only(
+                            "".join(
+                                (
+                                    "(The database was empty before ",
+                                    "importing these events)",
+                                )
+                            )
+                        )
+                    collatedb.identify_players()
+        except BaseException:
+            database.backout()
+            raise
+        if message:
+            database.backout()
+            return self._fail(logwidget, "\n".join(message))
+        if logwidget:
+            logwidget.append_text("Commit updates.")
+        database.commit()
+        self.updated = True
+        if logwidget:
+            logwidget.append_text("Database update completed.")
+            logwidget.append_text_only("")
+        reportdata = self.importtext.split("\n")
+        reportdata.extend(collatedb.export_players_on_database())
+        self.write_report(reportdata, logwidget=logwidget)
+        return True
+
+    def write_report(self, reportdata, logwidget=None):
+        """Save reportdata as the Import Events report."""
+        if not self.importevent_report:
+            self.importevent_report = os.path.join(
+                os.path.dirname(self.importfile),
+                "".join("".join(ctime().split()).split(":")),
+            )
+            if logwidget:
+                logwidget.append_text(
+                    "Validation report file name not available."
+                )
+                logwidget.append_text_only(
+                    "".join(
+                        (
+                            "A name generated from the current (system) ",
+                            "time will be used.",
+                        )
+                    )
+                )
+                logwidget.append_text_only("")
+        if logwidget:
+            logwidget.append_text("Saving Import Events report.")
+            logwidget.append_text_only("")
+        outputfile = bz2.open(
+            self.importevent_report, mode="wt", encoding="utf8"
+        )
+        try:
+            outputfile.write("\n".join(reportdata))
+        finally:
+            outputfile.close()
+        if logwidget:
+            logwidget.append_text("Import Events report saved in")
+            logwidget.append_text_only(self.importevent_report)
+            logwidget.append_text_only("")
+            logwidget.append_text_only(
+                "".join(
+                    (
+                        "The Import Events Report enables use of the ",
+                        "Identify application to record decisions ",
+                        "identifying players on the exporting database as ",
+                        "players on the importing database.",
+                    )
+                )
+            )
+            logwidget.append_text_only("")
@@ -32,10 +32,10 @@ class ImportCollationDB(collationdb.CollationDB):
 
     """Update results database from games in a CollationEvents instance."""
 
-    def __init__(self, collation, database):
+    def __init__(self, collation, database, progress=None):
         """ """
 
-        super().__init__(collation.games, database)
+        super().__init__(collation.games, database, progress=progress)
 
         self.collation = collation
         self.dbplayer = set()
@@ -0,0 +1,471 @@
+# integrity.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Check, and optionally repair, the links between records in a database.
+
+These are checked:
+
+The reference_count of each name record is the number of references to the
+name from event, player, and game records.
+The name, event, and player records referred to by other records exist.
+Each player merged with another is in the alias list of that player, and
+each player in an alias list is merged with the player owning the list.
+The player records referred to by ECF map records exist and the identity
+on each map record is the identity of the player.
+
+The event, name, player, and game files are scanned in shards, ranges of
+record numbers, which are done in parallel by separate processes for
+database engines which allow several processes to read a database at once.
+
+"""
+
+import concurrent.futures
+import collections
+import os
+
+from solentware_base.core.constants import SQLITE3_MODULE, APSW_MODULE
+
+from . import filespec
+from . import resultsrecord
+from .ecf import ecfmaprecord
+from .ogd import ecfgcodemaprecord
+from .opendatabase import open_results_database
+
+# Database engines which allow several processes to read a database at once.
+PARALLEL_ENGINES = frozenset((SQLITE3_MODULE, APSW_MODULE))
+
+# Each worker process is given this many shards of each file on average.
+SHARDS_PER_WORKER = 4
+
+# Record classes for files scanned in shards.
+SCANNED_FILES = (
+    (filespec.NAME_FILE_DEF, resultsrecord.ResultsDBrecordName),
+    (filespec.EVENT_FILE_DEF, resultsrecord.ResultsDBrecordEvent),
+    (filespec.PLAYER_FILE_DEF, resultsrecord.ResultsDBrecordPlayer),
+    (filespec.GAME_FILE_DEF, resultsrecord.ResultsDBrecordGame),
+)
+
+# Record classes, and field for edit_record, for ECF map files.
+MAP_FILES = (
+    (
+        filespec.MAPECFPLAYER_FILE_DEF,
+        ecfmaprecord.ECFmapDBrecordPlayer,
+        filespec.MAPECFPLAYER_FIELD_DEF,
+    ),
+    (
+        filespec.MAPECFCLUB_FILE_DEF,
+        ecfmaprecord.ECFmapDBrecordClub,
+        filespec.MAPECFCLUB_FIELD_DEF,
+    ),
+    (
+        filespec.MAPECFOGDPLAYER_FILE_DEF,
+        ecfgcodemaprecord.ECFmapOGDrecordPlayer,
+        filespec.MAPECFOGDPLAYER_FIELD_DEF,
+    ),
+)
+
+
+def is_merged(merge):
+    """Return True if merge, a player's merge value, is a player key."""
+    return merge is not None and not isinstance(merge, bool)
+
+
+def get_key_range(database, file):
+    """Return (low, high) record numbers in file, or None if file is empty."""
+    cursor = database.database_cursor(file, file)
+    try:
+        first = cursor.first()
+        if first is None:
+            return None
+        return (first[0], cursor.last()[0])
+    finally:
+        cursor.close()
+
+
+def split_key_range(keyrange, shards):
+    """Return list of (low, high) ranges, high excluded, covering keyrange."""
+    low, high = keyrange
+    step = max(1, (high - low + shards) // shards)
+    return [(k, min(k + step, high + 1)) for k in range(low, high + 1, step)]
+
+
+def scan_shard(database, file, low, high):
+    """Return summary of records in file with low <= record number < high.
+
+    The summary is a dict with the items relevant to file:
+
+    keys: list of record numbers.
+    counts: {name key: reference_count, ...} for names.
+    names: {name key: references, ...} made by the records.
+    events: {event key: references, ...} made by the records.
+    players: {player key: references, ...} made by games.
+    links: {player key: (merge, alias), ...} for players.
+
+    """
+    record = dict(SCANNED_FILES)[file]()
+    value = record.value
+    keys = []
+    counts = {}
+    names = collections.Counter()
+    events = collections.Counter()
+    players = collections.Counter()
+    links = {}
+    cursor = database.database_cursor(file, file)
+    try:
+        r = cursor.nearest(low)
+        while r and r[0] < high:
+            record.load_record(r)
+            key = record.key.recno
+            keys.append(key)
+            if file == filespec.NAME_FILE_DEF:
+                counts[key] = value.reference_count
+            elif file == filespec.EVENT_FILE_DEF:
+                names.update(value.sections)
+            elif file == filespec.PLAYER_FILE_DEF:
+                events[value.event] += 1
+                for name in (value.section, value.affiliation):
+                    if name is not None:
+                        names[name] += 1
+                links[key] = (value.merge, value.alias)
+            elif file == filespec.GAME_FILE_DEF:
+                events[value.event] += 1
+                players.update((value.homeplayer, value.awayplayer))
+                for name in (value.section, value.hometeam, value.awayteam):
+                    if name is not None:
+                        names[name] += 1
+            r = cursor.next()
+    finally:
+        cursor.close()
+    return dict(
+        keys=keys,
+        counts=counts,
+        names=names,
+        events=events,
+        players=players,
+        links=links,
+    )
+
+
+def _scan_shard_in_process(database_folder, enginename, file, low, high):
+    """Open database in a worker process and return scan_shard summary."""
+    database = open_results_database(database_folder, enginename=enginename)
+    try:
+        return scan_shard(database, file, low, high)
+    finally:
+        database.close_database()
+
+
+class IntegrityCheck(object):
+    """Check the links between records in database.
+
+    enginename is needed to scan shards in parallel: the worker processes
+    open their own connection to the database.
+
+    problems is a list of (file, key, description) tuples, and the repairs
+    which can be done for them are collected by the check methods.
+
+    """
+
+    def __init__(self, database, enginename=None, progress=None):
+        super(IntegrityCheck, self).__init__()
+        self.database = database
+        self.enginename = enginename
+        self.progress = progress
+        self.keys = {file: set() for file, recordclass in SCANNED_FILES}
+        self.counts = {}
+        self.names = collections.Counter()
+        self.events = collections.Counter()
+        self.players = collections.Counter()
+        self.links = {}
+        self.mapped_players = set()
+        self.problems = []
+        self.name_repairs = {}
+        self.player_repairs = {}
+        self.map_repairs = []
+
+    def _problem(self, file, key, description):
+        self.problems.append((file, key, description))
+
+    def scan(self, workers=None):
+        """Scan event, name, player, and game files in shards.
+
+        workers is the number of processes used, default the number of
+        processors, if the database engine allows parallel scans.
+
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        parallel = workers > 1 and self.enginename in PARALLEL_ENGINES
+        shards = workers * SHARDS_PER_WORKER if parallel else 1
+        tasks = []
+        for file, recordclass in SCANNED_FILES:
+            keyrange = get_key_range(self.database, file)
+            if keyrange is not None:
+                for low, high in split_key_range(keyrange, shards):
+                    tasks.append((file, low, high))
+        if self.progress is not None:
+            self.progress.start(total=len(tasks), stage="Scanning records.")
+        if parallel:
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        _scan_shard_in_process,
+                        self.database.home_directory,
+                        self.enginename,
+                        *task
+                    )
+                    for task in tasks
+                ]
+                for task, future in zip(tasks, futures):
+                    self._merge_shard(task[0], future.result())
+        else:
+            for task in tasks:
+                self._merge_shard(task[0], scan_shard(self.database, *task))
+
+    def _merge_shard(self, file, summary):
+        self.keys[file].update(summary["keys"])
+        self.counts.update(summary["counts"])
+        self.names.update(summary["names"])
+        self.events.update(summary["events"])
+        self.players.update(summary["players"])
+        self.links.update(summary["links"])
+        if self.progress is not None:
+            self.progress.advance()
+
+    def check_references(self):
+        """Check referenced name, event, and player records exist."""
+        for file, referenced in (
+            (filespec.NAME_FILE_DEF, self.names),
+            (filespec.EVENT_FILE_DEF, self.events),
+            (filespec.PLAYER_FILE_DEF, self.players),
+        ):
+            for key in sorted(set(referenced) - self.keys[file]):
+                self._problem(file, key, "referenced but does not exist")
+
+    def check_name_counts(self):
+        """Check reference counts on name records.
+
+        The repair deletes names with no references.
+
+        """
+        for key, count in sorted(self.counts.items()):
+            expected = self.names.get(key, 0)
+            if count != expected:
+                self._problem(
+                    filespec.NAME_FILE_DEF,
+                    key,
+                    "".join(
+                        (
+                            "reference count is ",
+                            str(count),
+                            " but should be ",
+                            str(expected),
+                        )
+                    ),
+                )
+                self.name_repairs[key] = expected
+
+    def _amend_player(self, key):
+        if key not in self.player_repairs:
+            merge, alias = self.links[key]
+            if isinstance(alias, list):
+                alias = list(alias)
+            self.player_repairs[key] = [merge, alias]
+        return self.player_repairs[key]
+
+    def check_player_links(self):
+        """Check merge and alias values of players agree.
+
+        The merge value of a player merged with another player is taken as
+        correct.  The repair adds the player to the alias list of the player
+        merged with, or makes the player unidentified if that player does
+        not exist.  Players merged with players which are merged with
+        another player are reported but not repaired.
+
+        """
+        links = self.links
+        player_file = filespec.PLAYER_FILE_DEF
+        for key, (merge, alias) in sorted(links.items()):
+            if is_merged(merge):
+                if merge not in links:
+                    self._problem(
+                        player_file,
+                        key,
+                        "merged with player which does not exist",
+                    )
+                    amend = self._amend_player(key)
+                    amend[:] = [None, []]
+                    continue
+                main_merge, main_alias = links[merge]
+                if is_merged(main_merge):
+                    self._problem(
+                        player_file,
+                        key,
+                        "merged with player merged with another player",
+                    )
+                    continue
+                if not isinstance(main_alias, list) or key not in main_alias:
+                    self._problem(
+                        player_file,
+                        key,
+                        "not in alias list of player merged with",
+                    )
+                    amend = self._amend_player(merge)
+                    if not isinstance(amend[1], list):
+                        amend[1] = []
+                    amend[1].append(key)
+                if alias is not main_merge:
+                    self._problem(
+                        player_file,
+                        key,
+                        "alias value does not match merge value of player",
+                    )
+                    self._amend_player(key)[1] = main_merge
+            elif isinstance(alias, list):
+                for a in alias:
+                    if a == key:
+                        description = "own alias list contains player"
+                    elif a not in links:
+                        description = "alias list contains missing player"
+                    elif not is_merged(links[a][0]) or links[a][0] != key:
+                        description = "alias list contains player not merged"
+                    else:
+                        continue
+                    self._problem(player_file, key, description)
+                    self._amend_player(key)[1].remove(a)
+
+    def check_map_records(self):
+        """Check player references on ECF map records.
+
+        The repair deletes map records for players which do not exist and
+        corrects identities which do not match the player.
+
+        """
+        database = self.database
+        identities = {}
+        for file, recordclass, field in MAP_FILES:
+            if file not in database.specification:
+                continue
+            cursor = database.database_cursor(file, file)
+            try:
+                r = cursor.first()
+                while r:
+                    record = recordclass()
+                    record.load_record(r)
+                    key = record.key.recno
+                    value = record.value
+                    r = cursor.next()
+                    if not value.__dict__:
+                        self._problem(file, key, "map record has no value")
+                        value.empty()
+                        self.map_repairs.append((file, field, record, None))
+                        continue
+                    try:
+                        playerkey = int(value.playerkey)
+                    except (TypeError, ValueError):
+                        playerkey = None
+                    if playerkey not in self.links:
+                        self._problem(
+                            file, key, "map record player does not exist"
+                        )
+                        self.map_repairs.append((file, field, record, None))
+                        continue
+                    self.mapped_players.add(playerkey)
+                    if not hasattr(value, "playername"):
+                        continue
+                    if playerkey not in identities:
+                        identities[playerkey] = resultsrecord.get_alias(
+                            database, playerkey
+                        ).value.identity_packed()
+                    if value.playername != identities[playerkey]:
+                        self._problem(
+                            file, key, "map record player identity is wrong"
+                        )
+                        amended = record.clone()
+                        amended.value.playername = identities[playerkey]
+                        self.map_repairs.append((file, field, record, amended))
+            finally:
+                cursor.close()
+
+    def run(self, workers=None):
+        """Do all checks and return list of problems found."""
+        self.scan(workers=workers)
+        self.check_references()
+        self.check_name_counts()
+        self.check_player_links()
+        self.check_map_records()
+        return self.problems
+
+    def is_repair_needed(self):
+        """Return True if any problems found can be repaired."""
+        return bool(
+            self.name_repairs or self.player_repairs or self.map_repairs
+        )
+
+    def repair(self):
+        """Apply repairs for problems found in one transaction.
+
+        Return number of records changed or deleted.
+
+        """
+        database = self.database
+        database.start_transaction()
+        try:
+            changed = self.apply_repairs()
+        except:
+            database.backout()
+            raise
+        database.commit()
+        return changed
+
+    def apply_repairs(self):
+        """Apply repairs within a transaction and return records changed."""
+        database = self.database
+        changed = 0
+        for key, count in sorted(self.name_repairs.items()):
+            name = resultsrecord.get_name_from_record_value(
+                database.get_primary_record(filespec.NAME_FILE_DEF, key)
+            )
+            if count:
+                amended = name.clone()
+                amended.value.reference_count = count
+                name.edit_record(
+                    database,
+                    filespec.NAME_FILE_DEF,
+                    filespec.NAME_FIELD_DEF,
+                    amended,
+                )
+            else:
+                name.delete_record(database, filespec.NAME_FILE_DEF)
+            changed += 1
+        for key, (merge, alias) in sorted(self.player_repairs.items()):
+            player = resultsrecord.get_alias(database, key)
+            amended = player.clone()
+            amended.value.merge = merge
+            amended.value.alias = alias
+            player.edit_record(
+                database,
+                filespec.PLAYER_FILE_DEF,
+                filespec.PLAYER_FIELD_DEF,
+                amended,
+            )
+            changed += 1
+        for file, field, record, amended in self.map_repairs:
+            if amended is None:
+                record.delete_record(database, file)
+            else:
+                record.edit_record(database, file, field, amended)
+            changed += 1
+        return changed
+
+    def get_report(self):
+        """Return list of lines describing problems found."""
+        if not self.problems:
+            return ["No problems found."]
+        return [
+            "".join((file, " ", str(key), ": ", description))
+            for file, key, description in self.problems
+        ]
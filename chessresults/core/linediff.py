@@ -0,0 +1,290 @@
+# linediff.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Line differences for take-on data difference files.
+
+The difference files are in the format produced by difflib.ndiff and read
+by difflib.restore.  Lines are mapped to integers, one per distinct line,
+and compared with a patience diff which falls back to a Myers diff where no
+line is unique to both sides of a region.  Time is roughly proportional to
+the number of lines plus the square of the number of changed lines, rather
+than the product of the line counts.
+
+The delta lines produced by ndiff in this module restore to the same
+original and edited text as difflib.ndiff output.  The '? ' intraline
+hint lines are not produced: a changed line appears as a '- ' line and a
+'+ ' line.
+
+LineDiff keeps the integer form of the original lines and the matches found
+for the previous edited version so only the region changed since the
+previous edit is compared again.
+
+"""
+
+import bisect
+
+_EQUAL = "  "
+_DELETE = "- "
+_INSERT = "+ "
+
+_RESTORE_TAGS = {1: _DELETE, 2: _INSERT}
+
+# Edits allowed in a region compared by _myers_region before giving up.
+_MYERS_LIMIT = 2000
+
+
+def restore(delta, which):
+    """Generate lines of original (which == 1) or edited (which == 2) text.
+
+    delta is a sequence of lines produced by ndiff in this module or by
+    difflib.ndiff.
+
+    """
+    try:
+        tag = _RESTORE_TAGS[int(which)]
+    except KeyError:
+        raise ValueError(
+            "".join(("unknown delta choice (must be 1 or 2): ", repr(which)))
+        ) from None
+    prefixes = (_EQUAL, tag)
+    for line in delta:
+        if line[:2] in prefixes:
+            yield line[2:]
+
+
+def ndiff(a, b):
+    """Return list of delta lines which transform lines a into lines b."""
+    return LineDiff(a).delta(b)
+
+
+class LineDiff(object):
+    """Differences between original lines and successive edited versions."""
+
+    def __init__(self, original):
+        """Note original, a list of lines, and map each line to an integer."""
+        super(LineDiff, self).__init__()
+        self.original = list(original)
+        self._line_numbers = dict()
+        self._original = self._map_lines(self.original)
+        self._edited = None
+        self._matches = None
+
+    def _map_lines(self, lines):
+        numbers = self._line_numbers
+        mapped = []
+        for line in lines:
+            n = numbers.get(line)
+            if n is None:
+                n = numbers[line] = len(numbers)
+            mapped.append(n)
+        return mapped
+
+    def delta(self, edited):
+        """Return list of delta lines which transform original into edited.
+
+        The comparison with original is limited to the region of edited
+        which differs from the edited argument of the previous call.
+
+        """
+        edited = list(edited)
+        a = self._original
+        b = self._map_lines(edited)
+        previous = self._edited
+        if previous is None:
+            matches = []
+            _match_region(a, 0, len(a), b, 0, len(b), matches)
+        else:
+            matches = self._rematch(a, b, previous, self._matches)
+        self._edited = b
+        self._matches = matches
+        return _format_delta(self.original, edited, matches)
+
+    @staticmethod
+    def _rematch(a, b, previous, matches):
+        """Return matches for a and b reusing matches for a and previous."""
+        lenb = len(b)
+        lenp = len(previous)
+        limit = min(lenb, lenp)
+        prefix = 0
+        while prefix < limit and b[prefix] == previous[prefix]:
+            prefix += 1
+        suffix = 0
+        limit -= prefix
+        while suffix < limit and b[-1 - suffix] == previous[-1 - suffix]:
+            suffix += 1
+        shift = lenb - lenp
+        head = [m for m in matches if m[1] < prefix]
+        tail = [(i, j + shift) for i, j in matches if j >= lenp - suffix]
+        alo = head[-1][0] + 1 if head else 0
+        blo = head[-1][1] + 1 if head else 0
+        ahi = tail[0][0] if tail else len(a)
+        bhi = tail[0][1] if tail else lenb
+        middle = []
+        _match_region(a, alo, ahi, b, blo, bhi, middle)
+        head.extend(middle)
+        head.extend(tail)
+        return head
+
+
+def _format_delta(a, b, matches):
+    """Return delta lines for lines a and b given list of matching (i, j)."""
+    delta = []
+    i = j = 0
+    for mi, mj in matches:
+        while i < mi:
+            delta.append(_DELETE + a[i])
+            i += 1
+        while j < mj:
+            delta.append(_INSERT + b[j])
+            j += 1
+        delta.append(_EQUAL + a[i])
+        i += 1
+        j += 1
+    while i < len(a):
+        delta.append(_DELETE + a[i])
+        i += 1
+    while j < len(b):
+        delta.append(_INSERT + b[j])
+        j += 1
+    return delta
+
+
+def _match_region(a, alo, ahi, b, blo, bhi, matches):
+    """Append matching (i, j) pairs for a[alo:ahi] and b[blo:bhi] in order.
+
+    Regions are split at lines unique in both a and b forming the longest
+    increasing sequence (patience diff) and regions without such lines are
+    compared by _myers_region.
+
+    """
+    stack = [(alo, ahi, blo, bhi)]
+    while stack:
+        item = stack.pop()
+        if len(item) == 2:
+            matches.append(item)
+            continue
+        alo, ahi, blo, bhi = item
+        while alo < ahi and blo < bhi and a[alo] == b[blo]:
+            matches.append((alo, blo))
+            alo += 1
+            blo += 1
+        suffix = []
+        while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+            ahi -= 1
+            bhi -= 1
+            suffix.append((ahi, bhi))
+        pending = []
+        if alo < ahi and blo < bhi:
+            anchors = _unique_anchors(a, alo, ahi, b, blo, bhi)
+            if anchors:
+                i, j = alo, blo
+                for ai, bj in anchors:
+                    pending.append((i, ai, j, bj))
+                    pending.append((ai, bj))
+                    i, j = ai + 1, bj + 1
+                pending.append((i, ahi, j, bhi))
+            else:
+                _myers_region(a, alo, ahi, b, blo, bhi, matches)
+        pending.extend(reversed(suffix))
+        stack.extend(reversed(pending))
+
+
+def _unique_anchors(a, alo, ahi, b, blo, bhi):
+    """Return longest increasing sequence of (i, j) for lines unique in both.
+
+    Lines occurring once in a[alo:ahi] and once in b[blo:bhi] are the
+    candidates.
+
+    """
+    positions = dict()
+    for i in range(alo, ahi):
+        n = a[i]
+        positions[n] = None if n in positions else [i, None]
+    for j in range(blo, bhi):
+        p = positions.get(b[j])
+        if p is None:
+            continue
+        if p[1] is None:
+            p[1] = j
+        else:
+            positions[b[j]] = None
+    candidates = sorted(
+        tuple(p)
+        for p in positions.values()
+        if p is not None and p[1] is not None
+    )
+    if not candidates:
+        return candidates
+
+    # Patience sort on the b positions.
+    tops = []
+    topindex = []
+    backlinks = []
+    for k, (i, j) in enumerate(candidates):
+        pile = bisect.bisect_left(tops, j)
+        backlinks.append(topindex[pile - 1] if pile else None)
+        if pile == len(tops):
+            tops.append(j)
+            topindex.append(k)
+        else:
+            tops[pile] = j
+            topindex[pile] = k
+    anchors = []
+    k = topindex[-1]
+    while k is not None:
+        anchors.append(candidates[k])
+        k = backlinks[k]
+    anchors.reverse()
+    return anchors
+
+
+def _myers_region(a, alo, ahi, b, blo, bhi, matches):
+    """Append matching (i, j) pairs for a[alo:ahi] and b[blo:bhi] in order.
+
+    Myers O(ND) shortest edit script.  If more than _MYERS_LIMIT edits are
+    needed the region is treated as completely replaced.
+
+    """
+    n = ahi - alo
+    m = bhi - blo
+    v = {1: 0}
+    trace = []
+    for d in range(min(n + m, _MYERS_LIMIT) + 1):
+        trace.append(dict(v))
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[k - 1] < v[k + 1]):
+                x = v[k + 1]
+            else:
+                x = v[k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[alo + x] == b[blo + y]:
+                x += 1
+                y += 1
+            v[k] = x
+            if x >= n and y >= m:
+                break
+        else:
+            continue
+        break
+    else:
+        return
+
+    found = []
+    x, y = n, m
+    for d in range(len(trace) - 1, -1, -1):
+        v = trace[d]
+        k = x - y
+        if k == -d or (k != d and v[k - 1] < v[k + 1]):
+            k = k + 1
+        else:
+            k = k - 1
+        px = v[k]
+        py = px - k
+        while x > px and y > py:
+            x -= 1
+            y -= 1
+            found.append((alo + x, blo + y))
+        x, y = px, py
+    found.reverse()
+    matches.extend(found)
@@ -15,6 +15,7 @@ addition of this source to the menu.
 
 from .. import filespec
 from .. import constants
+from ...basecore.database import bulk_task
 
 
 def _do_ecf_ogd_data_import(
@@ -41,7 +42,7 @@ def _do_ecf_ogd_data_import(
         return False
 
     results.do_database_task(
-        import_method,
+        bulk_task(import_method),
         logwidget=logwidget,
         taskmethodargs=dict(
             ecffile=ecffile,
@@ -0,0 +1,129 @@
+# opendatabase.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Open an existing results database without a user interface.
+
+The database engine is chosen as in the Open action of the Leagues frame:
+the folder must contain exactly one results database and exactly one of the
+installed database modules must be able to open it.
+
+"""
+
+import importlib
+import os
+
+from solentware_base import modulequery
+
+from .. import APPLICATION_DATABASE_MODULE
+from .filespec import FileSpec
+
+# for runtime "from <db|dpt>results import ResultsDatabase"
+_ResultsDB = "ResultsDatabase"
+
+
+class OpenDatabaseError(Exception):
+    pass
+
+
+def get_database_engine(database_folder):
+    """Return name of database engine for results database in folder.
+
+    OpenDatabaseError is raised if no engine, or more than one, can be used.
+
+    """
+    folder = os.path.basename(database_folder)
+    ed = modulequery.modules_for_existing_databases(
+        database_folder, FileSpec()
+    )
+    if not ed:
+        raise OpenDatabaseError(
+            "".join(
+                ("Folder ", folder, " does not contain a results database")
+            )
+        )
+    if len(ed) > 1:
+        raise OpenDatabaseError(
+            "".join(
+                ("There is more than one results database in folder ", folder)
+            )
+        )
+    enginename = None
+    for k, v in modulequery.installed_database_modules().items():
+        if v in ed[0]:
+            if enginename:
+                raise OpenDatabaseError(
+                    "".join(
+                        (
+                            "Several modules able to open database in ",
+                            folder,
+                            " available.  Unable to choose.",
+                        )
+                    )
+                )
+            enginename = k
+    if enginename is None:
+        raise OpenDatabaseError(
+            "".join(("No modules able to open database in ", folder))
+        )
+    return enginename
+
+
+def get_database_class(enginename):
+    """Return ResultsDatabase class for database engine enginename."""
+    try:
+        modulename = APPLICATION_DATABASE_MODULE[enginename]
+    except KeyError:
+        raise OpenDatabaseError(
+            "".join(("Database engine ", str(enginename), " not supported"))
+        ) from None
+    return getattr(importlib.import_module(modulename), _ResultsDB)
+
+
+def configure_database_class(database_class):
+    """Set task options of database_class from the configuration file.
+
+    The options are set on the class so database instances created by
+    do_database_task use the same performance profile, snapshot, and
+    instrumentation, settings.  Only SQLite engines have performance
+    profiles.
+
+    """
+    from . import configuration
+    from . import constants
+
+    conf = configuration.Configuration()
+    database_class.performance_profile = conf.get_configuration_value(
+        constants.SQLITE_PERFORMANCE_PROFILE
+    )
+    database_class.snapshot_bulk_tasks = (
+        conf.get_configuration_value(constants.SNAPSHOT_BULK_TASKS)
+        == constants.SNAPSHOT_BULK_TASKS_TRUE
+    )
+    database_class.instrument_tasks = conf.get_configuration_value(
+        constants.INSTRUMENT_TASKS
+    )
+    database_class.profile_tasks = (
+        conf.get_configuration_value(constants.PROFILE_TASKS)
+        == constants.PROFILE_TASKS_TRUE
+    )
+
+
+def open_results_database(database_folder, enginename=None, **kargs):
+    """Return open results database in database_folder.
+
+    The database engine is found by get_database_engine if enginename is
+    None.  The task options of the ResultsDatabase class are set from the
+    configuration file, and kargs are passed to the class.
+
+    """
+    if enginename is None:
+        enginename = get_database_engine(database_folder)
+    database_class = get_database_class(enginename)
+    configure_database_class(database_class)
+    database = database_class(database_folder, **kargs)
+    message = database.open_database()
+    if message:
+        database.close_database()
+        raise OpenDatabaseError(message)
+    return database
@@ -0,0 +1,148 @@
+# performancematrix.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Game results for performance calculations held in arrays.
+
+get_events_for_performance_calculation in resultsrecord returns dicts and
+sets keyed by record number, with several small objects per game and per
+player.  get_events_for_performance_matrix returns the same information as
+a PerformanceMatrix: players are given dense integer ids, games are rows of
+parallel arrays, and each player's opponents are held in compressed sparse
+row (CSR) form.
+
+The chesscalc Performance, Prediction, and Population, classes take the
+dicts and sets, so the calculations use the resultsrecord functions.  A
+PerformanceMatrix is for analysis which can be done on the arrays directly,
+such as walking the opponents of each player, without converting them.
+
+The numpy package is needed.
+
+"""
+
+import array
+
+try:
+    import numpy
+except ImportError:  # Not ModuleNotFoundError for Pythons earlier than 3.6
+    numpy = None
+
+from chessvalidate.core.gameresults import ecfresult
+
+from . import resultsrecord
+from .constants import AWIN, DRAW, HWIN
+
+# Score for home player.  Score for away player is the negated value.
+_HOME_SCORE = {HWIN: 1, DRAW: 0, AWIN: -1}
+
+
+class PerformanceMatrixError(Exception):
+    pass
+
+
+class PerformanceMatrix(object):
+    """Games between players in selected events held in numpy arrays.
+
+    persons[p] is the record number of the person with player id p.
+    names maps person record number to name, as in the names dict from
+    get_events_for_performance_calculation.
+    games[g] is the record number of game g.
+    home[g] and away[g] are the player ids of the players in game g.
+    score[g] is the score of the home player: 1 win, 0 draw, -1 loss.
+    Opponents of player p are opponents[opponents_indptr[p]:
+    opponents_indptr[p+1]], sorted and without duplicates.
+
+    """
+
+    def __init__(self, persons, names, games, home, away, score):
+        """Create arrays and opponent adjacency from game data."""
+        super(PerformanceMatrix, self).__init__()
+        self.persons = numpy.asarray(persons, dtype=numpy.int64)
+        self.names = names
+        self.games = numpy.asarray(games, dtype=numpy.int64)
+        self.home = numpy.asarray(home, dtype=numpy.int32)
+        self.away = numpy.asarray(away, dtype=numpy.int32)
+        self.score = numpy.asarray(score, dtype=numpy.int8)
+        count = len(self.persons)
+        pairs = numpy.unique(
+            numpy.concatenate(
+                (
+                    self.home.astype(numpy.int64) * count + self.away,
+                    self.away.astype(numpy.int64) * count + self.home,
+                )
+            )
+        )
+        self.opponents = (pairs % max(count, 1)).astype(numpy.int32)
+        self.opponents_indptr = numpy.zeros(count + 1, dtype=numpy.int64)
+        numpy.cumsum(
+            numpy.bincount(pairs // max(count, 1), minlength=count),
+            out=self.opponents_indptr[1:],
+        )
+
+    def get_opponents(self, player):
+        """Return array of player ids of opponents of player id player."""
+        indptr = self.opponents_indptr
+        return self.opponents[indptr[player] : indptr[player + 1]]
+
+    def get_player_games(self, player):
+        """Return array of row numbers of games played by player id player."""
+        return numpy.flatnonzero((self.home == player) | (self.away == player))
+
+
+def get_events_for_performance_matrix(database, events, gamedates=None):
+    """Return PerformanceMatrix for games in events, or None.
+
+    None is returned, like get_events_for_performance_calculation, if any
+    player in events cannot be resolved to a person.
+
+    The games of one event at a time are read, and only the arrays and one
+    id per person are kept between events.
+
+    If gamedates is a dict it is populated with {date: [game key, ...], ...}
+    for the games in the matrix.
+
+    """
+    if numpy is None:
+        raise PerformanceMatrixError("The numpy package is not installed")
+    person_ids = dict()
+    names = dict()
+    games = array.array("q")
+    home = array.array("i")
+    away = array.array("i")
+    score = array.array("b")
+    for e in events:
+        eventgames = resultsrecord.get_games_for_event(
+            database, resultsrecord.get_event(database, e[-1])
+        )
+        eventaliases = resultsrecord.get_aliases_for_games(
+            database, eventgames
+        )
+        eventpersons = resultsrecord.get_persons(database, eventaliases)
+        alias = dict()
+        for k in eventaliases.keys():
+            v = eventpersons.get(k)
+            if v is None:
+                return
+            alias[k] = v.key.recno
+            names[alias[k]] = v.value.name
+        for g in eventgames:
+            gv = g.value
+            if gv.result not in ecfresult:  # 'a', 'd', 'h'
+                continue
+            ids = []
+            for a in (gv.homeplayer, gv.awayplayer):
+                p = alias[a]
+                pid = person_ids.get(p)
+                if pid is None:
+                    pid = person_ids[p] = len(person_ids)
+                ids.append(pid)
+            games.append(g.key.recno)
+            home.append(ids[0])
+            away.append(ids[1])
+            score.append(_HOME_SCORE.get(gv.result, 0))
+            if gamedates is not None:
+                gamedates.setdefault(gv.date, []).append(g.key.recno)
+    persons = [0] * len(person_ids)
+    for p, pid in person_ids.items():
+        persons[pid] = p
+    return PerformanceMatrix(persons, names, games, home, away, score)
@@ -27,15 +27,37 @@ a single file making it difficult to forget some data.)
 """
 
 import os
-import collections
+import concurrent.futures
 
 from . import constants as cc
 
 
+def _read_file(args):
+    """Return result of cls.read_file(file_) for process pool workers."""
+    cls, file_ = args
+    return cls.read_file(file_)
+
+
+def _format_file_text(args):
+    """Return result of cls.format_file_text(text) for process pool workers."""
+    cls, text = args
+    return cls.format_file_text(text)
+
+
 class PrepareResults(object):
-    """Class for importing results data."""
+    """Class for importing results data.
+
+    Files are read, and reports generated, in a pool of processes if
+    processes is a number greater than 1.  Results are always collected in
+    sorted file name order because the translation of PINs is shared by all
+    files and done in sequence in the calling process.
+
+    progress, if given, is called as progress(stage, done, total) after each
+    file is read or reported.
 
-    def __init__(self, container):
+    """
+
+    def __init__(self, container, processes=None, progress=None):
         super(PrepareResults, self).__init__()
         self.container = container
         self.pinprefix = os.path.splitext(os.path.basename(container))[0]
@@ -43,6 +65,8 @@ class PrepareResults(object):
         self.keeppinvaluemap = dict()
         self.filenewtextmap = dict()
         self.error = []
+        self.processes = processes
+        self.progress = progress
 
     def empty_extract(self):
         return False
@@ -84,7 +108,7 @@ class PrepareResults(object):
         if context is None:
             context = dict()
         for c in context:
-            if not isinstance(context[c], collections.Callable):
+            if not callable(context[c]):
                 if context[c] is True:
                     context[c] = copy_text_extend
                 else:
@@ -254,25 +278,82 @@ class PrepareResults(object):
                 self.get_folder_contents(fn)
 
     def get_lines(self):
-        """Return lines of text from file.
+        """Return list of (file name, lines of text) in file name order.
 
-        Extend get_lines method in subclass if self.textlines needs
-        transforming before being processed by translate_results_format method.
+        Override read_file classmethod in subclass if the lines of text need
+        transforming before being processed by translate_results_format
+        method.
 
         """
         self.get_folder_contents(self.container)
-        filetext = []
-        for f in self.files:
-            ofile = open(f, "r")  # 'rb'?
-            filetext.append((f, [t.rstrip() for t in ofile.readlines()]))
+        cls = type(self)
+        return self._map_files(
+            _read_file, [(cls, f) for f in sorted(self.files)], "Read"
+        )
+
+    @classmethod
+    def read_file(cls, file_):
+        """Return (file_, lines of text in file_)."""
+        ofile = open(file_, "r")  # 'rb'?
+        try:
+            return (file_, [t.rstrip() for t in ofile.readlines()])
+        finally:
             ofile.close()
-        return filetext
 
     def extract_data_from_import_files(self, importfiles=None):
         """Return list containing processed import file contents."""
         if importfiles is None:
             importfiles = [("No files to display", [])]
-        return [self.report_file(f, t) for f, t in importfiles]
+        cls = type(self)
+        newtext = self._map_files(
+            _format_file_text, [(cls, t) for f, t in importfiles], "Report"
+        )
+        reports = []
+        for (f, t), nt in zip(importfiles, newtext):
+            self.filenewtextmap[f] = nt
+            reports.append(self.format_report(f, nt))
+        return reports
+
+    def report_file(self, file_, text):
+        """Return string containing filename and text in file."""
+        self.filenewtextmap[file_] = self.format_file_text(text)
+        return self.format_report(file_, self.filenewtextmap[file_])
+
+    @classmethod
+    def format_file_text(cls, text):
+        """Return text, a list of lines, as the text to be written to file."""
+        return "\n".join(text)
+
+    @staticmethod
+    def format_report(file_, newtext):
+        """Return string containing filename and newtext for display."""
+        return "\n".join((file_, "\n", newtext))
+
+    def _map_files(self, function, arguments, stage):
+        """Return list of function(a) for a in arguments in arguments order.
+
+        A process pool is used if self.processes allows and there is more
+        than one item in arguments.
+
+        """
+        total = len(arguments)
+        results = []
+        if self.processes is None or self.processes < 2 or total < 2:
+            for a in arguments:
+                results.append(function(a))
+                self._report_progress(stage, len(results), total)
+            return results
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=min(self.processes, total)
+        ) as executor:
+            for r in executor.map(function, arguments):
+                results.append(r)
+                self._report_progress(stage, len(results), total)
+        return results
+
+    def _report_progress(self, stage, done, total):
+        if self.progress is not None:
+            self.progress(stage, done, total)
 
 
 class PrepareSubmissionFile(PrepareResults):
@@ -451,43 +532,39 @@ class PrepareSubmissionFile(PrepareResults):
             },
         )
 
-    def get_lines(self):
+    @classmethod
+    def read_file(cls, file_):
         """Delimiter is # optionally preceded by newline sequence."""
-        filetext = []
-
-        for f, ft in super(PrepareSubmissionFile, self).get_lines():
-            columns = []
-            row = []
-            table = False
-            text = []
-            for t in "".join(ft).split("#"):
-                ts = t.split("=", 1)
-                key, value = ts[0], ts[-1]
-                if key == cc.TABLE_END:
-                    if len(row):
-                        text.append(key)
-                    table = False
-                    columns = []
-                elif key == cc.TABLE_START:
-                    if table:
-                        text.append(key)
-                    table = True
-                    row = []
-                elif table:
-                    if len(row) == 0:
-                        row = columns[:]
-                    text.append("=".join((row.pop(0), t)))
-                elif key == cc.COLUMN:
-                    columns.append(value)
-                elif key is value:
+        f, ft = super(PrepareSubmissionFile, cls).read_file(file_)
+        columns = []
+        row = []
+        table = False
+        text = []
+        for t in "".join(ft).split("#"):
+            key, sep, value = t.partition("=")
+            if key == cc.TABLE_END:
+                if len(row):
                     text.append(key)
-                else:
-                    text.append("=".join((key, value)))
-            filetext.append((f, text))
-        return filetext
+                table = False
+                columns = []
+            elif key == cc.TABLE_START:
+                if table:
+                    text.append(key)
+                table = True
+                row = []
+            elif table:
+                if len(row) == 0:
+                    row = columns[:]
+                text.append("=".join((row.pop(0), t)))
+            elif key == cc.COLUMN:
+                columns.append(value if sep else key)
+            else:
+                text.append(t)
+        return (f, text)
 
-    def report_file(self, file_, text):
-        """Return string containing filename and text in file."""
+    @classmethod
+    def format_file_text(cls, text):
+        """Return text, a list of lines, as the text to be written to file."""
         end_group = {
             cc.EVENT_DETAILS,
             cc.PLAYER_LIST,
@@ -519,15 +596,12 @@ class PrepareSubmissionFile(PrepareResults):
                 filetext.append(t)
         if linetext:
             filetext.append("#".join(linetext))
-        linetext = []
+        return "#".join(("", "\n#".join(filetext)))
 
-        self.filenewtextmap[file_] = "#".join(("", "\n#".join(filetext)))
-        return "\n".join(
-            (
-                "".join((file_, "\n")),
-                self.filenewtextmap[file_],
-            )
-        )
+    @staticmethod
+    def format_report(file_, newtext):
+        """Return string containing filename and newtext for display."""
+        return "\n".join(("".join((file_, "\n")), newtext))
 
     def write_file(self, inpath, outpath, folder):
         d, f = os.path.split(outpath[0])
@@ -552,8 +626,10 @@ class PrepareSubmissionFile(PrepareResults):
 class PrepareLeagueDump(PrepareResults):
     """Import data from dump of League program database."""
 
-    def __init__(self, container):
-        super(PrepareLeagueDump, self).__init__(container)
+    def __init__(self, container, processes=None, progress=None):
+        super(PrepareLeagueDump, self).__init__(
+            container, processes=processes, progress=progress
+        )
 
     def empty_extract(self):
         return super(PrepareLeagueDump, self).empty_extract()
@@ -725,17 +801,6 @@ class PrepareLeagueDump(PrepareResults):
             discardmap={cc.PBCF, cc.CNAME, cc.CBCF, cc.CBCFCOUNTY},
         )
 
-    def report_file(self, file_, text):
-        """Return string containing filename and text in file."""
-        self.filenewtextmap[file_] = "\n".join(text)
-        return "\n".join(
-            (
-                file_,
-                "\n",
-                self.filenewtextmap[file_],
-            )
-        )
-
     def write_file(self, inpath, outpath, folder):
         d, f = os.path.split(outpath[0])
         nd = os.path.join(folder, d)
@@ -948,6 +948,16 @@ def get_alias_identity(record):
 
 def get_events_for_performance_calculation(database, events):
     """Return calculation data from database records for events."""
+    return _get_events_for_performance(database, events, None)
+
+
+def _get_events_for_performance(database, events, gamedates):
+    """Return calculation data from database records for events.
+
+    If gamedates is a dict it is populated with {date: [game key, ...], ...}
+    for the games in the calculation data.
+
+    """
     games = dict()
     players = dict()
     game_opponent = dict()
@@ -995,36 +1005,56 @@ def get_events_for_performance_calculation(database, events):
                     result[alias[g.value.awayplayer]] = 0
                     result[alias[g.value.homeplayer]] = 0
                 games[g.key.recno] = result
+                if gamedates is not None:
+                    gamedates.setdefault(g.value.date, []).append(g.key.recno)
     return (games, players, game_opponent, opponents, names)
 
 
 def get_events_for_performance_prediction(database, events):
-    """Return calculation data from database records for events."""
-    (
-        games,
-        players,
-        game_opponent,
-        opponents,
-        names,
-    ) = get_events_for_performance_calculation(database, events)
+    """Return calculation data from database records for events.
+
+    The games are read once, noting the game dates, and each distinct date
+    is parsed once to find the season.
+
+    """
+    gamedates = dict()
+    gefpc = _get_events_for_performance(database, events, gamedates)
+    if gefpc is None:
+        return
+    return (get_seasons_for_game_dates(gamedates),) + gefpc
+
+
+def get_seasons_for_game_dates(gamedates):
+    """Return {season: {game key, ...}, ...} for gamedates.
+
+    gamedates is {date: [game key, ...], ...}.  Each date is parsed once.
+
+    """
     seasons = {}
-    game = ResultsDBrecordGame()
     asd = AppSysDate()
-    for gk in sorted(games):
-        game.load_record(
-            database.get_primary_record(filespec.GAME_FILE_DEF, gk)
+    for date, gamekeys in gamedates.items():
+        seasons.setdefault(get_season_for_date(asd, date), set()).update(
+            gamekeys
         )
-        # Hack to deal with surviving non-ISO format dates
-        # y, m, d = [int(e) for e in game.value.date.split('-')]
-        if asd.parse_date(game.value.date) > 0:
-            y, m, d = [int(e) for e in asd.iso_format_date().split("-")]
-        else:
-            y, m, d = (1950, 1, 1)
-        # End hack
-        if m < 7:
-            y -= 1
-        seasons.setdefault("-".join((str(y), "12", "25")), set()).add(gk)
-    return (seasons, games, players, game_opponent, opponents, names)
+    return seasons
+
+
+def get_season_for_date(appsysdate, date):
+    """Return season key, '<year>-12-25', for date parsed by appsysdate.
+
+    Seasons run from July to June and are named by the year they start.
+
+    """
+    # Hack to deal with surviving non-ISO format dates
+    # y, m, d = [int(e) for e in date.split('-')]
+    if appsysdate.parse_date(date) > 0:
+        y, m, d = [int(e) for e in appsysdate.iso_format_date().split("-")]
+    else:
+        y, m, d = (1950, 1, 1)
+    # End hack
+    if m < 7:
+        y -= 1
+    return "-".join((str(y), "12", "25"))
 
 
 def get_unpacked_player_identity(identity):
@@ -22,9 +22,9 @@ class TakeonCollationDB(collationdb.CollationDB):
 
     """Results extracted from a file of imported games."""
 
-    def __init__(self, collation, database):
+    def __init__(self, collation, database, progress=None):
 
-        super().__init__(collation.games, database)
+        super().__init__(collation.games, database, progress=progress)
         self.merges = collation.merges
         self.players = collation.players
 
@@ -23,10 +23,10 @@ not the same player.
 
 """
 
-import difflib
 import os
 import tkinter.messagebox
 
+from . import linediff
 from .takeonschedule import TakeonSchedule
 from .takeonreport import TakeonSubmission, TakeonLeagueDump
 from .takeonresults import TakeonSubmissionFile, TakeonLeagueDumpFile
@@ -69,6 +69,8 @@ class TakeonSeason(object):
         self._fixtures = None
         self._collation = None
         self.takeonfiles = []
+        self._fixturesdiff = None
+        self._resultsdiff = None
 
     @property
     def collation(self):
@@ -155,7 +157,7 @@ class TakeonSeason(object):
         """
         if self._collation == None:
             self.get_schedule_from_file(TakeonSchedule)
-            textlines = [t for t in difflib.restore(self.results, 2)]
+            textlines = [t for t in linediff.restore(self.results, 2)]
             if (
                 len(self.takeonfiles.files) == 1
                 and os.path.join(self.folder, constants.LEAGUE_DATABASE_DATA)
@@ -279,6 +281,8 @@ class TakeonSeason(object):
         self.resultsfile = reports
         self.fixtures = fixtures
         self.results = results
+        self._fixturesdiff = None
+        self._resultsdiff = None
         self.takeonfiles = merge
         return True
 
@@ -307,8 +311,7 @@ class TakeonSeason(object):
     # Copy code from original season.py instead of delegating to superclass
     def extract_schedule(self, newfixtures):
         """Update the Schedule object getfixtures from newfixtures text lines."""
-        oldfixtures = list(difflib.restore(self.fixtures, 1))
-        self.fixtures = list(difflib.ndiff(oldfixtures, newfixtures))
+        self.fixtures = self._get_fixtures_diff().delta(newfixtures)
         self._fixtures = None
         self.get_schedule_from_file(TakeonSchedule)
 
@@ -327,10 +330,8 @@ class TakeonSeason(object):
         original text entered into the file.
 
         """
-        oldfixtures = list(difflib.restore(self.fixtures, 1))
-        self.fixtures = list(difflib.ndiff(oldfixtures, newfixtures))
-        oldresults = list(difflib.restore(self.results, 1))
-        self.results = list(difflib.ndiff(oldresults, newresults))
+        self.fixtures = self._get_fixtures_diff().delta(newfixtures)
+        self.results = self._get_results_diff().delta(newresults)
         try:
             ff = open(self.fixturesfile, "wb")
             ff.write("\n".join(self.fixtures).encode("utf8"))
@@ -349,8 +350,7 @@ class TakeonSeason(object):
         object.
 
         """
-        oldresults = list(difflib.restore(self.results, 1))
-        self.results = list(difflib.ndiff(oldresults, newresults))
+        self.results = self._get_results_diff().delta(newresults)
         self._collation = None
         self.get_results_from_file()
 
@@ -362,6 +362,29 @@ class TakeonSeason(object):
         self.resultsfile = None
         self._fixtures = None
         self._collation = None
+        self._fixturesdiff = None
+        self._resultsdiff = None
+
+    def _get_fixtures_diff(self):
+        """Return LineDiff for original fixtures, creating it if necessary.
+
+        The LineDiff is kept so each edit compares only the lines changed
+        since the previous edit.
+
+        """
+        if self._fixturesdiff is None:
+            self._fixturesdiff = linediff.LineDiff(
+                linediff.restore(self.fixtures, 1)
+            )
+        return self._fixturesdiff
+
+    def _get_results_diff(self):
+        """Return LineDiff for original results, creating it if necessary."""
+        if self._resultsdiff is None:
+            self._resultsdiff = linediff.LineDiff(
+                linediff.restore(self.results, 1)
+            )
+        return self._resultsdiff
 
     def datafiles_exist(self):
         """Return True if files named in configuration file exist.
@@ -377,7 +400,7 @@ class TakeonSeason(object):
         return self._collation.games
 
     def get_difference_file(self, lines, diff, orig, parent, dlgcaption):
-        """Return list of text lines in file managed using difflib.
+        """Return list of text lines in file managed using linediff.
 
         lines - the text to be put in file if it does not yet exist
         diff - the file containing current version of event data
@@ -387,7 +410,7 @@ class TakeonSeason(object):
 
         """
         if not os.path.exists(diff):
-            difflines = list(difflib.ndiff(lines, lines))
+            difflines = list(linediff.ndiff(lines, lines))
             fo = open(diff, "wb")
             fo.write("\n".join(difflines).encode("utf8"))
             fo.close()
@@ -416,7 +439,7 @@ class TakeonSeason(object):
                 difflines = diffbytes.decode("utf8").splitlines()
             except UnicodeDecodeError:
                 difflines = diffbytes.decode("iso-8859-1").splitlines()
-            origlines = list(difflib.restore(difflines, 1))
+            origlines = list(linediff.restore(difflines, 1))
             if len(origlines) > len(lines):
                 tkinter.messagebox.showinfo(
                     parent=parent,
@@ -458,7 +481,7 @@ class TakeonSeason(object):
             elif len(lines) > len(origlines):
                 fd = open(diff, "wb")
                 newlines = lines[len(origlines) :]
-                newdifflines = difflib.ndiff(newlines, newlines)
+                newdifflines = linediff.ndiff(newlines, newlines)
                 difflines.extend(newdifflines)
                 fd.write("\n".join(difflines).encode("utf8"))
                 fd.close()
@@ -486,6 +509,6 @@ class TakeonSeason(object):
 
         """
         if self._fixtures == None:
-            f = list(difflib.restore(self.fixtures, 2))
+            f = list(linediff.restore(self.fixtures, 2))
             self._fixtures = getfixtures()
             self._fixtures.build_schedule(f)
@@ -0,0 +1,285 @@
+# taskexecutor.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Run long tasks one at a time in a background thread with progress reports.
+
+Tasks are held in a queue until the task in progress finishes.  Each task is
+given a TaskProgress instance, as the progress keyword argument, which is
+told how many items there are to do and how many have been done so far.  The
+rate items are done, and an estimate of the time to finish the task, are
+reported at intervals.
+
+Cancelling a task which has not started removes it from the queue.
+Cancelling the task in progress sets a flag which the task checks, by calling
+the advance or check_cancelled method of TaskProgress, in its long loops.
+These methods raise TaskCancelled if the flag is set so the task can back out
+the transaction being done.
+
+"""
+
+import collections
+import threading
+import time
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+FAILED = "failed"
+
+# Default minimum time, in seconds, between progress reports.
+REPORT_INTERVAL = 10
+
+
+class TaskCancelled(Exception):
+    pass
+
+
+class TaskProgress(object):
+    """Progress, and cancellation flag, for one task.
+
+    report, if given, is called as report(text) with a progress report at
+    most once every interval seconds while items are being done.  The call
+    is made in the thread running the task.
+
+    """
+
+    def __init__(self, name, report=None, interval=REPORT_INTERVAL):
+        super(TaskProgress, self).__init__()
+        self.name = name
+        self.report = report
+        self.interval = interval
+        self.state = PENDING
+        self.error = None
+        self.result = None
+        self.total = None
+        self.done = 0
+        self.started = None
+        self.finished = None
+        self._stage_started = None
+        self._stage_done = 0
+        self._reported = None
+        self._cancel = threading.Event()
+        self._finished = threading.Event()
+
+    def start(self, total=None, stage=None):
+        """Start counting items done in a stage of task, total if known.
+
+        A task can have several stages, each a long loop with its own
+        total.  The rate is calculated for the current stage.
+
+        """
+        now = time.monotonic()
+        if self.started is None:
+            self.started = now
+        self._stage_started = now
+        self._stage_done = 0
+        self._reported = now
+        self.total = total
+        self.done = 0
+        if stage is not None and self.report is not None:
+            self.report(stage)
+
+    def advance(self, count=1):
+        """Note count more items done and report progress if due.
+
+        Raise TaskCancelled if task has been cancelled.
+
+        """
+        self.check_cancelled()
+        self.done += count
+        self._stage_done += count
+        if self.report is None or self._reported is None:
+            return
+        now = time.monotonic()
+        if now - self._reported >= self.interval:
+            self._reported = now
+            self.report(self.get_report())
+
+    def check_cancelled(self):
+        """Raise TaskCancelled if task has been cancelled."""
+        if self._cancel.is_set():
+            raise TaskCancelled("".join(("Task '", self.name, "' cancelled")))
+
+    def cancel(self):
+        """Ask task to stop at next check."""
+        self._cancel.set()
+
+    def is_cancelled(self):
+        """Return True if task has been asked to stop."""
+        return self._cancel.is_set()
+
+    def is_finished(self):
+        """Return True if task has finished, however it finished."""
+        return self._finished.is_set()
+
+    def wait(self, timeout=None):
+        """Wait until task has finished.  Return False on timeout."""
+        return self._finished.wait(timeout)
+
+    def rate(self):
+        """Return items done per second in current stage or None."""
+        if self._stage_started is None:
+            return None
+        elapsed = time.monotonic() - self._stage_started
+        if elapsed <= 0:
+            return None
+        return self._stage_done / elapsed
+
+    def seconds_remaining(self):
+        """Return estimated seconds to finish current stage or None."""
+        rate = self.rate()
+        if not rate or self.total is None:
+            return None
+        return max(self.total - self.done, 0) / rate
+
+    def get_report(self):
+        """Return text describing progress of current stage."""
+        if self.total is None:
+            text = [str(self.done), " done"]
+        else:
+            text = [str(self.done), " of ", str(self.total), " done"]
+        rate = self.rate()
+        if rate is not None:
+            text.extend((", ", "%.1f" % rate, " per second"))
+        remaining = self.seconds_remaining()
+        if remaining is not None:
+            text.extend((", about ", _duration(remaining), " to finish"))
+        return "".join(text)
+
+
+class TaskExecutor(object):
+    """Queue of tasks run one at a time in a background thread.
+
+    The thread is started when the first task is submitted and stops when
+    the queue is empty.
+
+    """
+
+    def __init__(self):
+        super(TaskExecutor, self).__init__()
+        self._pending = collections.deque()
+        self._running = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        name,
+        method,
+        args=(),
+        kwargs=None,
+        report=None,
+        interval=REPORT_INTERVAL,
+        callback=None,
+    ):
+        """Add method to queue and return its TaskProgress instance.
+
+        method is called as method(*args, progress=progress, **kwargs) and
+        the value it returns is put in the result attribute of progress.
+        callback, if given, is called as callback(progress) when the task
+        finishes, however it finishes.  Both calls are in the background
+        thread.
+
+        """
+        progress = TaskProgress(name, report=report, interval=interval)
+        with self._lock:
+            self._pending.append(
+                (progress, method, args, kwargs or {}, callback)
+            )
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run_tasks, daemon=True
+                )
+                self._thread.start()
+        return progress
+
+    def get_pending(self):
+        """Return list of TaskProgress for tasks waiting to start."""
+        with self._lock:
+            return [task[0] for task in self._pending]
+
+    def get_running(self):
+        """Return TaskProgress for task in progress or None."""
+        return self._running
+
+    def is_busy(self):
+        """Return True if a task is in progress or waiting to start."""
+        with self._lock:
+            return self._thread is not None
+
+    def cancel(self, progress):
+        """Cancel task for progress, removing it from queue if not started."""
+        with self._lock:
+            for task in self._pending:
+                if task[0] is progress:
+                    self._pending.remove(task)
+                    progress.state = CANCELLED
+                    progress._finished.set()
+                    break
+            else:
+                progress.cancel()
+                return
+        if task[-1] is not None:
+            task[-1](progress)
+
+    def cancel_all(self):
+        """Cancel task in progress and remove all tasks from queue."""
+        for progress in self.get_pending():
+            self.cancel(progress)
+        running = self._running
+        if running is not None:
+            running.cancel()
+
+    def wait(self, timeout=None):
+        """Wait until queue is empty and return True, or False on timeout.
+
+        The wait includes the callback of the last task.
+
+        """
+        with self._lock:
+            thread = self._thread
+        if thread is None:
+            return True
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    def _run_tasks(self):
+        """Run tasks from queue until queue is empty."""
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._thread = None
+                    return
+                progress, method, args, kwargs, callback = (
+                    self._pending.popleft()
+                )
+                self._running = progress
+            progress.state = RUNNING
+            try:
+                progress.result = method(*args, progress=progress, **kwargs)
+                progress.state = CANCELLED if progress.is_cancelled() else DONE
+            except TaskCancelled:
+                progress.state = CANCELLED
+            except Exception as exc:
+                progress.state = FAILED
+                progress.error = exc
+            finally:
+                progress.finished = time.monotonic()
+                self._running = None
+                progress._finished.set()
+            if callback is not None:
+                callback(progress)
+
+
+def _duration(seconds):
+    """Return seconds as text like '1h 05m', '12m 30s', or '45s'."""
+    seconds = int(seconds + 0.5)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    if hours:
+        return "%dh %02dm" % (hours, minutes)
+    if minutes:
+        return "%dm %02ds" % (minutes, seconds)
+    return "%ds" % seconds
@@ -0,0 +1,5 @@
+# __init__.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Tests for the core modules."""
@@ -0,0 +1,105 @@
+# test_backup.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Snapshot taken by bulk_task, and its restore, on a synthetic league.
+
+The DPT tests are skipped if the dptdb package is not installed.
+
+"""
+
+import unittest
+import os
+import shutil
+import tempfile
+
+from .. import constants
+from .. import eventdata
+from .. import resultsrecord
+from ..opendatabase import get_database_class
+from ...basecore import backup
+from ...basecore.database import bulk_task
+from ...tools import synthetic_league
+from .test_eventdata import _game_lines
+from ... import SQLITE3_MODULE, DPT_MODULE
+
+try:
+    from ...dpt import resultsdatabase as dptresultsdatabase
+except ImportError:
+    dptresultsdatabase = None
+
+
+@bulk_task
+def _delete_events(database, logwidget, events=None):
+    eventdata.delete_events(database, events)
+
+
+class _BulkTaskSnapshot:
+    enginename = None
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.home = os.path.join(self.folder, "results")
+        self.database = self._open_database()
+        self.league = synthetic_league.SyntheticLeague(
+            seasons=2, teams=4, seed=1
+        )
+        self.league.populate(self.database)
+        self.database.snapshot_bulk_tasks = True
+
+    def tearDown(self):
+        if self.database is not None:
+            self.database.close_database()
+        shutil.rmtree(self.folder)
+
+    def _open_database(self):
+        database = get_database_class(self.enginename)(
+            self.home, allowcreate=True
+        )
+        self.assertFalse(database.open_database())
+        return database
+
+    def test_restore_snapshot_taken_by_bulk_task(self):
+        events = self.league.event_keys
+        deleted = self.league.season_event_keys[-1]
+        before = eventdata.get_event_export_data(self.database, events)
+        _delete_events(self.database, None, events=deleted)
+        for e in deleted:
+            self.assertIsNone(resultsrecord.get_event(self.database, e[-1]))
+        self.assertTrue(
+            os.path.isdir(
+                os.path.join(
+                    self.database.home_directory, constants.DATABASE_SNAPSHOT
+                )
+            )
+        )
+        self.database.close_database()
+        backup.restore_snapshot(self.database)
+        self.database = self._open_database()
+        self.assertEqual(
+            eventdata.get_event_export_data(self.database, events), before
+        )
+
+    def test_database_usable_after_snapshot(self):
+        kept = [e for s in self.league.season_event_keys[:-1] for e in s]
+        before = eventdata.get_event_export_data(self.database, kept)
+        _delete_events(
+            self.database, None, events=self.league.season_event_keys[-1]
+        )
+        self.assertEqual(
+            _game_lines(eventdata.get_event_export_data(self.database, kept)),
+            _game_lines(before),
+        )
+
+
+class SQLite3BulkTaskSnapshot(_BulkTaskSnapshot, unittest.TestCase):
+    enginename = SQLITE3_MODULE
+
+
+@unittest.skipIf(dptresultsdatabase is None, "dptdb not installed")
+class DPTBulkTaskSnapshot(_BulkTaskSnapshot, unittest.TestCase):
+    enginename = DPT_MODULE
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+# test_cli.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""cli tests on a synthetic league in an SQLite database."""
+
+import unittest
+from unittest import mock
+import os
+import io
+import json
+import shutil
+import tempfile
+import contextlib
+
+from ... import cli
+from .. import configuration
+from .. import constants
+from ..opendatabase import get_database_class
+from ...tools import synthetic_league
+
+# Database class attributes set from the configuration file.
+_OPTIONS = (
+    "performance_profile",
+    "snapshot_bulk_tasks",
+    "instrument_tasks",
+    "profile_tasks",
+)
+
+
+class CLI(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.home = os.path.join(self.folder, "results")
+        self.database_class = get_database_class("sqlite3")
+        self.options = {
+            name: vars(self.database_class)[name]
+            for name in _OPTIONS
+            if name in vars(self.database_class)
+        }
+        database = self.database_class(self.home, allowcreate=True)
+        database.open_database()
+        synthetic_league.SyntheticLeague(seasons=1, teams=4, seed=1).populate(
+            database
+        )
+        database.close_database()
+        environ = mock.patch.dict(os.environ, {"HOME": self.folder})
+        environ.start()
+        self.addCleanup(environ.stop)
+
+    def tearDown(self):
+        for name in _OPTIONS:
+            if name in self.options:
+                setattr(self.database_class, name, self.options[name])
+            elif name in vars(self.database_class):
+                delattr(self.database_class, name)
+        shutil.rmtree(self.folder)
+
+    def _main(self, *argv):
+        """Return exit status and JSON lines written by cli.main(argv)."""
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            with contextlib.redirect_stderr(io.StringIO()):
+                status = cli.main(list(argv))
+        return status, [
+            json.loads(line) for line in stdout.getvalue().splitlines()
+        ]
+
+    def test_export(self):
+        output = os.path.join(self.folder, "export.bz2")
+        status, lines = self._main(
+            "export", self.home, output, "--start", "2000-01-01"
+        )
+        self.assertEqual(status, cli.EXIT_OK)
+        self.assertEqual(lines[-1]["type"], "result")
+        self.assertEqual(lines[-1]["status"], cli.STATUS_OK)
+        self.assertTrue(os.path.isfile(output))
+
+    def test_configuration_read(self):
+        self._main("export", self.home, os.path.join(self.folder, "e.bz2"))
+        conf = configuration.Configuration()
+        self.assertEqual(
+            self.database_class.snapshot_bulk_tasks,
+            conf.get_configuration_value(constants.SNAPSHOT_BULK_TASKS)
+            == constants.SNAPSHOT_BULK_TASKS_TRUE,
+        )
+        self.assertEqual(
+            self.database_class.performance_profile,
+            conf.get_configuration_value(constants.SQLITE_PERFORMANCE_PROFILE),
+        )
+        for name in _OPTIONS:
+            self.assertIn(name, vars(self.database_class))
+
+    def test_dates_validated(self):
+        for date in ("2024-02-30", "yesterday"):
+            with contextlib.redirect_stderr(io.StringIO()) as stderr:
+                with self.assertRaises(SystemExit) as cm:
+                    cli.main(["export", self.home, "e.bz2", "--end", date])
+            self.assertEqual(cm.exception.code, cli.EXIT_USAGE)
+            self.assertIn("yyyy-mm-dd", stderr.getvalue())
+
+    def test_unexpected_error_opening_database(self):
+        with mock.patch(
+            "chessresults.core.opendatabase.open_results_database",
+            side_effect=RuntimeError("broken"),
+        ):
+            status, lines = self._main(
+                "export", self.home, os.path.join(self.folder, "e.bz2")
+            )
+        self.assertEqual(status, cli.EXIT_DATABASE)
+        self.assertEqual(
+            lines,
+            [
+                dict(
+                    type="result",
+                    command="export",
+                    status=cli.STATUS_ERROR,
+                    message="broken",
+                )
+            ],
+        )
+
+    def test_database_not_found(self):
+        status, lines = self._main(
+            "export", self.folder, os.path.join(self.folder, "e.bz2")
+        )
+        self.assertEqual(status, cli.EXIT_DATABASE)
+        self.assertEqual(lines[-1]["status"], cli.STATUS_ERROR)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+# test_dptdatabase.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""DPT results database tests on a synthetic league.
+
+These tests are skipped if the dptdb package is not installed.
+
+"""
+
+import unittest
+import os
+import shutil
+import tempfile
+
+try:
+    from ...dpt import resultsdatabase
+except ImportError:
+    resultsdatabase = None
+from ...tools import synthetic_league
+
+
+@unittest.skipIf(resultsdatabase is None, "dptdb not installed")
+class _Database(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.home = os.path.join(self.folder, "results")
+        database = resultsdatabase.ResultsDatabase(self.home, allowcreate=True)
+        database.open_database()
+        synthetic_league.SyntheticLeague(seasons=1, teams=4, seed=1).populate(
+            database
+        )
+        database.close_database()
+        self.database = resultsdatabase.ResultsDatabase(
+            self.home, allowcreate=True
+        )
+        self.assertEqual(self.database.open_database(), "")
+
+    def tearDown(self):
+        self.database.close_database()
+        shutil.rmtree(self.folder)
+
+
+class DeleteDatabase(_Database):
+    def test_files_not_opened(self):
+        database = self.database
+        opened = []
+        open_file_on_demand = database.open_file_on_demand
+
+        def note_file_opened(file):
+            opened.append(file)
+            return open_file_on_demand(file)
+
+        database.open_file_on_demand = note_file_opened
+        names = database._file_names()
+        self.assertGreaterEqual(len(names), len(database.specification))
+        database.delete_database()
+        self.assertEqual(opened, [])
+        for name in names:
+            self.assertFalse(os.path.exists(name), name)
+
+
+if __name__ == "__main__":
+    unittest.main()
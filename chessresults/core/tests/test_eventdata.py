@@ -0,0 +1,236 @@
+# test_eventdata.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""eventdata tests on a synthetic league in an SQLite database."""
+
+import unittest
+import os
+import shutil
+import tempfile
+
+from .. import eventdata
+from .. import filespec
+from .. import resultsrecord
+from ..opendatabase import get_database_class
+from ...tools import synthetic_league
+
+
+def _create_league(folder, seed=1):
+    """Return (database, league) for three season league in folder."""
+    database = get_database_class("sqlite3")(
+        os.path.join(folder, "results"), allowcreate=True
+    )
+    database.open_database()
+    league = synthetic_league.SyntheticLeague(seasons=3, teams=4, seed=seed)
+    league.populate(database)
+    return database, league
+
+
+def _count_records(database, file):
+    recordlist = database.recordlist_ebm(file)
+    try:
+        return recordlist.count_records()
+    finally:
+        recordlist.close()
+
+
+def _count_games(database, events):
+    return sum(
+        len(
+            resultsrecord.get_games_for_event(
+                database, resultsrecord.get_event(database, e[-1])
+            )
+        )
+        for e in events
+    )
+
+
+def _game_lines(exportdata):
+    """Return lines for games in exportdata, omitting player aliases."""
+    return [
+        line
+        for line in exportdata
+        if line.partition("=")[0]
+        in {
+            "date",
+            "board",
+            "hometeam",
+            "awayteam",
+            "homename",
+            "awayname",
+            "result",
+        }
+    ]
+
+
+class _League(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.database, self.league = _create_league(self.folder)
+
+    def tearDown(self):
+        self.database.close_database()
+        shutil.rmtree(self.folder)
+
+
+class ExportEvents(_League):
+    def test_games_exported(self):
+        events = self.league.season_event_keys[0]
+        exportdata = eventdata.get_event_export_data(self.database, events)
+        self.assertEqual(
+            len([line for line in exportdata if line.startswith("result=")]),
+            _count_games(self.database, events),
+        )
+
+    def test_same_seed_same_export(self):
+        folder = os.path.join(self.folder, "other")
+        os.mkdir(folder)
+        database, league = _create_league(folder)
+        try:
+            self.assertEqual(
+                eventdata.get_event_export_data(database, league.event_keys),
+                eventdata.get_event_export_data(
+                    self.database, self.league.event_keys
+                ),
+            )
+        finally:
+            database.close_database()
+
+    def test_other_seed_other_export(self):
+        folder = os.path.join(self.folder, "other")
+        os.mkdir(folder)
+        database, league = _create_league(folder, seed=2)
+        try:
+            self.assertNotEqual(
+                eventdata.get_event_export_data(database, league.event_keys),
+                eventdata.get_event_export_data(
+                    self.database, self.league.event_keys
+                ),
+            )
+        finally:
+            database.close_database()
+
+
+class DeleteEvents(_League):
+    def test_delete_last_season(self):
+        database = self.database
+        deleted = self.league.season_event_keys[-1]
+        kept = [e for s in self.league.season_event_keys[:-1] for e in s]
+        games = _count_records(database, filespec.GAME_FILE_DEF)
+        keptgames = _count_games(database, kept)
+        players = _count_records(database, filespec.PLAYER_FILE_DEF)
+        eventdata.delete_events(database, deleted)
+        for e in deleted:
+            self.assertIsNone(resultsrecord.get_event(database, e[-1]))
+        for e in kept:
+            self.assertIsNotNone(resultsrecord.get_event(database, e[-1]))
+        self.assertEqual(_count_games(database, kept), keptgames)
+        self.assertEqual(
+            _count_records(database, filespec.GAME_FILE_DEF), keptgames
+        )
+        self.assertLess(keptgames, games)
+        self.assertLess(
+            _count_records(database, filespec.PLAYER_FILE_DEF), players
+        )
+
+    def test_no_references_to_deleted_players(self):
+        database = self.database
+        eventdata.delete_events(database, self.league.season_event_keys[-1])
+        recordlist = database.recordlist_ebm(filespec.PLAYER_FILE_DEF)
+        cursor = recordlist.create_recordset_cursor()
+        try:
+            record = cursor.first()
+            while record:
+                player = resultsrecord.ResultsDBrecordPlayer()
+                player.load_record(record)
+                merge = player.value.merge
+                if merge is False:
+                    for alias in player.value.alias:
+                        self.assertIsNotNone(
+                            resultsrecord.get_alias(database, alias)
+                        )
+                elif merge is not True and merge is not None:
+                    self.assertIsNotNone(
+                        resultsrecord.get_alias(database, player.value.merge)
+                    )
+                record = cursor.next()
+        finally:
+            cursor.close()
+            recordlist.close()
+
+    def test_remaining_games_unchanged(self):
+        database = self.database
+        kept = [e for s in self.league.season_event_keys[:-1] for e in s]
+        before = eventdata.get_event_export_data(database, kept)
+        eventdata.delete_events(database, self.league.season_event_keys[-1])
+        after = eventdata.get_event_export_data(database, kept)
+        self.assertEqual(_game_lines(after), _game_lines(before))
+        self.assertLess(len(after), len(before))
+
+
+class SyntheticLeague(_League):
+    def _records(self, file, recordclass):
+        records = []
+        recordlist = self.database.recordlist_ebm(file)
+        cursor = recordlist.create_recordset_cursor()
+        try:
+            record = cursor.first()
+            while record:
+                records.append(recordclass())
+                records[-1].load_record(record)
+                record = cursor.next()
+        finally:
+            cursor.close()
+            recordlist.close()
+        return records
+
+    def test_every_player_in_a_game(self):
+        games = self._records(
+            filespec.GAME_FILE_DEF, resultsrecord.ResultsDBrecordGame
+        )
+        players = self._records(
+            filespec.PLAYER_FILE_DEF, resultsrecord.ResultsDBrecordPlayer
+        )
+        self.assertEqual(
+            {p.key.recno for p in players},
+            {g.value.homeplayer for g in games}.union(
+                g.value.awayplayer for g in games
+            ),
+        )
+
+    def test_name_reference_counts(self):
+        references = {}
+        for event in self._records(
+            filespec.EVENT_FILE_DEF, resultsrecord.ResultsDBrecordEvent
+        ):
+            for name in event.value.sections:
+                references[name] = references.get(name, 0) + 1
+        for game in self._records(
+            filespec.GAME_FILE_DEF, resultsrecord.ResultsDBrecordGame
+        ):
+            for name in (
+                game.value.section,
+                game.value.hometeam,
+                game.value.awayteam,
+            ):
+                references[name] = references.get(name, 0) + 1
+        for player in self._records(
+            filespec.PLAYER_FILE_DEF, resultsrecord.ResultsDBrecordPlayer
+        ):
+            references[player.value.section] = (
+                references.get(player.value.section, 0) + 1
+            )
+        self.assertEqual(
+            {
+                n.key.recno: n.value.reference_count
+                for n in self._records(
+                    filespec.NAME_FILE_DEF, resultsrecord.ResultsDBrecordName
+                )
+            },
+            references,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+# test_eventimport.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""eventimport tests importing synthetic league exports to SQLite."""
+
+import unittest
+import os
+import bz2
+import shutil
+import tempfile
+
+from .. import eventdata
+from .. import filespec
+from .. import taskexecutor
+from ..opendatabase import get_database_class
+from .test_eventdata import _create_league, _count_records, _game_lines
+
+try:
+    from ..eventimport import EventImport
+except ImportError:
+    EventImport = None
+
+
+class _Log(object):
+    """Collect text written by the task being tested."""
+
+    def __init__(self):
+        self.lines = []
+
+    def append_text(self, text, timestamp=True):
+        self.lines.append(text)
+
+    def append_text_only(self, text):
+        self.lines.append(text)
+
+
+@unittest.skipIf(EventImport is None, "chessvalidate not installed")
+class EventImportTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        source, league = _create_league(self.folder)
+        try:
+            self.events = league.season_event_keys[0]
+            self.exportdata = eventdata.get_event_export_data(
+                source, self.events
+            )
+        finally:
+            source.close_database()
+        self.importfile = os.path.join(self.folder, "import.bz2")
+        with bz2.open(self.importfile, mode="wt", encoding="utf8") as ofile:
+            ofile.write("\n".join(self.exportdata))
+        self.target = get_database_class("sqlite3")(
+            os.path.join(self.folder, "target"), allowcreate=True
+        )
+        self.target.open_database()
+        self.log = _Log()
+
+    def tearDown(self):
+        self.target.close_database()
+        shutil.rmtree(self.folder)
+
+    def _importer(self, progress=None):
+        importer = EventImport(
+            self.importfile,
+            importevent_report=os.path.join(self.folder, "report.bz2"),
+            progress=progress,
+        )
+        self.assertTrue(importer.read_import_file(logwidget=self.log))
+        self.assertTrue(importer.is_import_validated(logwidget=self.log))
+        return importer
+
+    def test_import_to_empty_database(self):
+        importer = self._importer()
+        self.assertTrue(importer.check_events(self.target, self.log))
+        self.assertIn(
+            "(The database was empty at time of assessment.)", self.log.lines
+        )
+        self.assertTrue(importer.do_updates(self.target, self.log))
+        self.assertTrue(importer.updated)
+        self.assertTrue(os.path.isfile(importer.importevent_report))
+        self.assertEqual(
+            _game_lines(
+                eventdata.get_event_export_data(
+                    self.target,
+                    [(key,) for key in self._event_keys()],
+                )
+            ),
+            _game_lines(self.exportdata),
+        )
+
+    def test_import_again_merges_players(self):
+        self.assertTrue(self._importer().do_updates(self.target, self.log))
+        players = _count_records(self.target, filespec.PLAYER_FILE_DEF)
+        importer = self._importer()
+        self.assertTrue(importer.check_events(self.target, self.log))
+        self.assertTrue(importer.do_updates(self.target, self.log))
+        self.assertIn("Merge exported database players.", self.log.lines)
+        self.assertEqual(
+            _count_records(self.target, filespec.PLAYER_FILE_DEF), players
+        )
+
+    def test_cancelled_import_backed_out(self):
+        progress = taskexecutor.TaskProgress("Import Events")
+        progress.cancel()
+        importer = self._importer(progress=progress)
+        self.assertRaises(
+            taskexecutor.TaskCancelled,
+            importer.do_updates,
+            self.target,
+            self.log,
+        )
+        self.assertFalse(importer.updated)
+        self.assertEqual(
+            _count_records(self.target, filespec.GAME_FILE_DEF), 0
+        )
+
+    def test_import_text_not_read_again(self):
+        importer = EventImport(
+            os.path.join(self.folder, "missing.bz2"),
+            importtext="\n".join(self.exportdata),
+        )
+        self.assertTrue(importer.read_import_file())
+
+    def test_no_events(self):
+        importer = EventImport(self.importfile, importtext="")
+        self.assertFalse(importer.read_import_file(logwidget=self.log))
+        self.assertIsNotNone(importer.failure)
+
+    def _event_keys(self):
+        recordlist = self.target.recordlist_ebm(filespec.EVENT_FILE_DEF)
+        cursor = recordlist.create_recordset_cursor()
+        try:
+            keys = []
+            record = cursor.first()
+            while record:
+                keys.append(record[0])
+                record = cursor.next()
+            return keys
+        finally:
+            cursor.close()
+            recordlist.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
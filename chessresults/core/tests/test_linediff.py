@@ -0,0 +1,166 @@
+# test_linediff.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""linediff tests restoring original and edited lines from deltas."""
+
+import unittest
+from unittest import mock
+import difflib
+import random
+
+from .. import linediff
+
+
+def _lines(rng, count, vocabulary):
+    """Return count lines chosen from vocabulary distinct lines."""
+    return ["line " + str(rng.randrange(vocabulary)) for i in range(count)]
+
+
+def _edit(rng, lines, vocabulary):
+    """Return copy of lines with a few lines replaced, inserted or deleted."""
+    lines = list(lines)
+    start = rng.randrange(len(lines) + 1)
+    for i in range(rng.randrange(1, 4)):
+        choice = rng.randrange(3)
+        if choice == 0 or not lines:
+            lines.insert(start, "new " + str(rng.randrange(vocabulary)))
+        elif choice == 1:
+            del lines[min(start, len(lines) - 1)]
+        else:
+            lines[min(start, len(lines) - 1)] = "changed " + str(i)
+        start = min(start + rng.randrange(3), len(lines))
+    return lines
+
+
+def _lcs_length(a, b):
+    """Return length of longest common subsequence of a and b."""
+    row = [0] * (len(b) + 1)
+    for x in a:
+        previous = 0
+        for j, y in enumerate(b):
+            previous, row[j + 1] = row[j + 1], (
+                previous + 1 if x == y else max(row[j], row[j + 1])
+            )
+    return row[-1]
+
+
+class Restore(unittest.TestCase):
+    def test_restore_difflib_delta(self):
+        a = ["one", "two", "three", "four"]
+        b = ["one", "three", "3a", "four", "five"]
+        delta = list(difflib.ndiff(a, b))
+        self.assertEqual(list(linediff.restore(delta, 1)), a)
+        self.assertEqual(list(linediff.restore(delta, 2)), b)
+
+    def test_restore_bad_choice(self):
+        self.assertRaises(
+            ValueError, lambda: list(linediff.restore(["  a"], 3))
+        )
+
+
+class Ndiff(unittest.TestCase):
+    def assert_round_trip(self, a, b, delta):
+        self.assertEqual(list(linediff.restore(delta, 1)), a)
+        self.assertEqual(list(linediff.restore(delta, 2)), b)
+        self.assertEqual(list(difflib.restore(delta, 1)), a)
+        self.assertEqual(list(difflib.restore(delta, 2)), b)
+
+    def test_empty(self):
+        self.assertEqual(linediff.ndiff([], []), [])
+        self.assert_round_trip([], ["a"], linediff.ndiff([], ["a"]))
+        self.assert_round_trip(["a"], [], linediff.ndiff(["a"], []))
+
+    def test_same(self):
+        a = ["a", "b", "a", "c"]
+        self.assertEqual(linediff.ndiff(a, a), ["  " + line for line in a])
+
+    def test_no_hint_lines(self):
+        delta = linediff.ndiff(["abcdef"], ["abcxef"])
+        self.assertEqual(delta, ["- abcdef", "+ abcxef"])
+
+    def test_random_round_trip(self):
+        rng = random.Random(1)
+        for vocabulary in (3, 20, 1000):
+            for i in range(50):
+                a = _lines(rng, rng.randrange(60), vocabulary)
+                b = _lines(rng, rng.randrange(60), vocabulary)
+                self.assert_round_trip(a, b, linediff.ndiff(a, b))
+
+    def test_unchanged_lines_kept(self):
+        rng = random.Random(2)
+        a = _lines(rng, 500, 1000)
+        b = list(a)
+        b[250:252] = ["inserted"]
+        delta = linediff.ndiff(a, b)
+        self.assert_round_trip(a, b, delta)
+        self.assertEqual(
+            [line[:2] for line in delta].count("  "), len(a) - 2
+        )
+
+    def test_myers_region(self):
+        # No line is unique, so the patience diff finds no anchors.
+        a = ["x", "y", "x", "y", "x", "z", "z"]
+        b = ["y", "x", "x", "y", "z", "x", "z"]
+        delta = linediff.ndiff(a, b)
+        self.assert_round_trip(a, b, delta)
+        self.assertEqual(
+            [line[:2] for line in delta].count("  "), _lcs_length(a, b)
+        )
+
+    def test_myers_limit_exceeded(self):
+        a = ["x", "y"] * 10
+        b = ["y", "y", "x"] * 10
+        with mock.patch.object(linediff, "_MYERS_LIMIT", 3):
+            delta = linediff.ndiff(a, b)
+        self.assert_round_trip(a, b, delta)
+        self.assertNotIn("  ", [line[:2] for line in delta])
+
+    def test_myers_limit_exceeded_between_anchors(self):
+        a = ["x", "y"] * 10 + ["unique"] + ["x", "y"] * 10
+        b = ["y", "y", "x"] * 10 + ["unique"] + ["x", "y"] * 10
+        with mock.patch.object(linediff, "_MYERS_LIMIT", 3):
+            delta = linediff.ndiff(a, b)
+        self.assert_round_trip(a, b, delta)
+        self.assertEqual(
+            [line[:2] for line in delta].count("  "), len(a) // 2 + 1
+        )
+
+
+class LineDiff(unittest.TestCase):
+    def test_repeated_edits(self):
+        rng = random.Random(3)
+        for vocabulary in (5, 1000):
+            original = _lines(rng, 200, vocabulary)
+            differ = linediff.LineDiff(original)
+            edited = original
+            for i in range(100):
+                edited = _edit(rng, edited, vocabulary)
+                delta = differ.delta(edited)
+                self.assertEqual(list(linediff.restore(delta, 1)), original)
+                self.assertEqual(list(linediff.restore(delta, 2)), edited)
+
+    def test_edit_reverted(self):
+        original = ["line " + str(i) for i in range(100)]
+        differ = linediff.LineDiff(original)
+        edited = list(original)
+        edited[40:45] = ["changed"]
+        differ.delta(edited)
+        delta = differ.delta(original)
+        self.assertEqual(delta, ["  " + line for line in original])
+
+    def test_same_as_new_differ(self):
+        rng = random.Random(4)
+        original = ["line " + str(i) for i in range(300)]
+        differ = linediff.LineDiff(original)
+        edited = original
+        for i in range(50):
+            edited = _edit(rng, edited, 1000)
+            self.assertEqual(
+                differ.delta(edited),
+                linediff.LineDiff(original).delta(edited),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
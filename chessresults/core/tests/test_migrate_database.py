@@ -0,0 +1,135 @@
+# test_migrate_database.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""migrate_database and compact_database tests on SQLite databases."""
+
+import unittest
+from unittest import mock
+import os
+import shutil
+import tempfile
+
+from .. import eventdata
+from .. import filespec
+from ..ecf import ecfmaprecord
+from ..opendatabase import open_results_database
+from ...tools import migrate_database
+from ...tools import compact_database
+from .test_eventdata import _create_league, _count_records, _game_lines
+
+
+def _add_map_records(database):
+    """Add map records with no value, and with no player, to database."""
+    database.start_transaction()
+    database.put(filespec.MAPECFPLAYER_FILE_DEF, None, repr(None))
+    record = ecfmaprecord.ECFmapDBrecordPlayer()
+    record.value.empty()
+    record.value.playercode = "123456A"
+    record.put_record(database, filespec.MAPECFPLAYER_FILE_DEF)
+    database.commit()
+
+
+def _export(folder, events):
+    database = open_results_database(folder)
+    try:
+        return eventdata.get_event_export_data(database, events)
+    finally:
+        database.close_database()
+
+
+class _Folders(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.source = os.path.join(self.folder, "results")
+        environ = mock.patch.dict(os.environ, {"HOME": self.folder})
+        environ.start()
+        self.addCleanup(environ.stop)
+        database, self.league = _create_league(self.folder)
+        try:
+            eventdata.delete_events(
+                database, self.league.season_event_keys[-1]
+            )
+            self.mapped = _count_records(
+                database, filespec.MAPECFPLAYER_FILE_DEF
+            )
+            _add_map_records(database)
+        finally:
+            database.close_database()
+        self.events = [
+            e for s in self.league.season_event_keys[:-1] for e in s
+        ]
+        self.exportdata = _export(self.source, self.events)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+
+class MigrateDatabase(_Folders):
+    def test_round_trip(self):
+        target = os.path.join(self.folder, "copy")
+        counts = migrate_database.migrate_database(
+            self.source, target, "sqlite3"
+        )
+        self.assertEqual(counts["no value"], 1)
+        self.assertEqual(
+            counts[filespec.MAPECFPLAYER_FILE_DEF], self.mapped + 1
+        )
+        exportdata = _export(target, self.events)
+        self.assertEqual(_game_lines(exportdata), _game_lines(self.exportdata))
+        self.assertEqual(len(exportdata), len(self.exportdata))
+
+    def test_failed_copy_removed(self):
+        class Fail(migrate_database.DatabaseMigration):
+            def relink_players(self):
+                raise RuntimeError("failed")
+
+        target = os.path.join(self.folder, "copy")
+        self.assertRaises(
+            RuntimeError,
+            migrate_database.migrate_database,
+            self.source,
+            target,
+            "sqlite3",
+            migrationclass=Fail,
+        )
+        self.assertFalse(os.path.exists(target))
+        migrate_database.migrate_database(self.source, target, "sqlite3")
+        self.assertTrue(os.path.exists(target))
+
+    def test_existing_target_refused(self):
+        self.assertRaises(
+            migrate_database.MigrateDatabaseError,
+            migrate_database.migrate_database,
+            self.source,
+            self.folder,
+            "sqlite3",
+        )
+
+
+class CompactDatabase(_Folders):
+    def test_compact(self):
+        compaction = compact_database.compact_database(self.source)
+        self.assertEqual(len(compaction.problems), 2)
+        exportdata = _export(self.source, self.events)
+        self.assertEqual(_game_lines(exportdata), _game_lines(self.exportdata))
+
+    def test_renumber(self):
+        compact_database.compact_database(self.source, renumber=True)
+        self.assertTrue(
+            os.path.isdir(
+                os.path.join(
+                    self.source + compact_database.PRECOMPACT_SUFFIX,
+                    "results",
+                )
+            )
+        )
+        self.assertFalse(
+            os.path.exists(self.source + compact_database.COMPACT_SUFFIX)
+        )
+        exportdata = _export(self.source, self.events)
+        self.assertEqual(_game_lines(exportdata), _game_lines(self.exportdata))
+
+
+if __name__ == "__main__":
+    unittest.main()
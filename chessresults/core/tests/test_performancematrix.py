@@ -0,0 +1,126 @@
+# test_performancematrix.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""performancematrix tests on a synthetic league in an SQLite database."""
+
+import unittest
+import os
+import shutil
+import tempfile
+
+from .. import performancematrix
+from .. import resultsrecord
+from ..opendatabase import get_database_class
+from ...tools import synthetic_league
+
+
+class _League(unittest.TestCase):
+    """Synthetic league of three seasons, with the last not identified."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.folder = tempfile.mkdtemp()
+        cls.database = get_database_class("sqlite3")(
+            os.path.join(cls.folder, "results"), allowcreate=True
+        )
+        cls.database.open_database()
+        cls.league = synthetic_league.SyntheticLeague(seasons=3, teams=4)
+        cls.league.populate(cls.database)
+        cls.events = [
+            e for season in cls.league.season_event_keys[:-1] for e in season
+        ]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.database.close_database()
+        shutil.rmtree(cls.folder)
+
+
+@unittest.skipIf(performancematrix.numpy is None, "numpy not installed")
+class PerformanceMatrix(_League):
+    def test_scores_same_as_resultsrecord(self):
+        matrix = performancematrix.get_events_for_performance_matrix(
+            self.database, self.events
+        )
+        games, players, game_opponent, opponents, names = (
+            resultsrecord.get_events_for_performance_calculation(
+                self.database, self.events
+            )
+        )
+        self.assertEqual(matrix.names, names)
+        persons = matrix.persons.tolist()
+        for g, h, a, s in zip(
+            matrix.games.tolist(),
+            matrix.home.tolist(),
+            matrix.away.tolist(),
+            matrix.score.tolist(),
+        ):
+            self.assertEqual(games[g], {persons[h]: s, persons[a]: -s})
+            self.assertEqual(
+                game_opponent[g],
+                {persons[h]: persons[a], persons[a]: persons[h]},
+            )
+
+    def test_game_dates(self):
+        gamedates = dict()
+        matrix = performancematrix.get_events_for_performance_matrix(
+            self.database, self.events, gamedates=gamedates
+        )
+        self.assertEqual(
+            sorted(g for dategames in gamedates.values() for g in dategames),
+            sorted(matrix.games.tolist()),
+        )
+
+    def test_opponents_csr(self):
+        matrix = performancematrix.get_events_for_performance_matrix(
+            self.database, self.events
+        )
+        games, players, game_opponent, opponents, names = (
+            resultsrecord.get_events_for_performance_calculation(
+                self.database, self.events
+            )
+        )
+        self.assertEqual(len(matrix.games), len(games))
+        self.assertEqual(len(matrix.persons), len(players))
+        persons = matrix.persons.tolist()
+        for player, person in enumerate(persons):
+            self.assertEqual(
+                {persons[o] for o in matrix.get_opponents(player).tolist()},
+                opponents[person],
+            )
+            self.assertEqual(
+                {
+                    matrix.games[g]
+                    for g in matrix.get_player_games(player).tolist()
+                },
+                players[person],
+            )
+
+    def test_unidentified_players(self):
+        self.assertIsNone(
+            performancematrix.get_events_for_performance_matrix(
+                self.database, self.league.event_keys
+            )
+        )
+
+
+class WithoutNumpy(_League):
+    def setUp(self):
+        self.numpy = performancematrix.numpy
+        performancematrix.numpy = None
+
+    def tearDown(self):
+        performancematrix.numpy = self.numpy
+
+    def test_matrix_needs_numpy(self):
+        self.assertRaises(
+            performancematrix.PerformanceMatrixError,
+            performancematrix.get_events_for_performance_matrix,
+            self.database,
+            self.events,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+# test_startup_import_times.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""startup_import_times tests, including the modules deferred to first use.
+
+The start-up modules are imported in a new process so the modules imported
+by other tests do not hide eager imports.
+
+"""
+
+import unittest
+import sys
+import subprocess
+
+from ...tools import startup_import_times
+
+
+class ImportTimes(unittest.TestCase):
+    def test_get_import_times(self):
+        times = startup_import_times.get_import_times("json")
+        self.assertEqual(times[-1][-1], "json")
+        self.assertIn("json.decoder", [t[-1] for t in times])
+        for cumulative, selftime, name in times:
+            self.assertGreaterEqual(cumulative, selftime)
+
+    def test_import_failure(self):
+        self.assertRaises(
+            startup_import_times.StartupImportTimesError,
+            startup_import_times.get_import_times,
+            "chessresults.no_such_module",
+        )
+
+    def test_get_deferred_imports(self):
+        times = [(3, 1, "json.decoder"), (2, 2, "jsonx"), (9, 4, "json")]
+        self.assertEqual(
+            startup_import_times.get_deferred_imports(
+                times, deferred=("json",)
+            ),
+            ["json.decoder", "json"],
+        )
+
+    def test_report_import_times(self):
+        report = startup_import_times.report_import_times("json", slowest=1)
+        lines = report.split("\n")
+        self.assertTrue(lines[0].startswith("json: "))
+        self.assertEqual(len(lines), 3)
+
+
+class DeferredImports(unittest.TestCase):
+    def test_startup_modules(self):
+        for module in startup_import_times.STARTUP_MODULES:
+            with self.subTest(module=module):
+                cp = subprocess.run(
+                    [
+                        sys.executable,
+                        "-c",
+                        "; ".join(
+                            (
+                                "import sys",
+                                "import " + module,
+                                "print('\\n'.join(sys.modules))",
+                            )
+                        ),
+                    ],
+                    capture_output=True,
+                    text=True,
+                )
+                if cp.returncode:
+                    self.skipTest(cp.stderr.strip().split("\n")[-1])
+                self.assertEqual(
+                    startup_import_times.get_deferred_imports(
+                        [(0, 0, name) for name in cp.stdout.split()]
+                    ),
+                    [],
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
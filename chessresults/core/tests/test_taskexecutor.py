@@ -0,0 +1,110 @@
+# test_taskexecutor.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""taskexecutor tests, including cancelling tasks and waiting for them."""
+
+import unittest
+import threading
+
+from .. import taskexecutor
+
+
+def _loop(started, progress=None):
+    """Count items until cancelled."""
+    progress.start()
+    started.set()
+    while True:
+        progress.advance()
+
+
+class TaskExecutor(unittest.TestCase):
+    def setUp(self):
+        self.executor = taskexecutor.TaskExecutor()
+
+    def tearDown(self):
+        self.executor.cancel_all()
+        self.assertTrue(self.executor.wait(timeout=5))
+
+    def test_result_and_callback(self):
+        finished = []
+        progress = self.executor.submit(
+            "add",
+            lambda a, b, progress=None: a + b,
+            args=(1, 2),
+            callback=finished.append,
+        )
+        self.assertTrue(self.executor.wait(timeout=5))
+        self.assertEqual(finished, [progress])
+        self.assertTrue(progress.is_finished())
+        self.assertEqual(progress.state, taskexecutor.DONE)
+        self.assertEqual(progress.result, 3)
+        self.assertFalse(self.executor.is_busy())
+
+    def test_failed(self):
+        def fail(progress=None):
+            raise ValueError("bad data")
+
+        progress = self.executor.submit("fail", fail)
+        self.assertTrue(progress.wait(timeout=5))
+        self.assertEqual(progress.state, taskexecutor.FAILED)
+        self.assertIsInstance(progress.error, ValueError)
+
+    def test_cancel_running(self):
+        started = threading.Event()
+        progress = self.executor.submit("loop", _loop, args=(started,))
+        self.assertTrue(started.wait(timeout=5))
+        self.assertFalse(progress.is_finished())
+        self.executor.cancel(progress)
+        self.assertTrue(progress.wait(timeout=5))
+        self.assertEqual(progress.state, taskexecutor.CANCELLED)
+
+    def test_cancel_pending(self):
+        started = threading.Event()
+        running = self.executor.submit("loop", _loop, args=(started,))
+        pending = self.executor.submit("add", lambda progress=None: 1)
+        self.assertTrue(started.wait(timeout=5))
+        self.executor.cancel(pending)
+        self.assertTrue(pending.is_finished())
+        self.assertEqual(pending.state, taskexecutor.CANCELLED)
+        self.assertEqual(self.executor.get_running(), running)
+
+    def test_cancel_all_and_wait(self):
+        started = threading.Event()
+        running = self.executor.submit("loop", _loop, args=(started,))
+        pending = self.executor.submit("add", lambda progress=None: 1)
+        self.assertTrue(started.wait(timeout=5))
+        self.assertFalse(self.executor.wait(timeout=0.01))
+        self.executor.cancel_all()
+        self.assertTrue(self.executor.wait(timeout=5))
+        self.assertEqual(running.state, taskexecutor.CANCELLED)
+        self.assertEqual(pending.state, taskexecutor.CANCELLED)
+        self.assertIsNone(pending.result)
+        self.assertFalse(self.executor.is_busy())
+
+    def test_wait_when_idle(self):
+        self.assertTrue(self.executor.wait(timeout=0))
+
+
+class TaskProgress(unittest.TestCase):
+    def test_advance_after_cancel(self):
+        progress = taskexecutor.TaskProgress("task")
+        progress.start(total=2)
+        progress.advance()
+        progress.cancel()
+        self.assertRaises(taskexecutor.TaskCancelled, progress.advance)
+        self.assertEqual(progress.done, 1)
+
+    def test_report(self):
+        reports = []
+        progress = taskexecutor.TaskProgress(
+            "task", report=reports.append, interval=0
+        )
+        progress.start(total=2, stage="Stage one")
+        progress.advance()
+        self.assertEqual(reports[0], "Stage one")
+        self.assertTrue(reports[1].startswith("1 of 2 done"))
+
+
+if __name__ == "__main__":
+    unittest.main()
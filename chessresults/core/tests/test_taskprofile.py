@@ -0,0 +1,134 @@
+# test_taskprofile.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""taskprofile tests, including profiled tasks running at the same time."""
+
+import unittest
+from unittest import mock
+import os
+import io
+import shutil
+import tempfile
+import threading
+import cProfile
+import tracemalloc
+import contextlib
+
+from ...basecore import taskprofile
+
+
+def _task(value):
+    return [value] * 1000
+
+
+class Profiled(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def _profiles(self):
+        return sorted(
+            n
+            for n in os.listdir(self.folder)
+            if n.startswith(taskprofile.PROFILE_FILE_PREFIX)
+        )
+
+    def test_result_and_profile_files(self):
+        self.assertEqual(
+            taskprofile.profiled(_task, self.folder)(1), [1] * 1000
+        )
+        profiles = self._profiles()
+        self.assertEqual(len(profiles), 2)
+        self.assertTrue(profiles[0].endswith("-allocations.txt"))
+        self.assertTrue(profiles[1].endswith(".pstats"))
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_names_unique_within_second(self):
+        task = taskprofile.profiled(_task, self.folder)
+        for i in range(3):
+            task(i)
+        self.assertEqual(len(self._profiles()), 6)
+
+    def test_concurrent_tasks(self):
+        second_started = threading.Event()
+        first_finished = threading.Event()
+        errors = []
+
+        def run(method):
+            try:
+                taskprofile.profiled(method, self.folder)()
+            except Exception as exc:
+                errors.append(exc)
+
+        def second():
+            second_started.set()
+            first_finished.wait(timeout=5)
+            return _task(2)
+
+        thread = threading.Thread(target=run, args=(second,))
+
+        def first():
+            thread.start()
+            second_started.wait(timeout=5)
+            return _task(1)
+
+        run(first)
+        self.assertTrue(tracemalloc.is_tracing())
+        first_finished.set()
+        thread.join(timeout=5)
+        self.assertEqual(errors, [])
+        profiles = self._profiles()
+        self.assertEqual(
+            len([p for p in profiles if p.endswith("-allocations.txt")]), 2
+        )
+        self.assertEqual(
+            len([p for p in profiles if p.endswith(".pstats")]), 1
+        )
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertFalse(taskprofile._cprofile_active)
+
+    def test_other_profiler_active(self):
+        def enable(self):
+            raise ValueError("Another profiling tool is already active")
+
+        with mock.patch.object(cProfile.Profile, "enable", enable):
+            self.assertEqual(
+                taskprofile.profiled(_task, self.folder)(1), [1] * 1000
+            )
+        profiles = self._profiles()
+        self.assertEqual(len(profiles), 1)
+        with open(os.path.join(self.folder, profiles[0])) as summary:
+            self.assertTrue(summary.read().startswith("No time profile"))
+        self.assertFalse(taskprofile._cprofile_active)
+
+    def test_tracing_started_elsewhere_not_stopped(self):
+        tracemalloc.start()
+        try:
+            taskprofile.profiled(_task, self.folder)(1)
+            self.assertTrue(tracemalloc.is_tracing())
+        finally:
+            tracemalloc.stop()
+
+    def test_write_error_does_not_hide_result(self):
+        task = taskprofile.profiled(
+            _task, os.path.join(self.folder, "missing")
+        )
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            self.assertEqual(task(1), [1] * 1000)
+        self.assertIn("FileNotFoundError", stderr.getvalue())
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_write_error_does_not_hide_exception(self):
+        def fail():
+            raise ValueError("bad data")
+
+        task = taskprofile.profiled(fail, os.path.join(self.folder, "missing"))
+        with contextlib.redirect_stderr(io.StringIO()):
+            self.assertRaises(ValueError, task)
+
+
+if __name__ == "__main__":
+    unittest.main()
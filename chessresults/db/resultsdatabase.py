@@ -17,12 +17,17 @@ from bsddb3.db import (
     DB_INIT_LOG,
     DB_INIT_TXN,
     DB_PRIVATE,
+    DB_ARCH_ABS,
+    DB_ARCH_DATA,
+    DB_ARCH_LOG,
+    DB_FREE_SPACE,
 )
 
 from solentware_base import bsddb3_database
 
 from ..core.filespec import FileSpec
 from ..basecore import database
+from ..basecore import backup
 
 
 class ResultsDatabase(database.Database, bsddb3_database.Database):
@@ -57,6 +62,31 @@ class ResultsDatabase(database.Database, bsddb3_database.Database):
             (self.database_file, self.dbenv.get_lg_dir().decode())
         )
 
+    def backup_database(self, backup_folder):
+        """Do Berkeley DB hot backup of database to backup_folder.
+
+        Return names of files copied.
+
+        """
+        return backup.berkeley_hot_backup(
+            self, backup_folder, DB_ARCH_DATA, DB_ARCH_LOG, DB_ARCH_ABS
+        )
+
+    def compact_files(self):
+        """Compact Berkeley DB database files and return True.
+
+        Free pages are returned to the file system.
+
+        """
+        for tables in (self.table, self.segment_table):
+            for table in tables.values():
+                if table is not None:
+                    table.compact(flags=DB_FREE_SPACE)
+        for control in self.ebm_control.values():
+            if control.ebm_table is not None:
+                control.ebm_table.compact(flags=DB_FREE_SPACE)
+        return True
+
     # Not clear why _keyify is necessary or just returns value for Berkeley DB.
     def _keyify(self, value):
         """Tranform a value from an ECF DbaseIII file for database key search.
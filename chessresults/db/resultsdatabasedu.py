@@ -0,0 +1,18 @@
+# resultsdatabasedu.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Results database using Berkeley DB via bsddb3 with deferred updates.
+
+Used to fill a new database in bulk, as the migrate_database tool does.
+"""
+
+from solentware_base import bsddb3du_database
+
+from . import resultsdatabase
+
+
+class ResultsDatabase(
+    resultsdatabase.ResultsDatabase, bsddb3du_database.Database
+):
+    """Results database which sorts index updates and applies them in bulk."""
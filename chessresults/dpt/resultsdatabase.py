@@ -7,20 +7,60 @@
 
 import os
 import shutil
+import time
+import weakref
 
 from solentware_base import dpt_database
+from solentware_base.core.constants import FILE, FOLDER
 
 from ..core.filespec import FileSpec
 from ..basecore import database
+from ..basecore import backup
 from .. import APPLICATION_NAME
 
+# Files opened on demand are closed by close_idle_files if not used for this
+# many seconds and no cursors on the file exist.
+IDLE_SECONDS = 300
+
+
+class ResultsDatabaseError(Exception):
+    pass
+
+
+class _FileTable(dict):
+    """Map file names to DPTFile instances opening each file on first use.
+
+    The time each file was last used is noted for close_idle_files.
+
+    """
+
+    def __init__(self, database):
+        super(_FileTable, self).__init__()
+        self._database = database
+        self.last_used = {}
+
+    def __getitem__(self, file):
+        self.last_used[file] = time.monotonic()
+        return super().__getitem__(file)
+
+    def __missing__(self, file):
+        return self._database.open_file_on_demand(file)
+
 
 class ResultsDatabase(database.Database, dpt_database.Database):
-    """Provide access to a database of results of games of chess."""
+    """Provide access to a database of results of games of chess.
+
+    Opening a DPT file means allocating its dataset and opening a context,
+    which is slow for large databases, so files not named in the files
+    argument of open_database are opened when first used.
+
+    """
 
     _datasourceset_modulename = "solentware_grid.dpt.dptdatasourceset"
     _knownnames_modulename = "chessresults.dpt.knownnames"
 
+    open_files_on_demand = True
+
     def __init__(self, databasefolder, **kargs):
 
         try:
@@ -32,18 +72,68 @@ class ResultsDatabase(database.Database, dpt_database.Database):
         super(ResultsDatabase, self).__init__(
             ddnames, databasefolder, sysprint=sysprint, **kargs
         )
+        self.table = _FileTable(self)
+        self._opened_on_demand = set()
+        self._file_cursors = {}
 
     def delete_database(self):
-        """Close and delete the open chess results database."""
-        names = [self.sysfolder]
-        for k, v in self.table.items():
-            names.append(v.file)
-        return super().delete_database(names)
+        """Close and delete the open chess results database.
+
+        Files not opened yet are deleted without opening them.
+
+        """
+        return super().delete_database([self.sysfolder] + self._file_names())
+
+    def _file_names(self):
+        """Return names of the database files, open or not."""
+        names = [dptfile.file for dptfile in dict.values(self.table)]
+        for file, specification in self.specification.items():
+            if file not in self.table:
+                names.append(
+                    os.path.join(
+                        specification.get(FOLDER) or self.home_directory,
+                        specification[FILE],
+                    )
+                )
+        return names
+
+    def backup_database(self, backup_folder):
+        """Copy DPT files to backup_folder and return names of files copied.
+
+        Each open file, except the control file, is closed so its changed
+        pages are written to disk, and is opened again after the copy.  The
+        record sets on these files, and the cursors using them, do not
+        survive the backup.  Files not open are copied without opening
+        them.  The backup is not done if an update is in progress.  Files
+        which have not changed since the last backup to backup_folder are
+        not copied.
+
+        """
+        if self.dbenv.UpdateIsInProgress():
+            raise backup.BackupError(
+                "Cannot backup database while an update is in progress"
+            )
+        names = self._file_names()
+        files = [file for file in self.specification if file in self.table]
+        for file in files:
+            dict.__getitem__(self.table, file).close_file(self.dbenv)
+        try:
+            return backup.copy_files(
+                self.home_directory, names, backup_folder
+            )
+        finally:
+            for file in files:
+                dict.__getitem__(self.table, file).open_file(self.dbenv)
 
     def open_database(self, files=None):
         """Return '' if all files are opened in Normal mode (FISTAT == 0),
         or a message explaining why it remains closed.
+
+        Files not in files, by default all files, are opened on first use.
+
         """
+        if files is None:
+            files = ()
         super().open_database(files=files)
         fistat = dict()
         for dbo in self.table.values():
@@ -75,3 +165,121 @@ class ResultsDatabase(database.Database, dpt_database.Database):
                 "backups, or source data, before trying again.",
             )
         )
+
+    def close_database(self):
+        """Extend, forget files so they are opened on demand if reopened."""
+        super().close_database()
+        self.table.clear()
+        self.table.last_used.clear()
+        self._opened_on_demand.clear()
+        self._file_cursors.clear()
+
+    def open_file_on_demand(self, file):
+        """Open file, not opened by open_database, and return its DPTFile.
+
+        Called when a file not in self.table is used.
+
+        """
+        if self.dbenv is None or file not in self.specification:
+            raise KeyError(file)
+        dptfile = self._dptfileclass()(
+            dbset=file,
+            default_dataset_folder=self.home_directory,
+            sfi=list(self.specification).index(file),
+            **self.specification[file]
+        )
+        dptfile.open_file(self.dbenv)
+        fistat = dptfile.get_file_parameters(self.dbenv)["FISTAT"]
+        if fistat[0] != 0:
+            dptfile.close_file(self.dbenv)
+            raise ResultsDatabaseError(
+                "".join(
+                    (
+                        APPLICATION_NAME,
+                        " opened file ",
+                        os.path.basename(dptfile.file),
+                        " but found it is not in the Normal state (",
+                        fistat[1],
+                        ").\n\nRestore the database from backups, or ",
+                        "source data, before trying again.",
+                    )
+                )
+            )
+        dict.__setitem__(self.table, file, dptfile)
+        self.table.last_used[file] = time.monotonic()
+        self._opened_on_demand.add(file)
+        if not self.dbenv.UpdateIsInProgress():
+            self.increase_database_size(files={file: None})
+        return dptfile
+
+    def open_database_files(self, files=None):
+        """Open files, by default all files, not already open."""
+        if files is None:
+            files = self.specification
+        for file in files:
+            if file not in self.table:
+                self.open_file_on_demand(file)
+
+    def allocate_and_open_contexts(self, files=None):
+        """Override, re-open files in files which are still in self.table.
+
+        Files not in self.table, perhaps closed by close_idle_files, will be
+        opened on demand.
+
+        """
+        super().allocate_and_open_contexts(
+            files=[f for f in files if f in self.table]
+        )
+
+    def database_cursor(self, file, field, keyrange=None, recordset=None):
+        """Extend, note cursor so file is not closed while cursor exists."""
+        return self._note_cursor(
+            file,
+            super().database_cursor(
+                file, field, keyrange=keyrange, recordset=recordset
+            ),
+        )
+
+    def create_recordset_cursor(self, dbset, dbname, recordset):
+        """Extend, note cursor so file is not closed while cursor exists."""
+        return self._note_cursor(
+            dbset, super().create_recordset_cursor(dbset, dbname, recordset)
+        )
+
+    def create_recordsetlist_cursor(self, dbset, dbname, keyrange, recordset):
+        """Extend, note cursor so file is not closed while cursor exists."""
+        return self._note_cursor(
+            dbset,
+            super().create_recordsetlist_cursor(
+                dbset, dbname, keyrange, recordset
+            ),
+        )
+
+    def _note_cursor(self, file, cursor):
+        self._file_cursors.setdefault(file, weakref.WeakSet()).add(cursor)
+        return cursor
+
+    def close_idle_files(self, idle=IDLE_SECONDS):
+        """Close files opened on demand and not used for idle seconds.
+
+        A file is not closed while any cursor created on it still exists,
+        because closing a file destroys its record sets, or while an update
+        is in progress.  Return the names of the files closed.
+
+        """
+        closed = []
+        if self.dbenv is None or self.dbenv.UpdateIsInProgress():
+            return closed
+        now = time.monotonic()
+        for file in sorted(self._opened_on_demand):
+            if now - self.table.last_used.get(file, now) < idle:
+                continue
+            if self._file_cursors.get(file):
+                continue
+            dict.__getitem__(self.table, file).close_file(self.dbenv)
+            del self.table[file]
+            del self.table.last_used[file]
+            self._opened_on_demand.remove(file)
+            self._file_cursors.pop(file, None)
+            closed.append(file)
+        return closed
@@ -24,6 +24,7 @@ from solentware_misc.gui import tasklog
 
 from ...core import resultsrecord
 from ...core import filespec
+from ...core import taskexecutor
 from ...core import constants
 from ...core.ecf import ecfmaprecord
 from ...core.ecf import ecfrecord
@@ -41,6 +42,7 @@ class ActiveClubs(logpanel.WidgetAndLogPanel):
 
     _btn_closeactiveclubs = "activeclubs_close"
     _btn_applyactiveclubs = "activeclubs_apply"
+    _btn_stopactiveclubs = "activeclubs_stop"
 
     def __init__(
         self,
@@ -79,10 +81,17 @@ class ActiveClubs(logpanel.WidgetAndLogPanel):
                     underline=0,
                     command=self.on_apply_downloaded_active_clubs,
                 ),
+                self._btn_stopactiveclubs: dict(
+                    text="Stop Apply Active Clubs",
+                    tooltip="Stop the active clubs update and back out changes.",
+                    underline=0,
+                    command=self.on_stop_apply_downloaded_active_clubs,
+                ),
             },
             starttaskbuttons=(
                 self._btn_closeactiveclubs,
                 self._btn_applyactiveclubs,
+                self._btn_stopactiveclubs,
             ),
             runmethod=False,
             runmethodargs=dict(),
@@ -90,6 +99,7 @@ class ActiveClubs(logpanel.WidgetAndLogPanel):
             **kargs
         )
         self._closecontexts = closecontexts
+        self._progress = None
 
         # Import may need to increase file size (DPT) so close DPT contexts in
         # this thread.
@@ -177,7 +187,7 @@ class ActiveClubs(logpanel.WidgetAndLogPanel):
         """
         pass
 
-    def apply_downloaded_active_clubs(self, *args, **kargs):
+    def apply_downloaded_active_clubs(self, *args, progress=None, **kargs):
         """Apply new, and update existing, club_codes from download.
 
         args and kargs soak up arguments set by threading or multiprocessing
@@ -189,13 +199,42 @@ class ActiveClubs(logpanel.WidgetAndLogPanel):
             logwidget=self.tasklog,
             ecfdata=self.active_clubs,
             downloaddate=self.downloaddate,
+            progress=progress,
         )
 
+    def _apply_downloaded_active_clubs_finished(self, progress):
+        """Report outcome of apply_downloaded_active_clubs task."""
+        if progress.state == taskexecutor.FAILED:
+            self.tasklog.append_text(
+                "".join(
+                    (
+                        "Apply Active Clubs failed: ",
+                        str(progress.error),
+                    )
+                )
+            )
+
+    def on_stop_apply_downloaded_active_clubs(self, event=None):
+        """Stop the apply_downloaded_active_clubs task at next check."""
+        if self._progress is None:
+            return
+        if self._progress.state in (
+            taskexecutor.PENDING,
+            taskexecutor.RUNNING,
+        ):
+            self.get_appsys().get_task_executor().cancel(self._progress)
+            self.tasklog.append_text(
+                "Stop requested.  Changes made so far will be backed out."
+            )
+
     def on_cancel_apply_downloaded_active_clubs(self, event=None):
         """Do any tidy up before switching to next panel.
 
-        Re-open the files that were closed on creating this widget.
+        Stop the update if it has not finished, then re-open the files that
+        were closed on creating this widget.
         """
+        if self._progress is not None and not self._progress.is_finished():
+            self.get_appsys().stop_tasks(progress=self._progress)
         self.get_appsys().get_results_database().allocate_and_open_contexts(
             files=self._closecontexts
         )
@@ -214,7 +253,7 @@ class ActiveClubs(logpanel.WidgetAndLogPanel):
                 )
 
     def on_apply_downloaded_active_clubs(self, event=None):
-        """Run apply_downloaded_active_clubs in separate thread."""
+        """Queue apply_downloaded_active_clubs to run in separate thread."""
         dlg = tkinter.messagebox.askquestion(
             parent=self.get_widget(),
             title="Apply Active Clubs",
@@ -227,7 +266,17 @@ class ActiveClubs(logpanel.WidgetAndLogPanel):
         )
         if dlg != tkinter.messagebox.YES:
             return
-        self.tasklog.run_method(method=self.apply_downloaded_active_clubs)
+        executor = self.get_appsys().get_task_executor()
+        if executor.is_busy():
+            self.tasklog.append_text(
+                "Update queued until earlier tasks are finished."
+            )
+        self._progress = executor.submit(
+            "Apply Active Clubs",
+            self.apply_downloaded_active_clubs,
+            report=self.tasklog.append_text,
+            callback=self._apply_downloaded_active_clubs_finished,
+        )
 
     def show_buttons_for_cancel_import(self):
         """Show buttons for actions allowed at start of import process."""
@@ -18,14 +18,8 @@ import io
 import email
 import base64
 import json
-import urllib.request
 import datetime
 
-try:
-    import tnefparse
-except ImportError:  # Not ModuleNotFoundError for Pythons earlier than 3.6
-    tnefparse = None
-
 from solentware_misc.gui import dialogue
 from solentware_misc.core.getconfigurationitem import get_configuration_item
 
@@ -192,12 +186,26 @@ class Control(control_database.Control):
             self, self._btn_ecfresultsfeedbackmonthly
         )
 
-    def _ecf_download(self, name, button, default_url, contexts, structure):
+    def _ecf_download(
+        self,
+        name,
+        button,
+        default_url,
+        contexts,
+        structure,
+        companion_url=None,
+    ):
         """Do download actions for rated players or active clubs.
 
         The process is identical so provide arguments to fit each case.
 
+        The companion_url list, if given, is prefetched into the download
+        cache in the database folder without waiting for it.
+
         """
+        # Imported on first use to keep urllib.request out of start-up.
+        from ...core.ecf import downloadcache
+
         name_title = name.title()
         title = " ".join(("Get", name_title))
         dlg = ecfdownload.ECFDownloadDialogue(
@@ -234,20 +242,26 @@ class Control(control_database.Control):
                 self.inhibit_context_switch(button)
                 return
             urlname = dialogue_result["URL"]
-            try:
-                url = urllib.request.urlopen(urlname)
-            except Exception as exc:
-                tkinter.messagebox.showinfo(
-                    parent=self.get_widget(),
-                    title=title,
-                    message="".join(
-                        ("Exception raised trying to open URL\n\n", str(exc))
-                    ),
+
+            cache = downloadcache.DownloadCache(
+                os.path.join(
+                    self.get_appsys().get_results_database().home_directory,
+                    constants.ECF_DOWNLOAD_CACHE,
                 )
-                self.inhibit_context_switch(button)
-                return
+            )
+
+            # The other list is usually downloaded next so prefetch it into
+            # the cache.
+            if companion_url is not None:
+                companion = get_configuration_item(
+                    configuration.Configuration().get_configuration_file_name(),
+                    companion_url,
+                    constants.DEFAULT_URLS,
+                )
+                if companion != urlname:
+                    cache.prefetch([companion])
             try:
-                urldata = url.read()
+                urldata, cached = cache.fetch(urlname)
             except Exception as exc:
                 tkinter.messagebox.showinfo(
                     parent=self.get_widget(),
@@ -334,23 +348,11 @@ class Control(control_database.Control):
 
     def _ecf_players_structure(self, data):
         """Callback for _ecf_download to validate json data structure."""
-        if set(data.keys()) == constants.PLAYERS_RATINGS_KEYS:
-            if (
-                tuple(data[constants.P_R_COLUMN_NAMES])
-                == constants.PLAYERS_RATINGS_COLUMN_NAMES
-            ):
-                return data
-        raise RuntimeError(
-            "Downloaded data not in expected format for rated players"
-        )
+        return ecfdataimport.check_players_ratings_structure(data)
 
     def _ecf_clubs_structure(self, data):
         """Callback for _ecf_download to validate json data structure."""
-        if set(data.keys()) == constants.ACTIVE_CLUBS_KEYS:
-            return data
-        raise RuntimeError(
-            "Downloaded data not in expected format for active clubs"
-        )
+        return ecfdataimport.check_active_clubs_structure(data)
 
     def on_ecf_players_download(self, event=None):
         """Do list of rated players download actions."""
@@ -360,6 +362,7 @@ class Control(control_database.Control):
             constants.PLAYERS_RATINGS_URL,
             (ECFPLAYER_FILE_DEF, ECFTXN_FILE_DEF, MAPECFPLAYER_FILE_DEF),
             self._ecf_players_structure,
+            companion_url=constants.ACTIVE_CLUBS_URL,
         )
 
     def on_ecf_clubs_download(self, event=None):
@@ -370,6 +373,7 @@ class Control(control_database.Control):
             constants.ACTIVE_CLUBS_URL,
             (ECFCLUB_FILE_DEF, ECFTXN_FILE_DEF),
             self._ecf_clubs_structure,
+            companion_url=constants.PLAYERS_RATINGS_URL,
         )
 
     def on_quit_ecf_zipped_files(self, event=None):
@@ -576,6 +580,15 @@ class Control(control_database.Control):
         )
 
 
+def _import_tnefparse():
+    """Return tnefparse module, imported when first needed, or None."""
+    try:
+        import tnefparse
+    except ImportError:  # Not ModuleNotFoundError for Pythons earlier than 3.6
+        return None
+    return tnefparse
+
+
 def _get_feedback_text(file):
     """Return feedback text from open file.
 
@@ -601,6 +614,7 @@ def _get_feedback_text(file):
                 ]
             )
         elif ct == "application/ms-tnef":
+            tnefparse = _import_tnefparse()
             if not tnefparse:
                 text.append(
                     b"Cannot process feedback: tnefparse is not installed."
@@ -5,18 +5,32 @@
 """Results database panel for allocating ECF grading codes.
 """
 
+import os
+import ast
+import queue
+import threading
 import tkinter
 import tkinter.messagebox
 
+from solentware_misc.core.getconfigurationitem import get_configuration_item
 from solentware_misc.gui import panel
 
 from ...core.ecf import ecfrecord
 from ...core.ecf import ecfmaprecord
+from ...core.ecf import ecflookup
+from ...core.ecf.feedbackupdate import FeedbackUpdate
 from ...core import resultsrecord
 from ...core import filespec
+from ...core import batchlookup
+from ...core import constants
+from ...core import configuration
+from ...basecore.ecfdataimport import copy_single_ecf_players_post_2020_rules
 from . import ecfplayergrids
 from . import ecfdetail
 
+# Interval, in milliseconds, between checks for end of ECF code lookup.
+_LOOKUP_POLL_INTERVAL = 200
+
 
 class ECFGradingCodes(panel.PanedPanelGridSelectorBar):
 
@@ -28,12 +42,15 @@ class ECFGradingCodes(panel.PanedPanelGridSelectorBar):
     _btn_grading_code = "ecfgradingcodes_grading_code"
     _btn_grading_code_download = "ecfgradingcodes_grading_code_download"
     _btn_ecf_name_download = "ecfgradingcodes_ecf_name_download"
+    _btn_selected_download = "ecfgradingcodes_selected_download"
     _btn_cancel_edit_ecf_name = "ecfgradingcodes_cancel"
 
     def __init__(self, parent=None, cnf=dict(), **kargs):
         """Extend and define the results database ECF grading code panel."""
         self.newpersongrid = None
         self.ecfpersongrid = None
+        self._lookup_results = None
+        self._lookup_poll = None
 
         super(ECFGradingCodes, self).__init__(parent=parent, cnf=cnf, **kargs)
 
@@ -45,6 +62,7 @@ class ECFGradingCodes(panel.PanedPanelGridSelectorBar):
                 self._btn_grading_code,
                 self._btn_cancel_edit_ecf_name,
                 self._btn_grading_code_download,
+                self._btn_selected_download,
             )
         )
         self.create_buttons()
@@ -71,8 +89,13 @@ class ECFGradingCodes(panel.PanedPanelGridSelectorBar):
 
         Used, at least, as callback from AppSysFrame container.
 
+        The ECF code lookup in progress, if any, is left to finish and its
+        results are ignored.
+
         """
-        pass
+        if self._lookup_poll is not None:
+            self.get_widget().after_cancel(self._lookup_poll)
+            self._lookup_poll = None
 
     def describe_buttons(self):
         """Define all action buttons that may appear on ECF grading code page."""
@@ -126,6 +149,18 @@ class ECFGradingCodes(panel.PanedPanelGridSelectorBar):
             underline=2,
             command=self.on_grading_code_download,
         )
+        self.define_button(
+            self._btn_selected_download,
+            text="Download Selected",
+            tooltip="".join(
+                (
+                    "Download ECF codes and names for reported codes of ",
+                    "selected and bookmarked new players.",
+                )
+            ),
+            underline=9,
+            command=self.on_selected_download,
+        )
 
     def cancel_edit_player_ecf_name(self):
         """Remove player from new player grid cancelling ECF name edit."""
@@ -383,6 +418,261 @@ class ECFGradingCodes(panel.PanedPanelGridSelectorBar):
         if dlg.is_yes():
             self.refresh_controls((self.ecfpersongrid,))
 
+    def download_selected_new_players(self):
+        """Download ECF details for codes of selected and bookmarked players.
+
+        The ECF code entered for the new player, and the codes reported
+        for the player in results, are looked up on the ECF website at
+        the same time.  Codes already on the ECF player list are ignored.
+
+        The lookup is done in a separate thread so the application stays
+        responsive while waiting for the ECF website.
+
+        """
+        title = "Download ECF Codes for Selected New Players"
+        if self._lookup_results is not None:
+            tkinter.messagebox.showinfo(
+                parent=self.get_widget(),
+                message="A download of ECF codes is already in progress",
+                title=title,
+            )
+            return
+        nsel = self.newpersongrid.selection
+        nbkm = self.newpersongrid.bookmarks
+        if len(nsel) + len(nbkm) == 0:
+            tkinter.messagebox.showinfo(
+                parent=self.get_widget(),
+                message=" ".join(
+                    (
+                        "Please select or bookmark the new players for whom",
+                        "download of ECF codes and names should be attempted",
+                    )
+                ),
+                title=title,
+            )
+            return
+        db = self.get_appsys().get_results_database()
+        maprecords = batchlookup.get_records(
+            db,
+            filespec.MAPECFPLAYER_FILE_DEF,
+            list({n[-1] for n in nsel + nbkm}),
+            ecfmaprecord.ECFmapDBrecordPlayer,
+        )
+        maprecords = [mr for mr in maprecords.values() if mr is not None]
+        aliases = batchlookup.get_records(
+            db,
+            filespec.PLAYER_FILE_DEF,
+            [ast.literal_eval(mr.value.playerkey) for mr in maprecords],
+            resultsrecord.ResultsDBrecordPlayer,
+        )
+
+        # Reported codes which look like ECF codes with wrong check letter
+        # are listed but not looked up.
+        ecfcodes = {}
+        membershipnumbers = {}
+        invalid = []
+        for mr in maprecords:
+            alias = aliases[ast.literal_eval(mr.value.playerkey)]
+            if alias is None:
+                continue
+            reportedcodes = list(alias.value.reported_codes or ())
+            if mr.value.playerecfcode:
+                reportedcodes.append(mr.value.playerecfcode)
+            for rc in reportedcodes:
+                for ecfcode, number in ecflookup.split_reported_code(rc):
+                    if number:
+                        membershipnumbers.setdefault(number, alias)
+                    elif ecflookup.is_ecf_code_valid(ecfcode.upper()):
+                        ecfcodes.setdefault(ecfcode.upper(), alias)
+                    else:
+                        invalid.append((ecfcode, alias))
+        update = FeedbackUpdate(db)
+        for code in set(ecfcodes).difference(
+            update.get_ecf_player_codes_not_on_database(ecfcodes)
+        ):
+            del ecfcodes[code]
+        if not ecfcodes and not membershipnumbers:
+            tkinter.messagebox.showinfo(
+                parent=self.get_widget(),
+                message="".join(
+                    (
+                        "No codes to look up for selected new players",
+                        "\n\n" if invalid else "",
+                        _lines_for_invalid_codes(invalid),
+                    )
+                ),
+                title=title,
+            )
+            return
+
+        configfile = (
+            configuration.Configuration().get_configuration_file_name()
+        )
+        urls = ecflookup.get_player_urls(
+            get_configuration_item(
+                configfile, constants.PLAYER_INFO_URL, constants.DEFAULT_URLS
+            ),
+            ecfcodes,
+        )
+        urls.update(
+            ecflookup.get_member_urls(
+                get_configuration_item(
+                    configfile,
+                    constants.MEMBER_INFO_URL,
+                    constants.DEFAULT_URLS,
+                ),
+                membershipnumbers,
+            )
+        )
+        cache = ecflookup.URLCache(
+            os.path.expanduser(os.path.join("~", constants.ECF_LOOKUP_CACHE))
+        )
+        reported = dict(ecfcodes)
+        reported.update(
+            ("".join(("ME", n)), a) for n, a in membershipnumbers.items()
+        )
+        self._lookup_results = queue.Queue()
+        threading.Thread(
+            target=_fetch_ecf_codes,
+            args=(
+                ecflookup.ECFLookup(cache=cache),
+                urls,
+                self._lookup_results,
+            ),
+            daemon=True,
+        ).start()
+        self.get_widget().configure(cursor="watch")
+        self._lookup_poll = self.get_widget().after(
+            _LOOKUP_POLL_INTERVAL,
+            self._poll_ecf_code_lookup,
+            title,
+            reported,
+            invalid,
+        )
+
+    def _poll_ecf_code_lookup(self, title, reported, invalid):
+        """Offer to add ECF codes found when lookup finishes."""
+        try:
+            results, error = self._lookup_results.get_nowait()
+        except queue.Empty:
+            self._lookup_poll = self.get_widget().after(
+                _LOOKUP_POLL_INTERVAL,
+                self._poll_ecf_code_lookup,
+                title,
+                reported,
+                invalid,
+            )
+            return
+        self._lookup_results = None
+        self._lookup_poll = None
+        self.get_widget().configure(cursor="")
+        if error is not None:
+            tkinter.messagebox.showinfo(
+                parent=self.get_widget(),
+                message="".join(
+                    (
+                        "Exception raised trying to download ECF codes:\n\n",
+                        str(error),
+                    )
+                ),
+                title=title,
+            )
+            return
+        db = self.get_appsys().get_results_database()
+        update = FeedbackUpdate(db)
+        found = {}
+        failed = []
+        for key in sorted(results):
+            ecfdata, error = results[key]
+            if error is None and (
+                not isinstance(ecfdata, dict) or not ecfdata.get("ECF_code")
+            ):
+                error = "no ECF code in response"
+            if error is not None:
+                failed.append((key, reported[key], error))
+                continue
+            found.setdefault(
+                ecfdata["ECF_code"], (ecfdata, key, reported[key])
+            )
+        for code in set(found).difference(
+            update.get_ecf_player_codes_not_on_database(found)
+        ):
+            del found[code]
+        lines = []
+        for code in sorted(found):
+            ecfdata, key, alias = found[code]
+            lines.append(
+                "".join(
+                    (
+                        ecfdata["ECF_code"],
+                        "  ",
+                        str(ecfdata["full_name"]),
+                        "  (",
+                        alias.value.name,
+                        " reported as ",
+                        key,
+                        ")",
+                    )
+                )
+            )
+        for key, alias, error in failed:
+            lines.append(
+                "".join(
+                    (
+                        key,
+                        " for ",
+                        alias.value.name,
+                        " not found: ",
+                        str(error),
+                    )
+                )
+            )
+        if invalid:
+            lines.append(_lines_for_invalid_codes(invalid))
+        if not found:
+            tkinter.messagebox.showinfo(
+                parent=self.get_widget(),
+                message="".join(
+                    (
+                        "No ECF codes found which are not on database\n\n",
+                        "\n".join(lines),
+                    )
+                ),
+                title=title,
+            )
+            return
+        if not tkinter.messagebox.askyesno(
+            parent=self.get_widget(),
+            message="".join(
+                (
+                    "\n".join(lines),
+                    "\n\nShould the ",
+                    str(len(found)),
+                    " ECF codes and names found be added to database?",
+                )
+            ),
+            title=title,
+        ):
+            return
+        errors = []
+        for code in sorted(found):
+            try:
+                copy_single_ecf_players_post_2020_rules(db, found[code][0])
+            except Exception as exc:
+                errors.append("".join((code, ": ", str(exc))))
+        self.refresh_controls((self.ecfpersongrid,))
+        if errors:
+            tkinter.messagebox.showinfo(
+                parent=self.get_widget(),
+                message="".join(
+                    (
+                        "Exception raised trying to add ECF codes:\n\n",
+                        "\n".join(errors),
+                    )
+                ),
+                title=title,
+            )
+
     def on_identify(self, event=None):
         """Link a player name with a grading code record."""
         self.select_grading_code()
@@ -414,6 +704,11 @@ class ECFGradingCodes(panel.PanedPanelGridSelectorBar):
         self.download_new_player_grading_code()
         return "break"
 
+    def on_selected_download(self, event=None):
+        """Download ECF details for codes of selected new players."""
+        self.download_selected_new_players()
+        return "break"
+
     def on_ecf_name_download(self, event=None):
         """Download the ECF name for the locally entered ECF code."""
         self.download_ecf_name_for_ecf_code()
@@ -649,3 +944,27 @@ class ECFGradingCodes(panel.PanedPanelGridSelectorBar):
             )
         )
         return
+
+
+def _fetch_ecf_codes(lookup, urls, results):
+    """Put (fetched urls, exception) on results queue.  Not Tk thread."""
+    try:
+        lookup.cache.remove_expired()
+        results.put((lookup.fetch(urls), None))
+    except Exception as exc:
+        results.put((None, exc))
+
+
+def _lines_for_invalid_codes(invalid):
+    """Return text listing reported codes with wrong check character."""
+    return "\n".join(
+        "".join(
+            (
+                ecfcode,
+                " for ",
+                alias.value.name,
+                " does not have the correct check character",
+            )
+        )
+        for ecfcode, alias in invalid
+    )
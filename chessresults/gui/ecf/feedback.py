@@ -11,24 +11,23 @@ to the database.
 """
 
 import tkinter
-import datetime
 
 from solentware_misc.gui import panel
 from solentware_misc.gui import textreadonly
 from solentware_misc.gui import tasklog
 
-from ...core import resultsrecord
 from ...core import filespec
 from ...core import constants
 from ...core.ecf import ecfrecord
-from ...core.ecf import ecfmaprecord
-
-subline = "Line "
-pinline = "New Player - Pin "
-newcodeline = "New code generated - "
-usecodeline = "Code to be used is "
-mergecodeline = ": Please note that the ECF Code supplied ("
-clubline = ": New Club supplied ("
+from ...core.ecf import feedbackupdate
+from ...core.ecf.feedbackupdate import (
+    subline,
+    pinline,
+    newcodeline,
+    usecodeline,
+    mergecodeline,
+    clubline,
+)
 
 
 class Feedback(panel.PlainPanel):
@@ -120,171 +119,11 @@ class Feedback(panel.PlainPanel):
         """
         if not self.allowapplycodes:
             return False
-
-        def new_club():
-            record = ecfrecord.ECFrefDBrecordECFclub()
-            record.key.recno = None
-            record.value.ECFcode = fbplayer[constants.CLUB_CODE]
-            record.value.ECFname = fbplayer[constants.CLUB]
-            record.value.ECFactive = False
-            record.put_record(database, filespec.ECFCLUB_FILE_DEF)
-            applycodesreport.append(
-                (
-                    fbplayer[constants.CLUB_CODE],
-                    fbplayer[constants.CLUB],
-                    "added as feedback update to club list",
-                )
-            )
-
-        def new_ecf_player(gcode):
-            record = ecfrecord.ECFrefDBrecordECFplayer()
-            record.key.recno = None
-            record.value.ECFcode = gcode
-            record.value.ECFname = fbplayer[constants.NAME]
-            record.value.ECFactive = False
-            if fbplayer[mergecodeline]:
-                record.value.ECFmerge = fbplayer[mergecodeline]
-            record.put_record(database, filespec.ECFPLAYER_FILE_DEF)
-            applycodesreport.append(
-                (
-                    gcode,
-                    fbplayer[constants.NAME],
-                    "added as feedback update to master list",
-                )
-            )
-
-        def update_ecf_player():
-
-            # Unmerge not done by feedback merge line.
-            # Currently wait for full Masterlist, but does absence of merge
-            # line imply break merge if it does not exist?
-            if not fbplayer[mergecodeline]:
-                return False
-
-            if fbplayer[mergecodeline] == ecfplayer.value.ECFmerge:
-                return
-            if ecfplayer.value.ECFmerge:
-                repmerge = " ".join(
-                    ("replacing noted merge into", ecfplayer.value.ECFmerge)
-                )
-            else:
-                repmerge = ""
-            ecfplayerclone = ecfplayer.clone()
-            ecfplayerclone.value.ECFmerge = fbplayer[mergecodeline]
-            ecfplayerclone.value.ECFactive = not bool(fbplayer[mergecodeline])
-            ecfplayer.edit_record(
-                database,
-                filespec.ECFPLAYER_FILE_DEF,
-                filespec.ECFPLAYER_FIELD_DEF,
-                ecfplayerclone,
-            )
-            applycodesreport.append(
-                (
-                    fbplayer[constants.BCF_CODE],
-                    fbplayer[constants.NAME],
-                    "noted as merged into",
-                    fbplayer[mergecodeline],
-                    "in feedback update",
-                    repmerge,
-                )
-            )
-            return True
-
-        def update_person(gcode):
-            personclone = person.clone()
-            personclone.value.playerecfcode = None
-            personclone.value.playerecfname = None
-            personclone.value.playercode = gcode
-            person.edit_record(
-                database,
-                filespec.MAPECFPLAYER_FILE_DEF,
-                filespec.MAPECFPLAYER_FIELD_DEF,
-                personclone,
-            )
-            applycodesreport.append(
-                (
-                    fbplayer[constants.PIN],
-                    fbplayer[constants.NAME],
-                    "associated with",
-                    gcode,
-                )
-            )
-
-        def update_player_club():
-            player = self._get_ecfmaprecord_for_player(
-                database, int(fbplayer[constants.PIN])
-            )
-            if player:
-                playerclone = player.clone()
-                playerclone.value.clubecfname = None
-                playerclone.value.clubecfcode = None
-                playerclone.value.clubcode = fbplayer[constants.CLUB_CODE]
-                player.edit_record(
-                    database,
-                    filespec.MAPECFCLUB_FILE_DEF,
-                    filespec.MAPECFCLUB_FIELD_DEF,
-                    playerclone,
-                )
-                applycodesreport.append(
-                    (
-                        fbplayer[constants.PIN],
-                        fbplayer[constants.NAME],
-                        "associated with club",
-                        fbplayer[constants.CLUB_CODE],
-                        fbplayer[constants.CLUB],
-                        "on club list",
-                    )
-                )
-
-        ecfdate = "".join(datetime.date.today().isoformat().split("-"))
-        applycodesreport = []
         self.allowapplycodes = False
         database = self.get_appsys().get_results_database()
-        database.start_transaction()
-        for fbplayer in self.newcodesapply:
-            if fbplayer[pinline]:
-                person = self._get_ecfmaprecord_for_new_person(
-                    database, int(fbplayer[constants.PIN])
-                )
-                if person:
-                    ecfgcode = fbplayer[newcodeline]
-                    if fbplayer[usecodeline]:
-                        ecfgcode = fbplayer[usecodeline]
-                    if ecfgcode:
-                        if (
-                            ecfrecord.get_ecf_player_for_grading_code(
-                                database, ecfgcode
-                            )
-                            is None
-                        ):
-                            new_ecf_player(ecfgcode)
-                        update_person(ecfgcode)
-                if self._is_ecf_club_code_a_new_club(
-                    database, fbplayer[constants.CLUB_CODE]
-                ):
-                    new_club()
-                update_player_club()
-            else:
-                ecfplayer = ecfrecord.get_ecf_player_for_grading_code(
-                    database, fbplayer[constants.BCF_CODE]
-                )
-                if ecfplayer is None:
-                    callup = new_ecf_player(fbplayer[constants.BCF_CODE])
-                else:
-                    callup = update_ecf_player()
-                person = self._get_ecfmaprecord_for_person(
-                    database, int(fbplayer[constants.PIN])
-                )
-                if person:
-                    if callup:
-                        update_person(fbplayer[constants.BCF_CODE])
-                if fbplayer[clubline]:
-                    if self._is_ecf_club_code_a_new_club(
-                        database, fbplayer[constants.CLUB_CODE]
-                    ):
-                        new_club()
-                    update_player_club()
-        database.commit()
+        applycodesreport = feedbackupdate.FeedbackUpdate(
+            database
+        ).apply_feedback(self.newcodesapply)
         self.newcodesapply = []
         self.refresh_controls(
             (
@@ -321,7 +160,7 @@ class Feedback(panel.PlainPanel):
                 "".join(
                     (
                         "\n\nApply Feedback did following updates:\n\n",
-                        "\n".join(["\t".join(e) for e in applycodesreport]),
+                        "\n".join(applycodesreport),
                     )
                 ),
             )
@@ -499,7 +338,11 @@ class Feedback(panel.PlainPanel):
 
     def on_apply_feedback(self, event=None):
         """Run apply_new_grading_codes in separate thread."""
-        self.tasklog.run_method(method=self.apply_new_grading_codes)
+        self.tasklog.run_method(
+            method=self.get_appsys()
+            .get_results_database()
+            .profile_task(self.apply_new_grading_codes)
+        )
 
     def show_buttons_for_cancel_import(self):
         """Show buttons for actions allowed at start of import process."""
@@ -513,60 +356,6 @@ class Feedback(panel.PlainPanel):
             (self._btn_closefeedback, self._btn_applyfeedback)
         )
 
-    def _get_ecfmaprecord_for_new_person(self, database, pin):
-        """Return ECFmapDBrecordPlayer() for pin or None.
-
-        None is returned if the value attributes make it inappropriate to
-        update with a grading code extracted from ECF feedback.  For example
-        a grading code has been supplied by editing from the Grading Codes tab.
-
-        """
-        rec = resultsrecord.get_alias(database, pin)
-        if rec:
-            maprec = ecfmaprecord.get_new_person_for_identity(
-                database, rec.value
-            )
-            if maprec:
-                if maprec.value.playercode is None:
-                    if maprec.value.playerecfcode is None:
-                        if maprec.value.playerecfname is not None:
-                            return maprec
-
-    def _get_ecfmaprecord_for_person(self, database, pin):
-        """Return ECFmapDBrecordPlayer() for pin or None.
-
-        None is returned if the value attributes make it inappropriate to
-        update with a grading code extracted from ECF feedback.  For example
-        a grading code has been supplied by editing from the Grading Codes tab.
-
-        """
-        rec = resultsrecord.get_alias(database, pin)
-        if rec:
-            rec = resultsrecord.get_person_from_player(database, rec)
-        if rec:
-            maprec = ecfmaprecord.get_person_for_alias(
-                database, database.encode_record_number(rec.key.pack())
-            )
-            if maprec:
-                if maprec.value.playercode:
-                    return maprec
-
-    def _get_ecfmaprecord_for_player(self, database, pin):
-        """Return ECFmapDBrecordClub() for pin or None.
-
-        None is returned if the value attributes make it inappropriate to
-        update with a club code extracted from ECF feedback.
-
-        """
-        rec = resultsrecord.get_alias(database, pin)
-        if rec:
-            maprec = ecfmaprecord.get_player_for_alias(
-                database, rec.key.pack()
-            )
-            if maprec:
-                if maprec.value.clubcode is None:
-                    return maprec
-
     def _is_ecf_club_code_a_new_club(self, database, ecfcode):
         """Return True if ecfcode is not on database or False.
 
@@ -20,10 +20,8 @@ from solentware_misc.gui import panel
 from solentware_misc.gui import textreadonly
 from solentware_misc.gui import tasklog
 
-from ...core.ecf import ecfmaprecord
-from ...core.ecf import ecfrecord
 from ...core.ecf import feedback_html
-from ...core import resultsrecord
+from ...core.ecf import feedbackupdate
 from ...core import filespec
 from ...core import constants
 from ...core import configuration
@@ -119,23 +117,22 @@ class FeedbackMonthly(panel.PlainPanel):
         self.response = self.process_response(feedbacktext)
 
     def process_response(self, response):
-        database = self.get_appsys().get_results_database()
-        gepfgc = ecfrecord.get_ecf_player_for_grading_code
-        gecfcc = ecfrecord.get_ecf_club_for_club_code
+        update = feedbackupdate.FeedbackUpdate(
+            self.get_appsys().get_results_database()
+        )
         self.allowapplycodes = None
-        fb = feedback_html.FeedbackHTML()
+        fb = feedback_html.FeedbackRowsHTML()
         fb.submission_file_name = "@@@@@@@@"
         fb.responsestring = response
-        fb.feed(response)
-        fb.insert_whitespace_and_redact_dates()
-        fb.find_player_lists()
+        feedbackplayers = []
+        submissionplayers = []
+        for kind, key, text in fb.iter_rows((response,)):
+            if kind == feedback_html.FEEDBACK_PLAYER:
+                feedbackplayers.append((key, text))
+            else:
+                submissionplayers.append((key, text))
         self.insert_text_feedbackctrl("\n\n")
-        if (
-            fb.feedbacknumbers is None
-            or fb.feedbackplayers is None
-            or fb.submissionpins is None
-            or fb.submissionplayers is None
-        ):
+        if not (fb.feedback_list_complete and fb.submission_list_complete):
             message = "".join(
                 (
                     "The upload for this feedback is assumed to have failed ",
@@ -154,9 +151,8 @@ class FeedbackMonthly(panel.PlainPanel):
         updateclubs = []
         newecfcodes = []
         mergeecfcodes = []
-        playerset = set()
-        clubset = set()
-        for sp in fb.submissionplayers[1:]:
+        submissiondetails = []
+        for pin, sp in submissionplayers:
             elements = [e.strip() for e in sp.split("\t")]
             ed = dict()
             for e in elements:
@@ -166,31 +162,45 @@ class FeedbackMonthly(panel.PlainPanel):
                 k = f[0].strip("#")
                 if k in knames:
                     ed[k] = f[1].strip()
+            submissiondetails.append(ed)
+        newplayers = update.get_ecf_player_codes_not_on_database(
+            [
+                ed["ECFCode"]
+                for ed in submissiondetails
+                if len(pknames.intersection(ed)) == 2
+            ]
+        )
+        newclubs = update.get_ecf_club_codes_not_on_database(
+            [
+                ed["ClubCode"]
+                for ed in submissiondetails
+                if len(cknames.intersection(ed)) == 2
+            ]
+        )
+        for ed in submissiondetails:
             if len(pknames.intersection(ed)) == 2:
-                if ed["ECFCode"] not in playerset:
-                    if gepfgc(database, ed["ECFCode"]) is None:
-                        updateplayers.append(ed)
-                        playerset.add(ed["ECFCode"])
+                if ed["ECFCode"] in newplayers:
+                    updateplayers.append(ed)
+                    newplayers.discard(ed["ECFCode"])
             if len(cknames.intersection(ed)) == 2:
-                if ed["ClubCode"] not in clubset:
-                    if gecfcc(database, ed["ClubCode"]) is None:
-                        updateclubs.append(ed)
-                        clubset.add(ed["ClubCode"])
+                if ed["ClubCode"] in newclubs:
+                    updateclubs.append(ed)
+                    newclubs.discard(ed["ClubCode"])
 
         # Commented code displays the two blocks from which PINs and grading
         # codes are fitted together.
 
         # self.insert_text_feedbackctrl(
         #    'List of players generated in response to submission\n\n')
-        # self.insert_text_feedbackctrl(fb.feedbackplayers[0])
+        # self.insert_text_feedbackctrl(fb.feedback_heading)
         # self.insert_text_feedbackctrl('\n')
-        # for n, p in zip(fb.feedbacknumbers, fb.feedbackplayers[1:]):
-        #    self.insert_text_feedbackctrl(''.join((n, p, '\n')))
+        # for n, p in feedbackplayers:
+        #    self.insert_text_feedbackctrl(''.join((n, '. ', p, '\n')))
         # self.insert_text_feedbackctrl(
         #    '\n\nList of players in the submission\n\n')
-        # self.insert_text_feedbackctrl(fb.submissionplayers[0])
-        # for n, p in zip(fb.submissionpins, fb.submissionplayers[1:]):
-        #    self.insert_text_feedbackctrl(''.join((n, p)))
+        # self.insert_text_feedbackctrl(fb.submission_heading)
+        # for n, p in submissionplayers:
+        #    self.insert_text_feedbackctrl(''.join(('#PIN=', n, p, '\n')))
 
         if updateplayers:
             self.insert_text_applyctrl(
@@ -220,18 +230,14 @@ class FeedbackMonthly(panel.PlainPanel):
                 )
             )
         )
-        for fbn, spin, sp, fbp in zip(
-            fb.feedbacknumbers,
-            fb.submissionpins,
-            fb.submissionplayers[1:],
-            fb.feedbackplayers[1:],
-        ):
+        for (fbn, fbp), (pin, sp) in zip(feedbackplayers, submissionplayers):
             self.insert_text_feedbackctrl(
                 "".join(
                     (
-                        fbn.strip(),
-                        "\t",
-                        spin[1:],
+                        fbn,
+                        ".\t",
+                        "PIN=",
+                        pin,
                         "\t\t",
                         _remove_dates_re.sub("", fbp),
                         "\n",
@@ -247,7 +253,7 @@ class FeedbackMonthly(panel.PlainPanel):
                     "".join(
                         (
                             "Pin ",
-                            spin.split("=")[1],
+                            pin,
                             ": ",
                             n.group(1).strip(),
                             " : no grading code assigned.\n\n",
@@ -257,13 +263,13 @@ class FeedbackMonthly(panel.PlainPanel):
                 continue
             m = _exact_re.search(fbp)
             if m:
-                newecfcodes.append((spin.split("=")[1], m.group(1)))
+                newecfcodes.append((pin, m.group(1)))
                 self.insert_allowapply_header()
                 self.insert_text_applyctrl(
                     "".join(
                         (
                             "Pin ",
-                            spin.split("=")[1],
+                            pin,
                             ": ",
                             n.group(1).strip(),
                             " : grading code ",
@@ -275,13 +281,13 @@ class FeedbackMonthly(panel.PlainPanel):
                 continue
             m = _match_to_re.search(fbp)
             if m:
-                newecfcodes.append((spin.split("=")[1], m.group(1)))
+                newecfcodes.append((pin, m.group(1)))
                 self.insert_allowapply_header()
                 self.insert_text_applyctrl(
                     "".join(
                         (
                             "Pin ",
-                            spin.split("=")[1],
+                            pin,
                             ": ",
                             n.group(1).strip(),
                             " : grading code ",
@@ -293,13 +299,13 @@ class FeedbackMonthly(panel.PlainPanel):
                 continue
             m = _new_re.search(fbp)
             if m:
-                newecfcodes.append((spin.split("=")[1], m.group(1)))
+                newecfcodes.append((pin, m.group(1)))
                 self.insert_allowapply_header()
                 self.insert_text_applyctrl(
                     "".join(
                         (
                             "Pin ",
-                            spin.split("=")[1],
+                            pin,
                             ": ",
                             n.group(1).strip(),
                             " : grading code ",
@@ -311,15 +317,13 @@ class FeedbackMonthly(panel.PlainPanel):
                 continue
             m = _merge_re.search(fbp)
             if m:
-                mergeecfcodes.append(
-                    (spin.split("=")[1], m.group(2), m.group(1))
-                )
+                mergeecfcodes.append((pin, m.group(2), m.group(1)))
                 self.insert_allowapply_header()
                 self.insert_text_applyctrl(
                     "".join(
                         (
                             "Pin ",
-                            spin.split("=")[1],
+                            pin,
                             ": ",
                             n.group(1).strip(),
                             " : grading code ",
@@ -402,205 +406,14 @@ class FeedbackMonthly(panel.PlainPanel):
             return False
 
         database = self.get_appsys().get_results_database()
-        database.start_transaction()
-
-        if updateplayers:
-            record = ecfrecord.ECFrefDBrecordECFplayer()
-            gepfgc = ecfrecord.get_ecf_player_for_grading_code
-            self.insert_text_applyctrl("Add ECF codes and player names.\n\n")
-            for up in updateplayers:
-                if gepfgc(database, up["ECFCode"]):
-                    continue
-                record.key.recno = None
-                record.value.ECFcode = up["ECFCode"]
-                record.value.ECFname = up["Name"]
-                record.value.ECFactive = True
-                record.value.ECFclubcodes = []
-                record.put_record(database, filespec.ECFPLAYER_FILE_DEF)
-                self.insert_text_applyctrl(
-                    "  ".join(("Added", up["ECFCode"], up["Name"]))
-                )
-                self.insert_text_applyctrl("\n")
-            self.insert_text_applyctrl("\n")
-
-            # An almost exact copy of code in copy_ecf_players_post_2020_rules
-            # function in ecfdataimport module.  (mr.value replaced by v).
-            ecfmapcursor = database.database_cursor(
-                filespec.MAPECFPLAYER_FILE_DEF, filespec.MAPECFPLAYER_FIELD_DEF
-            )
-            try:
-                mapdata = ecfmapcursor.first()
-                while mapdata:
-                    mr = ecfmaprecord.ECFmapDBrecordPlayer()
-                    mr.load_record(mapdata)
-                    v = mr.value
-
-                    # mapdata values like (key, None) occur sometimes, origin
-                    # unknown but seen only when mixing event imports and ecf
-                    # reference data imports.
-                    # Ignoring them should be correct, and seems ok too.
-                    # Find and delete them offline.
-                    # See gui.events_lite too.
-                    if v.__dict__:
-
-                        if v.playercode is None:
-                            if v.playerecfcode is not None:
-                                if ecfrecord.get_ecf_player_for_grading_code(
-                                    database, v.playerecfcode
-                                ):
-                                    newmr = mr.clone()
-                                    newmr.value.playerecfcode = None
-                                    newmr.value.playercode = v.playerecfcode
-                                    mr.edit_record(
-                                        database,
-                                        filespec.MAPECFPLAYER_FILE_DEF,
-                                        filespec.MAPECFPLAYER_FIELD_DEF,
-                                        newmr,
-                                    )
-                    mapdata = ecfmapcursor.next()
-            finally:
-                ecfmapcursor.close()
-
-        if updateclubs:
-            ecfrec = ecfrecord.ECFrefDBrecordECFclub()
-            gecfcc = ecfrecord.get_ecf_club_for_club_code
-            self.insert_text_applyctrl("Add ECF codes and club names.\n\n")
-            for uc in updateclubs:
-                if gecfcc(database, uc["ClubCode"]):
-                    continue
-                ecfrec.key.recno = None
-                ecfrec.value.ECFcode = uc["ClubCode"]
-                ecfrec.value.ECFactive = True
-                ecfrec.value.ECFname = uc["ClubName"]
-                ecfrec.value.ECFcountycode = ""
-                ecfrec.put_record(database, filespec.ECFCLUB_FILE_DEF)
-                self.insert_text_applyctrl(
-                    "  ".join(("Added", uc["ClubCode"], uc["ClubName"]))
-                )
-                self.insert_text_applyctrl("\n")
-            self.insert_text_applyctrl("\n")
-
-            # The ecfdataimport import module does not have this code analogous
-            # to the updateplayers code.  It probably should now, but far less
-            # happened for clubs than players and should be same in future.
-            # Possibly MAPECFCLUB_FIELD_DEF should be PLAYERALIASMAP_FIELD_DEF
-            # because that index selects player records which need processing.
-            ecfmapcursor = database.database_cursor(
-                filespec.MAPECFCLUB_FILE_DEF, filespec.MAPECFCLUB_FIELD_DEF
-            )
-            try:
-                mapdata = ecfmapcursor.first()
-                while mapdata:
-                    mr = ecfmaprecord.ECFmapDBrecordClub()
-                    mr.load_record(mapdata)
-                    v = mr.value
-
-                    # mapdata values like (key, None) occur sometimes, origin
-                    # unknown but seen only when mixing event imports and ecf
-                    # reference data imports.
-                    # Ignoring them should be correct, and seems ok too.
-                    # Find and delete them offline.
-                    # See gui.events_lite too.
-                    if v.__dict__:
-
-                        if v.clubcode is None:
-                            if v.clubecfcode is not None:
-                                if ecfrecord.get_ecf_club_for_club_code(
-                                    database, v.clubecfcode
-                                ):
-                                    newmr = mr.clone()
-                                    newmr.value.clubecfcode = None
-                                    newmr.value.clubcode = v.clubecfcode
-                                    mr.edit_record(
-                                        database,
-                                        filespec.MAPECFCLUB_FILE_DEF,
-                                        filespec.MAPECFCLUB_FIELD_DEF,
-                                        newmr,
-                                    )
-                    mapdata = ecfmapcursor.next()
-            finally:
-                ecfmapcursor.close()
-
-        if newecfcodes:
-            for spin, newcode in newecfcodes:
-                person = self._get_ecfmaprecord_for_new_person(database, spin)
-                if person is None:
-                    self.insert_text_applyctrl(
-                        "".join(
-                            (
-                                newcode,
-                                " is not consistent with code provided locally (",
-                                "try removing code for player in 'Grading Codes'",
-                                " tab)",
-                            )
-                        )
-                    )
-                    self.insert_text_applyctrl("\n")
-                    continue
-                personclone = person.clone()
-                personclone.value.playerecfcode = None
-                personclone.value.playerecfname = None
-                personclone.value.playercode = newcode
-                person.edit_record(
-                    database,
-                    filespec.MAPECFPLAYER_FILE_DEF,
-                    filespec.MAPECFPLAYER_FIELD_DEF,
-                    personclone,
-                )
-                self.insert_text_applyctrl(
-                    "".join(
-                        (
-                            newcode,
-                            " added as feedback update to ECF player list",
-                        )
-                    )
-                )
-                self.insert_text_applyctrl("\n")
-            self.insert_text_applyctrl("\n")
-
-        if mergeecfcodes:
-            for spin, usedcode, mergecode in mergeecfcodes:
-                ecfplayer = ecfrecord.get_ecf_player_for_grading_code(
-                    database, usedcode
-                )
-                if ecfplayer is None:
-                    continue
-                if mergecode == ecfplayer.value.ECFmerge:
-                    if not ecfplayer.value.ECFactive:
-                        continue
-                if ecfplayer.value.ECFmerge:
-                    repmerge = "  ".join(
-                        (
-                            " replacing noted merge into",
-                            ecfplayer.value.ECFmerge,
-                        )
-                    )
-                else:
-                    repmerge = ""
-                ecfplayerclone = ecfplayer.clone()
-                ecfplayerclone.value.ECFmerge = mergecode
-                ecfplayerclone.value.ECFactive = False
-                ecfplayer.edit_record(
-                    database,
-                    filespec.ECFPLAYER_FILE_DEF,
-                    filespec.ECFPLAYER_FIELD_DEF,
-                    ecfplayerclone,
-                )
-                self.insert_text_applyctrl(
-                    "".join(
-                        (
-                            usedcode,
-                            "  noted as merged into  ",
-                            mergecode,
-                            "  in feedback update",
-                            repmerge,
-                        )
-                    )
-                )
-                self.insert_text_applyctrl("\n")
+        report = feedbackupdate.FeedbackUpdate(
+            database
+        ).apply_monthly_feedback(
+            updateplayers, updateclubs, newecfcodes, mergeecfcodes
+        )
+        for line in report:
+            self.insert_text_applyctrl(line)
             self.insert_text_applyctrl("\n")
-
-        database.commit()
         self.newcodesapply = []
         self.refresh_controls(
             (
@@ -663,7 +476,11 @@ class FeedbackMonthly(panel.PlainPanel):
             tkinter.messagebox.showinfo(
                 title="Apply Feedback", message="Feedback not applied"
             )
-        self.tasklog.run_method(method=self.apply_new_grading_codes)
+        self.tasklog.run_method(
+            method=self.get_appsys()
+            .get_results_database()
+            .profile_task(self.apply_new_grading_codes)
+        )
 
     def show_buttons_for_cancel_import(self):
         """Show buttons for actions allowed at start of import process."""
@@ -677,25 +494,6 @@ class FeedbackMonthly(panel.PlainPanel):
             (self._btn_closefeedbackmonthly, self._btn_applyfeedbackmonthly)
         )
 
-    def _get_ecfmaprecord_for_new_person(self, database, pin):
-        """Return ECFmapDBrecordPlayer() for pin or None.
-
-        None is returned if the value attributes make it inappropriate to
-        update with a grading code extracted from ECF feedback.  For example
-        a grading code has been supplied by editing from the Grading Codes tab.
-
-        """
-        rec = resultsrecord.get_alias(database, pin)
-        if rec:
-            maprec = ecfmaprecord.get_new_person_for_identity(
-                database, rec.value
-            )
-            if maprec:
-                if maprec.value.playercode is None:
-                    if maprec.value.playerecfcode is None:
-                        if maprec.value.playerecfname is not None:
-                            return maprec
-
 
 def show_ecf_results_feedback_monthly_tab(tab, button):
     """Show monthly feedback panel to do ECF feedback actions.
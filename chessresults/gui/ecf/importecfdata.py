@@ -233,7 +233,9 @@ class ImportECFData(logpanel.WidgetAndLogPanel):
         # See comment in relative module ..core.ecfdataimport in function
         # _do_ecf_reference_data_import().
         self.tasklog.run_method(
-            method=self._copymethod,
+            method=self.get_appsys()
+            .get_results_database()
+            .profile_task(self._copymethod),
             args=(self,),
             kwargs=dict(
                 ecfdate=self.get_ecf_date(),
@@ -14,11 +14,8 @@ from solentware_misc.gui.configuredialog import ConfigureDialog
 from . import control
 from . import events
 from . import newplayers
-from . import ecfgradingcodes
-from . import ecfclubcodes
 from . import ecfevents
 from . import ecfeventcopy
-from . import ecfplayers
 from . import importecfdata
 from . import feedback
 from . import feedback_monthly
@@ -26,7 +23,6 @@ from . import activeclubs
 from . import ratedplayers
 from . import newevent
 from .. import leagues_database
-from .. import players
 from .. import configuredialog_hack
 from ... import ECF_DATA_IMPORT_MODULE
 from ...core import constants
@@ -72,9 +68,9 @@ class Leagues(leagues_database.Leagues):
             text="ECF Codes",
             tooltip="Associate player with ECF code.",
             underline=2,
-            tabclass=lambda **k: ecfgradingcodes.ECFGradingCodes(
-                gridhorizontal=False, **k
-            ),
+            tabclass=lambda **k: importlib.import_module(
+                ".ecf.ecfgradingcodes", "chessresults.gui"
+            ).ECFGradingCodes(gridhorizontal=False, **k),
             destroy_actions=(control.Control._btn_closedatabase,),
         )
         self.define_tab(
@@ -82,9 +78,9 @@ class Leagues(leagues_database.Leagues):
             text="Club Codes",
             tooltip="Associate player with ECF club code.",
             underline=0,
-            tabclass=lambda **k: ecfclubcodes.ECFClubCodes(
-                gridhorizontal=False, **k
-            ),
+            tabclass=lambda **k: importlib.import_module(
+                ".ecf.ecfclubcodes", "chessresults.gui"
+            ).ECFClubCodes(gridhorizontal=False, **k),
             destroy_actions=(control.Control._btn_closedatabase,),
         )
         self.define_tab(
@@ -122,9 +118,9 @@ class Leagues(leagues_database.Leagues):
             text="Player ECF Detail",
             tooltip="Grading codes and club codes allocated to players.",
             underline=3,
-            tabclass=lambda **k: ecfplayers.ECFPlayers(
-                gridhorizontal=False, **k
-            ),
+            tabclass=lambda **k: importlib.import_module(
+                ".ecf.ecfplayers", "chessresults.gui"
+            ).ECFPlayers(gridhorizontal=False, **k),
             destroy_actions=(control.Control._btn_closedatabase,),
         )
         self.define_tab(
@@ -18,7 +18,6 @@ import tkinter
 import tkinter.messagebox
 import re
 import os
-import urllib.request
 import json
 
 from solentware_misc.core.getconfigurationitem import get_configuration_item
@@ -298,6 +297,10 @@ class NewPlayers(newplayers_database.NewPlayers):
         self, aliasrecord, db, title, reported_code, url_name, request_value
     ):
         """Attempt to download ECF data for reported code."""
+        # Imported on first use to keep http.client and friends out of
+        # start-up.
+        import urllib.request
+
         urlname = get_configuration_item(
             configuration.Configuration().get_configuration_file_name(),
             url_name,
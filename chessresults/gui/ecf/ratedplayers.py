@@ -28,6 +28,7 @@ from ...core.ecf import ecfrecord
 from ...core.ecf import ecfdataimport
 from ...core import resultsrecord
 from ...core import filespec
+from ...core import taskexecutor
 from ...core import constants
 
 _REFRESH_FILE_FIELD = {
@@ -42,6 +43,7 @@ class RatedPlayers(logpanel.WidgetAndLogPanel):
 
     _btn_closeratedplayers = "ratedplayers_close"
     _btn_applyratedplayers = "ratedplayers_apply"
+    _btn_stopratedplayers = "ratedplayers_stop"
 
     def __init__(
         self,
@@ -80,10 +82,17 @@ class RatedPlayers(logpanel.WidgetAndLogPanel):
                     underline=0,
                     command=self.on_apply_downloaded_rated_players,
                 ),
+                self._btn_stopratedplayers: dict(
+                    text="Stop Apply Rated Players",
+                    tooltip="Stop the rated players update and back out changes.",
+                    underline=0,
+                    command=self.on_stop_apply_downloaded_rated_players,
+                ),
             },
             starttaskbuttons=(
                 self._btn_closeratedplayers,
                 self._btn_applyratedplayers,
+                self._btn_stopratedplayers,
             ),
             runmethod=False,
             runmethodargs=dict(),
@@ -91,6 +100,7 @@ class RatedPlayers(logpanel.WidgetAndLogPanel):
             **kargs
         )
         self._closecontexts = closecontexts
+        self._progress = None
 
         # Import may need to increase file size (DPT) so close DPT contexts in
         # this thread.
@@ -230,7 +240,7 @@ class RatedPlayers(logpanel.WidgetAndLogPanel):
         """
         pass
 
-    def apply_downloaded_rated_players(self, *args, **kargs):
+    def apply_downloaded_rated_players(self, *args, progress=None, **kargs):
         """Apply new, and update existing, ecf_codes from download.
 
         args and kargs soak up arguments set by threading or multiprocessing
@@ -242,13 +252,42 @@ class RatedPlayers(logpanel.WidgetAndLogPanel):
             logwidget=self.tasklog,
             ecfdata=self.all_players,
             downloaddate=self.downloaddate,
+            progress=progress,
         )
 
+    def _apply_downloaded_rated_players_finished(self, progress):
+        """Report outcome of apply_downloaded_rated_players task."""
+        if progress.state == taskexecutor.FAILED:
+            self.tasklog.append_text(
+                "".join(
+                    (
+                        "Apply Rated Players failed: ",
+                        str(progress.error),
+                    )
+                )
+            )
+
+    def on_stop_apply_downloaded_rated_players(self, event=None):
+        """Stop the apply_downloaded_rated_players task at next check."""
+        if self._progress is None:
+            return
+        if self._progress.state in (
+            taskexecutor.PENDING,
+            taskexecutor.RUNNING,
+        ):
+            self.get_appsys().get_task_executor().cancel(self._progress)
+            self.tasklog.append_text(
+                "Stop requested.  Changes made so far will be backed out."
+            )
+
     def on_cancel_apply_downloaded_rated_players(self, event=None):
         """Do any tidy up before switching to next panel.
 
-        Re-open the files that were closed on creating this widget.
+        Stop the update if it has not finished, then re-open the files that
+        were closed on creating this widget.
         """
+        if self._progress is not None and not self._progress.is_finished():
+            self.get_appsys().stop_tasks(progress=self._progress)
         self.get_appsys().get_results_database().allocate_and_open_contexts(
             files=self._closecontexts
         )
@@ -267,7 +306,7 @@ class RatedPlayers(logpanel.WidgetAndLogPanel):
                 )
 
     def on_apply_downloaded_rated_players(self, event=None):
-        """Run apply_downloaded_rated_players in separate thread."""
+        """Queue apply_downloaded_rated_players to run in separate thread."""
         dlg = tkinter.messagebox.askquestion(
             parent=self.get_widget(),
             title="Apply Rated Players",
@@ -280,7 +319,17 @@ class RatedPlayers(logpanel.WidgetAndLogPanel):
         )
         if dlg != tkinter.messagebox.YES:
             return
-        self.tasklog.run_method(method=self.apply_downloaded_rated_players)
+        executor = self.get_appsys().get_task_executor()
+        if executor.is_busy():
+            self.tasklog.append_text(
+                "Update queued until earlier tasks are finished."
+            )
+        self._progress = executor.submit(
+            "Apply Rated Players",
+            self.apply_downloaded_rated_players,
+            report=self.tasklog.append_text,
+            callback=self._apply_downloaded_rated_players_finished,
+        )
 
     def show_buttons_for_cancel_import(self):
         """Show buttons for actions allowed at start of import process."""
@@ -14,6 +14,8 @@ import tkinter.messagebox
 import urllib.parse
 import subprocess
 import os
+import queue
+import threading
 
 try:
     if subprocess.run(["curl", "-V"], capture_output=True).returncode:
@@ -28,6 +30,7 @@ except ModuleNotFoundError:
     requests = None
 
 from ...core.ecf import feedback_html
+from ...core.ecf import uploadqueue
 from ...core import configuration
 from ...core import constants
 
@@ -70,6 +73,8 @@ _EVENT_CODE = "EVENT CODE"
 _SUBMISSION_INDEX = "SUBMISSION INDEX"
 _EVENT_NAME = "EVENT NAME"
 _RESULTS_OFFICER_ADDRESS = "RESULTS OFFICER ADDRESS"
+_UPLOAD_STATE_FILE = "ecfuploadstate.json"
+_UPLOAD_POLL_INTERVAL = 200
 
 
 class UploadResultsError(Exception):
@@ -179,6 +184,14 @@ class _UploadResults:
             command=self.upload_results_submission,
             accelerator="Alt F9",
         )
+        menu.add_command(
+            label="Upload Several Submission Files",
+            command=self.upload_several_results_submissions,
+        )
+        menu.add_command(
+            label="Cancel Upload of Several Files",
+            command=self.cancel_several_results_submissions,
+        )
         menu.add_separator()
 
         # See comments just before save_response definition for
@@ -212,6 +225,8 @@ class _UploadResults:
         self.username = username
         self.password = password
         self.most_recent_response = None
+        self.upload_queue = None
+        self._upload_responses = queue.Queue()
 
     # Put the scrollbar next to, not in, the Text widget and lose the tags.
     def insert_text(self, text):
@@ -293,18 +308,13 @@ class _UploadResults:
             "Use a subclass which implements 'set_create_new_ecf_codes_option'"
         )
 
-    def upload_results_submission(self, event=None):
-        """Upload a file of results with curl or Requests package.
-
-        curl, if available, is run by subprocess.run and the code snippet
-        from Steve Bush is used if Requests package has to be used.
-
-        """
+    def is_upload_url_valid(self):
+        """Return True if upload URL looks valid, or report problem."""
         try:
             urlp = urllib.parse.urlparse(self.urlname.get())
         except ValueError as exc:
             tkinter.messagebox.showinfo(title="Invalid URL", message=str(exc))
-            return
+            return False
         if not urlp.scheme and not urlp.netloc and not urlp.path:
             tkinter.messagebox.showinfo(
                 title="Invalid URL",
@@ -315,24 +325,35 @@ class _UploadResults:
                     )
                 ),
             )
-            return
+            return False
         if not urlp.scheme:
             tkinter.messagebox.showinfo(
                 title="Incomplete URL",
                 message="URL scheme missing (eg: https)",
             )
-            return
+            return False
         if not urlp.netloc:
             tkinter.messagebox.showinfo(
                 title="Incomplete URL",
                 message="URL address missing (eg: www.ecfrating.org.uk)",
             )
-            return
+            return False
         if not urlp.path:
             tkinter.messagebox.showinfo(
                 title="Incomplete URL",
                 message="URL path missing (eg: /v2/submit/)",
             )
+            return False
+        return True
+
+    def upload_results_submission(self, event=None):
+        """Upload a file of results with curl or Requests package.
+
+        curl, if available, is run by subprocess.run and the code snippet
+        from Steve Bush is used if Requests package has to be used.
+
+        """
+        if not self.is_upload_url_valid():
             return
         localfilename = self.filename.get()
         try:
@@ -498,6 +519,218 @@ class _UploadResults:
             return
         self.password.set("")
 
+    def upload_several_results_submissions(self, event=None):
+        """Upload several files of results with Requests package.
+
+        The files are uploaded by an upload queue in a background thread and
+        each response is processed when it arrives.  The queue state is kept
+        in a file in the folder of the first selected file so an interrupted
+        upload can be resumed by selecting the files again.
+
+        """
+        if self.upload_queue is not None:
+            tkinter.messagebox.showinfo(
+                title="Upload Results Files",
+                message="An upload of several files is in progress",
+            )
+            return
+        if not self.is_upload_url_valid():
+            return
+        if not requests:
+            message = "The 'Requests' package is not installed"
+            self.insert_text(
+                "".join(
+                    (
+                        message,
+                        ".\n\nIt is required to upload several files.\n\n",
+                    )
+                )
+            )
+            tkinter.messagebox.showinfo(title="Upload Method", message=message)
+            return
+        if not self.username.get():
+            message = "No user name supplied"
+            self.insert_text(message + ".\n\n")
+            tkinter.messagebox.showinfo(title="User Name", message=message)
+            return
+        if not self.password.get():
+            message = "No password supplied"
+            self.insert_text(message + ".\n\n")
+            tkinter.messagebox.showinfo(title="Password", message=message)
+            return
+        conf = configuration.Configuration()
+        localfilenames = tkinter.filedialog.askopenfilenames(
+            parent=self.text,
+            title="Browse Results Submission Files",
+            initialdir=conf.get_configuration_value(
+                constants.RECENT_SUBMISSION
+            ),
+        )
+        if not localfilenames:
+            return
+        for localfilename in localfilenames:
+            try:
+                rft = open(localfilename).read()
+            except Exception as exc:
+                self.insert_text(str(exc) + ".\n\n")
+                tkinter.messagebox.showinfo(
+                    title="Open Submission File", message=str(exc)
+                )
+                return
+            if not self.is_results_file_text_sane(rft):
+                message = "".join(
+                    (localfilename, " cannot be a valid submission file")
+                )
+                self.insert_text(message + ".\n\n")
+                tkinter.messagebox.showinfo(
+                    title="Submission File", message=message
+                )
+                return
+        if self.urlname.get() == _DEFAULT_LIVE_URL:
+            if not tkinter.messagebox.askyesno(
+                title="Upload Results Files",
+                message="Do you want to upload to the live ECF database?",
+            ):
+                return
+        options = {}
+        self.set_email_graders_option(options)
+        self.set_report_only_option(options)
+        self.set_create_new_ecf_codes_option(options)
+        try:
+            upload_queue = uploadqueue.UploadQueue(
+                self.urlname.get(),
+                self.username.get(),
+                self.password.get(),
+                os.path.join(
+                    os.path.dirname(localfilenames[0]), _UPLOAD_STATE_FILE
+                ),
+                options=options,
+            )
+            upload_queue.add_files(localfilenames)
+        except (uploadqueue.UploadQueueError, OSError, ValueError) as exc:
+            self.insert_text(str(exc) + ".\n\n")
+            tkinter.messagebox.showinfo(
+                title="Upload Results Files", message=str(exc)
+            )
+            return
+        finally:
+            self.password.set("")
+        pending = upload_queue.get_pending_files(filenames=localfilenames)
+        self.insert_text(
+            "".join(
+                (
+                    str(len(pending)),
+                    " of ",
+                    str(len(localfilenames)),
+                    " selected files not yet uploaded.\n\n",
+                )
+            )
+        )
+        if not pending:
+            return
+        self.upload_queue = upload_queue
+        threading.Thread(
+            target=self._run_upload_queue,
+            args=(upload_queue, localfilenames),
+            daemon=True,
+        ).start()
+        self.root.after(_UPLOAD_POLL_INTERVAL, self._poll_upload_responses)
+
+    def cancel_several_results_submissions(self, event=None):
+        """Stop the upload of several files after uploads in progress."""
+        if self.upload_queue is None:
+            tkinter.messagebox.showinfo(
+                title="Cancel Upload of Several Files",
+                message="No upload of several files is in progress",
+            )
+            return
+        if self.upload_queue.is_cancelled():
+            return
+        self.upload_queue.cancel()
+        self.insert_text(
+            "".join(
+                (
+                    "Upload of several files cancelled.  Uploads in ",
+                    "progress will be completed.\n\n",
+                )
+            )
+        )
+
+    def _run_upload_queue(self, upload_queue, filenames):
+        """Run upload_queue and note when finished.  Not Tk thread."""
+        try:
+            not_uploaded = upload_queue.run(
+                filenames=filenames, callback=self._queue_response
+            )
+        except Exception as exc:
+            self._upload_responses.put((None, None, None, exc))
+            not_uploaded = upload_queue.get_pending_files(filenames=filenames)
+        self._upload_responses.put((None, not_uploaded, None, None))
+
+    def _queue_response(self, filename, status_code, text, error):
+        """Pass response to Tk thread.  Called in upload thread."""
+        self._upload_responses.put((filename, status_code, text, error))
+
+    def _poll_upload_responses(self):
+        """Process upload responses which have arrived."""
+        while True:
+            try:
+                filename, status, text, error = (
+                    self._upload_responses.get_nowait()
+                )
+            except queue.Empty:
+                break
+            if filename is None:
+                if error is not None:
+                    self.insert_text(
+                        "".join(
+                            ("Upload queue stopped: ", str(error), ".\n\n")
+                        )
+                    )
+                    continue
+                self.upload_queue = None
+                self.insert_text(
+                    "".join(
+                        (
+                            "Upload of several files finished with ",
+                            str(len(status)),
+                            " files not uploaded.\n\n",
+                        )
+                    )
+                )
+                for f in status:
+                    self.insert_text(f + "\n")
+                self.insert_text("\n")
+                return
+            if error is not None:
+                self.insert_text(
+                    "".join(
+                        (
+                            "Upload of ",
+                            filename,
+                            " failed.\n\nReported exception is:\n",
+                            str(error),
+                            "\n\n",
+                        )
+                    )
+                )
+                continue
+            self.insert_text(
+                "".join(
+                    (
+                        "Response to upload request is status_code '",
+                        str(status),
+                        "'.\n\nResponse to upload of ",
+                        filename,
+                        " is:\n",
+                    )
+                )
+            )
+            self.most_recent_response = self.process_response(
+                text, submission_file_name=filename
+            )
+        self.root.after(_UPLOAD_POLL_INTERVAL, self._poll_upload_responses)
+
     def is_results_file_text_sane(self, text):
         """Return True if text could be a valid ECF results submission.
 
@@ -534,20 +767,21 @@ class _UploadResults:
                 return True
         return False
 
-    def process_response(self, response):
-        fb = feedback_html.FeedbackHTML()
-        fb.submission_file_name = self.filename.get()
+    def process_response(self, response, submission_file_name=None):
+        fb = feedback_html.FeedbackRowsHTML()
+        if submission_file_name is None:
+            submission_file_name = self.filename.get()
+        fb.submission_file_name = submission_file_name
         fb.responsestring = response
-        fb.feed(response)
-        fb.insert_whitespace_and_redact_dates()
-        fb.find_player_lists()
+        feedbackplayers = []
+        submissionplayers = []
+        for kind, key, text in fb.iter_rows((response,)):
+            if kind == feedback_html.FEEDBACK_PLAYER:
+                feedbackplayers.append((key, text))
+            else:
+                submissionplayers.append((key, text))
         self.insert_text("\n\n")
-        if (
-            fb.feedbacknumbers is None
-            or fb.feedbackplayers is None
-            or fb.submissionpins is None
-            or fb.submissionplayers is None
-        ):
+        if not (fb.feedback_list_complete and fb.submission_list_complete):
             message = "".join(
                 (
                     "The upload is assumed to have failed because the player ",
@@ -562,14 +796,15 @@ class _UploadResults:
         self.insert_text(
             "List of players generated in response to submission\n\n"
         )
-        self.insert_text(fb.feedbackplayers[0])
+        self.insert_text(fb.feedback_heading)
         self.insert_text("\n")
-        for n, p in zip(fb.feedbacknumbers, fb.feedbackplayers[1:]):
-            self.insert_text("".join((n, p, "\n")))
+        for n, p in feedbackplayers:
+            self.insert_text("".join((n, ". ", p, "\n")))
         self.insert_text("\n\nList of players in the submission\n\n")
-        self.insert_text(fb.submissionplayers[0])
-        for n, p in zip(fb.submissionpins, fb.submissionplayers[1:]):
-            self.insert_text("".join((n, p)))
+        self.insert_text(fb.submission_heading)
+        self.insert_text("\n")
+        for n, p in submissionplayers:
+            self.insert_text("".join(("#PIN=", n, p, "\n")))
         self.insert_text(
             "".join(
                 (
@@ -578,12 +813,8 @@ class _UploadResults:
                 )
             )
         )
-        for n, s, p in zip(
-            fb.feedbacknumbers, fb.submissionpins, fb.feedbackplayers[1:]
-        ):
-            self.insert_text(
-                "".join((n.strip(), "\t", s[1:], "\t\t", p, "\n"))
-            )
+        for (n, p), (s, sp) in zip(feedbackplayers, submissionplayers):
+            self.insert_text("".join((n, ".\t", "PIN=", s, "\t\t", p, "\n")))
         self.insert_text("\n\n")
         return fb
 
@@ -726,7 +957,7 @@ class SubmitResults(_UploadResults):
 
     def set_email_graders_option(self, options):
         """Send response to grader by email."""
-        if curl:
+        if isinstance(options, list):
             options.append("-F email_graders=")
         elif requests:
             options["email_graders"] = "on"
@@ -761,7 +992,7 @@ class SubmitResultsFromPrincipals(SubmitResults):
     def set_create_new_ecf_codes_option(self, options):
         """Create new ECF codes when requested if submission file is valid."""
         if self.create_new_ecf_codes.get():
-            if curl:
+            if isinstance(options, list):
                 options.append("-F auto_create_players=")
             elif requests:
                 options["auto_create_players"] = "on"
@@ -790,7 +1021,7 @@ class CheckAndReportResults(_UploadResults):
 
     def set_report_only_option(self, options):
         """Validate submission but do not commit."""
-        if curl:
+        if isinstance(options, list):
             options.append("-F report_only=")
         elif requests:
             options["report_only"] = "on"
@@ -18,15 +18,13 @@ from solentware_misc.core.utilities import AppSysPersonName
 
 from chessvalidate.core import gameresults
 
-from chesscalc.gui import performance, prediction, population
-
 from ..core import (
     constants,
     filespec,
     resultsrecord,
     configuration,
+    eventdata,
 )
-from ..core.importreports import convert_alias_to_transfer_format
 from . import (
     eventgrids,
     gamesummary,
@@ -103,98 +101,6 @@ class Events(panel.PanelGridSelector):
 
     def generate_event_export(self, database, logwidget):
         """Write events selected for export to serial file."""
-
-        def add_name_to_export(key, valuekey):
-            exportdata.append(
-                "=".join(
-                    (
-                        key,
-                        resultsrecord.get_name_from_record_value(
-                            database.get_primary_record(
-                                filespec.NAME_FILE_DEF, valuekey
-                            )
-                        ).value.name,
-                    )
-                )
-            )
-
-        def add_game_player_to_export(
-            cname, cpin, cpinfalse, caffiliation, creportedcodes
-        ):
-            def agpte(player):
-                aliastext, m, a, affiliation, reportedcodes = player
-                exportdata.append("=".join((cname, aliastext[0])))
-                if aliastext[6]:
-                    exportdata.append("=".join((cpin, str(aliastext[6]))))
-                elif aliastext[6] is False:
-                    exportdata.append("=".join((cpinfalse, "true")))
-                if affiliation:
-                    add_name_to_export(caffiliation, affiliation)
-                if reportedcodes:
-                    for rc in reportedcodes:
-                        exportdata.append("=".join((creportedcodes, rc)))
-
-            return agpte
-
-        add_game_homeplayer_to_export = add_game_player_to_export(
-            constants._homename,
-            constants._homepin,
-            constants._homepinfalse,
-            constants._homeaffiliation,
-            constants._homereportedcodes,
-        )
-        add_game_awayplayer_to_export = add_game_player_to_export(
-            constants._awayname,
-            constants._awaypin,
-            constants._awaypinfalse,
-            constants._awayaffiliation,
-            constants._awayreportedcodes,
-        )
-
-        def add_game_to_export(game):
-            v = game.value
-            if gameplayers[v.homeplayer] not in eventplayers:
-                return False
-            if gameplayers[v.awayplayer] not in eventplayers:
-                return False
-            event = resultsrecord.get_event_from_record_value(
-                database.get_primary_record(filespec.EVENT_FILE_DEF, v.event)
-            ).value
-            exportdata.append("=".join((constants._event, event.name)))
-            exportdata.append(
-                "=".join((constants._startdate, event.startdate))
-            )
-            exportdata.append("=".join((constants._enddate, event.enddate)))
-            for s in event.sections:
-                add_name_to_export(constants._eventsection, s)
-            if v.homeplayerwhite is True:
-                exportdata.append(
-                    "=".join((constants._homeplayerwhite, constants._yes))
-                )
-            elif v.homeplayerwhite is False:
-                exportdata.append(
-                    "=".join((constants._homeplayerwhite, constants._no))
-                )
-            else:
-                exportdata.append(
-                    "=".join((constants._homeplayerwhite, constants.NOCOLOR))
-                )
-            exportdata.append("=".join((constants._date, v.date)))
-            if v.board:
-                exportdata.append("=".join((constants._board, v.board)))
-            if v.round:
-                exportdata.append("=".join((constants._round, v.round)))
-            if v.hometeam:
-                add_name_to_export(constants._hometeam, v.hometeam)
-            if v.awayteam:
-                add_name_to_export(constants._awayteam, v.awayteam)
-            if v.section:
-                add_name_to_export(constants._section, v.section)
-            add_game_homeplayer_to_export(players[gameplayers[v.homeplayer]])
-            add_game_awayplayer_to_export(players[gameplayers[v.awayplayer]])
-            exportdata.append("=".join((constants._result, v.result)))
-            return True
-
         esel = self.eventgrid.selection
         ebkm = self.eventgrid.bookmarks
         export_events = []
@@ -244,86 +150,10 @@ class Events(panel.PanelGridSelector):
             if logwidget:
                 logwidget.append_text_only("\t".join(er))
 
-        # get all aliases on exporting database
-        # note identity with embedded keys translated and merge structure
-        if logwidget:
-            logwidget.append_text("Finding all player names on the database.")
-            logwidget.append_text_only("")
-        players = dict()
-        gai = resultsrecord.get_alias_identity
-        pr = resultsrecord.ResultsDBrecordPlayer()
-        pk = pr.key
-        pv = pr.value
-        pr.set_database(database)
-        rset = database.recordlist_ebm(filespec.PLAYER_FILE_DEF)
-        cursor = rset.create_recordset_cursor()
-        try:
-            r = cursor.first()
-            while r:
-                pr.load_record(r)
-                players[pk.recno] = (
-                    gai(pr),
-                    pv.merge,
-                    pv.alias,
-                    pv.affiliation,
-                    pv.reported_codes,
-                )
-                r = cursor.next()
-        finally:
-            cursor.close()
-            rset.close()
-
-        # get all games for events being exported
-        if logwidget:
-            logwidget.append_text("Finding all games in the events.")
-            logwidget.append_text_only("")
-        games = []
-        for event in export_events:
-            eventgames = resultsrecord.get_games_for_event(
-                database, resultsrecord.get_event(database, event[-1])
-            )
-            games.extend(eventgames)
-
-        # get all alias keys for games being exported and map coded to decoded
-        if logwidget:
-            logwidget.append_text_only("")
-            logwidget.append_text("Finding all player names in the events.")
-        eventplayers = set()
-        gameplayers = dict()
-        for g in games:
-            for ak in (g.value.homeplayer, g.value.awayplayer):
-                k = ak  # Legacy of {coded:decoded} mapping.
-                eventplayers.add(k)
-                gameplayers[ak] = k
-        if logwidget:
-            logwidget.append_text("Preparing data for export.")
-            logwidget.append_text_only("")
-
-        # add all aliases to export data with identity last
-        main_alias_values = {type(True), type(False), type(None)}
-        exportdata = []
-        for k, v in players.items():
-            pi, pm, pa, paff, prc = v
-            if type(pm) in main_alias_values:
-                for a in pa:
-                    if a != k:
-                        exportdata.extend(
-                            convert_alias_to_transfer_format(
-                                players[a][0], constants._name
-                            )
-                        )
-                exportdata.extend(
-                    convert_alias_to_transfer_format(pi, constants._name)
-                )
-                exportdata.append(
-                    "=".join((constants._exportedeventplayer, "true"))
-                )
-
-        # add all games being exported to export data
-        allmerged = True
-        for g in games:
-            allmerged = allmerged and add_game_to_export(g)
-        if not allmerged:
+        exportdata = eventdata.get_event_export_data(
+            database, export_events, logwidget=logwidget
+        )
+        if exportdata is None:
             tkinter.messagebox.showinfo(
                 parent=self.get_widget(),
                 message=" ".join(
@@ -367,7 +197,7 @@ class Events(panel.PanelGridSelector):
             dict(
                 runmethod=self.get_appsys()
                 .get_results_database()
-                .do_database_task,
+                .do_snapshot_task,
                 starttaskmsg="Export events task started",
                 tabtitle="Export Events",
                 runmethodargs=dict(taskmethod=self.generate_event_export),
@@ -399,7 +229,7 @@ class Events(panel.PanelGridSelector):
             dict(
                 runmethod=self.get_appsys()
                 .get_results_database()
-                .do_database_task,
+                .do_snapshot_task,
                 starttaskmsg="Game Summary by event task started",
                 tabtitle="Game Summary",
                 runmethodargs=dict(taskmethod=self.display_game_summary),
@@ -422,7 +252,7 @@ class Events(panel.PanelGridSelector):
             dict(
                 runmethod=self.get_appsys()
                 .get_results_database()
-                .do_database_task,
+                .do_snapshot_task,
                 starttaskmsg="Event summary task started",
                 tabtitle="Event Summary",
                 runmethodargs=dict(taskmethod=self.generate_event_summary),
@@ -691,79 +521,7 @@ class Events(panel.PanelGridSelector):
             if not dlg.ok_pressed():
                 return
 
-        def unset_name(skey):
-            """Get name record and decrement reference count."""
-            if skey not in names:
-                names[skey] = resultsrecord.get_name_from_record_value(
-                    db.get_primary_record(filespec.NAME_FILE_DEF, skey)
-                )
-                namesamend[skey] = names[skey].clone()
-            namesamend[skey].value.reference_count -= 1
-
-        def unset_player(skey):
-            """Get player record and decrement reference counts for names."""
-            if skey not in players:
-                players[skey] = resultsrecord.get_alias(db, skey)
-                a = players[skey].value.affiliation
-                if a is not None:
-                    unset_name(a)
-                if players[skey].value.section:
-                    unset_name(players[skey].value.section)
-
-        events = dict()
-        games = []
-        players = dict()
-        names = dict()
-        namesamend = dict()
-
-        db.start_transaction()
-        for e in delete_events:
-            events[e[-1]] = resultsrecord.get_event_from_record_value(
-                db.get_primary_record(filespec.EVENT_FILE_DEF, e[-1])
-            )
-            for s in events[e[-1]].value.sections:
-                unset_name(s)
-            games.extend(
-                resultsrecord.get_games_for_event(
-                    db, self.eventgrid.objects[e]
-                )
-            )
-        for g in games:
-            for s in (g.value.awayteam, g.value.hometeam, g.value.section):
-                if s is not None:
-                    unset_name(s)
-            for p in (g.value.homeplayer, g.value.awayplayer):
-                unset_player(p)
-
-        for g in games:
-            g.delete_record(db, filespec.GAME_FILE_DEF)
-        for n in names:
-            if n in namesamend:
-                rc = namesamend[n].value.reference_count
-                if rc <= 0:
-                    names[n].delete_record(db, filespec.NAME_FILE_DEF)
-                elif names[n].value.reference_count != rc:
-                    names[n].edit_record(
-                        db,
-                        filespec.NAME_FILE_DEF,
-                        filespec.NAME_FIELD_DEF,
-                        namesamend[n],
-                    )
-        for p in players:
-            if isinstance(players[p].value.merge, int):
-                prforp = resultsrecord.get_person_from_alias(db, players[p])
-                prforpamend = prforp.clone()
-                prforpamend.value.alias.remove(p)
-                prforp.edit_record(
-                    db,
-                    filespec.PLAYER_FILE_DEF,
-                    filespec.PLAYER_FIELD_DEF,
-                    prforpamend,
-                )
-            players[p].delete_record(db, filespec.PLAYER_FILE_DEF)
-        for e in events:
-            events[e].delete_record(db, filespec.EVENT_FILE_DEF)
-        db.commit()
+        eventdata.delete_events(db, delete_events)
         self.refresh_controls((self.eventgrid,))
 
     def describe_buttons(self):
@@ -9,6 +9,7 @@ import tkinter
 import tkinter.messagebox
 import tkinter.filedialog
 import os
+import time
 
 # __import__ is still used in places, a legacy of pre-3.1 origin of this module.
 import importlib
@@ -19,12 +20,13 @@ from chessvalidate.core.season import Season
 from chessvalidate.gui import leagues_validate
 
 from ..core.takeonseason import TakeonSeason
+from ..core.taskexecutor import TaskExecutor
+from ..core.opendatabase import configure_database_class
 from . import sourceedit
 from . import takeonedit
 from . import control_database
 from . import events_database
 from . import newplayers_database
-from . import players
 from . import importevents
 from . import taskpanel
 from . import joineventplayers
@@ -33,12 +35,17 @@ from .. import APPLICATION_DATABASE_MODULE, ERROR_LOG
 from .. import KNOWN_NAME_DATASOURCE_MODULE
 from ..core import configuration
 from ..core import constants
+from ..basecore import backup
 
 # for runtime "from <db|dpt>results import ResultsDatabase"
 _ResultsDB = "ResultsDatabase"
 _DataSourceSet = "DataSourceSet"
 _KnownNamesDS = "KnownNamesDS"
 
+# Milliseconds between checks for database files not used recently, when the
+# database engine opens files on demand.
+_IDLE_FILES_INTERVAL = 60000
+
 
 class Leagues(leagues_validate.Leagues):
 
@@ -69,6 +76,8 @@ class Leagues(leagues_validate.Leagues):
         self.database = None
         self.database_folder = None
         self._database_modulename = None
+        self._task_executor = None
+        self._idle_files_after = None
 
     def define_menus(self):
         """Override.  Define the application menus."""
@@ -89,6 +98,17 @@ class Leagues(leagues_validate.Leagues):
             command=self.try_command(self.database_close, menu1),
         )
         menu1.add_separator()
+        menu1.add_command(
+            label="Backup",
+            underline=0,
+            command=self.try_command(self.database_backup, menu1),
+        )
+        menu1.add_command(
+            label="Restore Snapshot",
+            underline=0,
+            command=self.try_command(self.database_restore_snapshot, menu1),
+        )
+        menu1.add_separator()
         menu1.add_command(
             label="Delete",
             underline=0,
@@ -169,7 +189,9 @@ class Leagues(leagues_validate.Leagues):
             text="Players",
             tooltip="Merge or separate existing players.",
             underline=0,
-            tabclass=lambda **k: players.Players(gridhorizontal=False, **k),
+            tabclass=lambda **k: importlib.import_module(
+                ".players", "chessresults.gui"
+            ).Players(gridhorizontal=False, **k),
             destroy_actions=(control_database.Control._btn_closedatabase,),
         )
         self.define_tab(
@@ -343,6 +365,126 @@ class Leagues(leagues_validate.Leagues):
     def _add_ecf_url_item(self, menu):
         """Subclasses should override this if edit ECF URL defaults needed."""
 
+    def database_backup(self):
+        """Backup results database to a folder chosen by user."""
+        if self.database is None:
+            tkinter.messagebox.showinfo(
+                parent=self.get_widget(),
+                title="Backup",
+                message="No results database open",
+            )
+            return
+        conf = configuration.Configuration()
+        backup_folder = tkinter.filedialog.askdirectory(
+            parent=self.get_widget(),
+            title="Select folder for backup of results database",
+            initialdir=conf.get_configuration_value(constants.RECENT_DATABASE),
+        )
+        if not backup_folder:
+            return
+        home = os.path.normcase(os.path.abspath(self.database.home_directory))
+        if (
+            os.path.commonpath(
+                (home, os.path.normcase(os.path.abspath(backup_folder)))
+            )
+            == home
+        ):
+            tkinter.messagebox.showinfo(
+                parent=self.get_widget(),
+                title="Backup",
+                message="".join(
+                    (
+                        "The backup folder cannot be in the results ",
+                        "database folder",
+                    )
+                ),
+            )
+            return
+        try:
+            copied = self.database.backup_database(backup_folder)
+        except backup.BackupError as exc:
+            tkinter.messagebox.showinfo(
+                parent=self.get_widget(), title="Backup", message=str(exc)
+            )
+            return
+        tkinter.messagebox.showinfo(
+            parent=self.get_widget(),
+            title="Backup",
+            message="".join(
+                (
+                    "Backup done.\n\n",
+                    str(len(copied)),
+                    " files copied to\n\n",
+                    backup_folder,
+                )
+            ),
+        )
+
+    def database_restore_snapshot(self):
+        """Restore results database from snapshot taken before a large task."""
+        title = "Restore Snapshot"
+        if self.database is None:
+            tkinter.messagebox.showinfo(
+                parent=self.get_widget(),
+                title=title,
+                message="No results database open",
+            )
+            return
+        if self.get_task_executor().is_busy():
+            tkinter.messagebox.showinfo(
+                parent=self.get_widget(),
+                title=title,
+                message="Wait for the tasks in progress to finish",
+            )
+            return
+        snapshot = os.path.join(
+            self.database.home_directory, constants.DATABASE_SNAPSHOT
+        )
+        if not os.path.isdir(snapshot):
+            tkinter.messagebox.showinfo(
+                parent=self.get_widget(),
+                title=title,
+                message="There is no snapshot of the results database",
+            )
+            return
+        if not tkinter.messagebox.askyesno(
+            parent=self.get_widget(),
+            title=title,
+            message="".join(
+                (
+                    "Please confirm the results database is to be replaced ",
+                    "by the snapshot taken at ",
+                    time.strftime(
+                        "%Y-%m-%d %H:%M",
+                        time.localtime(os.stat(snapshot).st_mtime),
+                    ),
+                    ".\n\nAll changes made since the snapshot was taken ",
+                    "will be lost.",
+                )
+            ),
+        ):
+            return
+        database = self.database
+        database_folder = self.database_folder
+        self._database_close()
+        self.database = None
+        self.switch_context(control_database.Control._btn_closedatabase)
+        self.set_error_file_on_close_databasee()
+        try:
+            backup.restore_snapshot(database)
+        except backup.BackupError as exc:
+            tkinter.messagebox.showinfo(
+                parent=self.get_widget(), title=title, message=str(exc)
+            )
+            return
+        self._database_open(database_folder)
+        if self.database is not None:
+            tkinter.messagebox.showinfo(
+                parent=self.get_widget(),
+                title=title,
+                message="The results database has been restored from snapshot",
+            )
+
     def database_close(self):
         """Close results database."""
         if self.database is None:
@@ -358,10 +500,19 @@ class Leagues(leagues_validate.Leagues):
                 message="Database interface not defined",
             )
         else:
+            if self.get_task_executor().is_busy():
+                message = "".join(
+                    (
+                        "Close results database\n\nTasks in progress will ",
+                        "be stopped and their changes backed out.",
+                    )
+                )
+            else:
+                message = "Close results database"
             dlg = tkinter.messagebox.askquestion(
                 parent=self.get_widget(),
                 title="Close",
-                message="Close results database",
+                message=message,
             )
             if dlg == tkinter.messagebox.YES:
                 self._database_close()
@@ -407,6 +558,9 @@ class Leagues(leagues_validate.Leagues):
             # delete_database() call.  The close_database() call just before
             # setting database to None is removed.  The 'database is None'
             # test is done at start of this method.
+            if self._idle_files_after is not None:
+                self.get_widget().after_cancel(self._idle_files_after)
+                self._idle_files_after = None
             try:
                 self.get_control_context().close_resources()
             except AttributeError:
@@ -708,6 +862,7 @@ class Leagues(leagues_validate.Leagues):
 
     def _database_open(self, database_folder):
         """Open results database after creating it if necessary."""
+        configure_database_class(self._database_class)
         self.database = self._database_class(
             database_folder, **self._resultsdbkargs
         )
@@ -718,6 +873,10 @@ class Leagues(leagues_validate.Leagues):
             )
             return
         self.database_folder = database_folder
+        if self.database.open_files_on_demand:
+            self._idle_files_after = self.get_widget().after(
+                _IDLE_FILES_INTERVAL, self._close_idle_files
+            )
         self.set_error_file()
         self.set_ecf_url_defaults()
         self.switch_context(control_database.Control._btn_opendatabase)
@@ -796,6 +955,28 @@ class Leagues(leagues_validate.Leagues):
         """Return the open database."""
         return self.database
 
+    def get_task_executor(self):
+        """Return the queue of long background tasks."""
+        if self._task_executor is None:
+            self._task_executor = TaskExecutor()
+        return self._task_executor
+
+    def stop_tasks(self, progress=None):
+        """Cancel task for progress, or all tasks, and wait until finished.
+
+        Cancelled tasks back out their changes before finishing.  Task
+        progress reports go through the task log's queue so waiting here
+        does not stop the tasks finishing.
+
+        """
+        executor = self.get_task_executor()
+        if progress is None:
+            executor.cancel_all()
+            executor.wait()
+        else:
+            executor.cancel(progress)
+            progress.wait()
+
     def results_close(self):
         """Close results source document."""
         if self.results_data is None:
@@ -854,9 +1035,13 @@ class Leagues(leagues_validate.Leagues):
             return True
 
     def _database_close(self):
-        """Close results database."""
+        """Close results database after stopping tasks in progress."""
         if self.database is None:
             return
+        self.stop_tasks()
+        if self._idle_files_after is not None:
+            self.get_widget().after_cancel(self._idle_files_after)
+            self._idle_files_after = None
         try:
             self.get_control_context().close_resources()
         except AttributeError:
@@ -864,6 +1049,16 @@ class Leagues(leagues_validate.Leagues):
                 raise
         self.database.close_database()
 
+    def _close_idle_files(self):
+        """Close database files not used recently and check again later."""
+        self._idle_files_after = None
+        if self.database is None:
+            return
+        self.database.close_idle_files()
+        self._idle_files_after = self.get_widget().after(
+            _IDLE_FILES_INTERVAL, self._close_idle_files
+        )
+
     def _database_quit(self):
         """Quit Results."""
         if self.database is None:
@@ -9,8 +9,6 @@ import tkinter.messagebox
 
 from solentware_misc.core.utilities import AppSysPersonName
 
-from chesscalc.gui import performance, prediction, population
-
 from ...core import (
     constants,
     filespec,
@@ -41,7 +39,7 @@ class Events(events_database.Events):
             dict(
                 runmethod=self.get_appsys()
                 .get_results_database()
-                .do_database_task,
+                .do_snapshot_task,
                 starttaskmsg="Player performances task started",
                 tabtitle="Performances",
                 runmethodargs=dict(
@@ -66,7 +64,7 @@ class Events(events_database.Events):
             dict(
                 runmethod=self.get_appsys()
                 .get_results_database()
-                .do_database_task,
+                .do_snapshot_task,
                 starttaskmsg="Predictions task started",
                 tabtitle="Predictions",
                 runmethodargs=dict(
@@ -91,7 +89,7 @@ class Events(events_database.Events):
             dict(
                 runmethod=self.get_appsys()
                 .get_results_database()
-                .do_database_task,
+                .do_snapshot_task,
                 starttaskmsg="Population map analysis task started",
                 tabtitle="Populations",
                 runmethodargs=dict(
@@ -251,6 +249,9 @@ class Events(events_database.Events):
                 "Calculating performances and season comparisions."
             )
             logwidget.append_text_only("")
+        # Imported on first use to keep chesscalc out of start-up.
+        from chesscalc.gui import prediction
+
         prediction.Prediction(
             self,
             "Calculate  Distributions",
@@ -354,6 +355,8 @@ class Events(events_database.Events):
         for k in names.keys():
             aspn = AppSysPersonName(names[k])
             names[k] = (aspn.name, names[k])
+        from chesscalc.gui import performance
+
         performance.Performance(
             self,
             "Calculate Player Performances",
@@ -461,6 +464,8 @@ class Events(events_database.Events):
                 "Calculating population map analysis and details."
             )
             logwidget.append_text_only("")
+        from chesscalc.gui import population
+
         population.Population(
             self,
             "Calculate Population Map Analysis",
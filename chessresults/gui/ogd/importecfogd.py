@@ -160,7 +160,12 @@ class ImportECFOGD(logpanel.WidgetAndLogPanel):
 
     def on_start_ecf_import(self, event=None):
         """Run get_event_data_to_be_imported in separate thread."""
-        self.tasklog.run_method(method=self._copymethod, args=(self,))
+        self.tasklog.run_method(
+            method=self.get_appsys()
+            .get_results_database()
+            .profile_task(self._copymethod),
+            args=(self,),
+        )
 
     def show_buttons_for_cancel_import(self):
         """Show buttons for actions allowed at start of import process."""
@@ -11,7 +11,6 @@ import importlib
 from . import control_ogd
 from . import events_ogd
 from . import newplayers_ogd
-from . import ogdgradingcodes
 from . import importecfogd
 from .. import leagues_database
 from ... import ECF_OGD_DATA_IMPORT_MODULE
@@ -48,9 +47,9 @@ class Leagues(leagues_database.Leagues):
             text="Grading Codes",
             tooltip="Associate player with ECF grading code.",
             underline=0,
-            tabclass=lambda **k: ogdgradingcodes.ECFGradingCodes(
-                gridhorizontal=False, **k
-            ),
+            tabclass=lambda **k: importlib.import_module(
+                ".ogd.ogdgradingcodes", "chessresults.gui"
+            ).ECFGradingCodes(gridhorizontal=False, **k),
             destroy_actions=(control_ogd.Control._btn_closedatabase,),
         )
         self.define_tab(
@@ -21,11 +21,17 @@ from ..core import constants as cc
 
 
 class Prepare(ExceptionHandler):
-    """Convert from League or ECF submission format to Results format."""
+    """Convert from League or ECF submission format to Results format.
 
-    def __init__(self, format_class):
+    Files are read and reported in a pool of processes if processes is a
+    number greater than 1.
+
+    """
+
+    def __init__(self, format_class, processes=None):
         super(Prepare, self).__init__()
         self.format_class = format_class
+        self.processes = processes
         self.format_error = None
         self.importdata = None
         self.folder = None
@@ -46,7 +52,9 @@ class Prepare(ExceptionHandler):
             )
             self.root.wm_deiconify()
             self.root.update_idletasks()
-            self.importdata = self.format_class(folder)
+            self.importdata = self.format_class(
+                folder, processes=self.processes, progress=self.show_progress
+            )
             extract = self.importdata.translate_results_format()
             if not self.importdata.error:
                 del self.format_error[:]
@@ -170,6 +178,22 @@ class Prepare(ExceptionHandler):
             self.root.destroy()
             self.root = None
 
+    def show_progress(self, stage, done, total):
+        """Show progress of stage in window title."""
+        self.root.wm_title(
+            string=" ".join(
+                (
+                    "Please wait while processing selected folder:",
+                    stage,
+                    str(done),
+                    "of",
+                    str(total),
+                    "files",
+                )
+            )
+        )
+        self.root.update_idletasks()
+
     def quit_submission(self):
         if tkinter.messagebox.askyesno(
             parent=self.get_widget(),
@@ -27,12 +27,18 @@ from ..core.ecf.ecfmaprecord import get_grading_code_for_person
 from ..core.ecf.ecfrecord import get_ecf_player_for_grading_code
 from ..core import collationdb
 from ..core import filespec
+from ..core import taskexecutor
+
+# Interval, in milliseconds, between checks for the update task finishing.
+_UPDATE_POLL_INTERVAL = 200
 
 
 class SourceEdit(sourceedit.SourceEdit):
     """The Edit panel for raw results data."""
 
     _btn_update = "sourceedit_update"
+    _update_progress = None
+    _update_poll = None
 
     def describe_buttons(self):
         """Define all action buttons that may appear on data input page."""
@@ -101,25 +107,82 @@ class SourceEdit(sourceedit.SourceEdit):
         )
 
     def on_update(self, event=None):
-        """Update database from validated source document."""
-        if self.update_event_results():
-            db = self.get_appsys().get_results_database()
-            self.refresh_controls(
-                (
-                    (
-                        db,
-                        filespec.PLAYER_FILE_DEF,
-                        filespec.PLAYERPARTIALNEW_FIELD_DEF,
-                    ),
+        """Queue update of database from validated source document."""
+        self.update_event_results()
+
+    def close(self):
+        """Stop checking for the update task finishing and close panel.
+
+        The update task, if not finished, is left to finish.
+
+        """
+        if self._update_poll is not None:
+            self.get_widget().after_cancel(self._update_poll)
+            self._update_poll = None
+        super().close()
+
+    def _update_event_results_finished(self):
+        """Report outcome of update task and refresh database controls."""
+        progress = self._update_progress
+        if not progress.is_finished():
+            self._update_poll = self.get_widget().after(
+                _UPDATE_POLL_INTERVAL, self._update_event_results_finished
+            )
+            return
+        self._update_poll = None
+        self._update_progress = None
+        if progress.state == taskexecutor.FAILED:
+            tkinter.messagebox.showinfo(
+                parent=self.get_widget(),
+                message="".join(
                     (
-                        db,
-                        filespec.EVENT_FILE_DEF,
-                        filespec.EVENTNAME_FIELD_DEF,
-                    ),
-                )
+                        "Update failed and was backed out.\n\n",
+                        str(progress.error),
+                    )
+                ),
+                title="Update",
+            )
+            return
+        if progress.state == taskexecutor.CANCELLED:
+            tkinter.messagebox.showinfo(
+                parent=self.get_widget(),
+                message="Update cancelled and backed out",
+                title="Update",
+            )
+            return
+        if isinstance(progress.result, tuple):
+            dialogue.Report(
+                parent=self,
+                title="Player records blocking update",
+                action_titles={"Save": "Save Blocking Update Details"},
+                wrap=tkinter.WORD,
+                tabstyle="tabular",
+            ).append("\n\n".join(progress.result))
+        else:
+            tkinter.messagebox.showinfo(
+                parent=self.get_widget(),
+                message="".join(("Results database updated")),
+                title="Update",
             )
-            self.show_buttons_for_generate()
-            self.create_buttons()
+        db = self.get_appsys().get_results_database()
+        if db is None:
+            return
+        self.refresh_controls(
+            (
+                (
+                    db,
+                    filespec.PLAYER_FILE_DEF,
+                    filespec.PLAYERPARTIALNEW_FIELD_DEF,
+                ),
+                (
+                    db,
+                    filespec.EVENT_FILE_DEF,
+                    filespec.EVENTNAME_FIELD_DEF,
+                ),
+            )
+        )
+        self.show_buttons_for_generate()
+        self.create_buttons()
 
     def show_buttons_for_update(self):
         """Show buttons for actions allowed after generating reports."""
@@ -411,7 +474,7 @@ class SourceEdit(sourceedit.SourceEdit):
             genres.append(("", None))
 
     def update_event_results(self):
-        """Show dialogue to update database and return true if updated."""
+        """Show dialogue to update database and return True if queued."""
         if self.is_report_modified():
             tkinter.messagebox.showinfo(
                 parent=self.get_widget(),
@@ -437,6 +500,14 @@ class SourceEdit(sourceedit.SourceEdit):
                 title="Update",
             )
             return False
+        executor = self.get_appsys().get_task_executor()
+        if executor.is_busy():
+            tkinter.messagebox.showinfo(
+                parent=self.get_widget(),
+                message="Wait for the tasks in progress to finish",
+                title="Update",
+            )
+            return False
         if not tkinter.messagebox.askyesno(
             parent=self.get_widget(),
             message="".join(("Do you want to update results?")),
@@ -445,25 +516,49 @@ class SourceEdit(sourceedit.SourceEdit):
             return False
 
         self._collate_unfinished_games()
-        collatedb = collationdb.CollationDB(
-            self.get_context().results_data.get_collated_games(), db
+        self._update_progress = executor.submit(
+            "Update Results",
+            self.update_results_task,
+            args=(db, self.get_context().results_data.get_collated_games()),
         )
-        db.start_transaction()
-        u = collatedb.update_results()
+        self._update_event_results_finished()
+        return True
+
+    def update_results_task(self, database, games, progress=None):
+        """Apply games to database and return outcome of update.
+
+        The update is done by do_database_task on a new connection because
+        the connection used by this panel belongs to the Tk thread.
+
+        """
+        outcome = []
+        database.do_database_task(
+            self.apply_collated_games,
+            taskmethodargs=dict(
+                games=games, outcome=outcome, progress=progress
+            ),
+        )
+        return outcome[0]
+
+    def apply_collated_games(
+        self, database, logwidget, games=None, outcome=None, progress=None
+    ):
+        """Apply games to database and append outcome of update to outcome.
+
+        For do_database_task calls.  A tuple of reasons is the outcome if
+        player records block the update.  The update is backed out if
+        blocked, cancelled, or it fails.
+
+        """
+        collatedb = collationdb.CollationDB(games, database, progress=progress)
+        database.start_transaction()
+        try:
+            u = collatedb.update_results()
+        except BaseException:
+            database.backout()
+            raise
         if isinstance(u, tuple):
-            db.backout()
-            dialogue.Report(
-                parent=self,
-                title="Player records blocking update",
-                action_titles={"Save": "Save Blocking Update Details"},
-                wrap=tkinter.WORD,
-                tabstyle="tabular",
-            ).append("\n\n".join(u))
+            database.backout()
         else:
-            db.commit()
-            dlg = tkinter.messagebox.showinfo(
-                parent=self.get_widget(),
-                message="".join(("Results database updated")),
-                title="Update",
-            )
-        return True
+            database.commit()
+        outcome.append(u)
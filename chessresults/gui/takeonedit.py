@@ -27,14 +27,18 @@ Players tab.
 
 import tkinter
 import tkinter.messagebox
-import difflib
 import os
 import datetime
 
 from solentware_misc.gui import panel, dialogue, textreadonly, texttab
 
+from ..core import linediff
 from ..core import takeoncollationdb
 from ..core import filespec
+from ..core import taskexecutor
+
+# Interval, in milliseconds, between checks for the update task finishing.
+_UPDATE_POLL_INTERVAL = 200
 
 
 class TakeonEdit(panel.PlainPanel):
@@ -70,6 +74,8 @@ class TakeonEdit(panel.PlainPanel):
         self.originalpane = None
         self.editpane = None
         self.generatedpane = None
+        self._update_progress = None
+        self._update_poll = None
         self.show_buttons_for_generate()
         self.create_buttons()
         self.folder = tkinter.Label(
@@ -131,7 +137,7 @@ class TakeonEdit(panel.PlainPanel):
         # self.schedulectrl.insert(Tkinter.END, '\n'.join(genfix))
 
     def update_event_results(self):
-        """Show dialogue to update database and return true if updated."""
+        """Show dialogue to update database and return True if queued."""
         if self.is_report_modified():
             tkinter.messagebox.showinfo(
                 parent=self.get_widget(),
@@ -157,35 +163,133 @@ class TakeonEdit(panel.PlainPanel):
                 title="Update",
             )
             return False
+        executor = self.get_appsys().get_task_executor()
+        if executor.is_busy():
+            tkinter.messagebox.showinfo(
+                parent=self.get_widget(),
+                message="Wait for the tasks in progress to finish",
+                title="Update",
+            )
+            return False
         if not tkinter.messagebox.askyesno(
             parent=self.get_widget(),
             message="".join(("Do you want to update results?")),
             title="Update",
         ):
             return False
+        self._update_progress = executor.submit(
+            "Update Results",
+            self.update_results_task,
+            args=(db, self.get_context().results_data.collation),
+        )
+        self._update_event_results_finished()
+        return True
+
+    def update_results_task(self, database, collation, progress=None):
+        """Apply collation to database and return outcome of update.
+
+        The update is done by do_database_task on a new connection because
+        the connection used by this panel belongs to the Tk thread.
+
+        """
+        outcome = []
+        database.do_database_task(
+            self.apply_collation,
+            taskmethodargs=dict(
+                collation=collation, outcome=outcome, progress=progress
+            ),
+        )
+        return outcome[0]
+
+    def apply_collation(
+        self, database, logwidget, collation=None, outcome=None, progress=None
+    ):
+        """Apply collation to database and append outcome of update to outcome.
+
+        For do_database_task calls.  A tuple of reasons is the outcome if
+        player records block the update.  The update is backed out if
+        blocked, cancelled, or it fails.
+
+        """
         collatedb = takeoncollationdb.TakeonCollationDB(
-            self.get_context().results_data.collation, db
+            collation, database, progress=progress
         )
-        db.start_transaction()
-        u = collatedb.update_results()
+        database.start_transaction()
+        try:
+            u = collatedb.update_results()
+            if not isinstance(u, tuple):
+                collatedb.merge_players()
+        except BaseException:
+            database.backout()
+            raise
         if isinstance(u, tuple):
-            db.backout()
+            database.backout()
+        else:
+            database.commit()
+        outcome.append(u)
+
+    def _update_event_results_finished(self):
+        """Report outcome of update task and refresh database controls."""
+        progress = self._update_progress
+        if not progress.is_finished():
+            self._update_poll = self.get_widget().after(
+                _UPDATE_POLL_INTERVAL, self._update_event_results_finished
+            )
+            return
+        self._update_poll = None
+        self._update_progress = None
+        if progress.state == taskexecutor.FAILED:
+            tkinter.messagebox.showinfo(
+                parent=self.get_widget(),
+                message="".join(
+                    (
+                        "Update failed and was backed out.\n\n",
+                        str(progress.error),
+                    )
+                ),
+                title="Update",
+            )
+            return
+        if progress.state == taskexecutor.CANCELLED:
+            tkinter.messagebox.showinfo(
+                parent=self.get_widget(),
+                message="Update cancelled and backed out",
+                title="Update",
+            )
+            return
+        if isinstance(progress.result, tuple):
             dialogue.Report(
                 parent=self,
                 title="Player records blocking update",
                 action_titles={"Save": "Save Blocking Update Details"},
                 wrap=tkinter.WORD,
                 tabstyle="tabular",
-            ).append("\n\n".join(u))
+            ).append("\n\n".join(progress.result))
         else:
-            collatedb.merge_players()
-            db.commit()
-            dlg = tkinter.messagebox.showinfo(
+            tkinter.messagebox.showinfo(
                 parent=self.get_widget(),
                 message="".join(("Results database updated")),
                 title="Update",
             )
-        return True
+        db = self.get_appsys().get_results_database()
+        if db is None:
+            return
+        self.refresh_controls(
+            (
+                (
+                    db,
+                    filespec.PLAYER_FILE_DEF,
+                    filespec.PLAYERPARTIALNEW_FIELD_DEF,
+                ),
+                (
+                    db,
+                    filespec.EVENT_FILE_DEF,
+                    filespec.EVENTNAME_FIELD_DEF,
+                ),
+            )
+        )
+        self.show_buttons_for_generate()
+        self.create_buttons()
 
     # Copied methods from here on
 
@@ -230,7 +334,7 @@ class TakeonEdit(panel.PlainPanel):
             tkinter.END,
             "\n".join(
                 list(
-                    difflib.restore(
+                    linediff.restore(
                         self.get_context().results_data.fixtures, 2
                     )
                 )
@@ -240,7 +344,9 @@ class TakeonEdit(panel.PlainPanel):
             tkinter.END,
             "\n".join(
                 list(
-                    difflib.restore(self.get_context().results_data.results, 2)
+                    linediff.restore(
+                        self.get_context().results_data.results, 2
+                    )
                 )
             ),
         )
@@ -290,7 +396,7 @@ class TakeonEdit(panel.PlainPanel):
             tkinter.END,
             "\n".join(
                 list(
-                    difflib.restore(
+                    linediff.restore(
                         self.get_context().results_data.fixtures, 1
                     )
                 )
@@ -300,7 +406,7 @@ class TakeonEdit(panel.PlainPanel):
             tkinter.END,
             "\n".join(
                 list(
-                    difflib.restore(
+                    linediff.restore(
                         self.get_context().results_data.fixtures, 2
                     )
                 )
@@ -310,7 +416,9 @@ class TakeonEdit(panel.PlainPanel):
             tkinter.END,
             "\n".join(
                 list(
-                    difflib.restore(self.get_context().results_data.results, 1)
+                    linediff.restore(
+                        self.get_context().results_data.results, 1
+                    )
                 )
             ),
         )
@@ -318,7 +426,9 @@ class TakeonEdit(panel.PlainPanel):
             tkinter.END,
             "\n".join(
                 list(
-                    difflib.restore(self.get_context().results_data.results, 2)
+                    linediff.restore(
+                        self.get_context().results_data.results, 2
+                    )
                 )
             ),
         )
@@ -517,25 +627,8 @@ class TakeonEdit(panel.PlainPanel):
         self.show_edits_and_generated()
 
     def on_update(self, event=None):
-        """Update database from validated source document."""
-        if self.update_event_results():
-            db = self.get_appsys().get_results_database()
-            self.refresh_controls(
-                (
-                    (
-                        db,
-                        filespec.PLAYER_FILE_DEF,
-                        filespec.PLAYERPARTIALNEW_FIELD_DEF,
-                    ),
-                    (
-                        db,
-                        filespec.EVENT_FILE_DEF,
-                        filespec.EVENTNAME_FIELD_DEF,
-                    ),
-                )
-            )
-            self.show_buttons_for_generate()
-            self.create_buttons()
+        """Queue update of database from validated source document."""
+        self.update_event_results()
 
     def show_buttons_for_compare(self):
         """Show buttons for actions allowed comparing input data versions."""
@@ -643,5 +736,9 @@ class TakeonEdit(panel.PlainPanel):
 
         Used, at least, as callback from AppSysFrame container.
 
+        The update task, if not finished, is left to finish.
+
         """
-        pass
+        if self._update_poll is not None:
+            self.get_widget().after_cancel(self._update_poll)
+            self._update_poll = None
@@ -6,6 +6,8 @@
 
 """
 
+import os
+
 if __name__ == "__main__":
 
     application_name = "PrepareECFFormat"
@@ -40,7 +42,7 @@ if __name__ == "__main__":
         )
         raise SystemExit(" import ".join(("Unable to", application_name)))
     try:
-        app = PrepareECF(PrepareSubmissionFile)
+        app = PrepareECF(PrepareSubmissionFile, processes=os.cpu_count())
     except Exception as error:
         start_application_exception(
             error, appname=application_name, action="initialise"
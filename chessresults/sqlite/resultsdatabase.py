@@ -5,13 +5,19 @@
 """Results database using Sqlite3 database via sqlite3.
 """
 
+import sqlite3
+
 from solentware_base import sqlite3_database
 
 from ..core.filespec import FileSpec
 from ..basecore import database
+from ..basecore import sqliteprofile
+from ..basecore import backup
 
 
-class ResultsDatabase(database.Database, sqlite3_database.Database):
+class ResultsDatabase(
+    sqliteprofile.Database, database.Database, sqlite3_database.Database
+):
     """Methods and data structures to create, open, and close database."""
 
     _datasourceset_modulename = "solentware_grid.core.datasourceset"
@@ -25,4 +31,18 @@ class ResultsDatabase(database.Database, sqlite3_database.Database):
 
     def delete_database(self):
         """Close and delete the open chess results database."""
-        return super().delete_database((self.database_file,))
+        return super().delete_database(
+            (
+                self.database_file,
+                self.database_file + "-wal",
+                self.database_file + "-shm",
+            )
+        )
+
+    def online_backup(self, filename):
+        """Copy database to filename by sqlite3 backup method."""
+        target = sqlite3.connect(filename)
+        try:
+            self.dbenv.backup(target, pages=backup.BACKUP_PAGES)
+        finally:
+            target.close()
@@ -0,0 +1,18 @@
+# resultsdatabasedu.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Results database using Sqlite3 via sqlite3 with deferred index updates.
+
+Used to fill a new database in bulk, as the migrate_database tool does.
+"""
+
+from solentware_base import sqlite3du_database
+
+from . import resultsdatabase
+
+
+class ResultsDatabase(
+    resultsdatabase.ResultsDatabase, sqlite3du_database.Database
+):
+    """Results database which sorts index updates and applies them in bulk."""
@@ -0,0 +1,280 @@
+# benchmark_suite.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Time common results database operations for each installed engine.
+
+A new database is created in a temporary folder for each database engine and
+filled with synthetic league results by synthetic_league.SyntheticLeague.
+The time taken for these operations is measured:
+
+populate: add the synthetic league to the database.
+export: generate export data for all events, as Export Events does.
+performance: get_events_for_performance_calculation for all events except
+those in the last season, as Performance does.
+performance matrix: get_events_for_performance_matrix for the same events,
+if numpy is installed.
+ecf players sync: apply a ECF rating list, as the ECF players download does.
+import: read the export data into a collation, as Import Events does.
+update results: CollationDB.update_results, and identify the imported
+players, for the collation on a new database, as Import Events does.
+delete events: delete the events of the last season, as Delete Event does.
+
+The results are written to a JSON file, or standard output, so timings can
+be compared for different engines, and for different versions of Results.
+
+Run as 'python -m chessresults.tools.benchmark_suite [-e engine]
+[-s seasons] [-t teams] [-o file]' where engine is one of the installed
+database engines, default all of them, teams is teams per division, and
+file is the output file.
+
+"""
+
+import sys
+import os
+import time
+import json
+import shutil
+import tempfile
+import platform
+import importlib
+
+from solentware_base import modulequery
+
+from .. import APPLICATION_DATABASE_MODULE, ECF_DATA_IMPORT_MODULE
+from ..core import eventdata
+from ..core import performancematrix
+from ..core import resultsrecord
+from ..core import importreports
+from ..core import importcollation
+from ..core import importcollationdb
+from ..core.opendatabase import get_database_class
+from . import synthetic_league
+
+# Version of the JSON output format.
+FORMAT_VERSION = 1
+
+
+class BenchmarkSuiteError(Exception):
+    pass
+
+
+def get_installed_engines():
+    """Return sorted names of installed engines usable for results."""
+    return sorted(
+        name
+        for name in modulequery.installed_database_modules()
+        if name in APPLICATION_DATABASE_MODULE
+    )
+
+
+class BenchmarkRun(object):
+    """The benchmark operations for one database engine.
+
+    Each operation method returns the number of items it processed.  Later
+    operations use the export data and collation from earlier ones.
+
+    """
+
+    def __init__(self, engine, league, folder):
+        super(BenchmarkRun, self).__init__()
+        self.engine = engine
+        self.league = league
+        self.folder = folder
+        self.database = None
+        self.exportdata = None
+        self.collation = None
+
+    def open_database(self, name):
+        """Return opened new database called name in folder."""
+        database = get_database_class(self.engine)(
+            os.path.join(self.folder, name), allowcreate=True
+        )
+        message = database.open_database()
+        if message:
+            raise BenchmarkSuiteError(message)
+        return database
+
+    def populate(self):
+        """Add synthetic league to a new database."""
+        self.database = self.open_database("results")
+        return sum(self.league.populate(self.database).values())
+
+    def export(self):
+        """Generate export data for all events."""
+        self.exportdata = eventdata.get_event_export_data(
+            self.database, self.league.event_keys
+        )
+        if self.exportdata is None:
+            raise BenchmarkSuiteError("Some players are not merged or joined")
+        return len(self.exportdata)
+
+    def performance(self):
+        """Get performance calculation data for events of earlier seasons.
+
+        The players in the last season are not identified.
+
+        """
+        events = [
+            e for season in self.league.season_event_keys[:-1] for e in season
+        ]
+        if (
+            resultsrecord.get_events_for_performance_calculation(
+                self.database, events
+            )
+            is None
+        ):
+            raise BenchmarkSuiteError("Some players are not identified")
+        return len(events)
+
+    def performance_matrix(self):
+        """Get performance matrix for events of earlier seasons."""
+        events = [
+            e for season in self.league.season_event_keys[:-1] for e in season
+        ]
+        if (
+            performancematrix.get_events_for_performance_matrix(
+                self.database, events
+            )
+            is None
+        ):
+            raise BenchmarkSuiteError("Some players are not identified")
+        return len(events)
+
+    def ecf_players_sync(self):
+        """Apply a rating list to the ECF player reference records."""
+        ecfdata = self.league.ecf_player_data()
+        importlib.import_module(
+            ECF_DATA_IMPORT_MODULE[self.engine], "chessresults.tools"
+        ).copy_ecf_players_post_2020_rules(
+            self.database,
+            ecfdata=ecfdata,
+            downloaddate=time.strftime("%Y-%m-%d"),
+        )
+        return len(ecfdata["players"])
+
+    def import_(self):
+        """Collate the games in the export data."""
+        importdata = importreports.get_import_event_reports(self.exportdata)
+        if importdata is None:
+            raise BenchmarkSuiteError(
+                "Unable to extract events from export data"
+            )
+        self.collation = importcollation.ImportCollation(importdata)
+        return len(importdata.game)
+
+    def update_results(self):
+        """Apply the collated games to a new database."""
+        database = self.open_database("imported")
+        try:
+            collatedb = importcollationdb.ImportCollationDB(
+                self.collation, database
+            )
+            database.start_transaction()
+            message = collatedb.update_results()
+            if message:
+                database.backout()
+                raise BenchmarkSuiteError(message[0])
+            collatedb.identify_players()
+            database.commit()
+        finally:
+            database.close_database()
+        return len(self.collation.importreport.game)
+
+    def delete_events(self):
+        """Delete the events in the last season."""
+        events = self.league.season_event_keys[-1]
+        eventdata.delete_events(self.database, events)
+        return len(events)
+
+    def run(self):
+        """Return {operation: dict(seconds, items) or dict(error), ...}.
+
+        Operations which need the result of a failed operation are reported
+        as not run.
+
+        """
+        results = {}
+        try:
+            for name, method, needs in (
+                ("populate", self.populate, None),
+                ("export", self.export, "populate"),
+                ("performance", self.performance, "populate"),
+                ("performance matrix", self.performance_matrix, "populate"),
+                ("ecf players sync", self.ecf_players_sync, "populate"),
+                ("import", self.import_, "export"),
+                ("update results", self.update_results, "import"),
+                ("delete events", self.delete_events, "populate"),
+            ):
+                if needs is not None and "error" in results[needs]:
+                    results[name] = dict(error="not run")
+                    continue
+                start = time.perf_counter()
+                try:
+                    items = method()
+                except Exception as exc:
+                    results[name] = dict(
+                        error=str(exc) or exc.__class__.__name__
+                    )
+                    continue
+                results[name] = dict(
+                    seconds=round(time.perf_counter() - start, 6),
+                    items=items,
+                )
+        finally:
+            if self.database is not None:
+                self.database.close_database()
+                self.database = None
+        return results
+
+
+def run_suite(engines=None, **scale):
+    """Return benchmark report for engines, default all installed engines.
+
+    scale is passed to synthetic_league.SyntheticLeague().
+
+    """
+    if engines is None:
+        engines = get_installed_engines()
+    report = dict(
+        format=FORMAT_VERSION,
+        date=time.strftime("%Y-%m-%dT%H:%M:%S"),
+        python=platform.python_version(),
+        platform=platform.platform(),
+        scale=scale,
+        engines={},
+    )
+    for engine in engines:
+        folder = tempfile.mkdtemp()
+        try:
+            report["engines"][engine] = BenchmarkRun(
+                engine, synthetic_league.SyntheticLeague(**scale), folder
+            ).run()
+        finally:
+            shutil.rmtree(folder, ignore_errors=True)
+    return report
+
+
+if __name__ == "__main__":
+
+    arguments = sys.argv[1:]
+    engines = None
+    scale = {}
+    output = None
+    while arguments[:1] in (["-e"], ["-s"], ["-t"], ["-o"]):
+        if arguments[0] == "-e":
+            engines = (engines or []) + [arguments[1]]
+        elif arguments[0] == "-s":
+            scale["seasons"] = int(arguments[1])
+        elif arguments[0] == "-t":
+            scale["teams"] = int(arguments[1])
+        else:
+            output = arguments[1]
+        arguments = arguments[2:]
+    report = run_suite(engines=engines, **scale)
+    if output is None:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(output, "w", encoding="utf-8") as jsonfile:
+            json.dump(report, jsonfile, indent=2)
@@ -0,0 +1,72 @@
+# check_integrity.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Check, and optionally repair, the links between records in a database.
+
+Run as 'python -m chessresults.tools.check_integrity [-r] [-w workers]
+folder' where folder is the folder containing the database, -r asks for
+the problems found to be repaired, and workers is the number of processes
+used to scan the database, default the number of processors.
+
+Scans are done in parallel only for the SQLite database engines.  The
+database should be backed up before repairs are done.
+
+"""
+
+import sys
+
+from ..core.integrity import IntegrityCheck
+from ..core.opendatabase import get_database_engine, open_results_database
+from ..core.taskexecutor import TaskProgress
+
+
+def check_integrity(database_folder, repair=False, workers=None, report=None):
+    """Check database in database_folder and return IntegrityCheck instance.
+
+    The repairs are done if repair is True.  report is called with progress
+    messages if given.
+
+    """
+    enginename = get_database_engine(database_folder)
+    database = open_results_database(database_folder, enginename=enginename)
+    try:
+        check = IntegrityCheck(
+            database,
+            enginename=enginename,
+            progress=TaskProgress("Check integrity", report=report),
+        )
+        check.run(workers=workers)
+        if repair and check.is_repair_needed():
+            changed = check.repair()
+            if report is not None:
+                report(" ".join((str(changed), "records repaired.")))
+        return check
+    finally:
+        database.close_database()
+
+
+if __name__ == "__main__":
+
+    arguments = sys.argv[1:]
+    repair = False
+    workers = None
+    while arguments[:1] in (["-r"], ["-w"]):
+        if arguments[0] == "-r":
+            repair = True
+            arguments = arguments[1:]
+        else:
+            workers = int(arguments[1])
+            arguments = arguments[2:]
+    if len(arguments) != 1:
+        print(
+            "Usage: python -m chessresults.tools.check_integrity",
+            "[-r] [-w workers] folder",
+        )
+        sys.exit(2)
+    check = check_integrity(
+        arguments[0], repair=repair, workers=workers, report=print
+    )
+    for line in check.get_report():
+        print(line)
+    sys.exit(1 if check.problems and not repair else 0)
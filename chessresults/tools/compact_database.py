@@ -0,0 +1,243 @@
+# compact_database.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Remove orphaned records from a results database and compact its files.
+
+Deleting events, and imports which replace earlier results, leave player and
+name records which nothing refers to.  A player is orphaned if no game refers
+to it, it has no aliases, and no ECF map record refers to it.  A name is
+orphaned if no event, player, or game refers to it.  Orphaned players and
+names are deleted, along with repairs of any problems found by the
+integrity check in core.integrity, in one transaction.
+
+The database files are then compacted in place if the database engine can
+do so: SQLite databases are vacuumed and Berkeley DB files are compacted.
+
+Alternatively the database is copied to a new database using the same engine
+with player and game records renumbered in event order, so the games of an
+event are close together in the file.  The copy is compact for all engines.
+The original database is kept in a folder named by adding '-precompact' to
+the database folder name.
+
+Run as 'python -m chessresults.tools.compact_database [-n] [-w workers]
+folder' where folder is the folder containing the database, -n asks for
+records to be renumbered in event order, and workers is the number of
+processes used to scan the database.
+
+"""
+
+import sys
+import os
+import shutil
+
+from .. import ERROR_LOG
+from ..core import constants
+from ..core import filespec
+from ..core import resultsrecord
+from ..core.integrity import IntegrityCheck
+from ..core.opendatabase import get_database_engine, open_results_database
+from ..core.taskexecutor import TaskProgress
+from .migrate_database import DatabaseMigration, FILES, migrate_database
+
+# Suffixes of folder names for the renumbered copy and the original database.
+COMPACT_SUFFIX = "-compact"
+PRECOMPACT_SUFFIX = "-precompact"
+
+
+class CompactDatabaseError(Exception):
+    pass
+
+
+class OrphanCompaction(IntegrityCheck):
+    """Find orphaned players and names as well as integrity problems.
+
+    The repairs delete the orphaned players and names.
+
+    """
+
+    def __init__(self, database, enginename=None, progress=None):
+        super(OrphanCompaction, self).__init__(
+            database, enginename=enginename, progress=progress
+        )
+        self.orphan_players = []
+
+    def _unreference(self, references, key):
+        references[key] -= 1
+        if references[key] <= 0:
+            del references[key]
+
+    def find_orphan_players(self):
+        """Remove orphaned players from the references found by scan.
+
+        The checks which follow see the database as it will be after the
+        orphaned players are deleted.
+
+        """
+        for key, (merge, alias) in sorted(self.links.items()):
+            if key in self.players or key in self.mapped_players:
+                continue
+            if isinstance(alias, list) and alias:
+                continue
+            player = resultsrecord.get_alias(self.database, key)
+            value = player.value
+            self._unreference(self.events, value.event)
+            for name in (value.section, value.affiliation):
+                if name is not None:
+                    self._unreference(self.names, name)
+            del self.links[key]
+            self.keys[filespec.PLAYER_FILE_DEF].discard(key)
+            self.orphan_players.append(player)
+
+    def check_name_counts(self):
+        """Extend to delete names which are not referenced."""
+        super().check_name_counts()
+        for key in self.counts:
+            if key not in self.names:
+                self.name_repairs[key] = 0
+
+    def run(self, workers=None):
+        """Find orphaned records and problems and return list of problems."""
+        self.scan(workers=workers)
+        self.check_map_records()
+        self.find_orphan_players()
+        self.check_references()
+        self.check_name_counts()
+        self.check_player_links()
+        return self.problems
+
+    def is_repair_needed(self):
+        """Return True if orphaned records, or repairable problems, found."""
+        return bool(self.orphan_players) or super().is_repair_needed()
+
+    def apply_repairs(self):
+        """Extend to delete orphaned players."""
+        for player in self.orphan_players:
+            player.delete_record(self.database, filespec.PLAYER_FILE_DEF)
+        return len(self.orphan_players) + super().apply_repairs()
+
+
+class EventOrderMigration(DatabaseMigration):
+    """Copy database with players and games in event order."""
+
+    def source_records(self, file):
+        """Yield player and game records in event order.
+
+        Records for the same event are in record number order, as are the
+        records in other files.
+
+        """
+        if file not in (filespec.PLAYER_FILE_DEF, filespec.GAME_FILE_DEF):
+            yield from super().source_records(file)
+            return
+        record = dict(FILES)[file]()
+        order = []
+        for r in super().source_records(file):
+            record.load_record(r)
+            order.append((record.value.event, r[0]))
+        order.sort()
+        for event, key in order:
+            yield self.source.get_primary_record(file, key)
+
+
+def renumber_database(database_folder, enginename):
+    """Replace database by a copy with records in event order.
+
+    Return the counts from EventOrderMigration.run().
+
+    """
+    parent, name = os.path.split(os.path.abspath(database_folder))
+    staging = os.path.join(parent, name + COMPACT_SUFFIX)
+    original = os.path.join(parent, name + PRECOMPACT_SUFFIX)
+    for folder in staging, original:
+        if os.path.exists(folder):
+            raise CompactDatabaseError(
+                "".join(("Folder ", folder, " already exists"))
+            )
+    os.mkdir(staging)
+    try:
+        counts = migrate_database(
+            database_folder,
+            os.path.join(staging, name),
+            enginename,
+            migrationclass=EventOrderMigration,
+        )
+        for item in ERROR_LOG, constants.ECF_DOWNLOAD_CACHE:
+            source = os.path.join(database_folder, item)
+            if os.path.isdir(source):
+                shutil.copytree(source, os.path.join(staging, name, item))
+            elif os.path.isfile(source):
+                shutil.copy2(source, os.path.join(staging, name, item))
+    except:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    os.mkdir(original)
+    os.rename(database_folder, os.path.join(original, name))
+    os.rename(os.path.join(staging, name), database_folder)
+    os.rmdir(staging)
+    return counts
+
+
+def compact_database(
+    database_folder, renumber=False, workers=None, report=None
+):
+    """Delete orphaned records then compact database in database_folder.
+
+    The database is renumbered in event order if renumber is True.  report
+    is called with progress messages if given.  Return the OrphanCompaction
+    instance used.
+
+    """
+    enginename = get_database_engine(database_folder)
+    database = open_results_database(database_folder, enginename=enginename)
+    try:
+        compaction = OrphanCompaction(
+            database,
+            enginename=enginename,
+            progress=TaskProgress("Compact database", report=report),
+        )
+        compaction.run(workers=workers)
+        if compaction.is_repair_needed():
+            changed = compaction.repair()
+            if report is not None:
+                report(
+                    " ".join((str(changed), "records deleted or repaired."))
+                )
+        if not renumber:
+            if database.compact_files():
+                if report is not None:
+                    report("Database files compacted.")
+            elif report is not None:
+                report("Database engine cannot compact files in place.")
+    finally:
+        database.close_database()
+    if renumber:
+        if report is not None:
+            report("Copying database in event order.")
+        renumber_database(database_folder, enginename)
+    return compaction
+
+
+if __name__ == "__main__":
+
+    arguments = sys.argv[1:]
+    renumber = False
+    workers = None
+    while arguments[:1] in (["-n"], ["-w"]):
+        if arguments[0] == "-n":
+            renumber = True
+            arguments = arguments[1:]
+        else:
+            workers = int(arguments[1])
+            arguments = arguments[2:]
+    if len(arguments) != 1:
+        print(
+            "Usage: python -m chessresults.tools.compact_database",
+            "[-n] [-w workers] folder",
+        )
+        sys.exit(2)
+    compaction = compact_database(
+        arguments[0], renumber=renumber, workers=workers, report=print
+    )
+    for line in compaction.get_report():
+        print(line)
@@ -0,0 +1,385 @@
+# migrate_database.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Copy a results database to a new database using another database engine.
+
+The records are copied file by file, names first, then events, players,
+games, and the ECF reference and map files.  The new database gives each
+record the next record number, so record numbers are not preserved when the
+old database has gaps left by deleted records.  Instead the references to
+names, events, and players in later files are remapped to the new record
+numbers as the records are copied.  References from players to other
+players are remapped after all players have been copied.
+
+Records with no value, like the '(key, None)' ECF map records seen in some
+databases, are not copied.  Map records which do not refer to a player are
+copied unchanged.
+
+Index updates are sorted and applied in bulk for each segment of records,
+except when the new database uses DPT where records are added normally.
+
+Run as 'python -m chessresults.tools.migrate_database source target engine'
+where source is the folder containing the database to be copied, target is
+the folder to be created for the new database, and engine is one of the
+installed database engines.
+
+"""
+
+import sys
+import os
+import shutil
+import importlib
+from ast import literal_eval
+
+from .. import APPLICATION_DATABASEDU_MODULE
+from ..core import filespec
+from ..core import resultsrecord
+from ..core.ecf import ecfrecord
+from ..core.ecf import ecfmaprecord
+from ..core.ogd import ecfogdrecord
+from ..core.ogd import ecfgcodemaprecord
+from ..core.opendatabase import get_database_class, open_results_database
+
+# Number of records added between commits.
+COMMIT_INTERVAL = 10000
+
+# Files in the order copied, so the records referred to by a record have
+# been copied before it.
+FILES = (
+    (filespec.NAME_FILE_DEF, resultsrecord.ResultsDBrecordName),
+    (filespec.EVENT_FILE_DEF, resultsrecord.ResultsDBrecordEvent),
+    (filespec.PLAYER_FILE_DEF, resultsrecord.ResultsDBrecordPlayer),
+    (filespec.GAME_FILE_DEF, resultsrecord.ResultsDBrecordGame),
+    (filespec.ECFPLAYER_FILE_DEF, ecfrecord.ECFrefDBrecordECFplayer),
+    (filespec.ECFCLUB_FILE_DEF, ecfrecord.ECFrefDBrecordECFclub),
+    (filespec.ECFTXN_FILE_DEF, ecfrecord.ECFrefDBrecordECFdate),
+    (filespec.ECFEVENT_FILE_DEF, ecfrecord.ECFrefDBrecordEvent),
+    (filespec.MAPECFPLAYER_FILE_DEF, ecfmaprecord.ECFmapDBrecordPlayer),
+    (filespec.MAPECFCLUB_FILE_DEF, ecfmaprecord.ECFmapDBrecordClub),
+    (filespec.ECFOGDPLAYER_FILE_DEF, ecfogdrecord.ECFrefOGDrecordPlayer),
+    (
+        filespec.MAPECFOGDPLAYER_FILE_DEF,
+        ecfgcodemaprecord.ECFmapOGDrecordPlayer,
+    ),
+)
+
+
+class MigrateDatabaseError(Exception):
+    pass
+
+
+def get_target_database_class(enginename):
+    """Return class for filling new database for engine enginename.
+
+    The class defers index updates if available for the engine.
+
+    """
+    modulename = APPLICATION_DATABASEDU_MODULE.get(enginename)
+    if modulename is None:
+        return get_database_class(enginename)
+    return importlib.import_module(modulename).ResultsDatabase
+
+
+class DatabaseMigration(object):
+    """Copy all records in source database to empty target database.
+
+    deferred is True if target is an instance of a class from
+    get_target_database_class which defers index updates.
+
+    keymaps maps the record numbers of names, events, and players in source
+    to the record numbers given to the copies in target.
+
+    """
+
+    def __init__(self, source, target, deferred=False, logwidget=None):
+        super(DatabaseMigration, self).__init__()
+        self.source = source
+        self.target = target
+        self.deferred = deferred
+        self.logwidget = logwidget
+        self.keymaps = {
+            filespec.NAME_FILE_DEF: {},
+            filespec.EVENT_FILE_DEF: {},
+            filespec.PLAYER_FILE_DEF: {},
+        }
+        self.player_links = []
+        self.counts = {}
+        self.no_value = 0
+
+    def _log(self, text):
+        if self.logwidget:
+            self.logwidget.append_text(text)
+
+    def remap(self, file, key):
+        """Return target record number for source record number key in file.
+
+        None is returned for None, the reference to nothing.
+
+        """
+        if key is None:
+            return None
+        try:
+            return self.keymaps[file][key]
+        except KeyError:
+            raise MigrateDatabaseError(
+                "".join(
+                    (
+                        "Record ",
+                        repr(key),
+                        " in file ",
+                        file,
+                        " is referenced but does not exist",
+                    )
+                )
+            ) from None
+
+    def remap_identity(self, identity):
+        """Return packed player identity with event and section remapped."""
+        name, (event, section, pin) = literal_eval(identity)
+        return repr(
+            (
+                name,
+                (
+                    self.remap(filespec.EVENT_FILE_DEF, event),
+                    self.remap(filespec.NAME_FILE_DEF, section),
+                    pin,
+                ),
+            )
+        )
+
+    def remap_playerkey(self, playerkey):
+        """Return playerkey, repr(<player record number>), remapped.
+
+        "" and None, which do not refer to a player, are returned unchanged.
+
+        """
+        if playerkey in ("", None):
+            return playerkey
+        return repr(self.remap(filespec.PLAYER_FILE_DEF, int(playerkey)))
+
+    def remap_value(self, file, value):
+        """Remap references in value, a record value for file, in place."""
+        if file == filespec.EVENT_FILE_DEF:
+            value.sections = [
+                self.remap(filespec.NAME_FILE_DEF, s) for s in value.sections
+            ]
+        elif file == filespec.PLAYER_FILE_DEF:
+            value.event = self.remap(filespec.EVENT_FILE_DEF, value.event)
+            value.section = self.remap(filespec.NAME_FILE_DEF, value.section)
+            value.affiliation = self.remap(
+                filespec.NAME_FILE_DEF, value.affiliation
+            )
+        elif file == filespec.GAME_FILE_DEF:
+            value.event = self.remap(filespec.EVENT_FILE_DEF, value.event)
+            for attr in ("section", "hometeam", "awayteam"):
+                setattr(
+                    value,
+                    attr,
+                    self.remap(filespec.NAME_FILE_DEF, getattr(value, attr)),
+                )
+            for attr in ("homeplayer", "awayplayer"):
+                setattr(
+                    value,
+                    attr,
+                    self.remap(filespec.PLAYER_FILE_DEF, getattr(value, attr)),
+                )
+        elif file in (
+            filespec.MAPECFPLAYER_FILE_DEF,
+            filespec.MAPECFCLUB_FILE_DEF,
+        ):
+            value.playerkey = self.remap_playerkey(value.playerkey)
+            if value.playername:
+                value.playername = self.remap_identity(value.playername)
+        elif file == filespec.MAPECFOGDPLAYER_FILE_DEF:
+            value.playerkey = self.remap_playerkey(value.playerkey)
+
+    def source_records(self, file):
+        """Yield records in file in source in the order they are copied.
+
+        The records are in record number order.
+
+        """
+        cursor = self.source.database_cursor(file, file)
+        try:
+            r = cursor.first()
+            while r:
+                yield r
+                r = cursor.next()
+        finally:
+            cursor.close()
+
+    def copy_file(self, file, recordclass):
+        """Copy records in file from source to target and return count.
+
+        Records with no value are counted in no_value but not copied.
+
+        """
+        keymap = self.keymaps.get(file)
+        record = recordclass()
+        count = 0
+        no_value = self.no_value
+        for r in self.source_records(file):
+            record.load_record(r)
+            sourcekey = record.key.recno
+            if not record.value.__dict__:
+                self.no_value += 1
+                continue
+            self.remap_value(file, record.value)
+            record.key.recno = None
+            record.put_record(self.target, file)
+            if keymap is not None:
+                keymap[sourcekey] = record.key.recno
+            if file == filespec.PLAYER_FILE_DEF:
+                value = record.value
+                if value.get_alias_list() or (
+                    value.merge is not None
+                    and not isinstance(value.merge, bool)
+                ):
+                    self.player_links.append(record.key.recno)
+            count += 1
+            if not count % COMMIT_INTERVAL:
+                self.commit_batch()
+        if self.no_value > no_value:
+            self._log(
+                "".join(
+                    (
+                        str(self.no_value - no_value),
+                        " records in file ",
+                        file,
+                        " have no value and are not copied.",
+                    )
+                )
+            )
+        return count
+
+    def commit_batch(self):
+        """Commit records added so far and start a new transaction."""
+        self.target.commit()
+        if self.deferred:
+            self.target.deferred_update_housekeeping()
+        self.target.start_transaction()
+
+    def relink_players(self):
+        """Remap alias and merge references between player records.
+
+        The index values of player records do not depend on the record
+        numbers in these references, so index entries are not changed.
+
+        """
+        self.target.start_transaction()
+        try:
+            for key in self.player_links:
+                player = resultsrecord.get_alias(self.target, key)
+                amended = player.clone()
+                value = amended.value
+                if value.get_alias_list():
+                    value.alias = [
+                        self.remap(filespec.PLAYER_FILE_DEF, a)
+                        for a in value.alias
+                    ]
+                if value.merge is not None and not isinstance(
+                    value.merge, bool
+                ):
+                    value.merge = self.remap(
+                        filespec.PLAYER_FILE_DEF, value.merge
+                    )
+                player.edit_record(
+                    self.target,
+                    filespec.PLAYER_FILE_DEF,
+                    filespec.PLAYER_FIELD_DEF,
+                    amended,
+                )
+        except:
+            self.target.backout()
+            raise
+        self.target.commit()
+        return len(self.player_links)
+
+    def run(self):
+        """Copy the database and return {file: records copied, ...}.
+
+        The number of player records whose links to other players were
+        remapped is the 'player links' item, and the number of records not
+        copied because they have no value is the 'no value' item.
+
+        """
+        if self.deferred:
+            self.target.set_defer_update()
+        else:
+            self.target.start_transaction()
+        try:
+            for file, recordclass in FILES:
+                if file not in self.source.specification:
+                    continue
+                self._log("".join(("Copying ", file, " records.")))
+                self.counts[file] = self.copy_file(file, recordclass)
+            if self.deferred:
+                self._log("Writing final index updates.")
+                self.target.do_final_segment_deferred_updates()
+        except:
+            self.target.backout()
+            raise
+        if self.deferred:
+            self.target.unset_defer_update()
+        else:
+            self.target.commit()
+        self._log("Remapping links between player records.")
+        self.counts["player links"] = self.relink_players()
+        self.counts["no value"] = self.no_value
+        return self.counts
+
+
+def migrate_database(
+    source_folder,
+    target_folder,
+    enginename,
+    logwidget=None,
+    migrationclass=DatabaseMigration,
+):
+    """Copy database in source_folder to new database in target_folder.
+
+    The new database uses engine enginename.  Return the counts from
+    the run() method of migrationclass, DatabaseMigration by default.
+
+    target_folder is removed if the copy fails, so the copy can be tried
+    again.
+
+    """
+    if os.path.exists(target_folder):
+        raise MigrateDatabaseError(
+            "".join(("Folder ", target_folder, " already exists"))
+        )
+    source = open_results_database(source_folder)
+    try:
+        try:
+            target = get_target_database_class(enginename)(
+                target_folder, allowcreate=True
+            )
+            deferred = enginename in APPLICATION_DATABASEDU_MODULE
+            message = target.open_database()
+            if message:
+                raise MigrateDatabaseError(message)
+            try:
+                return migrationclass(
+                    source, target, deferred=deferred, logwidget=logwidget
+                ).run()
+            finally:
+                target.close_database()
+        except BaseException:
+            shutil.rmtree(target_folder, ignore_errors=True)
+            raise
+    finally:
+        source.close_database()
+
+
+if __name__ == "__main__":
+
+    if len(sys.argv) != 4:
+        print(
+            "Usage: python -m chessresults.tools.migrate_database",
+            "source target engine",
+        )
+        sys.exit(2)
+    for file, count in migrate_database(*sys.argv[1:]).items():
+        print(file, count)
@@ -0,0 +1,213 @@
+# sqlite_profile_benchmark.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Compare SQLite performance profiles on import, export and summary tasks.
+
+For each profile a new database is created in a temporary folder, and the
+time taken for these workloads is reported:
+
+import: add events, names, players, and games in one transaction.
+export: read every player and game record in key order.
+summary: collect the games, players, teams, and sections of each event, as
+the Event Summary report does.
+
+Run as 'python -m chessresults.tools.sqlite_profile_benchmark [-e engine]
+[-g games] [profile ...]' where engine is sqlite3 (default) or apsw.
+
+"""
+
+import sys
+import os
+import time
+import random
+import shutil
+import tempfile
+import importlib
+
+from ..core import filespec
+from ..core import resultsrecord
+from ..basecore import sqliteprofile
+
+ENGINES = dict(
+    sqlite3="chessresults.sqlite.resultsdatabase",
+    apsw="chessresults.apsw.resultsdatabase",
+)
+
+# Default number of games added by import workload.
+GAMES = 20000
+
+# Players, teams, and games per event.
+PLAYERS_PER_EVENT = 200
+TEAMS_PER_EVENT = 10
+GAMES_PER_EVENT = 1000
+
+
+def _put(database, record, file):
+    """Add record to file and return its key."""
+    record.key.recno = None
+    record.put_record(database, file)
+    return record.key.recno
+
+
+def _add_name(database, text):
+    """Add name text and return its key."""
+    record = resultsrecord.ResultsDBrecordName()
+    record.value.name = text
+    record.value.reference_count = 1
+    return _put(database, record, filespec.NAME_FILE_DEF)
+
+
+def import_workload(database, games, seed=1):
+    """Add events with players and games in one transaction."""
+    rng = random.Random(seed)
+    database.start_transaction()
+    added = 0
+    event_number = 0
+    while added < games:
+        event_number += 1
+        section = _add_name(database, "Division " + str(event_number))
+        teams = [
+            _add_name(database, "".join(("Team ", str(event_number), str(t))))
+            for t in range(TEAMS_PER_EVENT)
+        ]
+        event = resultsrecord.ResultsDBrecordEvent()
+        event.value.name = "League " + str(event_number)
+        event.value.startdate = "2025-09-01"
+        event.value.enddate = "2026-05-31"
+        event.value.sections = [section]
+        eventkey = _put(database, event, filespec.EVENT_FILE_DEF)
+        players = []
+        for p in range(PLAYERS_PER_EVENT):
+            player = resultsrecord.ResultsDBrecordPlayer()
+            value = player.value
+            value.name = "".join(("Player, ", str(event_number), "-", str(p)))
+            value.event = eventkey
+            value.section = section
+            value.pin = None
+            value.affiliation = None
+            value.alias = []
+            value.merge = False
+            players.append(_put(database, player, filespec.PLAYER_FILE_DEF))
+        for g in range(min(GAMES_PER_EVENT, games - added)):
+            game = resultsrecord.ResultsDBrecordGame()
+            value = game.value
+            value.homeplayer, value.awayplayer = rng.sample(players, 2)
+            value.hometeam, value.awayteam = rng.sample(teams, 2)
+            value.result = rng.choice(("h", "d", "a"))
+            value.date = "2025-%02d-%02d" % (
+                rng.randint(9, 12),
+                rng.randint(1, 28),
+            )
+            value.board = str(g % 8 + 1)
+            value.event = eventkey
+            value.section = section
+            _put(database, game, filespec.GAME_FILE_DEF)
+            added += 1
+    database.commit()
+    return added
+
+
+def export_workload(database):
+    """Read all player and game records and return number read."""
+    count = 0
+    for file, recordclass in (
+        (filespec.PLAYER_FILE_DEF, resultsrecord.ResultsDBrecordPlayer),
+        (filespec.GAME_FILE_DEF, resultsrecord.ResultsDBrecordGame),
+    ):
+        cursor = database.database_cursor(file, file)
+        try:
+            r = cursor.first()
+            while r is not None:
+                record = recordclass()
+                record.load_record(r)
+                count += 1
+                r = cursor.next()
+        finally:
+            cursor.close()
+    return count
+
+
+def summary_workload(database):
+    """Collect event summary data for all events and return games seen."""
+    count = 0
+    cursor = database.database_cursor(
+        filespec.EVENT_FILE_DEF, filespec.EVENT_FILE_DEF
+    )
+    try:
+        eventkeys = []
+        r = cursor.first()
+        while r is not None:
+            eventkeys.append(r[0])
+            r = cursor.next()
+    finally:
+        cursor.close()
+    for key in eventkeys:
+        games = resultsrecord.get_games_for_event(
+            database, resultsrecord.get_event(database, key)
+        )
+        players = set()
+        names = set()
+        for g in games:
+            players.update((g.value.homeplayer, g.value.awayplayer))
+            names.update((g.value.hometeam, g.value.awayteam))
+            names.add(g.value.section)
+        for p in players:
+            resultsrecord.get_alias(database, p)
+        for n in names:
+            database.get_primary_record(filespec.NAME_FILE_DEF, n)
+        count += len(games)
+    return count
+
+
+def run_profile(database_class, profile, games):
+    """Return [(workload, seconds, items), ...] for profile."""
+    folder = tempfile.mkdtemp()
+    database_class.performance_profile = profile
+    try:
+        database = database_class(
+            os.path.join(folder, "results"), allowcreate=True
+        )
+        database.open_database()
+        timings = []
+        try:
+            for name, workload, args in (
+                ("import", import_workload, (games,)),
+                ("export", export_workload, ()),
+                ("summary", summary_workload, ()),
+            ):
+                start = time.perf_counter()
+                items = workload(database, *args)
+                timings.append((name, time.perf_counter() - start, items))
+        finally:
+            database.close_database()
+        return timings
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+
+    arguments = sys.argv[1:]
+    engine = "sqlite3"
+    games = GAMES
+    while arguments[:1] in (["-e"], ["-g"]):
+        if arguments[0] == "-e":
+            engine = arguments[1]
+        else:
+            games = int(arguments[1])
+        arguments = arguments[2:]
+    database_class = importlib.import_module(ENGINES[engine]).ResultsDatabase
+    print(engine, str(games), "games")
+    print(
+        "%-10s%-10s%12s%12s%12s"
+        % ("profile", "workload", "seconds", "items", "per second")
+    )
+    for profile in arguments or sqliteprofile.PROFILES:
+        for name, seconds, items in run_profile(
+            database_class, profile, games
+        ):
+            print(
+                "%-10s%-10s%12.3f%12d%12.0f"
+                % (profile, name, seconds, items, items / seconds)
+            )
@@ -0,0 +1,137 @@
+# startup_import_times.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Report time taken to import the modules used to start Results.
+
+Each module named on the command line, or the Leagues frame modules used by
+the results_* applications by default, is imported in a new Python process
+run with '-X importtime'.  The total import time and the slowest modules
+imported as a consequence are reported, followed by any modules which should
+be imported on first use but were imported at start-up.
+
+Run as 'python -m chessresults.tools.startup_import_times [-n count]
+[module ...]'.
+
+"""
+
+import sys
+import subprocess
+
+# Modules imported by the results_* applications before the window appears.
+STARTUP_MODULES = (
+    "chessresults.gui.resultsroot",
+    "chessresults.gui.leagues_database",
+    "chessresults.gui.ecf.leagues",
+    "chessresults.gui.lite.leagues_lite",
+    "chessresults.gui.ogd.leagues_ogd",
+)
+
+# Modules imported on first use rather than at start-up.
+DEFERRED_MODULES = (
+    "chesscalc.gui",
+    "tnefparse",
+    "requests",
+    "chessresults.gui.ecf.uploadresults",
+    "chessresults.gui.ecf.ecfgradingcodes",
+    "chessresults.gui.ecf.ecfclubcodes",
+    "chessresults.gui.ecf.ecfplayers",
+    "chessresults.gui.players",
+    "chessresults.gui.ogd.ogdgradingcodes",
+    "chessresults.core.ecf.downloadcache",
+)
+
+# Number of slowest imported modules reported for each module.
+SLOWEST = 15
+
+
+class StartupImportTimesError(Exception):
+    pass
+
+
+def get_import_times(module):
+    """Return [(cumulative, self, name), ...] microseconds for module import.
+
+    The list is in the order modules finished importing, so module is last.
+
+    """
+    cp = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + module],
+        capture_output=True,
+        text=True,
+    )
+    if cp.returncode:
+        raise StartupImportTimesError(
+            "".join(
+                (
+                    "Import of '",
+                    module,
+                    "' failed:\n\n",
+                    cp.stderr.strip().split("\n")[-1],
+                )
+            )
+        )
+    times = []
+    for line in cp.stderr.split("\n"):
+        if not line.startswith("import time:"):
+            continue
+        selftime, cumulative, name = line[len("import time:") :].split("|")
+        if not selftime.strip().isdigit():
+            continue  # The column headings.
+        times.append((int(cumulative), int(selftime), name.strip()))
+    return times
+
+
+def get_deferred_imports(times, deferred=DEFERRED_MODULES):
+    """Return names in deferred, or their submodules, imported in times."""
+    imported = []
+    for cumulative, selftime, name in times:
+        for d in deferred:
+            if name == d or name.startswith(d + "."):
+                imported.append(name)
+                break
+    return imported
+
+
+def report_import_times(module, slowest=SLOWEST):
+    """Return text reporting import time of module and slowest imports."""
+    times = get_import_times(module)
+    if not times:
+        return "".join((module, ": no import times reported"))
+    lines = [
+        "".join(
+            (
+                module,
+                ": ",
+                "%.3f" % (times[-1][0] / 1000000),
+                " seconds, ",
+                str(len(times)),
+                " modules imported",
+            )
+        ),
+        "    cumulative        self  module",
+    ]
+    for cumulative, selftime, name in sorted(times[:-1], reverse=True)[
+        :slowest
+    ]:
+        lines.append("%14d%12d  %s" % (cumulative, selftime, name))
+    deferred = get_deferred_imports(times)
+    if deferred:
+        lines.append("    imported at start-up but expected on first use:")
+        lines.extend(["        " + name for name in deferred])
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+
+    arguments = sys.argv[1:]
+    slowest = SLOWEST
+    if arguments[:1] == ["-n"]:
+        slowest = int(arguments[1])
+        arguments = arguments[2:]
+    for module in arguments or STARTUP_MODULES:
+        try:
+            print(report_import_times(module, slowest=slowest))
+        except StartupImportTimesError as exc:
+            print(exc)
+        print()
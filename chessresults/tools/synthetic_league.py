@@ -0,0 +1,478 @@
+# synthetic_league.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Generate synthetic league results for benchmarks.
+
+Each season has several league events, each with divisions of teams from
+clubs.  The teams in a division play each other home and away, and each
+match is played on several boards by players from the team's squad.
+
+Most players continue from one season to the next.  The player record in
+the first season a player appears is the identified player, and the records
+in later seasons are aliases merged with it.  Some players appear under two
+spellings in an event, and the second is an alias merged with the identified
+player.  Players who first appear in the last season, the season in
+progress, have not been identified yet: so the events of the last season
+can be deleted.
+
+The identified players have ECF grading code and club code map records, and
+there are ECF player and club reference records for the codes.
+
+The same seed, and scale arguments, always generate the same data.
+
+"""
+
+import random
+
+from ..core import filespec
+from ..core import resultsrecord
+from ..core.ecf import ecfmaprecord
+from ..core.ecf import ecfrecord
+
+# Default scale.
+SEASONS = 3
+EVENTS_PER_SEASON = 2
+DIVISIONS_PER_EVENT = 3
+TEAMS_PER_DIVISION = 8
+BOARDS = 6
+
+# Players in a team's squad are those needed for a match plus reserves.
+RESERVES = 3
+
+# Chance a squad player continues into the next season.
+CONTINUE = 0.8
+
+# Chance a player appears under a second spelling in an event.
+MISSPELT = 0.05
+
+# Chance an identified player has an ECF grading code.
+ECF_CODED = 0.7
+
+# Date of first season.
+FIRST_YEAR = 2020
+
+SURNAMES = (
+    "Adams",
+    "Baker",
+    "Clarke",
+    "Davies",
+    "Evans",
+    "Fisher",
+    "Green",
+    "Hughes",
+    "Irving",
+    "Jones",
+    "King",
+    "Lewis",
+    "Morgan",
+    "Norris",
+    "Owen",
+    "Price",
+    "Quinn",
+    "Roberts",
+    "Smith",
+    "Taylor",
+    "Underwood",
+    "Vaughan",
+    "Walker",
+    "Young",
+)
+
+FORENAMES = (
+    "Alan",
+    "Beth",
+    "Chris",
+    "David",
+    "Emma",
+    "Frank",
+    "Grace",
+    "Harry",
+    "Isla",
+    "John",
+    "Kate",
+    "Liam",
+    "Mary",
+    "Neil",
+    "Olive",
+    "Peter",
+    "Rachel",
+    "Simon",
+    "Tom",
+    "Will",
+)
+
+
+class SyntheticLeague(object):
+    """Synthetic league results for a number of seasons.
+
+    populate() adds the results to an open database.  The event_keys and
+    season_event_keys attributes refer to the events added, in the form
+    used by the events arguments of functions in core.eventdata and
+    resultsrecord.get_events_for_performance_calculation.  The players in
+    all seasons except the last are identified.
+
+    """
+
+    def __init__(
+        self,
+        seasons=SEASONS,
+        events=EVENTS_PER_SEASON,
+        divisions=DIVISIONS_PER_EVENT,
+        teams=TEAMS_PER_DIVISION,
+        boards=BOARDS,
+        seed=1,
+    ):
+        super(SyntheticLeague, self).__init__()
+        self.seasons = seasons
+        self.events = events
+        self.divisions = divisions
+        self.teams = teams
+        self.boards = boards
+        self.seed = seed
+        self.event_keys = []
+        self.season_event_keys = []
+        self.ecf_codes = []
+        self.club_codes = []
+
+    def _put(self, database, record, file):
+        """Add record to file and return its key."""
+        record.key.recno = None
+        record.put_record(database, file)
+        return record.key.recno
+
+    def _new_name(self, rng, used):
+        """Return a player name not in used and add it to used."""
+        while True:
+            name = "".join(
+                (
+                    rng.choice(SURNAMES),
+                    ", ",
+                    rng.choice(FORENAMES),
+                    " ",
+                    chr(rng.randrange(26) + ord("A")),
+                    str(rng.randrange(100)),
+                )
+            )
+            if name not in used:
+                used.add(name)
+                return name
+
+    def _plan(self):
+        """Return events, players, games, and name references to add.
+
+        Names are text at this stage and are replaced by name record keys
+        when the records are added.
+
+        """
+        rng = random.Random(self.seed)
+        used = set()
+        clubs = [
+            "Club " + str(c)
+            for c in range(self.events * self.divisions * self.teams)
+        ]
+        squadsize = self.boards + RESERVES
+        squads = {}
+        events = []
+        players = []
+        games = []
+        references = {}
+        first = {}
+        last = self.seasons - 1
+
+        def refer(name):
+            references[name] = references.get(name, 0) + 1
+
+        for season in range(self.seasons):
+            year = FIRST_YEAR + season
+            startdate = "%d-09-01" % year
+            enddate = "%d-05-31" % (year + 1)
+            club = iter(clubs)
+            for event in range(self.events):
+                eventname = "League " + str(event + 1)
+                sections = []
+                for division in range(self.divisions):
+                    section = "".join(
+                        (eventname, " Division ", str(division + 1))
+                    )
+                    sections.append(section)
+                    refer(section)
+                    teamplayers = {}
+                    for team in range(self.teams):
+                        teamname = next(club)
+                        squad = [
+                            p
+                            for p in squads.get(teamname, ())
+                            if rng.random() < CONTINUE
+                        ]
+                        while len(squad) < squadsize:
+                            squad.append(self._new_name(rng, used))
+                        squads[teamname] = squad
+                        teamplayers[teamname] = squad
+                    divisionplayers = []
+                    for teamname, squad in teamplayers.items():
+                        for name in squad:
+                            divisionplayers.append(
+                                (name, len(events), teamname, False)
+                            )
+                            if first.get(name, season) == last:
+                                continue
+                            if rng.random() < MISSPELT:
+                                divisionplayers.append(
+                                    (name + ".", len(events), teamname, name)
+                                )
+                    misspelt = {p[-1] for p in divisionplayers if p[-1]}
+                    fixtures = [
+                        (home, away)
+                        for home in teamplayers
+                        for away in teamplayers
+                        if home != away
+                    ]
+                    divisiongames = []
+                    for number, (home, away) in enumerate(fixtures):
+                        date = "%d-%02d-%02d" % (
+                            year if number % 9 < 4 else year + 1,
+                            (number % 9 + 8) % 12 + 1,
+                            number % 28 + 1,
+                        )
+                        homesquad = rng.sample(teamplayers[home], self.boards)
+                        awaysquad = rng.sample(teamplayers[away], self.boards)
+                        for board in range(self.boards):
+                            homeplayer, awayplayer = [
+                                (
+                                    name + "."
+                                    if name in misspelt and rng.random() < 0.5
+                                    else name
+                                )
+                                for name in (
+                                    homesquad[board],
+                                    awaysquad[board],
+                                )
+                            ]
+                            divisiongames.append(
+                                [
+                                    len(events),
+                                    section,
+                                    home,
+                                    away,
+                                    homeplayer,
+                                    awayplayer,
+                                    str(board + 1),
+                                    date,
+                                    rng.choice(("h", "d", "a")),
+                                ]
+                            )
+
+                    # Player records are created for players in games, so
+                    # reserves who did not play are dropped.  A misspelling
+                    # is replaced if the correct spelling was not used.
+                    played = {n for game in divisiongames for n in game[4:6]}
+                    for game in divisiongames:
+                        for i in 4, 5:
+                            name = game[i]
+                            if name.endswith(".") and name[:-1] not in played:
+                                game[i] = name[:-1]
+                    played = set()
+                    for game in divisiongames:
+                        played.update(game[4:6])
+                        games.append(tuple(game))
+                        refer(section)
+                        refer(game[2])
+                        refer(game[3])
+                    for player in divisionplayers:
+                        if player[0] in played:
+                            players.append(player)
+                            refer(player[2])
+                            first.setdefault(player[0], season)
+                events.append(
+                    (season, eventname, startdate, enddate, sections)
+                )
+        return events, players, games, references, clubs
+
+    def populate(self, database):
+        """Add synthetic results to database and return count of records.
+
+        The records are added in one transaction.
+
+        """
+        rng = random.Random(self.seed)
+        events, players, games, references, clubs = self._plan()
+        counts = {}
+        database.start_transaction()
+
+        namekeys = {}
+        for name, count in references.items():
+            record = resultsrecord.ResultsDBrecordName()
+            record.value.name = name
+            record.value.reference_count = count
+            namekeys[name] = self._put(
+                database, record, filespec.NAME_FILE_DEF
+            )
+        counts["names"] = len(namekeys)
+
+        eventkeys = []
+        self.event_keys = []
+        self.season_event_keys = [[] for s in range(self.seasons)]
+        for season, eventname, startdate, enddate, sections in events:
+            record = resultsrecord.ResultsDBrecordEvent()
+            record.value.name = eventname
+            record.value.startdate = startdate
+            record.value.enddate = enddate
+            record.value.sections = [namekeys[s] for s in sections]
+            key = self._put(database, record, filespec.EVENT_FILE_DEF)
+            eventkeys.append(key)
+            self.event_keys.append((key,))
+            self.season_event_keys[season].append((key,))
+        counts["events"] = len(eventkeys)
+
+        # An event player's name is the key to the player record which will
+        # be used in games.  Aliases, for later seasons and misspelt names,
+        # are merged with the player record from the first season the player
+        # appears.  Players who first appear in the last season are not
+        # identified.
+        persons = {}
+        personclubs = {}
+        playerkeys = {}
+        aliases = {}
+        for name, event, teamname, misspelling_of in players:
+            record = resultsrecord.ResultsDBrecordPlayer()
+            value = record.value
+            value.name = name
+            value.event = eventkeys[event]
+            value.section = namekeys[teamname]
+            value.pin = None
+            value.affiliation = None
+            if misspelling_of:
+                person = persons[misspelling_of]
+            else:
+                person = persons.get(name)
+            value.alias = []
+            if person is not None:
+                value.alias = False
+                value.merge = person
+            elif events[event][0] == self.seasons - 1:
+                value.merge = None
+            else:
+                value.merge = False
+            key = self._put(database, record, filespec.PLAYER_FILE_DEF)
+            if person is not None:
+                aliases[person][-1].append(key)
+            elif value.merge is False:
+                persons[name] = key
+                aliases[key] = (record, [])
+                personclubs[key] = clubs.index(teamname)
+            playerkeys[name, event] = key
+        for key, (record, alias) in aliases.items():
+            if not alias:
+                continue
+            newrecord = record.clone()
+            newrecord.value.alias = alias
+            record.edit_record(
+                database,
+                filespec.PLAYER_FILE_DEF,
+                filespec.PLAYER_FIELD_DEF,
+                newrecord,
+            )
+        counts["players"] = len(players)
+        counts["persons"] = len(persons)
+
+        for (
+            event,
+            section,
+            home,
+            away,
+            homeplayer,
+            awayplayer,
+            board,
+            date,
+            result,
+        ) in games:
+            record = resultsrecord.ResultsDBrecordGame()
+            value = record.value
+            value.event = eventkeys[event]
+            value.section = namekeys[section]
+            value.hometeam = namekeys[home]
+            value.awayteam = namekeys[away]
+            value.homeplayer = playerkeys[homeplayer, event]
+            value.awayplayer = playerkeys[awayplayer, event]
+            value.homeplayerwhite = int(board) % 2 == 1
+            value.board = board
+            value.date = date
+            value.result = result
+            self._put(database, record, filespec.GAME_FILE_DEF)
+        counts["games"] = len(games)
+
+        self.club_codes = []
+        for number, name in enumerate(clubs):
+            record = ecfrecord.ECFrefDBrecordECFclub()
+            record.value.ECFcode = "C%03d" % number
+            record.value.ECFactive = True
+            record.value.ECFname = name
+            record.value.ECFcountycode = "K%d" % (number % 5)
+            self._put(database, record, filespec.ECFCLUB_FILE_DEF)
+            self.club_codes.append(record.value.ECFcode)
+        counts["ecf clubs"] = len(self.club_codes)
+
+        self.ecf_codes = []
+        for name, key in persons.items():
+            record, alias = aliases[key]
+            club = self.club_codes[personclubs[key]]
+            if rng.random() < ECF_CODED:
+                code = "%06d%s" % (
+                    len(self.ecf_codes) + 100000,
+                    chr(len(self.ecf_codes) % 26 + ord("A")),
+                )
+                self.ecf_codes.append((code, name, club))
+                ecfplayer = ecfrecord.ECFrefDBrecordECFplayer()
+                ecfplayer.value.ECFcode = code
+                ecfplayer.value.ECFactive = True
+                ecfplayer.value.ECFname = name
+                ecfplayer.value.ECFclubcodes = [club]
+                self._put(database, ecfplayer, filespec.ECFPLAYER_FILE_DEF)
+            else:
+                code = None
+            mapplayer = ecfmaprecord.ECFmapDBrecordPlayer()
+            mapplayer.value.playerkey = repr(key)
+            mapplayer.value.playername = record.value.identity_packed()
+            mapplayer.value.playercode = code
+            self._put(database, mapplayer, filespec.MAPECFPLAYER_FILE_DEF)
+            mapclub = ecfmaprecord.ECFmapDBrecordClub()
+            mapclub.value.playerkey = repr(key)
+            mapclub.value.playername = record.value.identity_packed()
+            mapclub.value.clubcode = club
+            self._put(database, mapclub, filespec.MAPECFCLUB_FILE_DEF)
+        counts["ecf players"] = len(self.ecf_codes)
+
+        database.commit()
+        return counts
+
+    def ecf_player_data(self, joiners=0.1, leavers=0.1):
+        """Return ECF rating list data for the ECF coded players.
+
+        The data is in the form used by copy_ecf_players_post_2020_rules:
+        some players have left, some have joined, and some have changed
+        club since the ECF player reference records were added.
+
+        """
+        rng = random.Random(self.seed)
+        players = []
+        for code, name, club in self.ecf_codes:
+            if rng.random() < leavers:
+                continue
+            if rng.random() < 0.05:
+                club = rng.choice(self.club_codes)
+            players.append([code, name, club])
+        used = set()
+        for number in range(int(len(self.ecf_codes) * joiners)):
+            players.append(
+                [
+                    "%06dN" % (number + 900000),
+                    self._new_name(rng, used),
+                    rng.choice(self.club_codes),
+                ]
+            )
+        return dict(
+            rating_effective_date="%d-09-01" % (FIRST_YEAR + self.seasons),
+            column_names=["ECF_code", "full_name", "club_code"],
+            players=players,
+        )
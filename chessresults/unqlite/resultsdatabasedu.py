@@ -0,0 +1,18 @@
+# resultsdatabasedu.py
+# Copyright 2026 Roger Marsh
+# Licence: See LICENCE (BSD licence)
+
+"""Results database using UnQLite via unqlite with deferred index updates.
+
+Used to fill a new database in bulk, as the migrate_database tool does.
+"""
+
+from solentware_base import unqlitedu_database
+
+from . import resultsdatabase
+
+
+class ResultsDatabase(
+    resultsdatabase.ResultsDatabase, unqlitedu_database.Database
+):
+    """Results database which sorts index updates and applies them in bulk."""